@@ -0,0 +1,58 @@
+"""
+Measure the recall and query speed of the IVF index by number of probed lists.
+
+Generates clustered random embeddings, builds an IVFIndex over them, and for
+every nprobe reports the recall of top-k queries against an exhaustive search
+and how many times faster the index answered.
+
+Usage:
+    python benchmarks/bench_ann_index.py --size 200000 --nprobe 1 4 8 16 32
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from ard.utils.ann_index import IVFIndex
+from ard.utils.embedding_store import EmbeddingStore
+
+
+def make_store(n: int, dim: int, clusters: int, seed: int = 0) -> EmbeddingStore:
+    """Create n named embeddings around random cluster centers."""
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dim)).astype(np.float32)
+    vectors = centers[rng.integers(clusters, size=n)]
+    vectors += 0.5 * rng.normal(size=(n, dim)).astype(np.float32)
+    store = EmbeddingStore(dim)
+    store.add_many([f"node {i}" for i in range(n)], vectors)
+    return store
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--size", type=int, default=50_000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--clusters", type=int, default=1000)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[1, 4, 8, 16, 32])
+    args = parser.parse_args()
+
+    store = make_store(args.size, args.dim, args.clusters)
+    start = time.perf_counter()
+    index = IVFIndex.from_store(store)
+    elapsed = time.perf_counter() - start
+    print(f"{'build':>22}: {elapsed:>10,.2f} s, {index.num_lists} lists")
+
+    for nprobe in args.nprobe:
+        report = index.recall_report(args.k, args.queries, nprobe=nprobe)
+        label = f"nprobe {report.nprobe}"
+        print(
+            f"{label:>22}: recall@{args.k} {report.recall:>6.3f}, "
+            f"{report.speedup:>6.1f}x faster than exact"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Compare the NetworkX and CSR graph backends on traversal-heavy operations.
+
+Builds a synthetic graph with the same triplet generator as bench_ingestion.py,
+copies it into each backend and reports the memory allocated for the graph
+structure (attribute values such as "sources" lists are shared by both copies
+and not counted) and the average time of the neighbor queries used by the
+subgraph generators.
+
+Usage:
+    python benchmarks/bench_backends.py --size 1000000
+"""
+
+import argparse
+import gc
+import random
+import time
+import tracemalloc
+
+from bench_ingestion import make_triplets
+
+from ard.knowledge_graph import KnowledgeGraph
+from ard.storage.graph import CSRBackend, NetworkXBackend
+
+
+def per_call_us(function, args, repeat: int = 1) -> float:
+    """Average time of a call in microseconds."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for arg in args:
+            function(arg)
+    return (time.perf_counter() - start) / (repeat * len(args)) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--size", type=int, default=200_000)
+    parser.add_argument(
+        "--nodes-per-triplet",
+        type=float,
+        default=0.1,
+        help="Number of distinct nodes relative to the number of triplets",
+    )
+    parser.add_argument("--queries", type=int, default=20_000)
+    parser.add_argument(
+        "--paths",
+        type=int,
+        default=5,
+        help="Number of undirected shortest paths, slow on NetworkX as it copies "
+        "the graph for every call",
+    )
+    args = parser.parse_args()
+
+    source = KnowledgeGraph()
+    source.add_triplets(
+        make_triplets(args.size, max(1, int(args.size * args.nodes_per_triplet)))
+    )
+    nx_graph = source.graph.graph
+    print(f"{len(nx_graph)} nodes, {nx_graph.number_of_edges()} edges")
+
+    graphs = {}
+    for name, convert in (
+        ("networkx", lambda: NetworkXBackend.from_networkx(nx_graph.copy())),
+        ("csr", lambda: CSRBackend.from_networkx(nx_graph)),
+    ):
+        gc.collect()
+        tracemalloc.start()
+        backend = convert()
+        size, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        kg = KnowledgeGraph()
+        kg._backend = backend
+        graphs[name] = (kg, size)
+
+    rng = random.Random(0)
+    nodes = list(nx_graph.nodes())
+    sample = [rng.choice(nodes) for _ in range(args.queries)]
+    pairs = list(zip(sample[: args.paths], sample[args.paths : 2 * args.paths]))
+
+    print(
+        f"{'backend':>9} {'struct MB':>9} {'succ us':>8} {'nbrs us':>8} "
+        f"{'walk us':>8} {'path ms':>8}"
+    )
+    for name, (kg, size) in graphs.items():
+        succ = per_call_us(kg.get_successors, sample)
+        neighbors = per_call_us(kg.get_node_neighbors, sample)
+        walk = per_call_us(lambda node: kg.random_walk(node, 20), sample[:2000]) / 20
+        path = per_call_us(
+            lambda pair: kg.graph.shortest_path(*pair, directed=False), pairs
+        )
+        print(
+            f"{name:>9} {size / 2**20:>9.1f} {succ:>8.2f} {neighbors:>8.2f} "
+            f"{walk:>8.2f} {path / 1000:>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
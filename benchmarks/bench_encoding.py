@@ -0,0 +1,82 @@
+"""
+Measure the encoding throughput of node names by number of worker processes.
+
+Generates synthetic node names of varied length, encodes them once with a
+single model.encode call as Embedder used to, then with the EncodingEngine in
+process and over pools of worker processes, and reports texts per second.
+Requires sentence-transformers.
+
+Usage:
+    python benchmarks/bench_encoding.py --size 50000 --workers 0 2 4 8
+"""
+
+import argparse
+import random
+import time
+
+from ard.utils.encoding_engine import EncodingEngine, load_sentence_transformer
+
+
+def make_names(n: int, seed: int = 0) -> list:
+    """Create n node-like names of one to eight words."""
+    rng = random.Random(seed)
+    words = [
+        "protein",
+        "kinase",
+        "receptor",
+        "inhibitor",
+        "pathway",
+        "cell",
+        "tumor",
+        "expression",
+        "signaling",
+        "mitochondrial",
+        "dna",
+        "repair",
+        "immune",
+        "response",
+        "factor",
+        "binding",
+    ]
+    return [
+        " ".join(rng.choices(words, k=rng.randint(1, 8))) + f" {i}" for i in range(n)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--size", type=int, default=20_000)
+    parser.add_argument("--model", default="all-MiniLM-L6-v2")
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--chunk-size", type=int, default=2048)
+    parser.add_argument("--workers", type=int, nargs="+", default=[0, 2, 4])
+    args = parser.parse_args()
+
+    names = make_names(args.size)
+    model = load_sentence_transformer(args.model)
+
+    start = time.perf_counter()
+    model.encode(names, show_progress_bar=False)
+    elapsed = time.perf_counter() - start
+    print(f"{'single encode call':>22}: {len(names) / elapsed:>10,.0f} texts/s")
+
+    for workers in args.workers:
+        with EncodingEngine(
+            args.model,
+            batch_size=args.batch_size,
+            num_workers=workers,
+            chunk_size=args.chunk_size,
+            model=model if workers == 0 else None,
+        ) as engine:
+            if workers:
+                # Start the pool and load the models outside the measurement
+                engine.encode(names[: workers * args.chunk_size])
+            start = time.perf_counter()
+            engine.encode(names)
+            elapsed = time.perf_counter() - start
+        label = f"engine, {workers} workers" if workers else "engine, in process"
+        print(f"{label:>22}: {len(names) / elapsed:>10,.0f} texts/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Benchmark saving and loading a KnowledgeGraph with the JSON and binary formats.
+
+Builds a synthetic graph with the same triplet generator as bench_ingestion.py,
+saves it in both formats and reports file size, save time, load time and the
+peak memory allocated while loading (measured with tracemalloc, which slows
+both loaders down by a similar factor; the load time is measured separately
+without it). The "mmap" row opens the binary file with
+KnowledgeGraph.open_readonly instead of loading it.
+
+Usage:
+    python benchmarks/bench_graph_io.py --sizes 100000 1000000
+"""
+
+import argparse
+import gc
+import os
+import tempfile
+import time
+import tracemalloc
+
+from bench_ingestion import make_triplets
+
+from ard.knowledge_graph import KnowledgeGraph
+
+
+def measure_load(filename: str, load=KnowledgeGraph.load_from_file):
+    """Return the load time and the peak memory allocated while loading."""
+    gc.collect()
+    start = time.perf_counter()
+    kg = load(filename)
+    elapsed = time.perf_counter() - start
+    del kg
+
+    gc.collect()
+    tracemalloc.start()
+    kg = load(filename)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kg
+    return elapsed, peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument(
+        "--nodes-per-triplet",
+        type=float,
+        default=0.1,
+        help="Number of distinct nodes relative to the number of triplets",
+    )
+    args = parser.parse_args()
+
+    print(
+        f"{'triplets':>10} {'format':>6} {'size MB':>8} {'save s':>7} "
+        f"{'load s':>7} {'peak MB':>8}"
+    )
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for n in args.sizes:
+            kg = KnowledgeGraph()
+            kg.add_triplets(make_triplets(n, max(1, int(n * args.nodes_per_triplet))))
+
+            for name, extension in (("json", ".json"), ("binary", ".kgb")):
+                filename = os.path.join(temp_dir, f"graph_{n}{extension}")
+                start = time.perf_counter()
+                kg.save_to_file(filename)
+                saved = time.perf_counter() - start
+
+                loaded, peak = measure_load(filename)
+                size = os.path.getsize(filename)
+                print(
+                    f"{n:>10} {name:>6} {size / 2**20:>8.1f} {saved:>7.2f} "
+                    f"{loaded:>7.2f} {peak / 2**20:>8.1f}"
+                )
+                if extension == ".kgb":
+                    opened, peak = measure_load(filename, KnowledgeGraph.open_readonly)
+                    print(
+                        f"{n:>10} {'mmap':>6} {size / 2**20:>8.1f} {'-':>7} "
+                        f"{opened:>7.4f} {peak / 2**20:>8.1f}"
+                    )
+                os.remove(filename)
+
+
+if __name__ == "__main__":
+    main()
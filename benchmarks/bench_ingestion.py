@@ -0,0 +1,107 @@
+"""
+Benchmark triplet ingestion into a KnowledgeGraph.
+
+Builds synthetic triplets whose node mentions follow a Zipf distribution, so a
+handful of hub nodes collect most of the provenance, and times
+KnowledgeGraph.add_triplets for growing input sizes. The original per-triplet
+loop is timed as well for the smaller sizes.
+
+Usage:
+    python benchmarks/bench_ingestion.py --sizes 10000 100000 1000000 2000000
+"""
+
+import argparse
+import random
+import time
+from typing import List
+
+from ard.data.triplets import Triplet
+from ard.knowledge_graph import KnowledgeGraph
+
+
+def make_triplets(n: int, num_nodes: int, seed: int = 0) -> List[Triplet]:
+    """Create n synthetic triplets over num_nodes Zipf-distributed nodes."""
+    rng = random.Random(seed)
+    weights = [1.0 / (rank + 1) for rank in range(num_nodes)]
+    relations = [f"relation_{i}" for i in range(50)]
+    subjects = rng.choices(range(num_nodes), weights=weights, k=n)
+    objects = rng.choices(range(num_nodes), weights=weights, k=n)
+    return [
+        Triplet(
+            node_1=f"node_{s}",
+            edge=rng.choice(relations),
+            node_2=f"node_{o}",
+            metadata={"chunk_id": f"chunk_{i // 20}", "paper": f"paper_{i // 500}"},
+        )
+        for i, (s, o) in enumerate(zip(subjects, objects))
+    ]
+
+
+def add_triplets_one_by_one(kg: KnowledgeGraph, triplets: List[Triplet]) -> None:
+    """The original ingestion loop, kept here as the baseline."""
+    for triplet in triplets:
+        if not kg.has_node(triplet.node_1):
+            kg.add_node(triplet.node_1, sources=[])
+        if not kg.has_node(triplet.node_2):
+            kg.add_node(triplet.node_2, sources=[])
+
+        source_metadata = {"relation": triplet.edge, "triplet_id": id(triplet)}
+        if triplet.metadata:
+            source_metadata.update(triplet.metadata)
+
+        node1_attrs = kg.get_node_attrs(triplet.node_1)
+        node1_attrs["sources"].append(source_metadata.copy())
+        kg.add_node(triplet.node_1, **node1_attrs)
+
+        node2_attrs = kg.get_node_attrs(triplet.node_2)
+        node2_attrs["sources"].append(source_metadata.copy())
+        kg.add_node(triplet.node_2, **node2_attrs)
+
+        if kg.has_edge(triplet.node_1, triplet.node_2):
+            edge_data = kg.get_edge_attrs(triplet.node_1, triplet.node_2)
+            edge_data["sources"].append(source_metadata)
+            kg.add_edge(triplet.node_1, triplet.node_2, **edge_data)
+        else:
+            edge_data = {"relation": triplet.edge, "sources": [source_metadata]}
+            kg.add_edge(triplet.node_1, triplet.node_2, **edge_data)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000]
+    )
+    parser.add_argument(
+        "--nodes-per-triplet",
+        type=float,
+        default=0.1,
+        help="Number of distinct nodes relative to the number of triplets",
+    )
+    parser.add_argument(
+        "--legacy-max",
+        type=int,
+        default=100_000,
+        help="Largest size the original per-triplet loop is timed for",
+    )
+    args = parser.parse_args()
+
+    print(f"{'triplets':>10} {'batched s':>10} {'us/triplet':>11} {'legacy s':>10}")
+    for n in args.sizes:
+        triplets = make_triplets(n, max(1, int(n * args.nodes_per_triplet)))
+
+        start = time.perf_counter()
+        kg = KnowledgeGraph()
+        kg.add_triplets(triplets)
+        batched = time.perf_counter() - start
+
+        legacy = "-"
+        if n <= args.legacy_max:
+            start = time.perf_counter()
+            add_triplets_one_by_one(KnowledgeGraph(), triplets)
+            legacy = f"{time.perf_counter() - start:10.2f}"
+
+        print(f"{n:>10} {batched:>10.2f} {batched / n * 1e6:>11.2f} {legacy:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Compare merging groups of nodes one at a time with the bulk merge executor.
+
+Builds a synthetic graph with the same triplet generator as bench_ingestion.py,
+groups a share of its nodes into groups of two to four, and reports the time to
+merge them the way merge_similar_nodes used to, one node after the other
+through the backend methods, and in one pass with GraphBackend.merge_nodes.
+
+Usage:
+    python benchmarks/bench_merge.py --size 1000000 --backend csr
+"""
+
+import argparse
+import random
+import time
+
+from bench_ingestion import make_triplets
+
+from ard.knowledge_graph import KnowledgeGraph
+from ard.knowledge_graph.ingestion import gc_paused
+
+
+def merge_one_by_one(backend, groups) -> None:
+    """Merge every node of every group separately."""
+    for group, merged in groups:
+        if not backend.has_node(merged):
+            backend.add_node(merged, sources=[])
+        for node in group:
+            if node == merged:
+                continue
+            attrs = backend.get_node_attrs(node)
+            merged_attrs = backend.get_node_attrs(merged)
+            merged_attrs["sources"].extend(attrs["sources"])
+            backend.add_node(merged, **merged_attrs)
+            for _, target, data in backend.get_out_edges(node):
+                move_edge(backend, merged, target, data)
+            for source, _, data in backend.get_in_edges(node):
+                move_edge(backend, source, merged, data)
+            backend.remove_node(node)
+
+
+def move_edge(backend, source: str, target: str, data: dict) -> None:
+    if not backend.has_edge(source, target):
+        backend.add_edge(source, target, relation=data["relation"], sources=[])
+    edge_attrs = backend.get_edge_attrs(source, target)
+    edge_attrs["sources"].extend(data["sources"])
+    backend.add_edge(source, target, **edge_attrs)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--size", type=int, default=200_000)
+    parser.add_argument("--backend", choices=["networkx", "csr"], default="networkx")
+    parser.add_argument("--share", type=float, default=0.3)
+    args = parser.parse_args()
+
+    triplets = make_triplets(args.size, max(1, args.size // 10))
+    kg = KnowledgeGraph(backend=args.backend)
+    kg.add_triplets(triplets)
+    nodes = sorted(kg.get_nodes())
+    random.Random(0).shuffle(nodes)
+    nodes = nodes[: int(len(nodes) * args.share)]
+    groups, i = [], 0
+    rng = random.Random(1)
+    while i < len(nodes):
+        size = rng.randrange(2, 5)
+        groups.append((nodes[i : i + size], nodes[i]))
+        i += size
+    print(
+        f"{kg.number_of_nodes()} nodes, {kg.number_of_edges()} edges, "
+        f"{len(groups)} groups"
+    )
+
+    for label, merge in (
+        ("one by one", merge_one_by_one),
+        ("bulk", lambda backend, groups: backend.merge_nodes(groups)),
+    ):
+        kg = KnowledgeGraph(backend=args.backend)
+        kg.add_triplets(triplets)
+        start = time.perf_counter()
+        with gc_paused():
+            merge(kg.graph, groups)
+        elapsed = time.perf_counter() - start
+        print(f"{label:>12}: {elapsed:>8.2f} s, {kg.number_of_nodes()} nodes left")
+
+
+if __name__ == "__main__":
+    main()
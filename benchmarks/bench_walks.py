@@ -0,0 +1,73 @@
+"""
+Compare step-by-step random walks with the batched WalkEngine.
+
+Builds a synthetic graph with the same triplet generator as bench_ingestion.py
+and reports walker steps per second of a walk that looks up the neighbors of
+every node it visits, as the random walk subgraph generators used to, and of
+the engine with uniform, degree-biased and node2vec transitions.
+
+Usage:
+    python benchmarks/bench_walks.py --size 1000000 --backend csr
+"""
+
+import argparse
+import random
+import time
+
+from bench_ingestion import make_triplets
+
+from ard.knowledge_graph import KnowledgeGraph
+
+
+def step_by_step(kg: KnowledgeGraph, start_node: str, max_steps: int) -> list:
+    """Walk by looking up the neighbors of every visited node."""
+    path = [start_node]
+    current_node = start_node
+    for _ in range(max_steps):
+        neighbors = kg.get_node_neighbors(current_node)
+        if not neighbors:
+            break
+        current_node = random.choice(neighbors)
+        path.append(current_node)
+    return path
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--size", type=int, default=200_000)
+    parser.add_argument("--backend", choices=["networkx", "csr"], default="networkx")
+    parser.add_argument("--walkers", type=int, default=100_000)
+    parser.add_argument("--steps", type=int, default=20)
+    args = parser.parse_args()
+
+    kg = KnowledgeGraph(backend=args.backend)
+    kg.add_triplets(make_triplets(args.size, max(1, args.size // 10)))
+    print(f"{kg.number_of_nodes()} nodes, {kg.number_of_edges()} edges")
+
+    random.seed(0)
+    starts = kg.graph.sample_nodes(args.walkers)
+
+    count = min(2000, args.walkers)
+    start = time.perf_counter()
+    steps = sum(len(step_by_step(kg, node, args.steps)) - 1 for node in starts[:count])
+    elapsed = time.perf_counter() - start
+    print(f"{'step by step':>22}: {steps / elapsed:>12,.0f} steps/s")
+
+    start = time.perf_counter()
+    kg.get_walk_engine()
+    print(f"{'engine build':>22}: {time.perf_counter() - start:>12.2f} s")
+
+    for label, options in (
+        ("engine uniform", {}),
+        ("engine degree-biased", {"degree_bias": 1.0}),
+        ("engine node2vec", {"p": 4.0, "q": 0.5}),
+    ):
+        start = time.perf_counter()
+        walks = kg.random_walks(starts, args.steps, seed=0, **options)
+        elapsed = time.perf_counter() - start
+        steps = int(walks.lengths.sum()) - len(walks)
+        print(f"{label:>22}: {steps / elapsed:>12,.0f} steps/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 import time
+from contextlib import contextmanager
 from pathlib import Path
 
 import click
@@ -8,6 +9,7 @@ from openai import OpenAI
 from ard.data.dataset import Dataset
 from ard.knowledge_graph import KnowledgeGraph
 from ard.knowledge_graph.node_merger.embedding_based import EmbeddingBasedNodeMerger
+from ard.knowledge_graph.sampling import NodeSampler
 from ard.subgraph.subgraph import Subgraph
 from ard.subgraph.subgraph_generator import (
     RandomizedEmbeddingPathGenerator,
@@ -18,7 +20,9 @@ from ard.subgraph.subgraph_generator.random_walk import (
     SingleNodeRandomWalkGenerator,
 )
 from ard.subgraph.subgraph_generator.shortest_path import ShortestPathGenerator
-from ard.utils.embedder import Embedder
+from ard.utils.embedder import Embedder, convert_embeddings_file
+from ard.utils.embedding_cache import EmbeddingCache
+from ard.utils.encoding_engine import EncodingEngine
 
 client = OpenAI()
 
@@ -47,6 +51,18 @@ def log_timing(operation_name, start_time):
     logger.info(f"⏱️ {operation_name} completed in {elapsed:.2f} seconds")
 
 
+def batched(draw, batch_size):
+    """Yield samples from a sampling function, drawing batch_size at a time.
+
+    Stops when a draw returns nothing, e.g. on an empty graph.
+    """
+    while True:
+        samples = draw(batch_size)
+        if not samples:
+            return
+        yield from samples
+
+
 def log_section(section_name):
     """Create a visual separator for a new section in logs."""
     logger.info(f"\n{'=' * 50}")
@@ -54,6 +70,42 @@ def log_section(section_name):
     logger.info(f"{'=' * 50}")
 
 
+@contextmanager
+def open_embedder(embedding_cache, encoding_workers=0):
+    """Create the embedder of a command, with the persistent cache if enabled.
+
+    The worker processes and the cache connection are closed on exit, also when
+    the command fails.
+    """
+    engine = None
+    cache = None
+    try:
+        if encoding_workers:
+            logger.info(f"⚙️ Encoding with {encoding_workers} worker processes")
+            engine = EncodingEngine(num_workers=encoding_workers)
+        if embedding_cache:
+            cache = EmbeddingCache()
+            logger.info(
+                f"🗄️ Using embedding cache {cache.path} ({len(cache)} embeddings)"
+            )
+        yield Embedder(persistent_cache=cache, encoding_engine=engine)
+    finally:
+        if engine is not None:
+            engine.close()
+        if cache is not None:
+            cache.close()
+
+
+def log_cache_stats(embedder):
+    """Log the hit rate of the persistent embedding cache, if any."""
+    cache = embedder.persistent_cache
+    if cache is not None and cache.stats.hits + cache.stats.misses:
+        logger.info(
+            f"🗄️ Embedding cache: {cache.stats.hits} hits, {cache.stats.misses} "
+            f"misses ({cache.stats.hit_rate:.1%} hit rate)"
+        )
+
+
 @click.group()
 def cli():
     """ARD - Knowledge Graph and Subgraph Pipeline Tool."""
@@ -70,7 +122,10 @@ def cli():
     "--output",
     type=click.Path(),
     default="knowledge_graph.pkl",
-    help="Path to save the knowledge graph (default: knowledge_graph.pkl)",
+    help=(
+        "Path to save the knowledge graph (default: knowledge_graph.pkl). "
+        "Use a .kgb extension for the compact binary format."
+    ),
 )
 @click.option(
     "--max-items",
@@ -84,7 +139,28 @@ def cli():
     default=0.85,
     help="Similarity threshold for merging nodes (default: 0.85)",
 )
-def create_graph(data_path, output, max_items, similarity_threshold):
+@click.option(
+    "--embedding-cache/--no-embedding-cache",
+    default=True,
+    help=(
+        "Reuse embeddings across runs from a cache file, "
+        "$ARD_EMBEDDING_CACHE or ~/.cache/ard/embeddings.sqlite (default: on)."
+    ),
+)
+@click.option(
+    "--encoding-workers",
+    type=int,
+    default=0,
+    help="Number of processes encoding node names (default: 0, in process).",
+)
+def create_graph(
+    data_path,
+    output,
+    max_items,
+    similarity_threshold,
+    embedding_cache,
+    encoding_workers,
+):
     """Create a knowledge graph from data."""
     log_section("KNOWLEDGE GRAPH CREATION")
 
@@ -112,14 +188,17 @@ def create_graph(data_path, output, max_items, similarity_threshold):
     # Merge similar nodes using the EmbeddingBasedNodeMerger
     log_section("MERGING SIMILAR NODES")
     logger.info(f"🔄 Merging similar nodes (threshold={similarity_threshold})...")
-    merger = EmbeddingBasedNodeMerger(
-        embedding_model_name="all-MiniLM-L6-v2",
-        similarity_threshold=similarity_threshold,
-    )
+    with open_embedder(embedding_cache, encoding_workers) as embedder:
+        merger = EmbeddingBasedNodeMerger(
+            embedding_model_name="all-MiniLM-L6-v2",
+            similarity_threshold=similarity_threshold,
+            embedder=embedder,
+        )
 
-    start_time = time.time()
-    kg.merge_similar_nodes(merger)
-    log_timing("Node merging", start_time)
+        start_time = time.time()
+        kg.merge_similar_nodes(merger)
+        log_timing("Node merging", start_time)
+        log_cache_stats(embedder)
     logger.info(f"✅ Graph after merging: {kg}")
     logger.debug("Merged Graph details:")
     logger.debug(kg)
@@ -142,7 +221,10 @@ def create_graph(data_path, output, max_items, similarity_threshold):
 @click.option(
     "--embedder-path",
     type=click.Path(exists=True, file_okay=True, dir_okay=False),
-    help="Path to the embedder file. If not provided, it computes the embeddings on the fly.",
+    help=(
+        "Path to the embedder file. If not provided, it computes the embeddings on "
+        "the fly. Files with a .emb extension are memory-mapped."
+    ),
 )
 @click.option(
     "--num-subgraphs",
@@ -200,6 +282,14 @@ def create_graph(data_path, output, max_items, similarity_threshold):
     default="small",
     help="LLM to use for subgraph generation.",
 )
+@click.option(
+    "--embedding-cache/--no-embedding-cache",
+    default=True,
+    help=(
+        "Reuse embeddings across runs from a cache file, "
+        "$ARD_EMBEDDING_CACHE or ~/.cache/ard/embeddings.sqlite (default: on)."
+    ),
+)
 def extract_subgraph(
     graph_path,
     embedder_path,
@@ -211,6 +301,7 @@ def extract_subgraph(
     min_score,
     neighbor_probability,
     llm,
+    embedding_cache,
 ):
     """Extract subgraphs from a knowledge graph."""
     log_section("SUBGRAPH EXTRACTION")
@@ -233,8 +324,8 @@ def extract_subgraph(
         )
         logger.info(f"📂 Using default example knowledge graph: {graph_path}")
 
-    # Initialize embedder if provided
-    embedder = Embedder()
+    # Initialize embedder if provided, closed when the command exits
+    embedder = click.get_current_context().with_resource(open_embedder(embedding_cache))
     if embedder_path:
         logger.info(f"🔄 Loading embedder from {embedder_path}")
         embedder.load_from_file(embedder_path)
@@ -255,6 +346,11 @@ def extract_subgraph(
     output_path.mkdir(parents=True, exist_ok=True)
     logger.info(f"📁 Output directory: {output_path}")
 
+    # Start nodes are drawn in batches, and pairs only among connected nodes
+    sampler = NodeSampler(kg.graph)
+    start_nodes = batched(sampler.sample_nodes, num_subgraphs)
+    node_pairs = batched(sampler.sample_node_pairs, num_subgraphs)
+
     # Generate subgraphs
     for i in range(num_subgraphs):
         log_section(f"GENERATING SUBGRAPH {i + 1}/{num_subgraphs}")
@@ -269,7 +365,7 @@ def extract_subgraph(
                 )
                 start_time = time.time()
                 if method == "random_walk":
-                    start_node = kg.get_random_node()
+                    start_node = next(start_nodes)
                     logger.info(f"   Starting from node: {start_node}")
                     subgraph = Subgraph.from_one_node(
                         kg,
@@ -279,7 +375,7 @@ def extract_subgraph(
                         neighbor_probability=neighbor_probability,
                     )
                 elif method == "llm_walk":
-                    start_node = kg.get_random_node()
+                    start_node = next(start_nodes)
                     logger.info(f"   Starting from node: {start_node}")
                     subgraph = Subgraph.from_one_node(
                         kg,
@@ -289,8 +385,7 @@ def extract_subgraph(
                         neighbor_probability=neighbor_probability,
                     )
                 elif method == "embedding_path":
-                    start_node = kg.get_random_node()
-                    end_node = kg.get_random_node()
+                    start_node, end_node = next(node_pairs)
                     logger.info(f"   Path from: {start_node} to {end_node}")
                     subgraph = Subgraph.from_two_nodes(
                         kg,
@@ -301,8 +396,7 @@ def extract_subgraph(
                         neighbor_probability=neighbor_probability,
                     )
                 elif method == "randomized_embedding_path":
-                    start_node = kg.get_random_node()
-                    end_node = kg.get_random_node()
+                    start_node, end_node = next(node_pairs)
                     logger.info(f"   Path from: {start_node} to {end_node}")
                     subgraph = Subgraph.from_two_nodes(
                         kg,
@@ -313,8 +407,7 @@ def extract_subgraph(
                         neighbor_probability=neighbor_probability,
                     )
                 elif method == "shortest_path":
-                    start_node = kg.get_random_node()
-                    end_node = kg.get_random_node()
+                    start_node, end_node = next(node_pairs)
                     logger.info(f"   Path from: {start_node} to {end_node}")
                     subgraph = Subgraph.from_two_nodes(
                         kg,
@@ -349,6 +442,10 @@ def extract_subgraph(
                     subgraph.contextualize(llm=get_llm(llm))
                     log_timing("Contextualization", start_time)
                     break
+            except StopIteration:
+                raise click.ClickException(
+                    "No nodes left to sample from the knowledge graph"
+                ) from None
             except Exception as e:
                 logger.error(f"❌ Error in attempt {attempt}: {e}")
                 if attempt >= 3:
@@ -372,6 +469,18 @@ def extract_subgraph(
 
     log_section("PROCESS COMPLETED")
     logger.info(f"✅ Generated {num_subgraphs} subgraphs")
+    log_cache_stats(embedder)
+
+
+@cli.command("convert-embeddings")
+@click.argument("source", type=click.Path(exists=True, file_okay=True, dir_okay=False))
+@click.argument("target", type=click.Path())
+def convert_embeddings(source, target):
+    """Convert an embedder file, e.g. from JSON to the binary .emb format."""
+    start_time = time.time()
+    convert_embeddings_file(source, target)
+    log_timing("Embeddings conversion", start_time)
+    logger.info(f"✅ Embeddings saved to {target}")
 
 
 if __name__ == "__main__":
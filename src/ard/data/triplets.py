@@ -4,11 +4,14 @@ import os
 from dataclasses import dataclass
 from enum import Enum
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set, Tuple, Union
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
 
 import networkx as nx
 import pandas as pd
 
+# A triplet as a plain (node_1, edge, node_2, metadata) tuple
+TripletTuple = Tuple[str, str, str, Dict[str, Any]]
+
 
 class TripletMergeStrategy(Enum):
     """Enum for different strategies to merge metadata from multiple Triplets."""
@@ -311,19 +314,43 @@ class Triplets:
         """
         return self._graph is not None
 
-    def to_csv(self, output_path: Union[str, Path]) -> None:
+    def to_csv(
+        self,
+        output_path: Union[str, Path],
+        triplets: Optional[Iterable[Union[Triplet, TripletTuple]]] = None,
+    ) -> None:
         """
         Save the triplets to a CSV file.
 
         Args:
             output_path (Union[str, Path]): Path where the CSV file should be saved
+            triplets (Optional[Iterable[Union[Triplet, TripletTuple]]]): Triplets
+                to save instead of those of this object, such as
+                KnowledgeGraph.iter_triplets(); written as they are iterated
+        """
+        self.write_csv(output_path, self.triplets if triplets is None else triplets)
+
+    @staticmethod
+    def write_csv(
+        output_path: Union[str, Path],
+        triplets: Iterable[Union[Triplet, TripletTuple]],
+    ) -> None:
+        """
+        Save triplets to a CSV file, one row at a time.
+
+        Args:
+            output_path (Union[str, Path]): Path where the CSV file should be saved
+            triplets (Iterable[Union[Triplet, TripletTuple]]): Triplet objects or
+                (node_1, edge, node_2, metadata) tuples
         """
         with open(output_path, "w", newline="", encoding="utf-8") as f:
             writer = csv.DictWriter(
                 f, fieldnames=["node_1", "node_2", "edge", "metadata"]
             )
             writer.writeheader()
-            for triplet in self.triplets:
+            for triplet in triplets:
+                if not isinstance(triplet, Triplet):
+                    triplet = Triplet(*triplet)
                 writer.writerow(triplet.to_dict())
 
     def to_dataframe(self) -> pd.DataFrame:
@@ -1,3 +1,4 @@
+from ard.knowledge_graph.async_knowledge_graph import AsyncKnowledgeGraph
 from ard.knowledge_graph.knowledge_graph import KnowledgeGraph
 
-__all__ = ["KnowledgeGraph"]
+__all__ = ["KnowledgeGraph", "AsyncKnowledgeGraph"]
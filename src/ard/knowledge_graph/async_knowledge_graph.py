@@ -0,0 +1,334 @@
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+from ard.data.triplets import Triplet, TripletTuple
+from ard.knowledge_graph.knowledge_graph import KnowledgeGraph, edge_triplets
+from ard.storage.graph import GraphStatistics
+from ard.storage.graph.neo4j_async import AsyncNeo4jBackend
+
+
+class AsyncKnowledgeGraph:
+    """
+    A read-only knowledge graph stored in Neo4j, with coroutine methods.
+
+    Mirrors the read methods of KnowledgeGraph, so that many path generators
+    and subgraph extractions can run concurrently in one event loop, sharing
+    the connection pool of the backend.
+
+    Attributes:
+        _backend (AsyncNeo4jBackend): The asynchronous graph backend
+        config (Dict): Configuration parameters for the knowledge graph
+    """
+
+    def __init__(self, config: Dict = None, **backend_config) -> None:
+        """
+        Initialize an AsyncKnowledgeGraph instance.
+
+        Args:
+            config (Dict, optional): Configuration parameters for the knowledge graph
+            **backend_config: Configuration of the AsyncNeo4jBackend, such as
+                uri, user, password and pool_size
+        """
+        self.config = config or {}
+        self._backend = AsyncNeo4jBackend(**backend_config)
+
+    @property
+    def graph(self) -> AsyncNeo4jBackend:
+        """
+        Get the graph backend.
+
+        Returns:
+            AsyncNeo4jBackend: The asynchronous graph backend
+        """
+        return self._backend
+
+    async def close(self) -> None:
+        """Close the connection pool of the backend."""
+        await self._backend.close()
+
+    async def __aenter__(self) -> "AsyncKnowledgeGraph":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def has_node(self, node: str) -> bool:
+        """
+        Check if a node exists in the graph.
+
+        Args:
+            node (str): The node to check
+
+        Returns:
+            bool: True if the node exists, False otherwise
+        """
+        return await self._backend.has_node(node)
+
+    async def has_edge(self, source: str, target: str) -> bool:
+        """
+        Check if an edge exists in the graph.
+
+        Args:
+            source (str): The source node
+            target (str): The target node
+
+        Returns:
+            bool: True if the edge exists, False otherwise
+        """
+        return await self._backend.has_edge(source, target)
+
+    async def get_node_attrs(self, node: str) -> Dict[str, Any]:
+        """
+        Get all attributes of a node.
+
+        Args:
+            node (str): The node to get attributes for
+
+        Returns:
+            Dict[str, Any]: The node attributes
+        """
+        return await self._backend.get_node_attrs(node)
+
+    async def get_edge_attrs(self, source: str, target: str) -> Dict[str, Any]:
+        """
+        Get all attributes of an edge.
+
+        Args:
+            source (str): The source node
+            target (str): The target node
+
+        Returns:
+            Dict[str, Any]: The edge attributes
+        """
+        return await self._backend.get_edge_attrs(source, target)
+
+    async def get_nodes(self) -> Set[str]:
+        """
+        Get all nodes in the graph.
+
+        Returns:
+            Set[str]: A set of all node names
+        """
+        return await self._backend.get_nodes()
+
+    async def get_edges(self) -> List[Tuple[str, str, Dict[str, Any]]]:
+        """
+        Get all edges in the graph.
+
+        Returns:
+            List[Tuple[str, str, Dict[str, Any]]]: A list of (source, target, attributes)
+        """
+        return await self._backend.get_edges()
+
+    async def get_random_node(self) -> Optional[str]:
+        """
+        Get a random node from the graph.
+
+        Returns:
+            Optional[str]: A randomly selected node name, or None if the graph is empty
+        """
+        nodes = await self._backend.sample_nodes(1)
+        if not nodes:
+            return None
+        return nodes[0]
+
+    async def get_successors(self, node: str) -> List[str]:
+        """
+        Get all successor nodes of a node.
+
+        Args:
+            node (str): The node to get successors for
+
+        Returns:
+            List[str]: A list of successor node names
+        """
+        return await self._backend.get_successors(node)
+
+    async def get_predecessors(self, node: str) -> List[str]:
+        """
+        Get all predecessor nodes of a node.
+
+        Args:
+            node (str): The node to get predecessors for
+
+        Returns:
+            List[str]: A list of predecessor node names
+        """
+        return await self._backend.get_predecessors(node)
+
+    async def get_out_edges(self, node: str) -> List[Tuple[str, str, Dict[str, Any]]]:
+        """
+        Get all outgoing edges of a node.
+
+        Args:
+            node (str): The node to get outgoing edges for
+
+        Returns:
+            List[Tuple[str, str, Dict[str, Any]]]: A list of (source, target, attributes)
+        """
+        return await self._backend.get_out_edges(node)
+
+    async def get_in_edges(self, node: str) -> List[Tuple[str, str, Dict[str, Any]]]:
+        """
+        Get all incoming edges of a node.
+
+        Args:
+            node (str): The node to get incoming edges for
+
+        Returns:
+            List[Tuple[str, str, Dict[str, Any]]]: A list of (source, target, attributes)
+        """
+        return await self._backend.get_in_edges(node)
+
+    async def get_node_neighbors(self, node: str) -> List[str]:
+        """
+        Get all neighbors of a node, both incoming and outgoing.
+
+        Args:
+            node (str): The node to get neighbors for
+
+        Returns:
+            List[str]: A list of node names
+        """
+        return await self._backend.get_neighbors(node)
+
+    async def get_neighborhood(
+        self, nodes: Iterable[str], hops: int = 1, limit: Optional[int] = None
+    ) -> List[str]:
+        """
+        Get the nodes within a number of hops of the given nodes, both incoming
+        and outgoing.
+
+        Args:
+            nodes (Iterable[str]): The nodes to start from
+            hops (int): The maximum distance from the nodes
+            limit (Optional[int]): The maximum number of nodes to return
+
+        Returns:
+            List[str]: A list of node names, closest first, without the given nodes
+        """
+        return await self._backend.neighborhood(nodes, hops=hops, limit=limit)
+
+    async def number_of_nodes(self) -> int:
+        """
+        Get the total number of nodes in the graph.
+
+        Returns:
+            int: Number of nodes
+        """
+        return await self._backend.number_of_nodes()
+
+    async def number_of_edges(self) -> int:
+        """
+        Get the total number of edges in the graph.
+
+        Returns:
+            int: Number of edges
+        """
+        return await self._backend.number_of_edges()
+
+    async def get_relation_types(self) -> Set[str]:
+        """
+        Get all relation types in the graph.
+
+        Returns:
+            Set[str]: A set of relation types
+        """
+        return await self._backend.get_relation_types()
+
+    async def get_edges_by_relation(
+        self, relation: str
+    ) -> List[Tuple[str, str, Dict[str, Any]]]:
+        """
+        Get all edges with a specific relation type.
+
+        Args:
+            relation (str): The relation type to filter by
+
+        Returns:
+            List[Tuple[str, str, Dict[str, Any]]]: A list of (source, target, attributes)
+        """
+        return await self._backend.get_edges_by_relation(relation)
+
+    async def get_statistics(self) -> GraphStatistics:
+        """
+        Get the statistics of the graph.
+
+        Returns:
+            GraphStatistics: Node and edge counts, degree histogram and relation counts
+        """
+        return await self._backend.get_statistics()
+
+    async def shortest_path(
+        self, source: str, target: str, directed: bool = True
+    ) -> List[str]:
+        """
+        Get the shortest path between two nodes.
+
+        Args:
+            source (str): The start node
+            target (str): The end node
+            directed (bool): Follow edges in their direction only
+
+        Returns:
+            List[str]: The nodes of the path, or an empty list if there is none
+        """
+        return await self._backend.shortest_path(source, target, directed)
+
+    async def iter_triplets(
+        self,
+        relation: Optional[str] = None,
+        nodes: Optional[Iterable[str]] = None,
+        predicate: Optional[Callable[[str, str, str, Dict[str, Any]], bool]] = None,
+        as_tuples: bool = False,
+    ) -> AsyncIterator[Union[Triplet, TripletTuple]]:
+        """
+        Iterate over the triplets in the knowledge graph, one edge at a time.
+
+        Takes the same filters as KnowledgeGraph.iter_triplets.
+
+        Args:
+            relation (Optional[str]): Only triplets with this relation
+            nodes (Optional[Iterable[str]]): Only triplets with node_1 or node_2
+                among these nodes
+            predicate (Optional[Callable[[str, str, str, Dict[str, Any]], bool]]):
+                Only triplets for which predicate(node_1, edge, node_2, metadata)
+                is true
+            as_tuples (bool): Yield (node_1, edge, node_2, metadata) tuples
+                instead of Triplet objects
+
+        Yields:
+            Union[Triplet, TripletTuple]: The triplets
+        """
+        async for source, target, data in self._backend.find_edges(relation, nodes):
+            for triplet in edge_triplets(source, target, data, predicate, as_tuples):
+                yield triplet
+
+    async def extract_subgraph(self, nodes: Iterable[str]) -> KnowledgeGraph:
+        """
+        Copy nodes and the edges between them into an in-memory knowledge graph.
+
+        Takes a single query, so that many subgraphs can be extracted
+        concurrently before being analysed like any other KnowledgeGraph.
+
+        Args:
+            nodes (Iterable[str]): The nodes to include; missing ones are skipped
+
+        Returns:
+            KnowledgeGraph: A NetworkX knowledge graph with the same config
+        """
+        node_attrs, edges = await self._backend.induced_subgraph(nodes)
+        kg = KnowledgeGraph(config=self.config)
+        kg.graph.add_nodes(node_attrs)
+        kg.graph.add_edges(edges)
+        return kg
@@ -0,0 +1,265 @@
+import gc
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
+
+from ard.data.triplets import Triplet
+from ard.storage.graph import GraphBackend
+
+DEFAULT_BATCH_SIZE = 100_000
+
+T = TypeVar("T")
+
+
+# Generation-0 threshold while a batch is committed, instead of the default 700
+GC_FLUSH_THRESHOLD = 100_000
+
+
+@contextmanager
+def gc_relaxed(threshold: int = GC_FLUSH_THRESHOLD) -> Iterator[None]:
+    """
+    Collect garbage less often for the duration of the block.
+
+    Committing a batch allocates millions of small, acyclic dicts and lists,
+    and each young-generation collection triggered by them traverses the
+    growing graph again. Raising the generation-0 threshold makes those
+    collections rare while leaving the collector enabled, so code running in
+    other threads still has its cycles collected.
+
+    Args:
+        threshold (int): Generation-0 threshold inside the block, kept as is if
+            the current one is higher
+    """
+    thresholds = gc.get_threshold()
+    gc.set_threshold(max(threshold, thresholds[0]), *thresholds[1:])
+    try:
+        yield
+    finally:
+        gc.set_threshold(*thresholds)
+
+
+class TripletIngestor:
+    """
+    Batched ingestion of triplets into a graph backend.
+
+    Node and edge provenance is gathered in plain dicts and lists while triplets
+    are added, and committed to the backend once per batch through
+    add_nodes/add_edges. The resulting graph is identical to adding the triplets
+    one at a time: nodes and edges keep their first-seen order, every node gets a
+    copy of the source metadata and every edge collects the metadata of all of
+    its triplets.
+
+    Attributes:
+        batch_size (Optional[int]): Number of triplets gathered before an automatic
+            flush. None disables automatic flushing.
+        relax_gc (bool): Whether to collect garbage less often while a batch is
+            committed, see gc_relaxed
+    """
+
+    def __init__(
+        self,
+        backend: GraphBackend,
+        batch_size: Optional[int] = DEFAULT_BATCH_SIZE,
+        relax_gc: bool = False,
+    ) -> None:
+        """
+        Initialize a TripletIngestor.
+
+        Args:
+            backend (GraphBackend): The backend the triplets are written to
+            batch_size (Optional[int]): Number of triplets per batch
+            relax_gc (bool): Whether to collect garbage less often while a batch
+                is committed
+        """
+        self._backend = backend
+        self.batch_size = batch_size
+        self.relax_gc = relax_gc
+        self._node_sources: Dict[str, List[Dict[str, Any]]] = {}
+        self._edges: Dict[Tuple[str, str], Tuple[str, List[Dict[str, Any]]]] = {}
+        self._pending = 0
+
+    def add(self, triplets: Iterable[Triplet]) -> None:
+        """
+        Gather triplets, flushing to the backend whenever a batch is full.
+
+        Args:
+            triplets (Iterable[Triplet]): The triplets to add
+        """
+        node_sources = self._node_sources
+        edges = self._edges
+        batch_size = self.batch_size
+
+        for triplet in triplets:
+            node_1 = triplet.node_1
+            node_2 = triplet.node_2
+
+            # Create source metadata from triplet metadata
+            source_metadata = {
+                "relation": triplet.edge,
+                "triplet_id": id(triplet),  # Use object id as a unique identifier
+            }
+            if triplet.metadata:
+                source_metadata.update(triplet.metadata)
+
+            sources = node_sources.get(node_1)
+            if sources is None:
+                sources = node_sources[node_1] = []
+            sources.append(source_metadata.copy())
+
+            sources = node_sources.get(node_2)
+            if sources is None:
+                sources = node_sources[node_2] = []
+            sources.append(source_metadata.copy())
+
+            edge = edges.get((node_1, node_2))
+            if edge is None:
+                edges[(node_1, node_2)] = (triplet.edge, [source_metadata])
+            else:
+                edge[1].append(source_metadata)
+
+            self._pending += 1
+            if batch_size and self._pending >= batch_size:
+                self.flush()
+
+    def flush(self) -> None:
+        """Commit the gathered nodes and edges to the backend."""
+        if self.relax_gc:
+            with gc_relaxed():
+                self._flush()
+        else:
+            self._flush()
+
+    def _flush(self) -> None:
+        if not self._pending:
+            return
+
+        backend = self._backend
+
+        existing_nodes = backend.get_nodes_attrs(self._node_sources)
+        nodes = []
+        for node, sources in self._node_sources.items():
+            attrs = existing_nodes.get(node)
+            if attrs is not None:
+                attrs.setdefault("sources", []).extend(sources)
+            else:
+                attrs = {"sources": sources}
+            nodes.append((node, attrs))
+        backend.add_nodes(nodes)
+
+        existing_edges = backend.get_edges_attrs(self._edges)
+        edges = []
+        for (source, target), (relation, sources) in self._edges.items():
+            attrs = existing_edges.get((source, target))
+            if attrs is not None:
+                attrs.setdefault("sources", []).extend(sources)
+            else:
+                attrs = {"relation": relation, "sources": sources}
+            edges.append((source, target, attrs))
+        backend.add_edges(edges)
+
+        self._node_sources.clear()
+        self._edges.clear()
+        self._pending = 0
+
+
+@dataclass
+class ItemLoadResult:
+    """
+    Timing and outcome of loading the triplets of one dataset item.
+
+    Attributes:
+        item_id (str): The ID of the item
+        num_triplets (int): Number of triplets read from the item
+        load_seconds (float): Time spent reading and parsing the item
+        add_seconds (float): Time spent adding its triplets to the graph
+        error (Optional[Exception]): The error raised for the item, if any
+    """
+
+    item_id: str
+    num_triplets: int = 0
+    load_seconds: float = 0.0
+    add_seconds: float = 0.0
+    error: Optional[Exception] = None
+
+
+def _timed_load(
+    load: Callable[[T], List[Triplet]], item: T
+) -> Tuple[Optional[List[Triplet]], float, Optional[Exception]]:
+    start = time.perf_counter()
+    try:
+        triplets = load(item)
+    except Exception as e:
+        return None, time.perf_counter() - start, e
+    return triplets, time.perf_counter() - start, None
+
+
+def load_items(
+    items: Sequence[T],
+    load: Callable[[T], List[Triplet]],
+    workers: Optional[int] = None,
+    prefetch: Optional[int] = None,
+) -> Iterator[Tuple[T, Optional[List[Triplet]], float, Optional[Exception]]]:
+    """
+    Load the triplets of items, concurrently but yielded in item order.
+
+    With workers, items are loaded in a thread pool, which overlaps the storage
+    reads of I/O bound backends such as S3. At most prefetch items are loaded
+    ahead of the one being consumed, which bounds the triplets held in memory.
+    Errors are caught and yielded with their item, so the caller decides
+    whether to skip them.
+
+    Args:
+        items (Sequence[T]): The items to load
+        load: Function returning the triplets of an item
+        workers (Optional[int]): Number of loading threads; None or 1 loads the
+            items one after the other in the calling thread
+        prefetch (Optional[int]): Maximum number of items loaded ahead,
+            2 * workers by default
+
+    Yields:
+        Tuple[T, Optional[List[Triplet]], float, Optional[Exception]]: The item,
+            its triplets or None on error, the seconds spent loading it, and
+            the error
+    """
+    if workers is not None and workers < 1:
+        raise ValueError("workers must be at least 1")
+    if not workers or workers == 1:
+        for item in items:
+            yield (item, *_timed_load(load, item))
+        return
+
+    window = max(prefetch or 2 * workers, 1)
+    remaining = iter(items)
+    pending: Deque[Tuple[T, Future]] = deque()
+    executor = ThreadPoolExecutor(max_workers=workers)
+
+    def submit_next() -> None:
+        for item in remaining:
+            pending.append((item, executor.submit(_timed_load, load, item)))
+            return
+
+    try:
+        for _ in range(window):
+            submit_next()
+        while pending:
+            item, future = pending.popleft()
+            submit_next()
+            yield (item, *future.result())
+    finally:
+        # Stop loading when the caller raises or stops consuming
+        executor.shutdown(wait=True, cancel_futures=True)
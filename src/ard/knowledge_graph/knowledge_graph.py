@@ -1,14 +1,108 @@
 import json
 import os
-import random
-from typing import Any, Dict, List, Optional, Set, Tuple, Union
+import time
+from contextlib import closing
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 
 from loguru import logger
 
 from ard.data.dataset import Dataset
-from ard.data.triplets import Triplet, Triplets
+from ard.data.triplets import Triplet, Triplets, TripletTuple
+from ard.knowledge_graph.ingestion import (
+    DEFAULT_BATCH_SIZE,
+    ItemLoadResult,
+    TripletIngestor,
+    load_items,
+)
 from ard.knowledge_graph.node_merger import NodeMerger
-from ard.storage.graph import GraphBackend, Neo4jBackend, NetworkXBackend
+from ard.knowledge_graph.sampling import NodeSampler
+from ard.knowledge_graph.walks import (
+    WALK_ENGINE_MIN_WALKERS,
+    Seeds,
+    WalkEngine,
+    Walks,
+)
+from ard.storage.graph import (
+    CachedBackend,
+    CSRBackend,
+    GraphBackend,
+    GraphStatistics,
+    InstrumentedBackend,
+    MmapGraphBackend,
+    Neo4jBackend,
+    NetworkXBackend,
+    SnapshotBackend,
+    SQLiteBackend,
+)
+from ard.storage.graph.graph_file import (
+    GraphFileReader,
+    is_graph_file,
+    write_graph_file,
+)
+
+
+def edge_triplets(
+    source: str,
+    target: str,
+    data: Dict[str, Any],
+    predicate: Optional[Callable[[str, str, str, Dict[str, Any]], bool]] = None,
+    as_tuples: bool = False,
+) -> Iterator[Union[Triplet, TripletTuple]]:
+    """
+    Get the triplets of an edge, one for every source of the edge.
+
+    An edge without sources gives a triplet without metadata.
+
+    Args:
+        source (str): The source node of the edge
+        target (str): The target node of the edge
+        data (Dict[str, Any]): The attributes of the edge
+        predicate (Optional[Callable[[str, str, str, Dict[str, Any]], bool]]):
+            Only triplets for which predicate(node_1, edge, node_2, metadata) is
+            true
+        as_tuples (bool): Yield (node_1, edge, node_2, metadata) tuples instead
+            of Triplet objects
+
+    Yields:
+        Union[Triplet, TripletTuple]: The triplets
+    """
+    relation_value = data.get("relation", "")
+    sources = data.get("sources") or [None]
+    for source_data in sources:
+        # Extract metadata (excluding relation and triplet_id)
+        metadata = (
+            {
+                k: v
+                for k, v in source_data.items()
+                if k != "relation" and k != "triplet_id"
+            }
+            if source_data is not None
+            else {}
+        )
+        if predicate is not None and not predicate(
+            source, relation_value, target, metadata
+        ):
+            continue
+        if as_tuples:
+            yield source, relation_value, target, metadata
+        else:
+            yield Triplet(
+                node_1=source,
+                edge=relation_value,
+                node_2=target,
+                metadata=metadata,
+            )
 
 
 class KnowledgeGraph:
@@ -23,10 +117,17 @@ class KnowledgeGraph:
         config (Dict): Configuration parameters for the knowledge graph
     """
 
+    # Class defaults of the caches, for instances created without __init__
+    # such as subgraphs loaded from files
+    _version = 0
+    _walk_engine: Optional[Tuple[Tuple, WalkEngine]] = None
+
     def __init__(
         self,
         config: Dict = None,
         backend: str = "networkx",
+        cache: Union[bool, int, None] = None,
+        instrument: bool = False,
         **backend_config,
     ) -> None:
         """
@@ -34,7 +135,13 @@ class KnowledgeGraph:
 
         Args:
             config (Dict, optional): Configuration parameters for the knowledge graph
-            backend (str): The backend to use ("networkx" or "neo4j")
+            backend (str): The backend to use ("networkx", "csr", "sqlite",
+                "neo4j" or "postgres")
+            cache (Union[bool, int, None]): Put a read-through cache in front of
+                the backend, of the given maximum size or of the default size
+                for True. Worth it for remote backends such as Neo4j
+            instrument (bool): Count and time the backend calls of the graph,
+                see InstrumentedBackend
             **backend_config: Additional configuration for the backend
         """
         self.config = config or {}
@@ -42,14 +149,36 @@ class KnowledgeGraph:
         # Initialize the appropriate backend
         if backend == "networkx":
             self._backend = NetworkXBackend()
+        elif backend == "csr":
+            self._backend = CSRBackend()
+        elif backend == "sqlite":
+            self._backend = SQLiteBackend(**backend_config)
         elif backend == "neo4j":
+            options = dict(backend_config)
             self._backend = Neo4jBackend(
-                uri=backend_config["uri"],
-                user=backend_config["user"],
-                password=backend_config["password"],
+                uri=options.pop("uri"),
+                user=options.pop("user"),
+                password=options.pop("password"),
+                **options,
             )
+        elif backend == "postgres":
+            # psycopg2 is only needed for graphs stored in Postgres
+            from ard.storage.graph.postgres import PostgresBackend
+
+            self._backend = PostgresBackend(**backend_config)
         else:
             raise ValueError(f"Unsupported backend: {backend}")
+        if cache is True:
+            self._backend = CachedBackend(self._backend)
+        elif cache:
+            self._backend = CachedBackend(self._backend, max_size=cache)
+        if instrument:
+            self._backend = InstrumentedBackend(self._backend)
+        # Incremented on every write through this KnowledgeGraph, so that
+        # structures computed from the graph are only rebuilt after a change
+        self._version = 0
+        self._walk_engine = None
+        self._samplers: Dict[str, Tuple[Tuple, NodeSampler]] = {}
 
     @classmethod
     def from_dataset(
@@ -57,26 +186,102 @@ class KnowledgeGraph:
         dataset: Dataset,
         skip_errors: bool = True,
         max_items: Optional[int] = None,
+        workers: Optional[int] = None,
+        prefetch: Optional[int] = None,
+        on_item: Optional[Callable[[ItemLoadResult], None]] = None,
         **kwargs,
     ) -> "KnowledgeGraph":
         """
         Create a KnowledgeGraph from a Dataset instance.
 
+        Items are read and parsed by a pool of worker threads and added to the
+        graph one at a time in dataset order, so the graph is the same for any
+        number of workers.
+
         Args:
             dataset (Dataset): The dataset to build the graph from
+            skip_errors (bool): Log and skip items that fail instead of raising
             max_items (Optional[int]): The maximum number of items to process
+            workers (Optional[int]): Number of threads reading items; None reads
+                them one after the other
+            prefetch (Optional[int]): Maximum number of items read ahead of the
+                one being added, 2 * workers by default
+            on_item (Optional[Callable[[ItemLoadResult], None]]): Called with the
+                timing and error of every item, in dataset order
             **kwargs: Additional arguments to pass to the constructor
         """
         kg = cls(**kwargs)
-        for item in dataset.items[:max_items]:
-            try:
-                triplets = item.get_triplets()
-                kg.add_triplets(triplets)
-            except Exception as e:
-                if skip_errors:
-                    logger.warning(f"Error processing item {item.id}: {e}")
-                else:
-                    raise e
+        # Share one ingestor across items so nodes mentioned by many items are
+        # merged in memory and written to the backend once per batch
+        ingestor = TripletIngestor(kg._backend)
+        items = load_items(
+            dataset.items[:max_items],
+            lambda item: item.get_triplets().triplets,
+            workers=workers,
+            prefetch=prefetch,
+        )
+        with closing(items):
+            for item, triplets, load_seconds, error in items:
+                result = ItemLoadResult(item.id, load_seconds=load_seconds, error=error)
+                if error is None:
+                    start = time.perf_counter()
+                    try:
+                        ingestor.add(triplets)
+                        result.num_triplets = len(triplets)
+                    except Exception as e:
+                        result.error = error = e
+                    result.add_seconds = time.perf_counter() - start
+                logger.debug(
+                    f"Item {item.id}: {result.num_triplets} triplets, loaded in "
+                    f"{load_seconds:.3f}s, added in {result.add_seconds:.3f}s"
+                )
+                if on_item is not None:
+                    on_item(result)
+                if error is not None:
+                    if skip_errors:
+                        logger.warning(f"Error processing item {item.id}: {error}")
+                    else:
+                        raise error
+        ingestor.flush()
+        return kg
+
+    @classmethod
+    def from_postgres(
+        cls,
+        dsn: Optional[str] = None,
+        table: str = "papers",
+        paper_hashes: Optional[Iterable[str]] = None,
+        batch_size: Optional[int] = DEFAULT_BATCH_SIZE,
+        **kwargs,
+    ) -> "KnowledgeGraph":
+        """
+        Create a KnowledgeGraph from the triplet table written by ard.utils.postgres.
+
+        Rows are streamed with a server-side cursor and added in batches, so
+        only one batch of rows is held in memory besides the graph itself.
+
+        Args:
+            dsn (Optional[str]): PostgreSQL connection string, read from the
+                POSTGRES_* environment variables by default
+            table (str): Name of the triplet table
+            paper_hashes (Optional[Iterable[str]]): Only load the triplets of
+                these papers
+            batch_size (Optional[int]): Number of triplets per backend commit
+            **kwargs: Additional arguments to pass to the constructor
+
+        Returns:
+            KnowledgeGraph: A new KnowledgeGraph instance
+        """
+        from ard.storage.graph.postgres import PostgresBackend
+
+        kg = cls(**kwargs)
+        source = PostgresBackend(dsn, table=table, create_indexes=False)
+        try:
+            ingestor = TripletIngestor(kg._backend, batch_size=batch_size)
+            ingestor.add(source.iter_triplets(paper_hashes))
+            ingestor.flush()
+        finally:
+            source.close()
         return kg
 
     @classmethod
@@ -114,62 +319,58 @@ class KnowledgeGraph:
 
         return kg
 
-    def add_triplets(self, triplets: Union[List[Triplet], Triplets]) -> None:
+    def add_triplets(
+        self,
+        triplets: Union[List[Triplet], Triplets],
+        batch_size: Optional[int] = DEFAULT_BATCH_SIZE,
+        relax_gc: bool = False,
+    ) -> None:
         """
         Add a list of triplets to the graph.
 
+        Node and edge provenance is gathered in memory and committed to the
+        backend once per batch.
+
         Args:
             triplets (List[Triplet]): The triplets to add to the graph
+            batch_size (Optional[int]): Number of triplets per backend commit,
+                None to commit everything at once
+            relax_gc (bool): Collect garbage less often while batches are
+                committed, which speeds up the ingestion of large batches
         """
         if isinstance(triplets, Triplets):
             triplet_list = triplets.triplets
         else:
             triplet_list = triplets
 
-        # Add all triplets to the graph
-        for triplet in triplet_list:
-            # Add source node if it doesn't exist
-            if not self.has_node(triplet.node_1):
-                self.add_node(triplet.node_1, sources=[])
+        ingestor = TripletIngestor(
+            self._backend, batch_size=batch_size, relax_gc=relax_gc
+        )
+        ingestor.add(triplet_list)
+        ingestor.flush()
+        self._changed()
 
-            # Add target node if it doesn't exist
-            if not self.has_node(triplet.node_2):
-                self.add_node(triplet.node_2, sources=[])
+    def _changed(self) -> None:
+        """Record a write to the graph, invalidating cached structures."""
+        self._version += 1
+        self._walk_engine = None
+        self._samplers = {}
 
-            # Create source metadata from triplet metadata
-            source_metadata = {
-                "relation": triplet.edge,
-                "triplet_id": id(triplet),  # Use object id as a unique identifier
-            }
-            if triplet.metadata:
-                source_metadata.update(triplet.metadata)
-
-            # Add metadata to source node's sources
-            node1_attrs = self.get_node_attrs(triplet.node_1)
-            node1_attrs["sources"].append(source_metadata.copy())
-            self.add_node(triplet.node_1, **node1_attrs)
-
-            # Add metadata to target node's sources
-            node2_attrs = self.get_node_attrs(triplet.node_2)
-            node2_attrs["sources"].append(source_metadata.copy())
-            self.add_node(triplet.node_2, **node2_attrs)
-
-            # Check if edge already exists
-            if self.has_edge(triplet.node_1, triplet.node_2):
-                # If edge exists, get its current attributes
-                edge_data = self.get_edge_attrs(triplet.node_1, triplet.node_2)
-
-                # Make sure sources list exists
-                if "sources" not in edge_data:
-                    edge_data["sources"] = []
-
-                # Add this triplet's metadata to sources
-                edge_data["sources"].append(source_metadata)
-                self.add_edge(triplet.node_1, triplet.node_2, **edge_data)
-            else:
-                # Create a new edge with the relation and a sources list
-                edge_data = {"relation": triplet.edge, "sources": [source_metadata]}
-                self.add_edge(triplet.node_1, triplet.node_2, **edge_data)
+    def _cache_key(self) -> Tuple:
+        """
+        Get the key under which structures built from the graph are cached.
+
+        Writes through this KnowledgeGraph change the key. Backends holding the
+        graph in memory may also be written to directly through graph, so their
+        node and edge counts are part of the key, which is cheap for them.
+
+        Returns:
+            Tuple: The key of the current state of the graph
+        """
+        key = (self._backend, self._version)
+        if self._backend.native_edge_arrays:
+            key += (len(self._backend), self._backend.number_of_edges())
+        return key
 
     def add_node(self, node: str, **attrs) -> None:
         """
@@ -180,6 +381,7 @@ class KnowledgeGraph:
             **attrs: Optional node attributes
         """
         self._backend.add_node(node, **attrs)
+        self._changed()
 
     def has_node(self, node: str) -> bool:
         """
@@ -203,6 +405,7 @@ class KnowledgeGraph:
             **attrs: Optional edge attributes
         """
         self._backend.add_edge(source, target, **attrs)
+        self._changed()
 
     def has_edge(self, source: str, target: str) -> bool:
         """
@@ -322,6 +525,7 @@ class KnowledgeGraph:
             node (str): The node identifier
         """
         self._backend.remove_node(node)
+        self._changed()
 
     def number_of_edges(self) -> int:
         """
@@ -339,7 +543,7 @@ class KnowledgeGraph:
         Returns:
             int: Number of nodes
         """
-        return len(self.get_nodes())
+        return len(self._backend)
 
     @property
     def graph(self) -> GraphBackend:
@@ -376,10 +580,45 @@ class KnowledgeGraph:
         Returns:
             Optional[str]: A randomly selected node name, or None if the graph is empty
         """
-        nodes = list(self.get_nodes())
+        nodes = self._backend.sample_nodes(1)
         if not nodes:
             return None
-        return random.choice(nodes)
+        return nodes[0]
+
+    def sample_node_pairs(
+        self,
+        n: int,
+        reachable: bool = True,
+        weighting: str = "uniform",
+        seed: Optional[int] = None,
+    ) -> List[Tuple[str, str]]:
+        """
+        Get many random pairs of distinct nodes in one call.
+
+        The sampler and the weights and components it computes on first use
+        are kept for later calls with the same weighting, until the graph is
+        modified, see _cache_key.
+
+        Args:
+            n (int): Number of pairs to pick
+            reachable (bool): Only pick pairs connected by an undirected path
+            weighting (str): "uniform" or "degree" to favor well-connected nodes
+            seed (Optional[int]): Random seed for reproducibility
+
+        Returns:
+            List[Tuple[str, str]]: The (start, end) pairs
+
+        Raises:
+            ValueError: If no pair of nodes satisfies the constraints
+        """
+        key = self._cache_key()
+        cached = self._samplers.get(weighting)
+        if cached is None or cached[0] != key:
+            cached = (key, NodeSampler(self._backend, weighting=weighting))
+            self._samplers[weighting] = cached
+        sampler = cached[1]
+        sampler.reseed(seed)
+        return sampler.sample_node_pairs(n, reachable=reachable)
 
     def get_edges(self) -> Set[str]:
         """
@@ -388,12 +627,33 @@ class KnowledgeGraph:
         Returns:
             Set[str]: A set of all edge types
         """
-        edge_types = set()
+        return self._backend.get_relation_types()
+
+    def get_edges_by_relation(
+        self, relation: str
+    ) -> List[Tuple[str, str, Dict[str, Any]]]:
+        """
+        Get all edges of a relation type.
+
+        Args:
+            relation (str): The relation type
+
+        Returns:
+            List[Tuple[str, str, Dict[str, Any]]]: List of (source, target, attributes) tuples
+        """
+        return self._backend.get_edges_by_relation(relation)
 
-        for _, _, data in self.get_edges_data():
-            edge_types.add(data["relation"])
+    def get_statistics(self) -> GraphStatistics:
+        """
+        Get node and edge counts, the degree histogram and relation frequencies.
 
-        return edge_types
+        The in-memory backends keep these up to date as the graph changes, so
+        this is cheap to call repeatedly.
+
+        Returns:
+            GraphStatistics: The statistics of the graph
+        """
+        return self._backend.get_statistics()
 
     def get_node_neighbors_relations(self, node: str) -> List[Tuple[str, str, str]]:
         """
@@ -433,9 +693,24 @@ class KnowledgeGraph:
         if not self.has_node(node):
             return []
 
-        neighbors = set(self.get_successors(node))
-        neighbors.update(self.get_predecessors(node))
-        return list(neighbors)
+        return self._backend.get_neighbors(node)
+
+    def get_neighborhood(
+        self, nodes: Iterable[str], hops: int = 1, limit: Optional[int] = None
+    ) -> List[str]:
+        """
+        Get the nodes within a number of hops of the given nodes, both incoming
+        and outgoing.
+
+        Args:
+            nodes (Iterable[str]): The nodes to start from
+            hops (int): The maximum distance from the nodes
+            limit (Optional[int]): The maximum number of nodes to return
+
+        Returns:
+            List[str]: A list of node names, closest first, without the given nodes
+        """
+        return self._backend.neighborhood(nodes, hops=hops, limit=limit)
 
     def merge_nodes(self, node1: str, node2: str, merged_node: str) -> None:
         """
@@ -449,151 +724,59 @@ class KnowledgeGraph:
         if not self.has_node(node1) or not self.has_node(node2):
             return
 
-        # Create the merged node if it doesn't exist yet
-        if not self.has_node(merged_node):
-            self.add_node(merged_node, sources=[])
-
-        # Combine sources from both nodes
-        node1_attrs = self.get_node_attrs(node1)
-        node2_attrs = self.get_node_attrs(node2)
-        merged_attrs = {"sources": []}
-
-        if "sources" in node1_attrs:
-            merged_attrs["sources"].extend(node1_attrs["sources"])
-        if "sources" in node2_attrs:
-            merged_attrs["sources"].extend(node2_attrs["sources"])
-
-        self.add_node(merged_node, **merged_attrs)
-
-        # Redirect all edges from node1 and node2 to merged_node
-        # Outgoing edges from node1
-        for _, target, data in self.get_out_edges(node1):
-            if not self.has_edge(merged_node, target):
-                # Create new edge with empty sources list
-                self.add_edge(
-                    merged_node, target, relation=data.get("relation", ""), sources=[]
-                )
-
-            # Add sources from this edge to the new edge
-            if "sources" in data:
-                edge_data = self.get_edge_attrs(merged_node, target)
-                edge_data["sources"].extend(data["sources"])
-                self.add_edge(merged_node, target, **edge_data)
-
-        # Outgoing edges from node2
-        for _, target, data in self.get_out_edges(node2):
-            if not self.has_edge(merged_node, target):
-                # Create new edge with empty sources list
-                self.add_edge(
-                    merged_node, target, relation=data.get("relation", ""), sources=[]
-                )
-
-            # Add sources from this edge to the new edge
-            if "sources" in data:
-                edge_data = self.get_edge_attrs(merged_node, target)
-                edge_data["sources"].extend(data["sources"])
-                self.add_edge(merged_node, target, **edge_data)
-
-        # Incoming edges to node1
-        for source, _, data in self.get_in_edges(node1):
-            if not self.has_edge(source, merged_node):
-                # Create new edge with empty sources list
-                self.add_edge(
-                    source, merged_node, relation=data.get("relation", ""), sources=[]
-                )
-
-            # Add sources from this edge to the new edge
-            if "sources" in data:
-                edge_data = self.get_edge_attrs(source, merged_node)
-                edge_data["sources"].extend(data["sources"])
-                self.add_edge(source, merged_node, **edge_data)
-
-        # Incoming edges to node2
-        for source, _, data in self.get_in_edges(node2):
-            if not self.has_edge(source, merged_node):
-                # Create new edge with empty sources list
-                self.add_edge(
-                    source, merged_node, relation=data.get("relation", ""), sources=[]
-                )
-
-            # Add sources from this edge to the new edge
-            if "sources" in data:
-                edge_data = self.get_edge_attrs(source, merged_node)
-                edge_data["sources"].extend(data["sources"])
-                self.add_edge(source, merged_node, **edge_data)
-
-        # Remove the original nodes
-        self.remove_node(node1)
-        self.remove_node(node2)
+        self._backend.merge_nodes([([node1, node2], merged_node)])
+        self._changed()
 
     def merge_similar_nodes(self, merger: NodeMerger) -> None:
         """
         Find and merge similar nodes using the provided merger strategy.
 
+        Names of the merged nodes are generated for all groups first, then the
+        groups are merged by the backend in a single pass.
+
         Args:
             merger (NodeMerger): The strategy to use for finding and merging nodes
         """
         # Find groups of nodes to merge
         merge_candidates = merger.find_merge_candidates(self)
 
-        # Process each group
-        for group in merge_candidates:
-            if len(group) < 2:
-                continue
-
-            # Generate name for merged node
-            merged_node_name = merger.generate_merged_node_name(group, self)
-
-            # Create the merged node if it doesn't exist yet
-            if not self.has_node(merged_node_name):
-                self.add_node(merged_node_name, sources=[])
-
-            # Combine all sources and edges
-            for node in group:
-                if node == merged_node_name:
-                    continue  # Skip if this is already the merged node
-
-                # Combine sources
-                node_attrs = self.get_node_attrs(node)
-                if "sources" in node_attrs:
-                    merged_attrs = self.get_node_attrs(merged_node_name)
-                    merged_attrs["sources"].extend(node_attrs["sources"])
-                    self.add_node(merged_node_name, **merged_attrs)
-
-                # Redirect outgoing edges
-                for _, target, data in self.get_out_edges(node):
-                    if not self.has_edge(merged_node_name, target):
-                        self.add_edge(
-                            merged_node_name,
-                            target,
-                            relation=data.get("relation", ""),
-                            sources=[],
-                        )
-
-                    # Combine the sources
-                    if "sources" in data:
-                        edge_data = self.get_edge_attrs(merged_node_name, target)
-                        edge_data["sources"].extend(data["sources"])
-                        self.add_edge(merged_node_name, target, **edge_data)
-
-                # Redirect incoming edges
-                for source, _, data in self.get_in_edges(node):
-                    if not self.has_edge(source, merged_node_name):
-                        self.add_edge(
-                            source,
-                            merged_node_name,
-                            relation=data.get("relation", ""),
-                            sources=[],
-                        )
-
-                    # Combine the sources
-                    if "sources" in data:
-                        edge_data = self.get_edge_attrs(source, merged_node_name)
-                        edge_data["sources"].extend(data["sources"])
-                        self.add_edge(source, merged_node_name, **edge_data)
-
-                # Remove the original node
-                self.remove_node(node)
+        groups = [
+            (group, merger.generate_merged_node_name(group, self))
+            for group in merge_candidates
+            if len(group) >= 2
+        ]
+        self._backend.merge_nodes(groups)
+        self._changed()
+
+    def iter_triplets(
+        self,
+        relation: Optional[str] = None,
+        nodes: Optional[Iterable[str]] = None,
+        predicate: Optional[Callable[[str, str, str, Dict[str, Any]], bool]] = None,
+        as_tuples: bool = False,
+    ) -> Iterator[Union[Triplet, TripletTuple]]:
+        """
+        Iterate over the triplets in the knowledge graph, one edge at a time.
+
+        Every source of an edge gives a triplet, and an edge without sources a
+        triplet without metadata. The relation and node filters are passed to
+        the backend, so that only matching edges are read.
+
+        Args:
+            relation (Optional[str]): Only triplets with this relation
+            nodes (Optional[Iterable[str]]): Only triplets with node_1 or node_2
+                among these nodes
+            predicate (Optional[Callable[[str, str, str, Dict[str, Any]], bool]]):
+                Only triplets for which predicate(node_1, edge, node_2, metadata)
+                is true
+            as_tuples (bool): Yield (node_1, edge, node_2, metadata) tuples
+                instead of Triplet objects
+
+        Yields:
+            Union[Triplet, TripletTuple]: The triplets
+        """
+        for source, target, data in self._backend.find_edges(relation, nodes):
+            yield from edge_triplets(source, target, data, predicate, as_tuples)
 
     @property
     def triplets(self) -> List[Triplet]:
@@ -603,31 +786,7 @@ class KnowledgeGraph:
         Returns:
             List[Triplet]: The list of triplets
         """
-        triplets = []
-        for source, target, data in self.get_edges_data():
-            relation = data.get("relation", "")
-
-            # For each source in the edge's sources list, create a triplet
-            if "sources" in data and data["sources"]:
-                for source_data in data["sources"]:
-                    # Extract metadata (excluding relation and triplet_id)
-                    metadata = {
-                        k: v
-                        for k, v in source_data.items()
-                        if k != "relation" and k != "triplet_id"
-                    }
-                    triplets.append(
-                        Triplet(
-                            node_1=source,
-                            edge=relation,
-                            node_2=target,
-                            metadata=metadata,
-                        )
-                    )
-            else:
-                # If no sources, create a single triplet with no metadata
-                triplets.append(Triplet(node_1=source, edge=relation, node_2=target))
-        return triplets
+        return list(self.iter_triplets())
 
     def __str__(self) -> str:
         """
@@ -636,15 +795,19 @@ class KnowledgeGraph:
         Returns:
             str: A string representation
         """
-        nodes_count = self.number_of_nodes()
-        edge_types_count = len(self.get_edges())
-        edges_count = self.number_of_edges()
+        statistics = self.get_statistics()
+        nodes_count = statistics.num_nodes
+        edge_types_count = len(statistics.relation_counts)
+        edges_count = statistics.num_edges
 
         return f"KnowledgeGraph(nodes={nodes_count}, edge_types={edge_types_count}, edges={edges_count})"
 
     def save_to_file(self, filename: str) -> None:
         """
-        Save the knowledge graph to a local file using JSON serialization.
+        Save the knowledge graph to a local file.
+
+        Files with the .kgb extension use the compact binary graph format (see
+        ard.storage.graph.graph_file); any other extension uses JSON.
 
         Args:
             filename (str): Path to the file where the graph will be saved
@@ -658,6 +821,15 @@ class KnowledgeGraph:
         # Create directory if it doesn't exist
         os.makedirs(os.path.dirname(os.path.abspath(filename)), exist_ok=True)
 
+        if is_graph_file(filename):
+            write_graph_file(
+                filename,
+                self._backend.iter_nodes(),
+                self._backend.iter_edges(),
+                self.config,
+            )
+            return
+
         # Convert the graph to a serializable format
         serializable_graph = self._backend.to_serializable()
         data_to_save = {"graph": serializable_graph, "config": self.config}
@@ -669,7 +841,10 @@ class KnowledgeGraph:
     @classmethod
     def load_from_file(cls, filename: str) -> "KnowledgeGraph":
         """
-        Load a knowledge graph from a local file using JSON deserialization.
+        Load a knowledge graph from a local file.
+
+        Files with the .kgb extension are streamed from the binary graph format
+        straight into the backend; any other extension is read as JSON.
 
         Args:
             filename (str): Path to the file containing the saved graph
@@ -684,6 +859,13 @@ class KnowledgeGraph:
         if not os.path.exists(filename):
             raise FileNotFoundError(f"File not found: {filename}")
 
+        if is_graph_file(filename):
+            reader = GraphFileReader(filename)
+            kg = cls(config=reader.config)
+            kg._backend.add_nodes(reader.iter_nodes())
+            kg._backend.add_edges(reader.iter_edges())
+            return kg
+
         # Load the data from file
         try:
             with open(filename, "r", encoding="utf-8") as f:
@@ -703,6 +885,38 @@ class KnowledgeGraph:
 
         return kg
 
+    @classmethod
+    def open_readonly(cls, filename: str) -> "KnowledgeGraph":
+        """
+        Open a binary graph file as a read-only, memory-mapped knowledge graph.
+
+        Opening is nearly instant and processes that open the same file share one
+        copy of it in the page cache, which makes this the preferred way to give
+        many subgraph workers access to a large graph. Methods that modify the
+        graph raise NotImplementedError.
+
+        Args:
+            filename (str): Path to a graph saved with a .kgb extension
+
+        Returns:
+            KnowledgeGraph: A knowledge graph backed by a MmapGraphBackend
+
+        Raises:
+            FileNotFoundError: If the specified file doesn't exist
+            ValueError: If the file is not a binary graph file
+        """
+        if not os.path.exists(filename):
+            raise FileNotFoundError(f"File not found: {filename}")
+        if not is_graph_file(filename):
+            raise ValueError(
+                f"Read-only mode requires a binary (.kgb) graph file: {filename}"
+            )
+
+        backend = MmapGraphBackend(filename)
+        kg = cls(config=backend.config)
+        kg._backend = backend
+        return kg
+
     def random_walk(self, start_node: str, max_steps: int = 10) -> List[str]:
         """
         Perform a random walk on the graph starting from a given node.
@@ -717,20 +931,100 @@ class KnowledgeGraph:
         if not self.has_node(start_node):
             raise ValueError(f"Start node '{start_node}' not found in the graph")
 
-        current_node = start_node
-        visited = [current_node]
+        return self._backend.random_walk(start_node, max_steps)
 
-        for _ in range(max_steps):
-            neighbors = self.get_successors(current_node) + self.get_predecessors(
-                current_node
-            )
-            if not neighbors:
-                break
-            next_node = random.choice(neighbors)
-            visited.append(next_node)
-            current_node = next_node
+    def snapshot(self) -> "KnowledgeGraph":
+        """
+        Get an immutable snapshot of the current state of the graph.
+
+        The snapshot shares the backend of the graph rather than copying it;
+        every later write copies the nodes it changes into the open snapshots
+        first. Snapshots can be read from other threads, e.g. by subgraph
+        workers or exporters, while the graph is written or merged. Methods of
+        the snapshot that modify the graph raise NotImplementedError.
+
+        Returns:
+            KnowledgeGraph: A read-only knowledge graph with the same config
+        """
+        if not isinstance(self._backend, SnapshotBackend):
+            self._backend = SnapshotBackend(self._backend)
+        kg = KnowledgeGraph(config=self.config)
+        kg._backend = self._backend.snapshot()
+        return kg
+
+    def get_walk_engine(self) -> WalkEngine:
+        """
+        Get a WalkEngine over the current state of the graph.
+
+        The engine is kept until the graph is modified, see _cache_key.
+        Building it reads every edge, see uses_walk_engine.
+
+        Returns:
+            WalkEngine: The engine
+        """
+        key = self._cache_key()
+        if self._walk_engine is None or self._walk_engine[0] != key:
+            self._walk_engine = (key, WalkEngine.from_backend(self._backend))
+        return self._walk_engine[1]
 
-        return visited
+    def uses_walk_engine(self, num_walkers: int = 1) -> bool:
+        """
+        Check whether walks should run on a WalkEngine rather than step by step.
+
+        The engine pays off when the backend holds the graph in memory, or when
+        enough walkers share it to make up for reading every edge from storage.
+        Otherwise a few steps of get_node_neighbors are far cheaper.
+
+        Args:
+            num_walkers (int): Number of walks about to be taken
+
+        Returns:
+            bool: Whether to call random_walks
+        """
+        return (
+            self._backend.native_edge_arrays or num_walkers >= WALK_ENGINE_MIN_WALKERS
+        )
+
+    def random_walks(
+        self,
+        start_nodes: List[str],
+        max_steps: int = 10,
+        targets: Optional[List[Optional[str]]] = None,
+        seed: Seeds = None,
+        p: float = 1.0,
+        q: float = 1.0,
+        degree_bias: float = 0.0,
+    ) -> Walks:
+        """
+        Perform many random walks at once, e.g. to build a walk corpus.
+
+        Unlike random_walk, every step picks uniformly among the distinct
+        neighbors of a node, and walks stop when they step onto their target.
+
+        Args:
+            start_nodes (List[str]): The start node of every walk
+            max_steps (int): The maximum number of steps of a walk
+            targets (Optional[List[Optional[str]]]): The target of every walk
+            seed (Seeds): A seed per walk, or one seed for the whole batch
+            p (float): node2vec return parameter
+            q (float): node2vec in-out parameter
+            degree_bias (float): Weight neighbors by their degree to this power
+
+        Returns:
+            Walks: The walks, in the order of the start nodes
+
+        Raises:
+            ValueError: If a node is not in the graph
+        """
+        return self.get_walk_engine().walk(
+            start_nodes,
+            max_steps,
+            targets=targets,
+            seed=seed,
+            p=p,
+            q=q,
+            degree_bias=degree_bias,
+        )
 
     @classmethod
     def load_from_neo4j(cls, neo4j_config: dict) -> "KnowledgeGraph":
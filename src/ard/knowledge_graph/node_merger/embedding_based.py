@@ -1,8 +1,14 @@
-from typing import List, Set
+from typing import Iterator, List, Optional, Set, Tuple
+
+import numpy as np
 
 from ard.knowledge_graph.node_merger.base import NodeMerger
+from ard.utils.ann_index import DEFAULT_NPROBE
 from ard.utils.embedder import Embedder
 
+# Number of nodes from which candidates are found with an approximate index
+DEFAULT_INDEX_MIN_NODES = 20_000
+
 
 class EmbeddingBasedNodeMerger(NodeMerger):
     """
@@ -16,6 +22,10 @@ class EmbeddingBasedNodeMerger(NodeMerger):
         self,
         embedding_model_name: str = "all-MiniLM-L6-v2",
         similarity_threshold: float = 0.85,
+        batch_size: int = 1024,
+        embedder: Optional[Embedder] = None,
+        index_min_nodes: Optional[int] = DEFAULT_INDEX_MIN_NODES,
+        nprobe: int = DEFAULT_NPROBE,
     ):
         """
         Initialize the embedding-based node merger.
@@ -23,10 +33,23 @@ class EmbeddingBasedNodeMerger(NodeMerger):
         Args:
             embedding_model_name: Name of the SentenceTransformer model to use
             similarity_threshold: Threshold for cosine similarity (0-1)
+            batch_size: Number of nodes compared with all others in one matrix
+                product, bounding memory to batch_size x number of nodes
+            embedder: Embedder to share with other components, e.g. one with a
+                persistent cache. A new one for embedding_model_name if None.
+            index_min_nodes: Number of nodes from which every node is only
+                compared with its neighbours in an approximate nearest-neighbour
+                index instead of all nodes, which may miss a few similar pairs.
+                None to always compare all nodes.
+            nprobe: Number of index lists searched per node, trading speed
+                for recall
         """
         self.embedding_model_name = embedding_model_name
         self.similarity_threshold = similarity_threshold
-        self.embedder = Embedder(
+        self.batch_size = batch_size
+        self.index_min_nodes = index_min_nodes
+        self.nprobe = nprobe
+        self.embedder = embedder or Embedder(
             model_name=embedding_model_name, distance_metric="cosine"
         )
 
@@ -42,27 +65,73 @@ class EmbeddingBasedNodeMerger(NodeMerger):
         """
         # Find groups of similar nodes
         similar_groups = []
-        processed_nodes = set()
-
-        for node1 in knowledge_graph.get_nodes():
-            if node1 in processed_nodes:
-                continue
+        nodes = list(knowledge_graph.get_nodes())
+        processed = np.zeros(len(nodes), dtype=bool)
 
-            similar_nodes = {node1}
-            for node2 in knowledge_graph.get_nodes():
-                if node1 == node2 or node2 in processed_nodes:
+        for start, block in self._similar_nodes(nodes):
+            for i, similar in enumerate(block, start):
+                if processed[i]:
                     continue
 
-                similarity = self.embedder.calculate_similarity(node1, node2)
-                if similarity >= self.similarity_threshold:
-                    similar_nodes.add(node2)
-
-            if len(similar_nodes) > 1:
-                similar_groups.append(similar_nodes)
-                processed_nodes.update(similar_nodes)
+                similar = similar[~processed[similar]]
+                similar = similar[similar != i]
+                if len(similar):
+                    similar_groups.append({nodes[i]} | {nodes[j] for j in similar})
+                    processed[i] = True
+                    processed[similar] = True
 
         return similar_groups
 
+    def _similar_nodes(
+        self, nodes: List[str]
+    ) -> Iterator[Tuple[int, List[np.ndarray]]]:
+        """
+        Find the positions of the nodes similar to every node, block by block.
+
+        Small graphs compare every node with all others. From index_min_nodes
+        nodes, an approximate index limits the comparisons of every node to
+        about the square root of the number of nodes.
+
+        Args:
+            nodes: The node names
+
+        Yields:
+            Tuple[int, List[np.ndarray]]: The position of the first node of a
+                block, and for every node of the block the positions of the
+                nodes at least similarity_threshold similar to it
+        """
+        if (
+            not nodes
+            or self.index_min_nodes is None
+            or len(nodes) < self.index_min_nodes
+        ):
+            for start in range(0, len(nodes), self.batch_size):
+                similarities = self.embedder.pairwise_similarities(
+                    nodes[start : start + self.batch_size], nodes, metric="cosine"
+                )
+                yield (
+                    start,
+                    [
+                        np.flatnonzero(row >= self.similarity_threshold)
+                        for row in similarities
+                    ],
+                )
+            return
+
+        index = self.embedder.build_index(nodes, nprobe=self.nprobe)
+        positions = {node: i for i, node in enumerate(nodes)}
+        for start in range(0, len(nodes), self.batch_size):
+            neighbors = index.radius_query_many(
+                nodes[start : start + self.batch_size], self.similarity_threshold
+            )
+            yield (
+                start,
+                [
+                    np.array([positions[name] for name, _ in row], dtype=np.int64)
+                    for row in neighbors
+                ],
+            )
+
     def generate_merged_node_name(self, nodes: Set[str], knowledge_graph) -> str:
         """
         Generate a name for the merged node, using the most frequent name.
@@ -0,0 +1,206 @@
+import random
+from itertools import accumulate
+from typing import Dict, List, Optional, Set, Tuple
+
+from ard.storage.graph import GraphBackend
+
+# Nodes of a group to sample from with their cumulative weights
+_Group = Tuple[List[str], List[int]]
+
+WEIGHTINGS = ("uniform", "degree")
+
+
+class NodeSampler:
+    """
+    Random sampling of nodes and node pairs, e.g. to seed subgraph generation.
+
+    Uniform sampling over the whole graph is answered by the backend in O(1) per
+    node. Degree-weighted and component-restricted sampling work from cumulative
+    weights and weakly connected components computed on first use, after which
+    every node costs O(log n); they reflect the graph at that time, so create a
+    new sampler after modifying the graph.
+
+    Attributes:
+        weighting (str): "uniform", or "degree" to pick nodes with probability
+            proportional to their number of incoming and outgoing edges
+        component (Optional[str]): Restrict sampling to the weakly connected
+            component of this node, or to the largest one with "largest"
+    """
+
+    def __init__(
+        self,
+        backend: GraphBackend,
+        weighting: str = "uniform",
+        component: Optional[str] = None,
+        seed: Optional[int] = None,
+    ) -> None:
+        """
+        Initialize a NodeSampler.
+
+        Args:
+            backend (GraphBackend): The graph to sample from
+            weighting (str): "uniform" or "degree"
+            component (Optional[str]): A node name or "largest", None to sample
+                from the whole graph
+            seed (Optional[int]): Seed of the sampler's own random number
+                generator, None to use the global one of the random module
+
+        Raises:
+            ValueError: If the weighting is not supported
+        """
+        if weighting not in WEIGHTINGS:
+            raise ValueError(f"Unsupported weighting: {weighting}")
+        self._backend = backend
+        self.weighting = weighting
+        self.component = component
+        self._rng = random.Random(seed) if seed is not None else random
+        self._groups: Dict[bool, Tuple[List[_Group], List[int], int]] = {}
+
+    def reseed(self, seed: Optional[int]) -> None:
+        """
+        Restart the random number generator, keeping the precomputed groups.
+
+        Args:
+            seed (Optional[int]): New seed, None to use the global random
+                number generator of the random module
+        """
+        self._rng = random.Random(seed) if seed is not None else random
+
+    def _weight(self, node: str) -> int:
+        if self.weighting == "degree":
+            return len(self._backend.get_successors(node)) + len(
+                self._backend.get_predecessors(node)
+            )
+        return 1
+
+    def _component_of(self, node: str, seen: Set[str]) -> List[str]:
+        """Collect the weakly connected component of a node with a BFS."""
+        component = [node]
+        seen.add(node)
+        for current in component:
+            for neighbor in self._backend.get_neighbors(current):
+                if neighbor not in seen:
+                    seen.add(neighbor)
+                    component.append(neighbor)
+        return component
+
+    def _components(self) -> List[List[str]]:
+        """Get the weakly connected components allowed by self.component."""
+        if self.component not in (None, "largest"):
+            if not self._backend.has_node(self.component):
+                raise ValueError(f"Node '{self.component}' not found in the graph")
+            return [self._component_of(self.component, set())]
+
+        # Sorted so that seeded samplers don't depend on set iteration order
+        seen: Set[str] = set()
+        components = [
+            self._component_of(node, seen)
+            for node in sorted(self._backend.get_nodes())
+            if node not in seen
+        ]
+        if self.component == "largest" and components:
+            return [max(components, key=len)]
+        return components
+
+    def _get_groups(self, connected: bool) -> Tuple[List[_Group], List[int], int]:
+        """
+        Get the groups of nodes to sample from.
+
+        Args:
+            connected (bool): Split the nodes into weakly connected components and
+                drop components with a single node
+
+        Returns:
+            Tuple[List[_Group], List[int], int]: The groups, their cumulative total
+                weights and the number of nodes that can be picked
+        """
+        if connected not in self._groups:
+            if connected or self.component is not None:
+                nodes = self._components()
+                if connected:
+                    nodes = [component for component in nodes if len(component) > 1]
+            else:
+                nodes = [sorted(self._backend.get_nodes())]
+
+            groups = []
+            size = 0
+            for group in nodes:
+                weights = [self._weight(node) for node in group]
+                size += sum(1 for weight in weights if weight > 0)
+                if any(weights):
+                    groups.append((group, list(accumulate(weights))))
+            totals = list(accumulate(weights[-1] for _, weights in groups))
+            self._groups[connected] = (groups, totals, size)
+        return self._groups[connected]
+
+    def _pick_in(self, group: _Group) -> str:
+        nodes, weights = group
+        return self._rng.choices(nodes, cum_weights=weights)[0]
+
+    def _pick(
+        self, groups: List[_Group], totals: List[int], k: int
+    ) -> List[Tuple[int, str]]:
+        """Pick k nodes, returned with the index of their group."""
+        indices = self._rng.choices(range(len(groups)), cum_weights=totals, k=k)
+        return [(index, self._pick_in(groups[index])) for index in indices]
+
+    def sample_nodes(self, n: int) -> List[str]:
+        """
+        Pick n nodes at random, with replacement.
+
+        Args:
+            n (int): Number of nodes to pick
+
+        Returns:
+            List[str]: The picked nodes, empty if there is no node to pick
+        """
+        if self.weighting == "uniform" and self.component is None:
+            return self._backend.sample_nodes(n, self._rng)
+
+        groups, totals, _ = self._get_groups(connected=False)
+        if not groups:
+            return []
+        return [node for _, node in self._pick(groups, totals, n)]
+
+    def sample_node_pairs(
+        self, n: int, reachable: bool = True
+    ) -> List[Tuple[str, str]]:
+        """
+        Pick n pairs of distinct nodes at random.
+
+        Args:
+            n (int): Number of pairs to pick
+            reachable (bool): Only pick pairs connected by an undirected path, as
+                needed by the path-based subgraph generators. Each pair is drawn
+                from a single weakly connected component.
+
+        Returns:
+            List[Tuple[str, str]]: The (start, end) pairs
+
+        Raises:
+            ValueError: If no pair of nodes satisfies the constraints
+        """
+        if reachable:
+            groups, totals, size = self._get_groups(connected=True)
+        elif self.weighting == "uniform" and self.component is None:
+            size = len(self._backend)
+        else:
+            size = self._get_groups(connected=False)[2]
+        if size < 2:
+            raise ValueError("The graph has no pair of nodes to sample from")
+
+        if reachable:
+            pairs = []
+            for index, start in self._pick(groups, totals, n):
+                end = start
+                while end == start:
+                    end = self._pick_in(groups[index])
+                pairs.append((start, end))
+            return pairs
+
+        pairs = []
+        for start, end in zip(self.sample_nodes(n), self.sample_nodes(n)):
+            while end == start:
+                end = self.sample_nodes(1)[0]
+            pairs.append((start, end))
+        return pairs
@@ -0,0 +1,323 @@
+import random
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+from ard.storage.graph import GraphBackend
+
+_GAMMA = 0x9E3779B97F4A7C15
+_MASK = (1 << 64) - 1
+# Random draws per walker and step, more than rejection sampling ever needs
+_DRAWS_PER_STEP = 1 << 20
+# Number of walkers from which building an engine from storage pays off
+WALK_ENGINE_MIN_WALKERS = 1024
+
+Seeds = Union[None, int, Sequence[int], np.ndarray]
+
+
+def _mix(state: np.ndarray) -> np.ndarray:
+    """Apply the splitmix64 finalizer to an array of 64-bit states."""
+    z = state ^ (state >> np.uint64(30))
+    z = z * np.uint64(0xBF58476D1CE4E5B9)
+    z = z ^ (z >> np.uint64(27))
+    z = z * np.uint64(0x94D049BB133111EB)
+    return z ^ (z >> np.uint64(31))
+
+
+def _uniform(seeds: np.ndarray, step: int, draw: int) -> np.ndarray:
+    """
+    Get one number in [0, 1) per walker, as a pure function of its seed.
+
+    The numbers are the splitmix64 sequence of every seed at position
+    (step, draw), so a walk does not depend on the other walkers of a batch.
+    """
+    counter = (step * _DRAWS_PER_STEP + draw + 1) * _GAMMA & _MASK
+    z = _mix(seeds + np.uint64(counter))
+    return (z >> np.uint64(11)).astype(np.float64) * (1.0 / (1 << 53))
+
+
+@dataclass
+class Walks:
+    """
+    A batch of random walks as arrays of node ids.
+
+    Attributes:
+        names (List[str]): Node names, indexed by node id
+        nodes (np.ndarray): Visited node ids, one row per walk including the
+            start node, padded with -1 after the end of the walk
+        lengths (np.ndarray): Number of visited nodes of every walk
+        reached (np.ndarray): Whether every walk ended on its target
+    """
+
+    names: List[str]
+    nodes: np.ndarray
+    lengths: np.ndarray
+    reached: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.lengths)
+
+    def path(self, walk: int) -> List[str]:
+        """Get the node names visited by a walk."""
+        names = self.names
+        return [names[node] for node in self.nodes[walk, : self.lengths[walk]].tolist()]
+
+    def paths(self) -> List[List[str]]:
+        """Get the node names visited by every walk."""
+        names = self.names
+        return [
+            [names[node] for node in row[:length]]
+            for row, length in zip(self.nodes.tolist(), self.lengths.tolist())
+        ]
+
+
+class WalkEngine:
+    """
+    Random walks of many walkers at once over integer adjacency arrays.
+
+    Walks ignore edge direction and step between distinct neighbors, like
+    KnowledgeGraph.get_node_neighbors. Every step advances all active walkers
+    with a few NumPy operations, so the cost per step of a walker is a small
+    constant instead of a neighbor lookup. The engine is a snapshot of the
+    graph when it was built; build a new one after modifying the graph.
+
+    Transitions are uniform over the neighbors, biased by neighbor degree, and
+    optionally second order as in node2vec: with return parameter p and in-out
+    parameter q, stepping back to the previous node is weighted by 1/p, to a
+    neighbor of the previous node by 1 and anywhere else by 1/q.
+    """
+
+    def __init__(
+        self, names: List[str], sources: np.ndarray, targets: np.ndarray
+    ) -> None:
+        """
+        Initialize a WalkEngine from the edges of a graph.
+
+        Args:
+            names (List[str]): Node names, indexed by node id
+            sources (np.ndarray): Source node ids of the edges
+            targets (np.ndarray): Target node ids of the edges
+        """
+        num_nodes = len(names)
+        sources = np.asarray(sources, dtype=np.int64)
+        targets = np.asarray(targets, dtype=np.int64)
+        # Both directions of every edge, sorted and without duplicates, as
+        # keys source * num_nodes + target
+        keys = np.unique(
+            np.concatenate(
+                [sources * num_nodes + targets, targets * num_nodes + sources]
+            )
+        )
+        self.names = names
+        self._ids: Optional[Dict[str, int]] = None
+        self._keys = keys
+        self.indptr = np.searchsorted(
+            keys, np.arange(num_nodes + 1, dtype=np.int64) * num_nodes
+        )
+        self.indices = keys % max(num_nodes, 1)
+        self.degrees = np.diff(self.indptr)
+        self._cumulative_weights: Dict[float, np.ndarray] = {}
+
+    @classmethod
+    def from_backend(cls, backend: GraphBackend) -> "WalkEngine":
+        """
+        Build a WalkEngine from the current state of a graph backend.
+
+        Args:
+            backend (GraphBackend): The graph to walk
+
+        Returns:
+            WalkEngine: The engine
+        """
+        return cls(*backend.edge_arrays())
+
+    def node_ids(self, nodes: Sequence[str]) -> np.ndarray:
+        """
+        Get the ids of nodes.
+
+        Args:
+            nodes (Sequence[str]): Node names
+
+        Returns:
+            np.ndarray: The node ids
+
+        Raises:
+            ValueError: If a node is not in the graph
+        """
+        if self._ids is None:
+            self._ids = {name: i for i, name in enumerate(self.names)}
+        ids = self._ids
+        try:
+            return np.fromiter((ids[node] for node in nodes), np.int64, len(nodes))
+        except KeyError as e:
+            raise ValueError(f"Node '{e.args[0]}' not found in the graph") from None
+
+    def _walker_seeds(self, seed: Seeds, num_walkers: int) -> np.ndarray:
+        if seed is None:
+            seed = random.getrandbits(63)
+        if isinstance(seed, (int, np.integer)):
+            seeds = np.uint64(int(seed) & _MASK) + np.arange(
+                num_walkers, dtype=np.uint64
+            )
+        else:
+            seeds = np.array([int(s) & _MASK for s in seed], dtype=np.uint64)
+            if seeds.shape != (num_walkers,):
+                raise ValueError("Expected one seed per walker")
+        return _mix(seeds)
+
+    def _cumulative(self, degree_bias: float) -> np.ndarray:
+        """Get the cumulative transition weights of all adjacency entries."""
+        if degree_bias not in self._cumulative_weights:
+            weights = self.degrees[self.indices].astype(np.float64) ** degree_bias
+            self._cumulative_weights[degree_bias] = np.cumsum(weights)
+        return self._cumulative_weights[degree_bias]
+
+    def _propose(
+        self,
+        current: np.ndarray,
+        seeds: np.ndarray,
+        step: int,
+        draw: int,
+        degree_bias: float,
+    ) -> np.ndarray:
+        """Pick a neighbor of every current node with the first order weights."""
+        u = _uniform(seeds, step, draw)
+        start = self.indptr[current]
+        if not degree_bias:
+            positions = start + (u * self.degrees[current]).astype(np.int64)
+        else:
+            cumulative = self._cumulative(degree_bias)
+            stop = self.indptr[current + 1]
+            base = np.where(start > 0, cumulative[start - 1], 0.0)
+            values = base + u * (cumulative[stop - 1] - base)
+            positions = np.searchsorted(cumulative, values, side="right")
+            positions = np.clip(positions, start, stop - 1)
+        return self.indices[positions]
+
+    def _adjacent(self, sources: np.ndarray, targets: np.ndarray) -> np.ndarray:
+        keys = sources * len(self.names) + targets
+        positions = np.minimum(
+            np.searchsorted(self._keys, keys), max(len(self._keys) - 1, 0)
+        )
+        return self._keys[positions] == keys
+
+    def _step(
+        self,
+        current: np.ndarray,
+        previous: np.ndarray,
+        seeds: np.ndarray,
+        step: int,
+        p: float,
+        q: float,
+        degree_bias: float,
+    ) -> np.ndarray:
+        """Pick the next node of every walker, by rejection sampling for p, q."""
+        if p == 1.0 and q == 1.0:
+            return self._propose(current, seeds, step, 0, degree_bias)
+
+        max_alpha = max(1.0 / p, 1.0, 1.0 / q)
+        result = np.empty_like(current)
+        pending = np.arange(len(current))
+        draw = 0
+        while len(pending):
+            previous_nodes = previous[pending]
+            proposed = self._propose(
+                current[pending], seeds[pending], step, draw, degree_bias
+            )
+            alpha = np.where(
+                proposed == previous_nodes,
+                1.0 / p,
+                np.where(self._adjacent(previous_nodes, proposed), 1.0, 1.0 / q),
+            )
+            # The first step has no previous node and takes every proposal
+            alpha[previous_nodes < 0] = max_alpha
+            accepted = _uniform(seeds[pending], step, draw + 1) * max_alpha < alpha
+            result[pending[accepted]] = proposed[accepted]
+            pending = pending[~accepted]
+            draw += 2
+        return result
+
+    def walk(
+        self,
+        start_nodes: Sequence[str],
+        max_steps: int,
+        targets: Optional[Sequence[Optional[str]]] = None,
+        seed: Seeds = None,
+        p: float = 1.0,
+        q: float = 1.0,
+        degree_bias: float = 0.0,
+    ) -> Walks:
+        """
+        Walk the graph with one walker per start node.
+
+        A walk ends after max_steps steps, at a node without neighbors, or when
+        it steps onto its target.
+
+        Args:
+            start_nodes (Sequence[str]): The start node of every walker
+            max_steps (int): The maximum number of steps of a walk
+            targets (Optional[Sequence[Optional[str]]]): The target of every
+                walker, None for walkers without a target
+            seed (Seeds): The seed of every walker, or a single seed s to give
+                walker i the seed s + i; None draws s from the random module
+            p (float): Return parameter, larger values make returning to the
+                previous node less likely
+            q (float): In-out parameter, larger values keep walks close to the
+                previous node
+            degree_bias (float): Weight the neighbors by their degree to this
+                power, negative values favor low degree neighbors
+
+        Returns:
+            Walks: The walks, in the order of the start nodes
+
+        Raises:
+            ValueError: If a node is not in the graph, or a parameter is invalid
+        """
+        if max_steps < 0:
+            raise ValueError("max_steps must not be negative")
+        if p <= 0 or q <= 0:
+            raise ValueError("p and q must be positive")
+
+        current = self.node_ids(start_nodes)
+        num_walkers = len(current)
+        seeds = self._walker_seeds(seed, num_walkers)
+        target_ids = np.full(num_walkers, -1, dtype=np.int64)
+        if targets is not None:
+            if len(targets) != num_walkers:
+                raise ValueError("Expected one target per walker")
+            with_target = [i for i, target in enumerate(targets) if target is not None]
+            target_ids[with_target] = self.node_ids([targets[i] for i in with_target])
+
+        nodes = np.full((num_walkers, max_steps + 1), -1, dtype=np.int64)
+        nodes[:, 0] = current
+        lengths = np.ones(num_walkers, dtype=np.int64)
+        previous = np.full(num_walkers, -1, dtype=np.int64)
+        reached = current == target_ids
+        active = ~reached
+
+        for step in range(1, max_steps + 1):
+            active &= self.degrees[current] > 0
+            walkers = np.flatnonzero(active)
+            if not len(walkers):
+                break
+            walker_nodes = current[walkers]
+            next_nodes = self._step(
+                walker_nodes,
+                previous[walkers],
+                seeds[walkers],
+                step,
+                p,
+                q,
+                degree_bias,
+            )
+            nodes[walkers, step] = next_nodes
+            lengths[walkers] += 1
+            previous[walkers] = walker_nodes
+            current[walkers] = next_nodes
+
+            hit = walkers[next_nodes == target_ids[walkers]]
+            reached[hit] = True
+            active[hit] = False
+
+        return Walks(self.names, nodes, lengths, reached)
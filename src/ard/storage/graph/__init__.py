@@ -1,5 +1,37 @@
 from ard.storage.graph.base import GraphBackend
+from ard.storage.graph.cached import CachedBackend, CacheInfo
+from ard.storage.graph.csr import CSRBackend
+from ard.storage.graph.instrumented import (
+    CallStats,
+    InstrumentedBackend,
+    MethodStats,
+    assert_max_calls,
+)
+from ard.storage.graph.mmap import MmapGraphBackend
 from ard.storage.graph.neo4j import Neo4jBackend
+from ard.storage.graph.neo4j_async import AsyncNeo4jBackend
 from ard.storage.graph.networkx import NetworkXBackend
+from ard.storage.graph.snapshot import GraphSnapshot, SnapshotBackend
+from ard.storage.graph.sqlite import SQLiteBackend
+from ard.storage.graph.statistics import GraphStatistics
+from ard.storage.graph.wrapper import BackendWrapper
 
-__all__ = ["GraphBackend", "NetworkXBackend", "Neo4jBackend"]
+__all__ = [
+    "GraphBackend",
+    "NetworkXBackend",
+    "Neo4jBackend",
+    "AsyncNeo4jBackend",
+    "MmapGraphBackend",
+    "CSRBackend",
+    "SQLiteBackend",
+    "GraphStatistics",
+    "BackendWrapper",
+    "CachedBackend",
+    "CacheInfo",
+    "InstrumentedBackend",
+    "CallStats",
+    "MethodStats",
+    "assert_max_calls",
+    "SnapshotBackend",
+    "GraphSnapshot",
+]
@@ -1,5 +1,12 @@
+import random
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Set, Tuple
+from collections import Counter
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+import numpy as np
+
+from ard.storage.graph.merge import MergeGroups, merge_edges, plan_merges
+from ard.storage.graph.statistics import GraphStatistics
 
 
 class GraphBackend(ABC):
@@ -23,6 +30,32 @@ class GraphBackend(ABC):
         """Add an edge with optional attributes."""
         pass
 
+    def add_nodes(self, nodes: Iterable[Tuple[str, Dict[str, Any]]]) -> None:
+        """
+        Add or update many nodes at once.
+
+        Backends that can write in bulk should override this; the default
+        falls back to one add_node call per node.
+
+        Args:
+            nodes: Iterable of (node, attributes) pairs
+        """
+        for node, attrs in nodes:
+            self.add_node(node, **attrs)
+
+    def add_edges(self, edges: Iterable[Tuple[str, str, Dict[str, Any]]]) -> None:
+        """
+        Add or update many edges at once.
+
+        Backends that can write in bulk should override this; the default
+        falls back to one add_edge call per edge.
+
+        Args:
+            edges: Iterable of (source, target, attributes) tuples
+        """
+        for source, target, attrs in edges:
+            self.add_edge(source, target, **attrs)
+
     @abstractmethod
     def has_edge(self, source: str, target: str) -> bool:
         """Check if an edge exists."""
@@ -38,16 +71,276 @@ class GraphBackend(ABC):
         """Get all attributes of an edge."""
         pass
 
+    def get_nodes_attrs(self, nodes: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the attributes of many nodes at once.
+
+        Backends with a round trip per query should override this; the default
+        calls has_node and get_node_attrs for every node.
+
+        Args:
+            nodes: The nodes to look up
+
+        Returns:
+            Dict[str, Dict[str, Any]]: The attributes of the nodes that are in
+                the graph
+        """
+        return {
+            node: self.get_node_attrs(node) for node in nodes if self.has_node(node)
+        }
+
+    def get_edges_attrs(
+        self, edges: Iterable[Tuple[str, str]]
+    ) -> Dict[Tuple[str, str], Dict[str, Any]]:
+        """
+        Get the attributes of many edges at once.
+
+        Backends with a round trip per query should override this; the default
+        calls has_edge and get_edge_attrs for every edge.
+
+        Args:
+            edges: (source, target) pairs to look up
+
+        Returns:
+            Dict[Tuple[str, str], Dict[str, Any]]: The attributes of the edges
+                that are in the graph
+        """
+        return {
+            (source, target): self.get_edge_attrs(source, target)
+            for source, target in edges
+            if self.has_edge(source, target)
+        }
+
     @abstractmethod
     def get_nodes(self) -> Set[str]:
         """Get all nodes in the graph."""
         pass
 
+    def sample_nodes(self, k: int, rng: Optional[random.Random] = None) -> List[str]:
+        """
+        Pick k nodes uniformly at random, with replacement.
+
+        Backends that can sample without listing every node should override
+        this; the default draws the whole batch from a single get_nodes() call.
+
+        Args:
+            k (int): Number of nodes to pick
+            rng (Optional[random.Random]): Random number generator, defaults to
+                the global one of the random module
+
+        Returns:
+            List[str]: The picked nodes, empty if the graph is empty
+        """
+        nodes = list(self.get_nodes())
+        if not nodes:
+            return []
+        return (rng or random).choices(nodes, k=k)
+
     @abstractmethod
     def get_edges(self) -> List[Tuple[str, str, Dict[str, Any]]]:
         """Get all edges in the graph with their attributes."""
         pass
 
+    def iter_nodes(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Iterate over all nodes with their attributes.
+
+        Backends that can stream their nodes should override this; the default
+        looks up the attributes of every node in get_nodes().
+
+        Yields:
+            Tuple[str, Dict[str, Any]]: (node, attributes) pairs
+        """
+        for node in self.get_nodes():
+            yield node, self.get_node_attrs(node)
+
+    def iter_edges(self) -> Iterator[Tuple[str, str, Dict[str, Any]]]:
+        """
+        Iterate over all edges with their attributes.
+
+        Yields:
+            Tuple[str, str, Dict[str, Any]]: (source, target, attributes) tuples
+        """
+        yield from self.get_edges()
+
+    @property
+    def native_edge_arrays(self) -> bool:
+        """
+        Whether edge_arrays is answered from the graph held in process memory.
+
+        When False, edge_arrays reads every node and edge from storage, which
+        callers should avoid repeating.
+        """
+        return False
+
+    def edge_arrays(self) -> Tuple[List[str], np.ndarray, np.ndarray]:
+        """
+        Get the edges of the graph as arrays of integer node ids.
+
+        Backends with an integer representation should override this; the
+        default numbers the nodes in sorted order and scans every edge.
+
+        Returns:
+            Tuple[List[str], np.ndarray, np.ndarray]: The node names, indexed by
+                id, and the source and target ids of every edge
+        """
+        names = sorted(self.get_nodes())
+        ids = {name: i for i, name in enumerate(names)}
+        pairs = np.array(
+            [(ids[source], ids[target]) for source, target, _ in self.iter_edges()],
+            dtype=np.int32,
+        ).reshape(-1, 2)
+        return names, pairs[:, 0], pairs[:, 1]
+
+    def get_edges_by_relation(
+        self, relation: str
+    ) -> List[Tuple[str, str, Dict[str, Any]]]:
+        """
+        Get all edges with the given relation.
+
+        Backends with a relation index should override this; the default scans
+        every edge.
+
+        Args:
+            relation (str): The relation of the edges
+
+        Returns:
+            List[Tuple[str, str, Dict[str, Any]]]: List of (source, target, attributes) tuples
+        """
+        return [
+            (source, target, attrs)
+            for source, target, attrs in self.iter_edges()
+            if attrs.get("relation") == relation
+        ]
+
+    def find_edges(
+        self, relation: Optional[str] = None, nodes: Optional[Iterable[str]] = None
+    ) -> Iterator[Tuple[str, str, Dict[str, Any]]]:
+        """
+        Iterate over the edges matching filters, without listing every edge.
+
+        Backends that can filter where the edges are stored should override
+        this; the default uses get_edges_by_relation for a relation, and the
+        incident edges of the nodes for nodes.
+
+        Args:
+            relation (Optional[str]): Only edges with this relation
+            nodes (Optional[Iterable[str]]): Only edges with a source or target
+                among these nodes; nodes that are not in the graph are ignored
+
+        Yields:
+            Tuple[str, str, Dict[str, Any]]: (source, target, attributes) tuples
+        """
+        if nodes is None:
+            if relation is None:
+                yield from self.iter_edges()
+            else:
+                yield from self.get_edges_by_relation(relation)
+            return
+
+        nodes = {node: None for node in nodes if self.has_node(node)}
+        for node in nodes:
+            for edge in self.get_out_edges(node):
+                if relation is None or edge[2].get("relation") == relation:
+                    yield edge
+            for edge in self.get_in_edges(node):
+                # Edges between two of the nodes were yielded as out edges
+                if edge[0] not in nodes and (
+                    relation is None or edge[2].get("relation") == relation
+                ):
+                    yield edge
+
+    def induced_subgraph(
+        self, nodes: Iterable[str]
+    ) -> Tuple[List[Tuple[str, Dict[str, Any]]], List[Tuple[str, str, Dict[str, Any]]]]:
+        """
+        Get nodes with their attributes and all edges between them.
+
+        Backends that can read a subgraph at once should override this; the
+        default looks up the nodes with get_nodes_attrs and scans their
+        outgoing edges.
+
+        Args:
+            nodes: The nodes of the subgraph; nodes that are not in the graph
+                are ignored
+
+        Returns:
+            Tuple[List[Tuple[str, Dict[str, Any]]], List[Tuple[str, str, Dict[str, Any]]]]:
+                (node, attributes) pairs and (source, target, attributes) tuples,
+                ready for add_nodes and add_edges
+        """
+        node_attrs = self.get_nodes_attrs(nodes)
+        edges = [
+            edge
+            for node in node_attrs
+            for edge in self.get_out_edges(node)
+            if edge[1] in node_attrs
+        ]
+        return list(node_attrs.items()), edges
+
+    def neighborhood(
+        self, nodes: Iterable[str], hops: int = 1, limit: Optional[int] = None
+    ) -> List[str]:
+        """
+        Get the nodes within a number of hops of the given nodes.
+
+        Edge direction is ignored, as in get_neighbors. Backends that can
+        traverse the graph at once should override this; the default does a
+        breadth-first search with get_neighbors.
+
+        Args:
+            nodes: The nodes to start from; nodes that are not in the graph are
+                ignored
+            hops (int): The maximum distance from the nodes
+            limit (Optional[int]): The maximum number of nodes to return
+
+        Returns:
+            List[str]: The nodes, closest first, without the given nodes
+        """
+        if hops < 0:
+            raise ValueError("hops must not be negative")
+        seen = {node: None for node in nodes if self.has_node(node)}
+        frontier = list(seen)
+        found: List[str] = []
+        for _ in range(hops):
+            next_frontier = []
+            for node in frontier:
+                for neighbor in self.get_neighbors(node):
+                    if neighbor not in seen:
+                        seen[neighbor] = None
+                        next_frontier.append(neighbor)
+                        found.append(neighbor)
+                        if limit is not None and len(found) >= limit:
+                            return found
+            frontier = next_frontier
+        return found
+
+    def get_relation_types(self) -> Set[str]:
+        """Get the relations of the edges in the graph."""
+        return self.get_statistics().relation_types
+
+    def get_statistics(self) -> GraphStatistics:
+        """
+        Get node and edge counts, the degree histogram and relation frequencies.
+
+        Backends that keep statistics up to date should override this; the
+        default computes them with one pass over the edges.
+
+        Returns:
+            GraphStatistics: The statistics of the graph
+        """
+        statistics = GraphStatistics(num_nodes=len(self))
+        degrees = Counter()
+        for source, target, attrs in self.iter_edges():
+            statistics.add_edge(attrs.get("relation"))
+            degrees[source] += 1
+            degrees[target] += 1
+        histogram = Counter(degrees.values())
+        if statistics.num_nodes > len(degrees):
+            histogram[0] = statistics.num_nodes - len(degrees)
+        statistics.degree_histogram = dict(histogram)
+        return statistics
+
     @abstractmethod
     def get_successors(self, node: str) -> List[str]:
         """Get all successor nodes of a node."""
@@ -58,6 +351,51 @@ class GraphBackend(ABC):
         """Get all predecessor nodes of a node."""
         pass
 
+    def get_neighbors(self, node: str) -> List[str]:
+        """
+        Get the distinct successors and predecessors of a node.
+
+        Backends with a faster way to gather both directions should override this.
+
+        Args:
+            node (str): The node to get neighbors for
+
+        Returns:
+            List[str]: The neighbor names, without duplicates
+        """
+        neighbors = set(self.get_successors(node))
+        neighbors.update(self.get_predecessors(node))
+        return list(neighbors)
+
+    def random_walk(self, start_node: str, max_steps: int) -> List[str]:
+        """
+        Walk the graph from a node, ignoring edge direction.
+
+        Every step moves to a node picked uniformly with random.choice from the
+        successors followed by the predecessors of the current node, so nodes
+        connected in both directions are twice as likely to be picked.
+
+        Args:
+            start_node (str): The node to start the walk from
+            max_steps (int): The maximum number of steps to take
+
+        Returns:
+            List[str]: The nodes visited during the walk, including the start node
+        """
+        current_node = start_node
+        visited = [current_node]
+
+        for _ in range(max_steps):
+            neighbors = self.get_successors(current_node) + self.get_predecessors(
+                current_node
+            )
+            if not neighbors:
+                break
+            current_node = random.choice(neighbors)
+            visited.append(current_node)
+
+        return visited
+
     @abstractmethod
     def get_out_edges(self, node: str) -> List[Tuple[str, str, Dict[str, Any]]]:
         """Get all outgoing edges of a node with their attributes."""
@@ -73,6 +411,42 @@ class GraphBackend(ABC):
         """Remove a node and all its edges."""
         pass
 
+    def merge_nodes(self, groups: MergeGroups) -> None:
+        """
+        Merge groups of nodes, each into a single node, in one pass.
+
+        Groups are applied in order. The merged node is created with empty
+        sources if needed, its sources are extended with those of the other
+        members, and their edges are moved to it before they are removed; see
+        plan_merges and merge_edges for how sources and edges are combined.
+
+        Backends with direct access to their adjacency should override this;
+        the default reads the edges of every merged node once, removes the
+        nodes and writes the merged nodes and edges with add_nodes and
+        add_edges.
+
+        Args:
+            groups (MergeGroups): (members, merged node) pairs
+        """
+        plan = plan_merges(groups, self.has_node, self.get_node_attrs)
+
+        def edge_attrs(source: str, target: str) -> Optional[Dict[str, Any]]:
+            if not self.has_edge(source, target):
+                return None
+            return self.get_edge_attrs(source, target)
+
+        edges = merge_edges(
+            plan,
+            lambda node: (self.get_out_edges(node), self.get_in_edges(node)),
+            edge_attrs,
+        )
+        for node in plan.relabel:
+            self.remove_node(node)
+        self.add_nodes(plan.nodes.items())
+        self.add_edges(
+            (source, target, attrs) for (source, target), attrs in edges.items()
+        )
+
     @abstractmethod
     def number_of_edges(self) -> int:
         """Get the total number of edges in the graph."""
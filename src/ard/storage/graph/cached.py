@@ -0,0 +1,276 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+
+from ard.storage.graph.base import GraphBackend
+from ard.storage.graph.merge import MergeGroups
+from ard.storage.graph.wrapper import BackendWrapper
+
+DEFAULT_CACHE_SIZE = 100_000
+
+# Cached value of a node or edge that is not in the graph
+_MISSING = None
+
+
+@dataclass
+class CacheInfo:
+    """
+    Counters of one cache of a CachedBackend.
+
+    Attributes:
+        hits (int): Number of lookups answered from the cache
+        misses (int): Number of lookups read from the wrapped backend
+        size (int): Number of cached entries
+        max_size (int): Maximum number of cached entries
+    """
+
+    hits: int = 0
+    misses: int = 0
+    size: int = 0
+    max_size: int = 0
+
+
+class _LRUCache:
+    """A bounded mapping that evicts the least recently used entries."""
+
+    def __init__(self, max_size: int) -> None:
+        self._entries: OrderedDict = OrderedDict()
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, key: Hashable) -> Tuple[bool, Any]:
+        """Get (True, value) for a cached key, or (False, None) otherwise."""
+        try:
+            value = self._entries[key]
+        except KeyError:
+            self.misses += 1
+            return False, None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return True, value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def info(self) -> CacheInfo:
+        return CacheInfo(self.hits, self.misses, len(self._entries), self.max_size)
+
+
+class CachedBackend(BackendWrapper):
+    """
+    A read-through cache in front of a graph backend.
+
+    Adjacency lists, node attributes and edge attributes are kept in bounded
+    LRU caches, so that repeated lookups of the same nodes and edges, as path
+    generators make, cost a single read of the wrapped backend. Nodes and edges
+    known to be missing are cached too. Writes through the wrapper drop the
+    entries they affect; writes made to the wrapped backend directly are not
+    seen until clear_cache() is called.
+
+    Cached attributes are returned as shallow copies, like the attributes of
+    the in-memory backends.
+    """
+
+    def __init__(
+        self, backend: GraphBackend, max_size: int = DEFAULT_CACHE_SIZE
+    ) -> None:
+        """
+        Initialize a CachedBackend.
+
+        Args:
+            backend (GraphBackend): The backend to cache
+            max_size (int): Maximum number of entries of every cache
+        """
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        super().__init__(backend)
+        # Keyed by (kind, node), kind being one of the adjacency methods
+        self._adjacency = _LRUCache(max_size)
+        self._nodes = _LRUCache(max_size)
+        self._edges = _LRUCache(max_size)
+
+    def cache_info(self) -> Dict[str, CacheInfo]:
+        """
+        Get the hit and miss counters of the caches.
+
+        Returns:
+            Dict[str, CacheInfo]: The counters of the "adjacency", "nodes" and
+                "edges" caches
+        """
+        return {
+            "adjacency": self._adjacency.info(),
+            "nodes": self._nodes.info(),
+            "edges": self._edges.info(),
+        }
+
+    def clear_cache(self) -> None:
+        """Drop every cached entry, keeping the counters."""
+        self._adjacency.clear()
+        self._nodes.clear()
+        self._edges.clear()
+
+    def _adjacent(self, kind: str, node: str) -> List[Any]:
+        found, value = self._adjacency.lookup((kind, node))
+        if not found:
+            value = getattr(self._backend, kind)(node)
+            self._adjacency.put((kind, node), value)
+        return list(value)
+
+    def _invalidate_node(self, node: str) -> None:
+        self._nodes.pop(node)
+        for kind in (
+            "get_successors",
+            "get_predecessors",
+            "get_neighbors",
+            "get_out_edges",
+            "get_in_edges",
+        ):
+            self._adjacency.pop((kind, node))
+
+    def _invalidate_edge(self, source: str, target: str) -> None:
+        self._edges.pop((source, target))
+        # Adding an edge may create its nodes, and changes both adjacencies
+        self._invalidate_node(source)
+        self._invalidate_node(target)
+
+    def get_nodes_attrs(self, nodes: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Get the attributes of many nodes, reading the uncached ones at once."""
+        found: Dict[str, Optional[Dict[str, Any]]] = {}
+        missing = []
+        for node in dict.fromkeys(nodes):
+            cached, attrs = self._nodes.lookup(node)
+            if cached:
+                found[node] = attrs
+            else:
+                found[node] = _MISSING
+                missing.append(node)
+        if missing:
+            read = self._backend.get_nodes_attrs(missing)
+            for node in missing:
+                attrs = read.get(node, _MISSING)
+                self._nodes.put(node, attrs)
+                found[node] = attrs
+        return {node: dict(attrs) for node, attrs in found.items() if attrs is not None}
+
+    def get_edges_attrs(
+        self, edges: Iterable[Tuple[str, str]]
+    ) -> Dict[Tuple[str, str], Dict[str, Any]]:
+        """Get the attributes of many edges, reading the uncached ones at once."""
+        found: Dict[Tuple[str, str], Optional[Dict[str, Any]]] = {}
+        missing = []
+        for edge in dict.fromkeys(edges):
+            cached, attrs = self._edges.lookup(edge)
+            if cached:
+                found[edge] = attrs
+            else:
+                found[edge] = _MISSING
+                missing.append(edge)
+        if missing:
+            read = self._backend.get_edges_attrs(missing)
+            for edge in missing:
+                attrs = read.get(edge, _MISSING)
+                self._edges.put(edge, attrs)
+                found[edge] = attrs
+        return {edge: dict(attrs) for edge, attrs in found.items() if attrs is not None}
+
+    def has_node(self, node: str) -> bool:
+        """Check if a node exists, from the node cache."""
+        return node in self.get_nodes_attrs([node])
+
+    def get_node_attrs(self, node: str) -> Dict[str, Any]:
+        """Get all attributes of a node, from the node cache."""
+        attrs = self.get_nodes_attrs([node]).get(node)
+        if attrs is None:
+            # Let the backend report a missing node its own way
+            return self._backend.get_node_attrs(node)
+        return attrs
+
+    def has_edge(self, source: str, target: str) -> bool:
+        """Check if an edge exists, from the edge cache."""
+        return (source, target) in self.get_edges_attrs([(source, target)])
+
+    def get_edge_attrs(self, source: str, target: str) -> Dict[str, Any]:
+        """Get all attributes of an edge, from the edge cache."""
+        attrs = self.get_edges_attrs([(source, target)]).get((source, target))
+        if attrs is None:
+            return self._backend.get_edge_attrs(source, target)
+        return attrs
+
+    def get_successors(self, node: str) -> List[str]:
+        """Get all successor nodes of a node, from the adjacency cache."""
+        return self._adjacent("get_successors", node)
+
+    def get_predecessors(self, node: str) -> List[str]:
+        """Get all predecessor nodes of a node, from the adjacency cache."""
+        return self._adjacent("get_predecessors", node)
+
+    def get_neighbors(self, node: str) -> List[str]:
+        """Get the distinct neighbors of a node, from the adjacency cache."""
+        return self._adjacent("get_neighbors", node)
+
+    def get_out_edges(self, node: str) -> List[Tuple[str, str, Dict[str, Any]]]:
+        """Get all outgoing edges of a node, from the adjacency cache."""
+        return [
+            (source, target, dict(attrs))
+            for source, target, attrs in self._adjacent("get_out_edges", node)
+        ]
+
+    def get_in_edges(self, node: str) -> List[Tuple[str, str, Dict[str, Any]]]:
+        """Get all incoming edges of a node, from the adjacency cache."""
+        return [
+            (source, target, dict(attrs))
+            for source, target, attrs in self._adjacent("get_in_edges", node)
+        ]
+
+    def random_walk(self, start_node: str, max_steps: int) -> List[str]:
+        """Walk the graph from a node with the cached adjacency."""
+        return GraphBackend.random_walk(self, start_node, max_steps)
+
+    def add_node(self, node: str, **attrs) -> None:
+        """Add a node with optional attributes, dropping its cached entries."""
+        self._nodes.pop(node)
+        self._backend.add_node(node, **attrs)
+
+    def add_nodes(self, nodes: Iterable[Tuple[str, Dict[str, Any]]]) -> None:
+        """Add or update many nodes at once, dropping their cached entries."""
+        nodes = list(nodes)
+        for node, _ in nodes:
+            self._nodes.pop(node)
+        self._backend.add_nodes(nodes)
+
+    def add_edge(self, source: str, target: str, **attrs) -> None:
+        """Add an edge with optional attributes, dropping its cached entries."""
+        self._invalidate_edge(source, target)
+        self._backend.add_edge(source, target, **attrs)
+
+    def add_edges(self, edges: Iterable[Tuple[str, str, Dict[str, Any]]]) -> None:
+        """Add or update many edges at once, dropping their cached entries."""
+        edges = list(edges)
+        for source, target, _ in edges:
+            self._invalidate_edge(source, target)
+        self._backend.add_edges(edges)
+
+    def remove_node(self, node: str) -> None:
+        """Remove a node and all its edges, dropping their cached entries."""
+        if self.has_node(node):
+            for _, target, _ in self.get_out_edges(node):
+                self._invalidate_edge(node, target)
+            for source, _, _ in self.get_in_edges(node):
+                self._invalidate_edge(source, node)
+        self._invalidate_node(node)
+        self._backend.remove_node(node)
+
+    def merge_nodes(self, groups: MergeGroups) -> None:
+        """Merge groups of nodes, dropping every cached entry."""
+        self._backend.merge_nodes(groups)
+        self.clear_cache()
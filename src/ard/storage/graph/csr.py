@@ -0,0 +1,935 @@
+import random
+from array import array
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+import networkx as nx
+import numpy as np
+
+from ard.storage.graph.base import GraphBackend
+from ard.storage.graph.merge import MergeGroups, merge_edges, plan_merges
+from ard.storage.graph.statistics import GraphStatistics
+
+# Marks edges without a "sources" attribute
+_ABSENT = object()
+
+# Overlay size below which CSRBackend never rebuilds its arrays
+_MIN_OVERLAY = 1024
+
+# Adjacency lists longer than this are scanned with NumPy
+_SCAN_THRESHOLD = 64
+
+
+def csr_neighbors(indptr: np.ndarray, indices: np.ndarray, node: int) -> List[int]:
+    """
+    Get the neighbors of a node from a CSR adjacency.
+
+    Args:
+        indptr (np.ndarray): Offsets of every node's neighbors, of length n + 1
+        indices (np.ndarray): Concatenated neighbor ids
+        node (int): The node id
+
+    Returns:
+        List[int]: The neighbor ids, in storage order
+    """
+    return indices[indptr[node] : indptr[node + 1]].tolist()
+
+
+def bidirectional_shortest_path(
+    source: int,
+    target: int,
+    successors: Callable[[int], Sequence[int]],
+    predecessors: Callable[[int], Sequence[int]],
+) -> Optional[List[int]]:
+    """
+    Find an unweighted shortest path with a breadth-first search from both ends.
+
+    The smaller frontier is expanded one full level at a time, so the first
+    node reached from both sides lies on a shortest path.
+
+    Args:
+        source (int): The source node id
+        target (int): The target node id
+        successors: Function returning the successors of a node id
+        predecessors: Function returning the predecessors of a node id
+
+    Returns:
+        Optional[List[int]]: The node ids on the path, or None if there is none
+    """
+    if source == target:
+        return [source]
+
+    forward_parents: Dict[int, Optional[int]] = {source: None}
+    backward_parents: Dict[int, Optional[int]] = {target: None}
+    forward = [source]
+    backward = [target]
+
+    while forward and backward:
+        if len(forward) <= len(backward):
+            frontier, forward = forward, []
+            for node in frontier:
+                for neighbor in successors(node):
+                    if neighbor not in forward_parents:
+                        forward_parents[neighbor] = node
+                        forward.append(neighbor)
+                    if neighbor in backward_parents:
+                        return _join_paths(forward_parents, backward_parents, neighbor)
+        else:
+            frontier, backward = backward, []
+            for node in frontier:
+                for neighbor in predecessors(node):
+                    if neighbor not in backward_parents:
+                        backward_parents[neighbor] = node
+                        backward.append(neighbor)
+                    if neighbor in forward_parents:
+                        return _join_paths(forward_parents, backward_parents, neighbor)
+    return None
+
+
+def _join_paths(
+    forward_parents: Dict[int, Optional[int]],
+    backward_parents: Dict[int, Optional[int]],
+    meeting: int,
+) -> List[int]:
+    path = []
+    node: Optional[int] = meeting
+    while node is not None:
+        path.append(node)
+        node = forward_parents[node]
+    path.reverse()
+    node = backward_parents[meeting]
+    while node is not None:
+        path.append(node)
+        node = backward_parents[node]
+    return path
+
+
+def _indptr(owners: np.ndarray, num_nodes: int) -> np.ndarray:
+    indptr = np.zeros(num_nodes + 1, dtype=np.int64)
+    np.cumsum(np.bincount(owners, minlength=num_nodes), out=indptr[1:])
+    return indptr
+
+
+class CSRBackend(GraphBackend):
+    """
+    In-memory backend storing the graph as integer-indexed CSR arrays.
+
+    Node names are interned to contiguous integer ids. Edges are kept in
+    parallel arrays of source, target and relation ids, with their "sources"
+    lists and any other attributes in side tables, and adjacency is served
+    from NumPy CSR arrays for outgoing, incoming and undirected neighbors.
+
+    Edges added after the CSR arrays were built are kept in a small overlay and
+    removed nodes leave tombstones; both are folded into the arrays once they
+    grow past a quarter of the graph, so writes stay cheap without slowing
+    down reads. Iteration orders match NetworkXBackend.
+    """
+
+    def __init__(self) -> None:
+        """Initialize a new, empty CSR backend."""
+        self._ids: Dict[str, int] = {}
+        self._names: List[Optional[str]] = []
+        self._node_attrs: List[Optional[Dict[str, Any]]] = []
+        self._removed_nodes = 0
+
+        self._edge_source = array("i")
+        self._edge_target = array("i")
+        self._edge_relation = array("i")
+        self._edge_alive = bytearray()
+        self._edge_sources: List[Any] = []
+        self._edge_extra: Dict[int, Dict[str, Any]] = {}
+        self._relation_names: List[str] = []
+        self._relation_ids: Dict[str, int] = {}
+        self._num_edges = 0
+
+        # Built on first use, then maintained by the integer-level helpers
+        self._statistics: Optional[GraphStatistics] = None
+        self._degrees: Optional[array] = None
+
+        self._build_csr()
+
+    @classmethod
+    def from_networkx(cls, graph: nx.DiGraph) -> "CSRBackend":
+        """
+        Initialize a new CSR backend from a NetworkX graph.
+
+        Args:
+            graph (nx.DiGraph): The graph to copy
+
+        Returns:
+            CSRBackend: New backend instance
+        """
+        backend = cls()
+        backend.add_nodes(graph.nodes(data=True))
+        backend.add_edges(graph.edges(data=True))
+        backend._build_csr()
+        return backend
+
+    @classmethod
+    def from_serializable(cls, data: Dict[str, Any]) -> "CSRBackend":
+        """
+        Initialize a new CSR backend from a serialized dictionary.
+
+        Args:
+            data (Dict[str, Any]): Serialized graph data from to_serializable()
+
+        Returns:
+            CSRBackend: New backend instance
+        """
+        backend = cls()
+        backend.add_nodes(
+            (node_data["id"], node_data.get("attributes", {}))
+            for node_data in data["nodes"]
+        )
+        backend.add_edges(
+            (edge_data["source"], edge_data["target"], edge_data.get("attributes", {}))
+            for edge_data in data["edges"]
+        )
+        backend._build_csr()
+        return backend
+
+    def to_networkx(self) -> nx.DiGraph:
+        """
+        Convert the graph to a NetworkX graph.
+
+        Returns:
+            nx.DiGraph: A graph with the same nodes, edges and attributes
+        """
+        graph = nx.DiGraph()
+        graph.add_nodes_from(self.iter_nodes())
+        graph.add_edges_from(self.iter_edges())
+        return graph
+
+    def to_serializable(self) -> Dict[str, Any]:
+        """
+        Convert the graph to a serializable dictionary.
+
+        Returns:
+            Dict[str, Any]: A serializable representation of the graph
+        """
+        nodes = [{"id": node, "attributes": attrs} for node, attrs in self.iter_nodes()]
+        edges = [
+            {"source": source, "target": target, "attributes": attrs}
+            for source, target, attrs in self.iter_edges()
+        ]
+        return {"nodes": nodes, "edges": edges}
+
+    # CSR maintenance
+
+    def _build_csr(self) -> None:
+        """Fold the overlay and tombstones into freshly built CSR arrays."""
+        dead_edges = len(self._edge_source) - self._num_edges
+        if self._removed_nodes > len(self._names) // 4 or (
+            dead_edges > len(self._edge_source) // 4
+        ):
+            self._compact()
+
+        num_nodes = len(self._names)
+        alive = np.frombuffer(self._edge_alive, dtype=np.bool_)
+        edges = np.flatnonzero(alive).astype(np.int32)
+        sources = np.frombuffer(self._edge_source, dtype=np.int32)[edges]
+        targets = np.frombuffer(self._edge_target, dtype=np.int32)[edges]
+        del alive
+
+        order = np.argsort(sources, kind="stable")
+        out_indptr = _indptr(sources, num_nodes)
+        out_edges = edges[order]
+        out_targets = targets[order]
+
+        order = np.argsort(targets, kind="stable")
+        in_indptr = _indptr(targets, num_nodes)
+        in_edges = edges[order]
+        in_sources = sources[order]
+
+        # Undirected neighbors: the successors followed by the predecessors of
+        # every node, in the order NetworkXBackend.random_walk sees them
+        out_degree = np.diff(out_indptr)
+        in_degree = np.diff(in_indptr)
+        neighbor_indptr = out_indptr + in_indptr
+        neighbors = np.empty(len(edges) * 2, dtype=np.int32)
+        owners = np.repeat(np.arange(num_nodes), out_degree)
+        positions = np.arange(len(edges)) - out_indptr[owners] + neighbor_indptr[owners]
+        neighbors[positions] = out_targets
+        owners = np.repeat(np.arange(num_nodes), in_degree)
+        positions = (
+            np.arange(len(edges))
+            - in_indptr[owners]
+            + neighbor_indptr[owners]
+            + out_degree[owners]
+        )
+        neighbors[positions] = in_sources
+
+        # Memoryviews give fast scalar access to the arrays from Python, while
+        # long adjacency lists are mapped to names with NumPy
+        self._name_array = np.empty(num_nodes, dtype=object)
+        self._name_array[:] = self._names
+        self._out_target_array = out_targets
+        self._in_source_array = in_sources
+        self._neighbor_array = neighbors
+        self._csr_nodes = num_nodes
+        self._csr_edge_limit = len(self._edge_source)
+        self._out_indptr = memoryview(out_indptr)
+        self._out_edges = memoryview(out_edges)
+        self._out_targets = memoryview(out_targets)
+        self._in_indptr = memoryview(in_indptr)
+        self._in_edges = memoryview(in_edges)
+        self._in_sources = memoryview(in_sources)
+        self._neighbor_indptr = memoryview(neighbor_indptr)
+        self._neighbors = memoryview(neighbors)
+
+        self._pending_out: Dict[int, List[int]] = {}
+        self._pending_in: Dict[int, List[int]] = {}
+        self._pending_index: Dict[Tuple[int, int], int] = {}
+        self._pending = 0
+        self._stale = 0
+
+    def _compact(self) -> None:
+        """Renumber nodes and edges to drop removed ones."""
+        live_nodes = [i for i, name in enumerate(self._names) if name is not None]
+        mapping = np.full(len(self._names) + 1, -1, dtype=np.int32)
+        mapping[live_nodes] = np.arange(len(live_nodes), dtype=np.int32)
+
+        self._names = [self._names[i] for i in live_nodes]
+        self._node_attrs = [self._node_attrs[i] for i in live_nodes]
+        self._ids = {name: i for i, name in enumerate(self._names)}
+        self._removed_nodes = 0
+        if self._degrees is not None:
+            degrees = np.frombuffer(self._degrees, dtype=np.int32)[live_nodes]
+            self._degrees = array("i", degrees.tobytes())
+
+        alive = np.frombuffer(self._edge_alive, dtype=np.bool_)
+        edges = np.flatnonzero(alive)
+        sources = mapping[np.frombuffer(self._edge_source, dtype=np.int32)[edges]]
+        targets = mapping[np.frombuffer(self._edge_target, dtype=np.int32)[edges]]
+        relations = np.frombuffer(self._edge_relation, dtype=np.int32)[edges]
+        del alive
+
+        self._edge_source = array("i", sources.tobytes())
+        self._edge_target = array("i", targets.tobytes())
+        self._edge_relation = array("i", relations.tobytes())
+        self._edge_alive = bytearray(b"\x01" * len(edges))
+        edges = edges.tolist()
+        self._edge_sources = [self._edge_sources[edge] for edge in edges]
+        self._edge_extra = {
+            new: self._edge_extra[old]
+            for new, old in enumerate(edges)
+            if old in self._edge_extra
+        }
+
+    def _get_statistics(self) -> GraphStatistics:
+        """Get the maintained statistics, computing them from the columns once."""
+        if self._statistics is None:
+            num_ids = len(self._names)
+            alive = np.frombuffer(self._edge_alive, dtype=np.bool_)
+            sources = np.frombuffer(self._edge_source, dtype=np.int32)[alive]
+            targets = np.frombuffer(self._edge_target, dtype=np.int32)[alive]
+            relations = np.frombuffer(self._edge_relation, dtype=np.int32)[alive]
+            del alive
+
+            degrees = np.bincount(sources, minlength=num_ids) + np.bincount(
+                targets, minlength=num_ids
+            )
+            histogram = np.bincount(degrees)
+            # Removed nodes have no edges left and are not counted
+            if self._removed_nodes:
+                histogram[0] -= self._removed_nodes
+            relation_counts = np.bincount(relations[relations >= 0])
+
+            self._degrees = array("i", degrees.astype(np.int32).tobytes())
+            self._statistics = GraphStatistics(
+                num_nodes=len(self._ids),
+                num_edges=self._num_edges,
+                degree_histogram={
+                    degree: int(count)
+                    for degree, count in enumerate(histogram.tolist())
+                    if count
+                },
+                relation_counts={
+                    self._relation_names[relation]: count
+                    for relation, count in enumerate(relation_counts.tolist())
+                    if count
+                },
+            )
+        return self._statistics
+
+    def _relation_name(self, relation: int) -> Optional[str]:
+        return self._relation_names[relation] if relation >= 0 else None
+
+    def _change_degree(self, node_id: int, delta: int) -> None:
+        degree = self._degrees[node_id]
+        self._statistics.change_degree(degree, degree + delta)
+        self._degrees[node_id] = degree + delta
+
+    def _maybe_build_csr(self) -> None:
+        """Rebuild the CSR arrays once the overlay or tombstones grow too large."""
+        if self._pending + self._stale > max(
+            _MIN_OVERLAY, len(self._out_targets) // 4
+        ) or (self._removed_nodes > max(_MIN_OVERLAY, len(self._names) // 4)):
+            self._build_csr()
+
+    # Integer-level access. These never rebuild the CSR arrays, so ids stay
+    # valid for the duration of a public call.
+
+    def _require_node(self, node: str) -> int:
+        node_id = self._ids.get(node)
+        if node_id is None:
+            raise KeyError(f"Node not found: {node}")
+        return node_id
+
+    def _add_node_id(self, node: str) -> int:
+        node_id = self._ids.get(node)
+        if node_id is None:
+            node_id = self._ids[node] = len(self._names)
+            self._names.append(node)
+            self._node_attrs.append({})
+            if self._statistics is not None:
+                self._statistics.add_node()
+                self._degrees.append(0)
+        return node_id
+
+    def _out_edge_ids(self, node_id: int) -> List[int]:
+        edges = []
+        if node_id < self._csr_nodes:
+            start = self._out_indptr[node_id]
+            end = self._out_indptr[node_id + 1]
+            edges = self._out_edges[start:end].tolist()
+            if self._stale:
+                alive = self._edge_alive
+                edges = [edge for edge in edges if alive[edge]]
+        edges.extend(self._pending_out.get(node_id, ()))
+        return edges
+
+    def _in_edge_ids(self, node_id: int) -> List[int]:
+        edges = []
+        if node_id < self._csr_nodes:
+            start = self._in_indptr[node_id]
+            end = self._in_indptr[node_id + 1]
+            edges = self._in_edges[start:end].tolist()
+            if self._stale:
+                alive = self._edge_alive
+                edges = [edge for edge in edges if alive[edge]]
+        edges.extend(self._pending_in.get(node_id, ()))
+        return edges
+
+    def _successor_ids(self, node_id: int) -> List[int]:
+        if self._stale:
+            target = self._edge_target
+            return [target[edge] for edge in self._out_edge_ids(node_id)]
+        successors = []
+        if node_id < self._csr_nodes:
+            start = self._out_indptr[node_id]
+            successors = self._out_targets[start : self._out_indptr[node_id + 1]]
+            successors = successors.tolist()
+        pending = self._pending_out.get(node_id)
+        if pending:
+            target = self._edge_target
+            successors.extend(target[edge] for edge in pending)
+        return successors
+
+    def _predecessor_ids(self, node_id: int) -> List[int]:
+        if self._stale:
+            source = self._edge_source
+            return [source[edge] for edge in self._in_edge_ids(node_id)]
+        predecessors = []
+        if node_id < self._csr_nodes:
+            start = self._in_indptr[node_id]
+            predecessors = self._in_sources[start : self._in_indptr[node_id + 1]]
+            predecessors = predecessors.tolist()
+        pending = self._pending_in.get(node_id)
+        if pending:
+            source = self._edge_source
+            predecessors.extend(source[edge] for edge in pending)
+        return predecessors
+
+    def _neighbor_ids(self, node_id: int) -> Sequence[int]:
+        """Successors followed by predecessors, with repetitions."""
+        if self._pending or self._stale:
+            return self._successor_ids(node_id) + self._predecessor_ids(node_id)
+        if node_id >= self._csr_nodes:
+            return ()
+        start = self._neighbor_indptr[node_id]
+        return self._neighbors[start : self._neighbor_indptr[node_id + 1]]
+
+    def _find_edge(self, source: int, target: int) -> Optional[int]:
+        edge = self._pending_index.get((source, target))
+        if edge is not None:
+            return edge
+        if source >= self._csr_nodes or target >= self._csr_nodes:
+            return None
+
+        out_start = self._out_indptr[source]
+        out_end = self._out_indptr[source + 1]
+        in_start = self._in_indptr[target]
+        in_end = self._in_indptr[target + 1]
+        # Scan whichever of the two adjacency lists is shorter
+        if out_end - out_start <= in_end - in_start:
+            edges = self._out_edges[out_start:out_end]
+            candidates = self._out_targets[out_start:out_end]
+            wanted = target
+        else:
+            edges = self._in_edges[in_start:in_end]
+            candidates = self._in_sources[in_start:in_end]
+            wanted = source
+
+        if len(candidates) > _SCAN_THRESHOLD:
+            positions = np.flatnonzero(np.asarray(candidates) == wanted).tolist()
+        else:
+            positions = [i for i, node in enumerate(candidates) if node == wanted]
+        for position in positions:
+            edge = edges[position]
+            if self._edge_alive[edge]:
+                return edge
+        return None
+
+    def _new_edge(self, source: int, target: int) -> int:
+        edge = len(self._edge_source)
+        self._edge_source.append(source)
+        self._edge_target.append(target)
+        self._edge_relation.append(-1)
+        self._edge_alive.append(1)
+        self._edge_sources.append(_ABSENT)
+        self._pending_out.setdefault(source, []).append(edge)
+        self._pending_in.setdefault(target, []).append(edge)
+        self._pending_index[(source, target)] = edge
+        self._pending += 1
+        self._num_edges += 1
+        if self._statistics is not None:
+            self._statistics.add_edge(None)
+            self._change_degree(source, 1)
+            self._change_degree(target, 1)
+        return edge
+
+    def _update_edge(self, edge: int, attrs: Dict[str, Any]) -> None:
+        if self._statistics is not None and "relation" in attrs:
+            relation = attrs["relation"]
+            self._statistics.change_relation(
+                self._relation_name(self._edge_relation[edge]),
+                relation if isinstance(relation, str) else None,
+            )
+        for key, value in attrs.items():
+            if key == "relation" and isinstance(value, str):
+                relation = self._relation_ids.get(value)
+                if relation is None:
+                    relation = self._relation_ids[value] = len(self._relation_names)
+                    self._relation_names.append(value)
+                self._edge_relation[edge] = relation
+                extra = self._edge_extra.get(edge)
+                if extra:
+                    extra.pop("relation", None)
+            elif key == "sources":
+                self._edge_sources[edge] = value
+            else:
+                if key == "relation":
+                    self._edge_relation[edge] = -1
+                self._edge_extra.setdefault(edge, {})[key] = value
+
+    def _edge_attrs(self, edge: int) -> Dict[str, Any]:
+        attrs = {}
+        relation = self._edge_relation[edge]
+        if relation >= 0:
+            attrs["relation"] = self._relation_names[relation]
+        sources = self._edge_sources[edge]
+        if sources is not _ABSENT:
+            attrs["sources"] = sources
+        extra = self._edge_extra.get(edge)
+        if extra:
+            attrs.update(extra)
+        return attrs
+
+    def _remove_edge(self, edge: int) -> None:
+        if self._statistics is not None:
+            self._statistics.remove_edge(self._relation_name(self._edge_relation[edge]))
+            self._change_degree(self._edge_source[edge], -1)
+            self._change_degree(self._edge_target[edge], -1)
+        self._edge_alive[edge] = 0
+        self._edge_sources[edge] = _ABSENT
+        self._edge_extra.pop(edge, None)
+        self._num_edges -= 1
+        if edge < self._csr_edge_limit:
+            self._stale += 1
+            return
+
+        source = self._edge_source[edge]
+        target = self._edge_target[edge]
+        self._pending_out[source].remove(edge)
+        self._pending_in[target].remove(edge)
+        del self._pending_index[(source, target)]
+        self._pending -= 1
+
+    # GraphBackend interface
+
+    def add_node(self, node: str, **attrs) -> None:
+        """Add a node with optional attributes."""
+        self._maybe_build_csr()
+        self._node_attrs[self._add_node_id(node)].update(attrs)
+
+    def add_nodes(self, nodes: Iterable[Tuple[str, Dict[str, Any]]]) -> None:
+        """Add or update many nodes at once."""
+        self._maybe_build_csr()
+        for node, attrs in nodes:
+            self._node_attrs[self._add_node_id(node)].update(attrs)
+
+    def has_node(self, node: str) -> bool:
+        """Check if a node exists."""
+        return node in self._ids
+
+    def add_edge(self, source: str, target: str, **attrs) -> None:
+        """Add an edge with optional attributes, creating missing nodes."""
+        self.add_edges([(source, target, attrs)])
+
+    def add_edges(self, edges: Iterable[Tuple[str, str, Dict[str, Any]]]) -> None:
+        """Add or update many edges at once, creating missing nodes."""
+        for source, target, attrs in edges:
+            self._maybe_build_csr()
+            source_id = self._add_node_id(source)
+            target_id = self._add_node_id(target)
+            edge = self._find_edge(source_id, target_id)
+            if edge is None:
+                edge = self._new_edge(source_id, target_id)
+            self._update_edge(edge, attrs)
+
+    def has_edge(self, source: str, target: str) -> bool:
+        """Check if an edge exists."""
+        source_id = self._ids.get(source)
+        target_id = self._ids.get(target)
+        if source_id is None or target_id is None:
+            return False
+        return self._find_edge(source_id, target_id) is not None
+
+    def get_node_attrs(self, node: str) -> Dict[str, Any]:
+        """Get all attributes of a node."""
+        return dict(self._node_attrs[self._require_node(node)])
+
+    def get_edge_attrs(self, source: str, target: str) -> Dict[str, Any]:
+        """Get all attributes of an edge."""
+        edge = self._find_edge(self._require_node(source), self._require_node(target))
+        if edge is None:
+            raise KeyError(f"Edge not found: ({source}, {target})")
+        return self._edge_attrs(edge)
+
+    def get_nodes(self) -> Set[str]:
+        """Get all nodes in the graph."""
+        return set(self._ids)
+
+    def sample_nodes(self, k: int, rng: Optional[random.Random] = None) -> List[str]:
+        """
+        Pick k nodes uniformly at random, with replacement.
+
+        Ids are drawn from the dense id range and ids of removed nodes are
+        redrawn. Once removed nodes outnumber live ones the ids are compacted
+        first, so every node takes fewer than two draws on average.
+        """
+        if not self._ids:
+            return []
+        if self._removed_nodes * 2 > len(self._names):
+            self._build_csr()
+
+        rng = rng or random
+        names = self._names
+        num_ids = len(names)
+        sample = []
+        while len(sample) < k:
+            name = names[rng.randrange(num_ids)]
+            if name is not None:
+                sample.append(name)
+        return sample
+
+    def get_edges(self) -> List[Tuple[str, str, Dict[str, Any]]]:
+        """Get all edges in the graph with their attributes."""
+        return list(self.iter_edges())
+
+    @property
+    def native_edge_arrays(self) -> bool:
+        """Edge arrays are slices of the CSR buffers."""
+        return True
+
+    def edge_arrays(self) -> Tuple[List[str], np.ndarray, np.ndarray]:
+        """Get the edges as arrays of node ids, renumbered without removed nodes."""
+        alive = np.frombuffer(self._edge_alive, dtype=np.bool_)
+        sources = np.frombuffer(self._edge_source, dtype=np.int32)[alive]
+        targets = np.frombuffer(self._edge_target, dtype=np.int32)[alive]
+        del alive
+        if not self._removed_nodes:
+            return list(self._names), sources, targets
+
+        live_nodes = [i for i, name in enumerate(self._names) if name is not None]
+        mapping = np.full(len(self._names), -1, dtype=np.int32)
+        mapping[live_nodes] = np.arange(len(live_nodes), dtype=np.int32)
+        names = [self._names[i] for i in live_nodes]
+        return names, mapping[sources], mapping[targets]
+
+    def get_edges_by_relation(
+        self, relation: str
+    ) -> List[Tuple[str, str, Dict[str, Any]]]:
+        """
+        Get all edges with the given relation.
+
+        The interned relation column serves as the index: matching edge ids are
+        found with a single vectorized comparison.
+        """
+        relation_id = self._relation_ids.get(relation)
+        if relation_id is None:
+            return []
+        relations = np.frombuffer(self._edge_relation, dtype=np.int32)
+        alive = np.frombuffer(self._edge_alive, dtype=np.bool_)
+        edges = np.flatnonzero((relations == relation_id) & alive).tolist()
+        del relations, alive
+
+        names = self._names
+        source = self._edge_source
+        target = self._edge_target
+        return [
+            (names[source[edge]], names[target[edge]], self._edge_attrs(edge))
+            for edge in edges
+        ]
+
+    def get_relation_types(self) -> Set[str]:
+        """Get the relations of the edges in the graph."""
+        return self._get_statistics().relation_types
+
+    def get_statistics(self) -> GraphStatistics:
+        """Get the statistics of the graph, maintained on every change."""
+        return self._get_statistics().copy()
+
+    def iter_nodes(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Iterate over all nodes with their attributes, in insertion order."""
+        for name, attrs in zip(self._names, self._node_attrs):
+            if name is not None:
+                yield name, attrs
+
+    def iter_edges(self) -> Iterator[Tuple[str, str, Dict[str, Any]]]:
+        """Iterate over all edges with their attributes, grouped by source."""
+        if self._pending or self._stale:
+            self._build_csr()
+        names = self._names
+        out_indptr = np.asarray(self._out_indptr)
+        owners = np.repeat(np.arange(self._csr_nodes), np.diff(out_indptr))
+        for source, edge, target in zip(
+            owners.tolist(), self._out_edges.tolist(), self._out_targets.tolist()
+        ):
+            yield names[source], names[target], self._edge_attrs(edge)
+
+    def _adjacent_names(
+        self, node: str, indptr: memoryview, ids: memoryview, values: np.ndarray
+    ) -> Optional[List[str]]:
+        """Map an adjacency list straight from the CSR arrays to names, if clean."""
+        node_id = self._ids.get(node)
+        if self._pending or self._stale or node_id is None:
+            return None
+        if node_id >= self._csr_nodes:
+            return []
+        start = indptr[node_id]
+        end = indptr[node_id + 1]
+        if end - start > _SCAN_THRESHOLD:
+            return self._name_array[values[start:end]].tolist()
+        names = self._names
+        return [names[i] for i in ids[start:end].tolist()]
+
+    def get_successors(self, node: str) -> List[str]:
+        """Get all successor nodes of a node."""
+        successors = self._adjacent_names(
+            node, self._out_indptr, self._out_targets, self._out_target_array
+        )
+        if successors is not None:
+            return successors
+        names = self._names
+        return [names[i] for i in self._successor_ids(self._require_node(node))]
+
+    def get_predecessors(self, node: str) -> List[str]:
+        """Get all predecessor nodes of a node."""
+        predecessors = self._adjacent_names(
+            node, self._in_indptr, self._in_sources, self._in_source_array
+        )
+        if predecessors is not None:
+            return predecessors
+        names = self._names
+        return [names[i] for i in self._predecessor_ids(self._require_node(node))]
+
+    def get_neighbors(self, node: str) -> List[str]:
+        """Get the distinct successors and predecessors of a node."""
+        neighbors = self._adjacent_names(
+            node, self._neighbor_indptr, self._neighbors, self._neighbor_array
+        )
+        if neighbors is not None:
+            return list(set(neighbors))
+        names = self._names
+        neighbors = self._neighbor_ids(self._require_node(node))
+        return [names[i] for i in dict.fromkeys(neighbors)]
+
+    def random_walk(self, start_node: str, max_steps: int) -> List[str]:
+        """
+        Walk the graph from a node, ignoring edge direction.
+
+        Walks are taken over integer ids and make the same random.choice calls
+        as GraphBackend.random_walk, so a seeded walk visits the same nodes as it
+        would on NetworkXBackend.
+        """
+        self._maybe_build_csr()
+        current = self._require_node(start_node)
+        visited = [current]
+        for _ in range(max_steps):
+            neighbors = self._neighbor_ids(current)
+            if not neighbors:
+                break
+            current = random.choice(neighbors)
+            visited.append(current)
+
+        names = self._names
+        return [names[i] for i in visited]
+
+    def get_out_edges(self, node: str) -> List[Tuple[str, str, Dict[str, Any]]]:
+        """Get all outgoing edges of a node with their attributes."""
+        names = self._names
+        target = self._edge_target
+        return [
+            (node, names[target[edge]], self._edge_attrs(edge))
+            for edge in self._out_edge_ids(self._require_node(node))
+        ]
+
+    def get_in_edges(self, node: str) -> List[Tuple[str, str, Dict[str, Any]]]:
+        """Get all incoming edges of a node with their attributes."""
+        names = self._names
+        source = self._edge_source
+        return [
+            (names[source[edge]], node, self._edge_attrs(edge))
+            for edge in self._in_edge_ids(self._require_node(node))
+        ]
+
+    def remove_node(self, node: str) -> None:
+        """Remove a node and all its edges."""
+        self._maybe_build_csr()
+        node_id = self._require_node(node)
+        edges = self._out_edge_ids(node_id) + self._in_edge_ids(node_id)
+        for edge in dict.fromkeys(edges):
+            self._remove_edge(edge)
+
+        del self._ids[node]
+        self._names[node_id] = None
+        self._node_attrs[node_id] = None
+        self._removed_nodes += 1
+        if self._statistics is not None:
+            self._statistics.remove_node(0)
+
+    def merge_nodes(self, groups: MergeGroups) -> None:
+        """
+        Merge groups of nodes, each into a single node, in one pass.
+
+        Edges are read by id, the edges of merged nodes are dropped and the
+        merged edges written straight to the edge columns, and the CSR arrays
+        are rebuilt once at the end. The statistics are recomputed on next use.
+        """
+        self._maybe_build_csr()
+        ids = self._ids
+        names = self._names
+        plan = plan_merges(
+            groups, ids.__contains__, lambda node: self._node_attrs[ids[node]]
+        )
+        if not plan.steps:
+            return
+        dropped: Dict[int, None] = {}
+        kept: Dict[Tuple[str, str], int] = {}
+
+        def incident_edges(node: str):
+            node_id = ids[node]
+            out_edges = self._out_edge_ids(node_id)
+            in_edges = self._in_edge_ids(node_id)
+            dropped.update(dict.fromkeys(out_edges + in_edges))
+            source = self._edge_source
+            target = self._edge_target
+            return (
+                (
+                    (node, names[target[edge]], self._edge_attrs(edge))
+                    for edge in out_edges
+                ),
+                (
+                    (names[source[edge]], node, self._edge_attrs(edge))
+                    for edge in in_edges
+                ),
+            )
+
+        def edge_attrs(source: str, target: str) -> Optional[Dict[str, Any]]:
+            source_id = ids.get(source)
+            target_id = ids.get(target)
+            if source_id is None or target_id is None:
+                return None
+            edge = self._find_edge(source_id, target_id)
+            if edge is None:
+                return None
+            kept[source, target] = edge
+            return self._edge_attrs(edge)
+
+        edges = merge_edges(plan, incident_edges, edge_attrs)
+
+        self._statistics = None
+        self._degrees = None
+        for edge in dropped:
+            self._edge_alive[edge] = 0
+            self._edge_sources[edge] = _ABSENT
+            self._edge_extra.pop(edge, None)
+        self._num_edges -= len(dropped)
+        for node in plan.relabel:
+            node_id = ids.pop(node)
+            names[node_id] = None
+            self._node_attrs[node_id] = None
+        self._removed_nodes += len(plan.relabel)
+
+        for node, attrs in plan.nodes.items():
+            self._node_attrs[self._add_node_id(node)].update(attrs)
+        for (source, target), attrs in edges.items():
+            edge = kept.get((source, target))
+            if edge is None:
+                edge = self._new_edge(ids[source], ids[target])
+            self._update_edge(edge, attrs)
+        self._build_csr()
+
+    def number_of_edges(self) -> int:
+        """Get the total number of edges in the graph."""
+        return self._num_edges
+
+    def shortest_path(
+        self, source: str, target: str, directed: bool = True
+    ) -> List[str]:
+        """
+        Get the shortest path between two nodes.
+
+        Raises:
+            nx.NodeNotFound: If either node is not in the graph
+            nx.NetworkXNoPath: If there is no path between the nodes
+        """
+        self._maybe_build_csr()
+        for node in (source, target):
+            if node not in self._ids:
+                raise nx.NodeNotFound(f"Node {node} not in graph")
+
+        if directed:
+            path = bidirectional_shortest_path(
+                self._ids[source],
+                self._ids[target],
+                self._successor_ids,
+                self._predecessor_ids,
+            )
+        else:
+            path = bidirectional_shortest_path(
+                self._ids[source],
+                self._ids[target],
+                self._neighbor_ids,
+                self._neighbor_ids,
+            )
+        if path is None:
+            raise nx.NetworkXNoPath(f"No path between {source} and {target}.")
+        names = self._names
+        return [names[i] for i in path]
+
+    def __len__(self) -> int:
+        """Get the total number of nodes in the graph."""
+        return len(self._ids)
@@ -0,0 +1,710 @@
+"""
+Compact binary file format for knowledge graphs.
+
+A graph file is a section file (see ard.utils.section_file) with the following
+sections, all indexed by integer node ids assigned in insertion order:
+
+- strings.offsets / strings.data: interned table of relation names, provenance
+  keys and string values, and JSON-encoded extra attributes
+- node_names.offsets / node_names.data: the name of every node
+- nodes.flags, nodes.extra, nodes.prov_indptr: per-node attribute layout, the
+  string id of any extra attributes and the node's provenance rows
+- node_names.sorted: node ids ordered by name, to look nodes up by name
+- edges.indptr, edges.target: outgoing adjacency in CSR form
+- edges.relation, edges.flags, edges.extra, edges.prov_start, edges.prov_count:
+  per-edge attributes, in the same order as edges.target
+- edges.in_indptr, edges.in_source, edges.in_edge: incoming adjacency in CSR
+  form, with the position of every edge in the outgoing arrays
+- node_sources.* / edge_sources.*: provenance stored column by column, one
+  row per entry of a "sources" list
+
+Provenance columns hold a kind code and a 64-bit value per row, where the value
+is either an integer, the bits of a float or a string id. The keys present in
+each row are given by its layout, so rows keep their original key order.
+"""
+
+import json
+import struct
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+from ard.utils.section_file import (
+    SectionFileReader,
+    SectionFileWriter,
+    StringTable,
+    StringTableBuilder,
+)
+
+Strings = Union[np.ndarray, StringTable]
+
+GRAPH_FILE_KIND = "ard.knowledge_graph"
+GRAPH_FILE_VERSION = 1
+GRAPH_FILE_EXTENSION = ".kgb"
+
+DEFAULT_CHUNK_SIZE = 65_536
+
+# Attribute flags
+HAS_SOURCES = 1
+HAS_RELATION = 2
+
+# Provenance value kinds
+KIND_ABSENT = 0
+KIND_STR = 1
+KIND_INT = 2
+KIND_FLOAT = 3
+KIND_TRUE = 4
+KIND_FALSE = 5
+KIND_NONE = 6
+KIND_JSON = 7
+
+_INT64_MIN = -(2**63)
+_INT64_MAX = 2**63 - 1
+_DOUBLE = struct.Struct("<d")
+_INT64 = struct.Struct("<q")
+
+
+def is_graph_file(filename: str) -> bool:
+    """Check if a filename uses the binary graph file extension."""
+    return str(filename).lower().endswith(GRAPH_FILE_EXTENSION)
+
+
+class _ProvenanceWriter:
+    """Columnar writer for the rows of "sources" lists."""
+
+    def __init__(
+        self,
+        writer: SectionFileWriter,
+        prefix: str,
+        strings: StringTableBuilder,
+        chunk_size: int,
+    ) -> None:
+        self._writer = writer
+        self._prefix = prefix
+        self._strings = strings
+        self._chunk_size = chunk_size
+
+        self._keys: List[str] = []
+        self._columns: Dict[str, int] = {}
+        self._layouts: Dict[Tuple[str, ...], Tuple[int, List[int]]] = {}
+
+        self._layout_spool = writer.spool(f"{prefix}.layout", np.int32)
+        self._kind_spools: List[Any] = []
+        self._value_spools: List[Any] = []
+
+        self._layout_buf: List[int] = []
+        self._kind_bufs: List[List[int]] = []
+        self._value_bufs: List[List[int]] = []
+        self.rows = 0
+
+    def _add_column(self, key: str) -> int:
+        column = len(self._keys)
+        self._keys.append(key)
+        self._columns[key] = column
+
+        kinds = self._writer.spool(f"{self._prefix}.{column}.kind", np.uint8)
+        values = self._writer.spool(f"{self._prefix}.{column}.value", np.int64)
+        flushed = self.rows - len(self._layout_buf)
+        kinds.append(np.zeros(flushed, dtype=np.uint8))
+        values.append(np.zeros(flushed, dtype=np.int64))
+        self._kind_spools.append(kinds)
+        self._value_spools.append(values)
+        self._kind_bufs.append([KIND_ABSENT] * self._chunk_size)
+        self._value_bufs.append([0] * self._chunk_size)
+        return column
+
+    def _encode(self, value: Any) -> Tuple[int, int]:
+        value_type = type(value)
+        if value_type is str:
+            return KIND_STR, self._strings.intern(value)
+        if value_type is bool:
+            return (KIND_TRUE if value else KIND_FALSE), 0
+        if value_type is int and _INT64_MIN <= value <= _INT64_MAX:
+            return KIND_INT, value
+        if value_type is float:
+            return KIND_FLOAT, _INT64.unpack(_DOUBLE.pack(value))[0]
+        if value is None:
+            return KIND_NONE, 0
+        return KIND_JSON, self._strings.intern(json.dumps(value))
+
+    def add(self, row: Dict[str, Any]) -> None:
+        """Append one provenance row."""
+        layout_key = tuple(row)
+        layout = self._layouts.get(layout_key)
+        if layout is None:
+            columns = [
+                self._columns[key] if key in self._columns else self._add_column(key)
+                for key in layout_key
+            ]
+            layout = self._layouts[layout_key] = (len(self._layouts), columns)
+
+        index = len(self._layout_buf)
+        self._layout_buf.append(layout[0])
+        kind_bufs = self._kind_bufs
+        value_bufs = self._value_bufs
+        string_ids = self._strings.ids
+        for column, value in zip(layout[1], row.values()):
+            # Strings are by far the most common values, so they skip _encode
+            if type(value) is str:
+                encoded = string_ids.get(value)
+                if encoded is None:
+                    encoded = self._strings.intern(value)
+                kind_bufs[column][index] = KIND_STR
+            else:
+                kind_bufs[column][index], encoded = self._encode(value)
+            value_bufs[column][index] = encoded
+
+        self.rows += 1
+        if index + 1 == self._chunk_size:
+            self._flush()
+
+    def _flush(self) -> None:
+        count = len(self._layout_buf)
+        if not count:
+            return
+        self._layout_spool.append(self._layout_buf)
+        self._layout_buf = []
+        for column in range(len(self._keys)):
+            self._kind_spools[column].append(self._kind_bufs[column][:count])
+            self._value_spools[column].append(self._value_bufs[column][:count])
+            self._kind_bufs[column] = [KIND_ABSENT] * self._chunk_size
+            self._value_bufs[column] = [0] * self._chunk_size
+
+    def close(self) -> Dict[str, Any]:
+        """Flush buffered rows and return the metadata needed to decode them."""
+        self._flush()
+        return {
+            "keys": self._keys,
+            "layouts": [columns for _, columns in self._layouts.values()],
+        }
+
+
+class GraphFileWriter:
+    """
+    Streaming writer for the binary graph file format.
+
+    Nodes and edges are encoded as they are added and spooled to temporary files,
+    so memory use stays bounded by the interned strings and the node id index.
+    Edges are sorted by source node when the file is closed.
+
+    Usage:
+        with GraphFileWriter("graph.kgb", config) as writer:
+            for node, attrs in nodes:
+                writer.add_node(node, attrs)
+            for source, target, attrs in edges:
+                writer.add_edge(source, target, attrs)
+    """
+
+    def __init__(
+        self,
+        path: str,
+        config: Optional[Dict[str, Any]] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> None:
+        """
+        Initialize a GraphFileWriter.
+
+        Args:
+            path (str): Path of the file to write
+            config (Optional[Dict[str, Any]]): Knowledge graph configuration to store
+            chunk_size (int): Number of rows buffered in memory per column
+        """
+        self._file = SectionFileWriter(path, GRAPH_FILE_KIND, GRAPH_FILE_VERSION)
+        self._file.meta["config"] = config or {}
+        self._chunk_size = chunk_size
+
+        self._strings = StringTableBuilder(self._file, "strings")
+        self._node_names = StringTableBuilder(self._file, "node_names")
+        self._node_ids: Dict[str, int] = {}
+
+        self._node_flags = self._file.spool("nodes.flags", np.uint8)
+        self._node_extra = self._file.spool("nodes.extra", np.int64)
+        self._node_prov_indptr = self._file.spool("nodes.prov_indptr", np.int64)
+        self._node_prov_indptr.append([0])
+        self._node_sources = _ProvenanceWriter(
+            self._file, "node_sources", self._strings, chunk_size
+        )
+
+        self._edge_source = self._file.spool("edges.source", np.int32)
+        self._edge_target = self._file.spool("edges.target", np.int32)
+        self._edge_relation = self._file.spool("edges.relation", np.int32)
+        self._edge_flags = self._file.spool("edges.flags", np.uint8)
+        self._edge_extra = self._file.spool("edges.extra", np.int64)
+        self._edge_prov_start = self._file.spool("edges.prov_start", np.int64)
+        self._edge_prov_count = self._file.spool("edges.prov_count", np.int32)
+        self._edge_sources = _ProvenanceWriter(
+            self._file, "edge_sources", self._strings, chunk_size
+        )
+
+        self._node_buf: Tuple[List[int], List[int], List[int]] = ([], [], [])
+        self._edge_buf: Tuple[List[int], ...] = ([], [], [], [], [], [], [])
+
+    def __enter__(self) -> "GraphFileWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self._file.abort()
+
+    def _split_sources(
+        self, attrs: Dict[str, Any], provenance: _ProvenanceWriter
+    ) -> Tuple[int, Dict[str, Any]]:
+        """Write the "sources" of an attribute dict and return the remainder."""
+        sources = attrs.get("sources")
+        if not isinstance(sources, list) or not all(
+            isinstance(source, dict) for source in sources
+        ):
+            return 0, attrs
+        for source in sources:
+            provenance.add(source)
+        return HAS_SOURCES, {k: v for k, v in attrs.items() if k != "sources"}
+
+    def add_node(self, node: str, attrs: Dict[str, Any]) -> None:
+        """
+        Add a node.
+
+        Args:
+            node (str): The node name
+            attrs (Dict[str, Any]): The node attributes
+
+        Raises:
+            ValueError: If the node was already added
+        """
+        if node in self._node_ids:
+            raise ValueError(f"Duplicate node: {node}")
+        self._node_ids[node] = self._node_names.add(node)
+
+        flags, extra = self._split_sources(attrs, self._node_sources)
+        flags_buf, extra_buf, indptr_buf = self._node_buf
+        flags_buf.append(flags)
+        extra_buf.append(self._strings.add(json.dumps(extra)) if extra else -1)
+        indptr_buf.append(self._node_sources.rows)
+        if len(flags_buf) >= self._chunk_size:
+            self._flush_nodes()
+
+    def add_edge(self, source: str, target: str, attrs: Dict[str, Any]) -> None:
+        """
+        Add an edge between two nodes that were already added.
+
+        Args:
+            source (str): The source node name
+            target (str): The target node name
+            attrs (Dict[str, Any]): The edge attributes
+
+        Raises:
+            ValueError: If either node was not added
+        """
+        for node in (source, target):
+            if node not in self._node_ids:
+                raise ValueError(f"Edge references unknown node: {node}")
+
+        relation = attrs.get("relation")
+        if isinstance(relation, str):
+            relation_id = self._strings.intern(relation)
+            attrs = {k: v for k, v in attrs.items() if k != "relation"}
+            relation_flag = HAS_RELATION
+        else:
+            relation_id = -1
+            relation_flag = 0
+
+        prov_start = self._edge_sources.rows
+        flags, extra = self._split_sources(attrs, self._edge_sources)
+
+        buf = self._edge_buf
+        buf[0].append(self._node_ids[source])
+        buf[1].append(self._node_ids[target])
+        buf[2].append(relation_id)
+        buf[3].append(flags | relation_flag)
+        buf[4].append(self._strings.add(json.dumps(extra)) if extra else -1)
+        buf[5].append(prov_start)
+        buf[6].append(self._edge_sources.rows - prov_start)
+        if len(buf[0]) >= self._chunk_size:
+            self._flush_edges()
+
+    def _flush_nodes(self) -> None:
+        flags, extra, indptr = self._node_buf
+        self._node_flags.append(flags)
+        self._node_extra.append(extra)
+        self._node_prov_indptr.append(indptr)
+        self._node_buf = ([], [], [])
+
+    def _flush_edges(self) -> None:
+        spools = (
+            self._edge_source,
+            self._edge_target,
+            self._edge_relation,
+            self._edge_flags,
+            self._edge_extra,
+            self._edge_prov_start,
+            self._edge_prov_count,
+        )
+        for spool, values in zip(spools, self._edge_buf):
+            spool.append(values)
+        self._edge_buf = ([], [], [], [], [], [], [])
+
+    def close(self) -> None:
+        """Sort the edges into CSR order and finalize the file."""
+        self._flush_nodes()
+        self._flush_edges()
+
+        num_nodes = len(self._node_ids)
+        sources = self._edge_source.read()
+        order = np.argsort(sources, kind="stable")
+        indptr = np.zeros(num_nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=num_nodes), out=indptr[1:])
+        self._file.write_array("edges.indptr", indptr)
+        self._file.discard(self._edge_source)
+
+        targets = self._edge_target.read()[order]
+        self._file.write_array("edges.target", targets)
+        self._file.discard(self._edge_target)
+        for spool in (
+            self._edge_relation,
+            self._edge_flags,
+            self._edge_extra,
+            self._edge_prov_start,
+            self._edge_prov_count,
+        ):
+            self._file.write_array(spool.name, spool.read()[order])
+            self._file.discard(spool)
+
+        in_order = np.argsort(targets, kind="stable")
+        in_indptr = np.zeros(num_nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(targets, minlength=num_nodes), out=in_indptr[1:])
+        self._file.write_array("edges.in_indptr", in_indptr)
+        self._file.write_array("edges.in_source", sources[order][in_order])
+        self._file.write_array("edges.in_edge", in_order, dtype=np.int64)
+
+        # Python orders strings by code point, which matches UTF-8 byte order
+        node_ids = self._node_ids
+        self._file.write_array(
+            "node_names.sorted", [node_ids[name] for name in sorted(node_ids)], np.int32
+        )
+
+        self._file.meta.update(
+            {
+                "num_nodes": num_nodes,
+                "num_edges": int(len(sources)),
+                "provenance": {
+                    "node_sources": self._node_sources.close(),
+                    "edge_sources": self._edge_sources.close(),
+                },
+            }
+        )
+        self._file.close()
+
+
+def write_graph_file(
+    path: str,
+    nodes: Iterable[Tuple[str, Dict[str, Any]]],
+    edges: Iterable[Tuple[str, str, Dict[str, Any]]],
+    config: Optional[Dict[str, Any]] = None,
+) -> None:
+    """
+    Write a graph to a binary graph file.
+
+    Args:
+        path (str): Path of the file to write
+        nodes: Iterable of (node, attributes) pairs
+        edges: Iterable of (source, target, attributes) tuples
+        config (Optional[Dict[str, Any]]): Knowledge graph configuration to store
+    """
+    with GraphFileWriter(path, config) as writer:
+        for node, attrs in nodes:
+            writer.add_node(node, attrs)
+        for source, target, attrs in edges:
+            writer.add_edge(source, target, attrs)
+
+
+class _ProvenanceReader:
+    """Decoder for the columnar provenance rows written by _ProvenanceWriter."""
+
+    def __init__(
+        self, file: SectionFileReader, prefix: str, meta: Dict[str, Any]
+    ) -> None:
+        self._file = file
+        self._prefix = prefix
+        keys = meta["keys"]
+        self._layouts = [
+            [(keys[column], column) for column in layout] for layout in meta["layouts"]
+        ]
+        self._num_columns = len(keys)
+
+    def _decode_column(
+        self, column: int, start: int, stop: int, strings: Strings
+    ) -> np.ndarray:
+        """Decode the values of one column into an object array."""
+        kinds = self._file.array(f"{self._prefix}.{column}.kind", start, stop)
+        values = self._file.array(f"{self._prefix}.{column}.value", start, stop)
+        decoded = np.empty(len(kinds), dtype=object)
+        for kind in np.unique(kinds).tolist():
+            mask = kinds == kind
+            if kind == KIND_STR and isinstance(strings, np.ndarray):
+                decoded[mask] = strings[values[mask]]
+            elif kind == KIND_STR:
+                for index in np.flatnonzero(mask).tolist():
+                    decoded[index] = strings[values[index]]
+            elif kind == KIND_INT:
+                decoded[mask] = values[mask].astype(object)
+            elif kind == KIND_FLOAT:
+                decoded[mask] = values[mask].view(np.float64).astype(object)
+            elif kind == KIND_TRUE:
+                decoded[mask] = True
+            elif kind == KIND_FALSE:
+                decoded[mask] = False
+            elif kind == KIND_JSON:
+                for index in np.flatnonzero(mask).tolist():
+                    decoded[index] = json.loads(strings[values[index]])
+        return decoded
+
+    def rows(self, start: int, stop: int, strings: Strings) -> List[Dict[str, Any]]:
+        """
+        Decode a contiguous range of rows.
+
+        Columns are decoded one at a time and rows are then assembled per
+        layout, which keeps the per-value work in NumPy.
+
+        Args:
+            start (int): First row
+            stop (int): End of the range
+            strings (Strings): The decoded string table as an object array, or
+                a lazily decoded StringTable
+
+        Returns:
+            List[Dict[str, Any]]: The decoded rows
+        """
+        if start >= stop:
+            return []
+        layouts = self._file.array(f"{self._prefix}.layout", start, stop)
+        columns = [
+            self._decode_column(column, start, stop, strings)
+            for column in range(self._num_columns)
+        ]
+
+        present = np.unique(layouts).tolist()
+        if len(present) == 1:
+            fields = self._layouts[present[0]]
+            if not fields:
+                return [{} for _ in range(stop - start)]
+            keys = [key for key, _ in fields]
+            values = [columns[column].tolist() for _, column in fields]
+            return [dict(zip(keys, row)) for row in zip(*values)]
+
+        rows: List[Any] = [None] * (stop - start)
+        for layout in present:
+            indices = np.flatnonzero(layouts == layout)
+            fields = self._layouts[layout]
+            if not fields:
+                for index in indices.tolist():
+                    rows[index] = {}
+                continue
+            keys = [key for key, _ in fields]
+            values = [columns[column][indices].tolist() for _, column in fields]
+            for index, row in zip(indices.tolist(), zip(*values)):
+                rows[index] = dict(zip(keys, row))
+        return rows
+
+
+class GraphFileReader:
+    """
+    Streaming reader for the binary graph file format.
+
+    Nodes and edges are decoded chunk by chunk, so loading a graph never holds
+    more than one chunk of intermediate data besides the string tables.
+    """
+
+    def __init__(
+        self, path: str, mmap: bool = False, chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> None:
+        """
+        Open a graph file.
+
+        Args:
+            path (str): Path of the file
+            mmap (bool): Whether to memory-map the file instead of reading sections
+            chunk_size (int): Number of nodes or edges decoded at a time
+
+        Raises:
+            FileNotFoundError: If the file doesn't exist
+            ValueError: If the file is not a graph file or has an unsupported version
+        """
+        self._file = SectionFileReader(path, kind=GRAPH_FILE_KIND, mmap=mmap)
+        if self._file.version > GRAPH_FILE_VERSION:
+            raise ValueError(
+                f"Unsupported graph file version {self._file.version}: {path}"
+            )
+        meta = self._file.meta
+        self.config: Dict[str, Any] = meta["config"]
+        self.num_nodes: int = meta["num_nodes"]
+        self.num_edges: int = meta["num_edges"]
+        self.chunk_size = chunk_size
+        self._node_sources = _ProvenanceReader(
+            self._file, "node_sources", meta["provenance"]["node_sources"]
+        )
+        self._edge_sources = _ProvenanceReader(
+            self._file, "edge_sources", meta["provenance"]["edge_sources"]
+        )
+        self._strings: Optional[np.ndarray] = None
+        self._string_table = self._file.strings("strings")
+        self._node_names: Optional[List[str]] = None
+
+    @property
+    def file(self) -> SectionFileReader:
+        """Get the underlying section file."""
+        return self._file
+
+    @property
+    def strings(self) -> np.ndarray:
+        """Get the decoded string table, as an object array indexed by string id."""
+        if self._strings is None:
+            strings = self._file.strings("strings").to_list()
+            self._strings = np.empty(len(strings), dtype=object)
+            self._strings[:] = strings
+        return self._strings
+
+    @property
+    def node_names(self) -> List[str]:
+        """Get the names of all nodes, indexed by node id."""
+        if self._node_names is None:
+            self._node_names = self._file.strings("node_names").to_list()
+        return self._node_names
+
+    def _attrs(
+        self,
+        flags: int,
+        extra: int,
+        sources: Optional[List[Dict[str, Any]]],
+        strings: Strings,
+    ) -> Dict[str, Any]:
+        attrs = {}
+        if flags & HAS_SOURCES:
+            attrs["sources"] = sources
+        if extra >= 0:
+            attrs.update(json.loads(strings[extra]))
+        return attrs
+
+    def node_attrs(self, node_id: int) -> Dict[str, Any]:
+        """
+        Decode the attributes of a single node.
+
+        Only the strings the node refers to are decoded, which makes this cheap
+        on a memory-mapped file.
+
+        Args:
+            node_id (int): The node id
+
+        Returns:
+            Dict[str, Any]: The node attributes
+        """
+        strings = self._strings if self._strings is not None else self._string_table
+        first, last = self._file.array("nodes.prov_indptr", node_id, node_id + 2)
+        sources = self._node_sources.rows(int(first), int(last), strings)
+        return self._attrs(
+            int(self._file.array("nodes.flags", node_id, node_id + 1)[0]),
+            int(self._file.array("nodes.extra", node_id, node_id + 1)[0]),
+            sources,
+            strings,
+        )
+
+    def edge_attrs(self, position: int) -> Dict[str, Any]:
+        """
+        Decode the attributes of a single edge.
+
+        Args:
+            position (int): The position of the edge in the outgoing CSR arrays
+
+        Returns:
+            Dict[str, Any]: The edge attributes
+        """
+        strings = self._strings if self._strings is not None else self._string_table
+        stop = position + 1
+        flags = int(self._file.array("edges.flags", position, stop)[0])
+        first = int(self._file.array("edges.prov_start", position, stop)[0])
+        count = int(self._file.array("edges.prov_count", position, stop)[0])
+        attrs = {}
+        if flags & HAS_RELATION:
+            relation = self._file.array("edges.relation", position, stop)[0]
+            attrs["relation"] = strings[int(relation)]
+        attrs.update(
+            self._attrs(
+                flags,
+                int(self._file.array("edges.extra", position, stop)[0]),
+                self._edge_sources.rows(first, first + count, strings),
+                strings,
+            )
+        )
+        return attrs
+
+    def iter_nodes(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Iterate over all nodes with their attributes, in insertion order.
+
+        Yields:
+            Tuple[str, Dict[str, Any]]: (node, attributes) pairs
+        """
+        names = self.node_names
+        strings = self.strings
+        for start in range(0, self.num_nodes, self.chunk_size):
+            stop = min(start + self.chunk_size, self.num_nodes)
+            flags = self._file.array("nodes.flags", start, stop).tolist()
+            extra = self._file.array("nodes.extra", start, stop).tolist()
+            indptr = self._file.array("nodes.prov_indptr", start, stop + 1).tolist()
+            rows = self._node_sources.rows(indptr[0], indptr[-1], strings)
+            base = indptr[0]
+            for index in range(stop - start):
+                sources = rows[indptr[index] - base : indptr[index + 1] - base]
+                yield (
+                    names[start + index],
+                    self._attrs(flags[index], extra[index], sources, strings),
+                )
+
+    def iter_edges(self) -> Iterator[Tuple[str, str, Dict[str, Any]]]:
+        """
+        Iterate over all edges with their attributes, grouped by source node.
+
+        Yields:
+            Tuple[str, str, Dict[str, Any]]: (source, target, attributes) tuples
+        """
+        names = self.node_names
+        strings = self.strings
+        indptr = self._file.array("edges.indptr")
+        for start in range(0, self.num_edges, self.chunk_size):
+            stop = min(start + self.chunk_size, self.num_edges)
+            sources = (
+                np.searchsorted(indptr, np.arange(start, stop), side="right") - 1
+            ).tolist()
+            targets = self._file.array("edges.target", start, stop).tolist()
+            relations = self._file.array("edges.relation", start, stop).tolist()
+            flags = self._file.array("edges.flags", start, stop).tolist()
+            extra = self._file.array("edges.extra", start, stop).tolist()
+            prov_start = self._file.array("edges.prov_start", start, stop)
+            prov_end = prov_start + self._file.array("edges.prov_count", start, stop)
+
+            # Provenance rows are usually contiguous, as edges arrive grouped by
+            # source, so a chunk decodes its whole span at once unless the rows
+            # are scattered across the file.
+            base = int(prov_start.min())
+            span = int(prov_end.max()) - base
+            needed = int((prov_end - prov_start).sum())
+            rows = None
+            if span <= 4 * needed + self.chunk_size:
+                rows = self._edge_sources.rows(base, base + span, strings)
+            prov_start = prov_start.tolist()
+            prov_end = prov_end.tolist()
+
+            for index in range(stop - start):
+                first = prov_start[index]
+                last = prov_end[index]
+                if rows is not None:
+                    edge_sources = rows[first - base : last - base]
+                else:
+                    edge_sources = self._edge_sources.rows(first, last, strings)
+                attrs = {}
+                if flags[index] & HAS_RELATION:
+                    attrs["relation"] = strings[relations[index]]
+                attrs.update(
+                    self._attrs(flags[index], extra[index], edge_sources, strings)
+                )
+                yield names[sources[index]], names[targets[index]], attrs
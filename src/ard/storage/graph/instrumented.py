@@ -0,0 +1,297 @@
+import bisect
+import functools
+import json
+import time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from ard.storage.graph.base import GraphBackend
+from ard.storage.graph.wrapper import BackendWrapper
+
+# Upper bounds of the latency histogram buckets, in seconds
+DEFAULT_LATENCY_BUCKETS = (1e-5, 1e-4, 1e-3, 1e-2, 1e-1, 1.0, 10.0)
+
+# Methods that return iterators, timed until the iterator is exhausted
+_STREAMING_METHODS = {"iter_nodes", "iter_edges", "find_edges"}
+
+# Scopes open in the current thread or task, with the backend they belong to
+_active_scopes: ContextVar[Tuple[Tuple["InstrumentedBackend", "CallStats"], ...]] = (
+    ContextVar("graph_backend_scopes", default=())
+)
+
+
+@dataclass
+class MethodStats:
+    """
+    Calls of one backend method.
+
+    Attributes:
+        calls (int): Number of calls
+        total_seconds (float): Time spent in all calls
+        max_seconds (float): Time spent in the slowest call
+        histogram (List[int]): Number of calls by latency bucket, the last
+            bucket counting calls slower than the largest bound
+    """
+
+    calls: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+    histogram: List[int] = field(default_factory=list)
+
+    def record(self, seconds: float, buckets: Sequence[float]) -> None:
+        """Count a call that took the given number of seconds."""
+        if not self.histogram:
+            self.histogram = [0] * (len(buckets) + 1)
+        self.calls += 1
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        self.histogram[bisect.bisect_left(buckets, seconds)] += 1
+
+
+@dataclass
+class CallStats:
+    """
+    Backend calls made during an operation, or over the life of a backend.
+
+    Attributes:
+        name (str): Name of the operation
+        methods (Dict[str, MethodStats]): Calls by backend method
+        start_time_ns (int): Wall clock time the operation started, in
+            nanoseconds since the epoch
+        end_time_ns (Optional[int]): Wall clock time the operation ended, None
+            while it runs
+    """
+
+    name: str
+    methods: Dict[str, MethodStats] = field(default_factory=dict)
+    start_time_ns: int = field(default_factory=time.time_ns)
+    end_time_ns: Optional[int] = None
+
+    @property
+    def calls(self) -> int:
+        """Get the total number of backend calls."""
+        return sum(stats.calls for stats in self.methods.values())
+
+    @property
+    def total_seconds(self) -> float:
+        """Get the total time spent in backend calls."""
+        return sum(stats.total_seconds for stats in self.methods.values())
+
+    def record(self, method: str, seconds: float, buckets: Sequence[float]) -> None:
+        """Count a call of a backend method."""
+        stats = self.methods.get(method)
+        if stats is None:
+            stats = self.methods[method] = MethodStats()
+        stats.record(seconds, buckets)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert the statistics to a JSON-serializable dictionary.
+
+        Returns:
+            Dict[str, Any]: The operation name, times and calls by method
+        """
+        return {
+            "name": self.name,
+            "start_time_ns": self.start_time_ns,
+            "end_time_ns": self.end_time_ns,
+            "calls": self.calls,
+            "total_seconds": self.total_seconds,
+            "methods": {
+                method: {
+                    "calls": stats.calls,
+                    "total_seconds": stats.total_seconds,
+                    "max_seconds": stats.max_seconds,
+                    "histogram": list(stats.histogram),
+                }
+                for method, stats in sorted(self.methods.items())
+            },
+        }
+
+
+class InstrumentedBackend(BackendWrapper):
+    """
+    A graph backend that counts and times every call to another backend.
+
+    Calls are recorded by method, both over the life of the backend and in
+    every open scope, so that the backend round trips of a single operation,
+    such as one subgraph extraction, can be read or checked in a test. With an
+    OpenTelemetry tracer, every scope and every call also becomes a span.
+
+    Only calls made through the wrapper are counted, calls that the wrapped
+    backend makes to itself are not. Scopes are open in the thread or asyncio
+    task that opened them, so concurrent operations each count their own
+    calls; the totals count the calls of all threads.
+    """
+
+    def __init__(
+        self,
+        backend: GraphBackend,
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+        tracer: Optional[Any] = None,
+    ) -> None:
+        """
+        Initialize an InstrumentedBackend.
+
+        Args:
+            backend (GraphBackend): The backend to wrap
+            buckets (Sequence[float]): Increasing upper bounds of the latency
+                histogram buckets, in seconds
+            tracer (Optional[Any]): OpenTelemetry tracer to record spans with,
+                e.g. from opentelemetry.trace.get_tracer
+
+        Raises:
+            ValueError: If buckets is not increasing
+        """
+        super().__init__(backend)
+        if any(a >= b for a, b in zip(buckets, buckets[1:])):
+            raise ValueError("buckets must be increasing")
+        self.buckets = tuple(buckets)
+        self.tracer = tracer
+        self.stats = CallStats("total")
+        self.scopes: List[CallStats] = []
+
+    def reset(self) -> None:
+        """Forget all recorded calls and finished scopes."""
+        self.stats.methods.clear()
+        self.scopes.clear()
+
+    @contextmanager
+    def scope(self, name: str) -> Iterator[CallStats]:
+        """
+        Record the backend calls of an operation separately.
+
+        Scopes can be nested, a call counts in every scope open in the same
+        thread or asyncio task. Finished scopes are kept in scopes, in the
+        order they end.
+
+        Args:
+            name (str): Name of the operation, e.g. "subgraph extraction #12"
+
+        Yields:
+            CallStats: The calls of the operation, updated while it runs
+        """
+        stats = CallStats(name)
+        span = (
+            self.tracer.start_as_current_span(name)
+            if self.tracer is not None
+            else nullcontext()
+        )
+        token = _active_scopes.set(_active_scopes.get() + ((self, stats),))
+        try:
+            with span as current:
+                yield stats
+                if current is not None:
+                    current.set_attribute("graph_backend.calls", stats.calls)
+        finally:
+            _active_scopes.reset(token)
+            stats.end_time_ns = time.time_ns()
+            self.scopes.append(stats)
+
+    def _record(self, method: str, seconds: float) -> None:
+        self.stats.record(method, seconds, self.buckets)
+        for backend, stats in _active_scopes.get():
+            if backend is self:
+                stats.record(method, seconds, self.buckets)
+
+    def _timed_iterator(self, method: str, iterator: Iterator[Any]) -> Iterator[Any]:
+        # The span is not made current, since the consumer runs between items
+        span = (
+            self.tracer.start_span(f"GraphBackend.{method}")
+            if self.tracer is not None
+            else None
+        )
+        start = time.perf_counter()
+        try:
+            yield from iterator
+        finally:
+            self._record(method, time.perf_counter() - start)
+            if span is not None:
+                span.end()
+
+    def report(self) -> Dict[str, Any]:
+        """
+        Get all recorded calls as a JSON-serializable dictionary.
+
+        Returns:
+            Dict[str, Any]: The calls over the life of the backend under
+                "total", and those of every finished scope under "scopes"
+        """
+        return {
+            "total": self.stats.to_dict(),
+            "scopes": [stats.to_dict() for stats in self.scopes],
+        }
+
+    def save_report(self, filename: str) -> None:
+        """
+        Save the recorded calls to a JSON file.
+
+        Args:
+            filename (str): The path to the file
+        """
+        with open(filename, "w") as f:
+            json.dump(self.report(), f, indent=2)
+
+
+def _instrumented(method: str) -> Callable[..., Any]:
+    """Make a method forwarding to the wrapped backend, counting and timing it."""
+    forward = getattr(BackendWrapper, method)
+
+    @functools.wraps(forward)
+    def call(self: InstrumentedBackend, *args, **kwargs) -> Any:
+        if method in _STREAMING_METHODS:
+            # Timed and traced while the iterator is consumed
+            return self._timed_iterator(method, forward(self, *args, **kwargs))
+        span = (
+            self.tracer.start_as_current_span(f"GraphBackend.{method}")
+            if self.tracer is not None
+            else nullcontext()
+        )
+        with span:
+            start = time.perf_counter()
+            try:
+                return forward(self, *args, **kwargs)
+            finally:
+                self._record(method, time.perf_counter() - start)
+
+    return call
+
+
+for _method in [
+    name
+    for name, value in vars(BackendWrapper).items()
+    if callable(value) and (not name.startswith("_") or name == "__len__")
+]:
+    setattr(InstrumentedBackend, _method, _instrumented(_method))
+
+
+@contextmanager
+def assert_max_calls(
+    backend: InstrumentedBackend, max_calls: int, name: str = "operation"
+) -> Iterator[CallStats]:
+    """
+    Fail if the code in the block makes more than max_calls backend calls.
+
+    Args:
+        backend (InstrumentedBackend): The backend the calls go through
+        max_calls (int): The largest number of calls allowed
+        name (str): Name of the operation, for the scope and the error
+
+    Yields:
+        CallStats: The calls made in the block
+
+    Raises:
+        AssertionError: If there were more than max_calls calls
+    """
+    with backend.scope(name) as stats:
+        yield stats
+    if stats.calls > max_calls:
+        calls = ", ".join(
+            f"{method}: {method_stats.calls}"
+            for method, method_stats in sorted(stats.methods.items())
+        )
+        raise AssertionError(
+            f"{name} made {stats.calls} backend calls, more than {max_calls} ({calls})"
+        )
@@ -0,0 +1,202 @@
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# Groups of nodes, each with the name of the node they are merged into
+MergeGroups = Iterable[Tuple[Iterable[str], str]]
+
+# The outgoing and incoming edges of a node, as (source, target, attributes)
+IncidentEdges = Tuple[
+    Iterable[Tuple[str, str, Dict[str, Any]]],
+    Iterable[Tuple[str, str, Dict[str, Any]]],
+]
+
+
+@dataclass
+class MergePlan:
+    """
+    The nodes to remove and write to merge groups of nodes.
+
+    Attributes:
+        relabel (Dict[str, str]): Every node of the graph that is merged away,
+            with the node it ends up in
+        nodes (Dict[str, Dict[str, Any]]): The attributes of the merged nodes
+        steps (List[Tuple[Optional[str], str]]): Every (member, merged node)
+            step in order, with a None member where a merged node is created
+    """
+
+    relabel: Dict[str, str] = field(default_factory=dict)
+    nodes: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    steps: List[Tuple[Optional[str], str]] = field(default_factory=list)
+
+
+def plan_merges(
+    groups: MergeGroups,
+    has_node: Callable[[str], bool],
+    node_attrs: Callable[[str], Dict[str, Any]],
+) -> MergePlan:
+    """
+    Resolve groups of nodes to merge, one group after the other.
+
+    A merged node keeps its attributes, or is created with empty sources, and
+    its sources are extended with those of its other members in group order.
+    A merged node that is a member of a later group is merged again, a node
+    merged away is created anew if a later group is merged into it, and
+    members that are not in the graph are skipped. Attributes read from the
+    graph are not modified.
+
+    Args:
+        groups (MergeGroups): (members, merged node) pairs
+        has_node: Function checking if a node is in the graph
+        node_attrs: Function returning the attributes of a node in the graph
+
+    Returns:
+        MergePlan: The plan, without the edges
+    """
+    plan = MergePlan()
+    relabel = plan.relabel
+    merged = plan.nodes
+    # The graph nodes that ended up in every merged node
+    members: Dict[str, List[str]] = {}
+
+    def in_graph(node: str) -> bool:
+        return node not in relabel and has_node(node)
+
+    for group, merged_node in groups:
+        if merged_node not in merged:
+            if in_graph(merged_node):
+                attrs = dict(node_attrs(merged_node))
+                attrs["sources"] = list(attrs.get("sources", []))
+                members[merged_node] = [merged_node]
+            else:
+                attrs = {"sources": []}
+                members[merged_node] = []
+                plan.steps.append((None, merged_node))
+            merged[merged_node] = attrs
+        sources = merged[merged_node]["sources"]
+
+        for node in dict.fromkeys(group):
+            if node == merged_node:
+                continue
+            if node in merged:
+                sources.extend(merged.pop(node)["sources"])
+                moved = members.pop(node)
+            elif in_graph(node):
+                sources.extend(node_attrs(node).get("sources", []))
+                moved = [node]
+            else:
+                continue
+            for member in moved:
+                relabel[member] = merged_node
+            members[merged_node].extend(moved)
+            plan.steps.append((node, merged_node))
+
+    return plan
+
+
+def merge_edges(
+    plan: MergePlan,
+    incident_edges: Callable[[str], IncidentEdges],
+    edge_attrs: Callable[[str, str], Optional[Dict[str, Any]]],
+) -> Dict[Tuple[str, str], Dict[str, Any]]:
+    """
+    Move the edges of merged nodes to the nodes they are merged into.
+
+    The edges of every node merged away are read once, then the steps of the
+    plan are replayed in memory: the outgoing and then incoming edges of each
+    member move to the merged node, where an edge that already connects the
+    same two nodes keeps its attributes and gets the "sources" of the moved
+    edge appended, and any other edge is created with the relation of the
+    moved edge. Edges of nodes that stay are only read to look such edges up.
+
+    Args:
+        plan (MergePlan): The plan from plan_merges
+        incident_edges: Function returning the outgoing and incoming edges of
+            a node
+        edge_attrs: Function returning the attributes of an edge, or None if
+            there is no such edge
+
+    Returns:
+        Dict[Tuple[str, str], Dict[str, Any]]: The new and changed edges with
+            their attributes, which replace those of an existing edge
+    """
+    relabel = plan.relabel
+    # Adjacency of the nodes merged away and of the new merged nodes, sharing
+    # one attribute dict per edge. Other edges are kept in "outside". Dicts
+    # read from the graph are only copied once an edge is extended, so that
+    # few objects outlive a step and the garbage collector stays idle.
+    succ: Dict[str, Dict[str, Dict[str, Any]]] = {}
+    pred: Dict[str, Dict[str, Dict[str, Any]]] = {}
+    outside: Dict[Tuple[str, str], Dict[str, Any]] = {}
+    # The dicts created here by id, held so that their ids stay unique
+    owned: Dict[int, Dict[str, Any]] = {}
+
+    incident = {node: incident_edges(node) for node in relabel}
+    for node, (out_edges, _) in incident.items():
+        succ[node] = {target: data for _, target, data in out_edges}
+    for node, (_, in_edges) in incident.items():
+        pred[node] = {
+            source: succ[source][node] if source in succ else data
+            for source, _, data in in_edges
+        }
+
+    def get(source: str, target: str) -> Optional[Dict[str, Any]]:
+        if source in succ:
+            return succ[source].get(target)
+        if target in pred:
+            return pred[target].get(source)
+        attrs = outside.get((source, target))
+        if attrs is None and source not in relabel and target not in relabel:
+            attrs = edge_attrs(source, target)
+        return attrs
+
+    def move(source: str, target: str, data: Dict[str, Any]) -> None:
+        attrs = get(source, target)
+        if attrs is None:
+            attrs = {"relation": data.get("relation", ""), "sources": []}
+        elif id(attrs) not in owned:
+            if "sources" not in data:
+                return
+            attrs = dict(attrs)
+            attrs["sources"] = list(attrs.get("sources", []))
+        else:
+            if "sources" in data:
+                attrs["sources"].extend(data["sources"])
+            return
+
+        owned[id(attrs)] = attrs
+        if source in succ:
+            succ[source][target] = attrs
+        if target in pred:
+            pred[target][source] = attrs
+        if source not in succ and target not in pred:
+            outside[source, target] = attrs
+        if "sources" in data:
+            attrs["sources"].extend(data["sources"])
+
+    for member, merged_node in plan.steps:
+        if member is None:
+            succ[merged_node] = {}
+            pred[merged_node] = {}
+            continue
+
+        for target, data in list(succ[member].items()):
+            move(merged_node, target, data)
+        for source, data in list(pred[member].items()):
+            move(source, merged_node, data)
+
+        for target in succ.pop(member):
+            if target != member and target in pred:
+                del pred[target][member]
+        for source in pred.pop(member):
+            if source != member and source in succ:
+                del succ[source][member]
+
+    edges = outside
+    for source, targets in succ.items():
+        for target, attrs in targets.items():
+            edges[source, target] = attrs
+    for target, sources in pred.items():
+        for source, attrs in sources.items():
+            if source not in succ:
+                edges[source, target] = attrs
+    return edges
@@ -0,0 +1,315 @@
+import bisect
+import random
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+import networkx as nx
+import numpy as np
+
+from ard.storage.graph.base import GraphBackend
+from ard.storage.graph.csr import bidirectional_shortest_path, csr_neighbors
+from ard.storage.graph.graph_file import GraphFileReader
+from ard.storage.graph.statistics import GraphStatistics
+from ard.utils.section_file import StringTable
+
+
+class _SortedNames:
+    """Sequence of node names in sorted order, as UTF-8 bytes, for bisect."""
+
+    def __init__(self, names: StringTable, order: np.ndarray) -> None:
+        self._names = names
+        self._order = order
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def __getitem__(self, index: int) -> bytes:
+        return self._names.to_bytes(self._order[index])
+
+    def find(self, name: str) -> Optional[int]:
+        """Get the id of the node with the given name, if any."""
+        encoded = name.encode("utf-8")
+        index = bisect.bisect_left(self, encoded)
+        if index < len(self) and self[index] == encoded:
+            return int(self._order[index])
+        return None
+
+
+class MmapGraphBackend(GraphBackend):
+    """
+    Read-only backend over a memory-mapped binary graph file.
+
+    Opening a graph only reads the file footer. Adjacency is served from the
+    CSR arrays of the file and names and attributes are decoded on access, so
+    processes that open the same file share a single copy of it in the page
+    cache. All write operations raise NotImplementedError.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Open a binary graph file.
+
+        Args:
+            path (str): Path of a file written in the binary graph file format
+
+        Raises:
+            FileNotFoundError: If the file doesn't exist
+            ValueError: If the file is not a graph file
+        """
+        self._reader = GraphFileReader(path, mmap=True)
+        file = self._reader.file
+        self._names = file.strings("node_names")
+        self._sorted_names = _SortedNames(self._names, file.array("node_names.sorted"))
+        self._indptr = file.array("edges.indptr")
+        self._targets = file.array("edges.target")
+        self._in_indptr = file.array("edges.in_indptr")
+        self._in_sources = file.array("edges.in_source")
+        self._in_edges = file.array("edges.in_edge")
+        self._statistics: Optional[GraphStatistics] = None
+        self._relation_ids: Dict[str, int] = {}
+
+    @property
+    def config(self) -> Dict[str, Any]:
+        """Get the knowledge graph configuration stored in the file."""
+        return self._reader.config
+
+    def _node_id(self, node: str) -> Optional[int]:
+        if not isinstance(node, str):
+            return None
+        return self._sorted_names.find(node)
+
+    def _require_node(self, node: str) -> int:
+        node_id = self._node_id(node)
+        if node_id is None:
+            raise KeyError(f"Node not found: {node}")
+        return node_id
+
+    def _edge_position(self, source: int, target: int) -> Optional[int]:
+        start, end = self._indptr[source], self._indptr[source + 1]
+        matches = np.flatnonzero(self._targets[start:end] == target)
+        return int(start + matches[0]) if len(matches) else None
+
+    def _read_only(self) -> NotImplementedError:
+        return NotImplementedError(f"{type(self).__name__} is read-only")
+
+    def add_node(self, node: str, **attrs) -> None:
+        """Not supported, the graph is read-only."""
+        raise self._read_only()
+
+    def add_edge(self, source: str, target: str, **attrs) -> None:
+        """Not supported, the graph is read-only."""
+        raise self._read_only()
+
+    def remove_node(self, node: str) -> None:
+        """Not supported, the graph is read-only."""
+        raise self._read_only()
+
+    def has_node(self, node: str) -> bool:
+        """Check if a node exists."""
+        return self._node_id(node) is not None
+
+    def has_edge(self, source: str, target: str) -> bool:
+        """Check if an edge exists."""
+        source_id = self._node_id(source)
+        target_id = self._node_id(target)
+        if source_id is None or target_id is None:
+            return False
+        return self._edge_position(source_id, target_id) is not None
+
+    def get_node_attrs(self, node: str) -> Dict[str, Any]:
+        """Get all attributes of a node."""
+        return self._reader.node_attrs(self._require_node(node))
+
+    def get_edge_attrs(self, source: str, target: str) -> Dict[str, Any]:
+        """Get all attributes of an edge."""
+        position = self._edge_position(
+            self._require_node(source), self._require_node(target)
+        )
+        if position is None:
+            raise KeyError(f"Edge not found: ({source}, {target})")
+        return self._reader.edge_attrs(position)
+
+    def get_nodes(self) -> Set[str]:
+        """Get all nodes in the graph."""
+        return set(self._names.to_list())
+
+    def sample_nodes(self, k: int, rng: Optional[random.Random] = None) -> List[str]:
+        """Pick k nodes uniformly at random, with replacement, in O(k)."""
+        num_nodes = self._reader.num_nodes
+        if not num_nodes:
+            return []
+        rng = rng or random
+        names = self._names
+        return [names[rng.randrange(num_nodes)] for _ in range(k)]
+
+    def get_edges(self) -> List[Tuple[str, str, Dict[str, Any]]]:
+        """Get all edges in the graph with their attributes."""
+        return list(self._reader.iter_edges())
+
+    def _get_statistics(self) -> GraphStatistics:
+        """Get the statistics, computed from the file arrays on first use."""
+        if self._statistics is None:
+            degrees = np.diff(self._indptr) + np.diff(self._in_indptr)
+            histogram = np.bincount(degrees) if len(degrees) else np.zeros(0)
+            relations = self._reader.file.array("edges.relation")
+            relation_ids, counts = np.unique(
+                relations[relations >= 0], return_counts=True
+            )
+            strings = self._reader.strings
+            self._relation_ids = {
+                strings[relation]: relation for relation in relation_ids.tolist()
+            }
+            self._statistics = GraphStatistics(
+                num_nodes=self._reader.num_nodes,
+                num_edges=self._reader.num_edges,
+                degree_histogram={
+                    degree: int(count)
+                    for degree, count in enumerate(histogram.tolist())
+                    if count
+                },
+                relation_counts=dict(zip(self._relation_ids, counts.tolist())),
+            )
+        return self._statistics
+
+    @property
+    def native_edge_arrays(self) -> bool:
+        """Edge arrays come straight from the memory-mapped file."""
+        return True
+
+    def edge_arrays(self) -> Tuple[List[str], np.ndarray, np.ndarray]:
+        """Get the edges as arrays of node ids, straight from the file arrays."""
+        num_nodes = self._reader.num_nodes
+        sources = np.repeat(np.arange(num_nodes, dtype=np.int32), np.diff(self._indptr))
+        return self._names.to_list(), sources, np.asarray(self._targets)
+
+    def get_edges_by_relation(
+        self, relation: str
+    ) -> List[Tuple[str, str, Dict[str, Any]]]:
+        """Get all edges with the given relation."""
+        self._get_statistics()
+        relation_id = self._relation_ids.get(relation)
+        if relation_id is None:
+            return []
+        relations = self._reader.file.array("edges.relation")
+        positions = np.flatnonzero(relations == relation_id)
+        sources = np.searchsorted(self._indptr, positions, side="right") - 1
+        names = self._names
+        return [
+            (names[source], names[target], self._reader.edge_attrs(position))
+            for position, source, target in zip(
+                positions.tolist(),
+                sources.tolist(),
+                self._targets[positions].tolist(),
+            )
+        ]
+
+    def get_relation_types(self) -> Set[str]:
+        """Get the relations of the edges in the graph."""
+        return self._get_statistics().relation_types
+
+    def get_statistics(self) -> GraphStatistics:
+        """Get the statistics of the graph, computed once as it never changes."""
+        return self._get_statistics().copy()
+
+    def iter_nodes(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Iterate over all nodes with their attributes, in insertion order."""
+        return self._reader.iter_nodes()
+
+    def iter_edges(self) -> Iterator[Tuple[str, str, Dict[str, Any]]]:
+        """Iterate over all edges with their attributes, grouped by source."""
+        return self._reader.iter_edges()
+
+    def get_successors(self, node: str) -> List[str]:
+        """Get all successor nodes of a node."""
+        node_id = self._require_node(node)
+        names = self._names
+        return [names[i] for i in csr_neighbors(self._indptr, self._targets, node_id)]
+
+    def get_predecessors(self, node: str) -> List[str]:
+        """Get all predecessor nodes of a node."""
+        node_id = self._require_node(node)
+        names = self._names
+        return [
+            names[i] for i in csr_neighbors(self._in_indptr, self._in_sources, node_id)
+        ]
+
+    def get_out_edges(self, node: str) -> List[Tuple[str, str, Dict[str, Any]]]:
+        """Get all outgoing edges of a node with their attributes."""
+        node_id = self._require_node(node)
+        start, end = int(self._indptr[node_id]), int(self._indptr[node_id + 1])
+        return [
+            (node, self._names[target], self._reader.edge_attrs(position))
+            for position, target in zip(
+                range(start, end), self._targets[start:end].tolist()
+            )
+        ]
+
+    def get_in_edges(self, node: str) -> List[Tuple[str, str, Dict[str, Any]]]:
+        """Get all incoming edges of a node with their attributes."""
+        node_id = self._require_node(node)
+        start, end = int(self._in_indptr[node_id]), int(self._in_indptr[node_id + 1])
+        return [
+            (self._names[source], node, self._reader.edge_attrs(position))
+            for source, position in zip(
+                self._in_sources[start:end].tolist(),
+                self._in_edges[start:end].tolist(),
+            )
+        ]
+
+    def number_of_edges(self) -> int:
+        """Get the total number of edges in the graph."""
+        return self._reader.num_edges
+
+    def shortest_path(
+        self, source: str, target: str, directed: bool = True
+    ) -> List[str]:
+        """
+        Get the shortest path between two nodes.
+
+        Raises:
+            nx.NodeNotFound: If either node is not in the graph
+            nx.NetworkXNoPath: If there is no path between the nodes
+        """
+        source_id = self._node_id(source)
+        target_id = self._node_id(target)
+        for node, node_id in ((source, source_id), (target, target_id)):
+            if node_id is None:
+                raise nx.NodeNotFound(f"Node {node} not in graph")
+
+        def successors(node_id: int) -> List[int]:
+            return csr_neighbors(self._indptr, self._targets, node_id)
+
+        def predecessors(node_id: int) -> List[int]:
+            return csr_neighbors(self._in_indptr, self._in_sources, node_id)
+
+        def neighbors(node_id: int) -> List[int]:
+            return successors(node_id) + predecessors(node_id)
+
+        if directed:
+            path = bidirectional_shortest_path(
+                source_id, target_id, successors, predecessors
+            )
+        else:
+            path = bidirectional_shortest_path(
+                source_id, target_id, neighbors, neighbors
+            )
+        if path is None:
+            raise nx.NetworkXNoPath(f"No path between {source} and {target}.")
+        return [self._names[node_id] for node_id in path]
+
+    def __len__(self) -> int:
+        """Get the total number of nodes in the graph."""
+        return self._reader.num_nodes
+
+    def to_serializable(self) -> Dict[str, Any]:
+        """
+        Convert the graph to a serializable dictionary.
+
+        Returns:
+            Dict[str, Any]: A serializable representation of the graph
+        """
+        nodes = [{"id": node, "attributes": attrs} for node, attrs in self.iter_nodes()]
+        edges = [
+            {"source": source, "target": target, "attributes": attrs}
+            for source, target, attrs in self.iter_edges()
+        ]
+        return {"nodes": nodes, "edges": edges}
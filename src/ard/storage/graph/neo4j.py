@@ -1,14 +1,282 @@
-from typing import Any, Dict, List, Set, Tuple
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
 
 from loguru import logger
 from neo4j import GraphDatabase
 
 from ard.storage.graph import GraphBackend
+from ard.storage.graph.graph_file import write_graph_file
+from ard.storage.graph.statistics import GraphStatistics
+
+DEFAULT_WRITE_BATCH_SIZE = 1000
+DEFAULT_NODE_LABEL = "Entity"
+DEFAULT_RELATIONSHIP_TYPE = "RELATES_TO"
+DEFAULT_PAGE_SIZE = 10_000
+
+
+def _quote(identifier: str) -> str:
+    """Quote a label or relationship type for use in a Cypher query."""
+    if not identifier:
+        raise ValueError("Labels and relationship types must not be empty")
+    return "`" + identifier.replace("`", "``") + "`"
+
+
+class CypherQueries:
+    """
+    The read queries of a graph stored in Neo4j.
+
+    Nodes are matched by label and name, and edges by relationship type, so
+    that every lookup goes through the index on node names. Shared by the
+    synchronous and asynchronous backends.
+    """
+
+    def __init__(self, node_label: str, relationship_type: str) -> None:
+        """
+        Build the queries of a graph.
+
+        Args:
+            node_label (str): Label of the nodes of the graph
+            relationship_type (str): Type of the relationships of the graph
+        """
+        self.label = label = _quote(node_label)
+        self.type = rel = _quote(relationship_type)
+        self.edge_pattern = edge = f"(source:{label})-[r:{rel}]->(target:{label})"
+        returns = (
+            "RETURN source.name AS source, target.name AS target, "
+            "properties(r) AS props"
+        )
+        self.count_nodes = f"MATCH (n:{label}) RETURN count(n) AS count"
+        self.count_edges = f"MATCH ()-[r:{rel}]->() RETURN count(r) AS count"
+        self.has_node = (
+            f"MATCH (n:{label}) WHERE n.name = $name RETURN count(n) AS count"
+        )
+        self.has_edge = f"""
+            MATCH {edge}
+            WHERE source.name = $source AND target.name = $target
+            RETURN count(r) AS count
+            """
+        self.node_attrs = f"""
+            MATCH (n:{label})
+            WHERE n.name = $id
+            RETURN properties(n) AS props
+            """
+        self.edge_attrs = f"""
+            MATCH {edge}
+            WHERE source.name = $source AND target.name = $target
+            RETURN properties(r) AS props
+            """
+        self.nodes_attrs = f"""
+            UNWIND $rows AS name
+            MATCH (n:{label} {{name: name}})
+            RETURN name, properties(n) AS props
+            """
+        self.edges_attrs = f"""
+            UNWIND $rows AS row
+            MATCH (source:{label} {{name: row[0]}})-[r:{rel}]->(target:{label} {{name: row[1]}})
+            RETURN row[0] AS source, row[1] AS target, properties(r) AS props
+            """
+        self.nodes = f"MATCH (n:{label}) RETURN n.name AS name"
+        self.sample_nodes = f"""
+            MATCH (n:{label})
+            WITH collect(n.name) AS names
+            WHERE size(names) > 0
+            UNWIND range(1, $k) AS i
+            RETURN names[toInteger(rand() * size(names))] AS name
+            """
+        self.edges = f"MATCH {edge} {returns}"
+        self.successors = f"""
+            MATCH (source:{label})-[:{rel}]->(target:{label})
+            WHERE source.name = $id
+            RETURN target.name AS id
+            """
+        self.predecessors = f"""
+            MATCH (source:{label})-[:{rel}]->(target:{label})
+            WHERE target.name = $id
+            RETURN source.name AS id
+            """
+        self.out_edges = f"MATCH {edge} WHERE source.name = $id {returns}"
+        self.in_edges = f"MATCH {edge} WHERE target.name = $id {returns}"
+        self.induced_subgraph = f"""
+            MATCH (n:{label})
+            WHERE n.name IN $nodes
+            OPTIONAL MATCH (n)-[r:{rel}]->(m:{label})
+            WHERE m.name IN $nodes
+            RETURN n.name AS name, properties(n) AS props,
+                collect(CASE WHEN m IS NULL THEN NULL
+                    ELSE [m.name, properties(r)] END) AS edges
+            """
+        self.relation_types = f"""
+            MATCH ()-[r:{rel}]->()
+            WITH DISTINCT coalesce(r.relation, r.edge) AS relation
+            WHERE relation IS NOT NULL
+            RETURN relation
+            """
+        self.degree_histogram = f"""
+            MATCH (n:{label})
+            WITH COUNT {{ (n)-[:{rel}]->() }}
+                + COUNT {{ (n)<-[:{rel}]-() }} AS degree
+            RETURN degree, count(*) AS count
+            """
+        self.relation_counts = f"""
+            MATCH ()-[r:{rel}]->()
+            WITH coalesce(r.relation, r.edge) AS relation
+            WHERE relation IS NOT NULL
+            RETURN relation, count(*) AS count
+            """
+        self.shortest_path = f"""
+            MATCH (source:{label}), (target:{label})
+            WHERE source.name = $source AND target.name = $target
+            MATCH path = shortestPath((source)-[:{rel}*]->(target))
+            RETURN [node.name for node IN nodes(path)] AS path
+            """
+        self.undirected_shortest_path = self.shortest_path.replace("*]->", "*]-")
+
+    def node_page(self, after: Optional[str], limit: int) -> Tuple[str, Dict[str, Any]]:
+        """
+        Build the query of a page of nodes with their attributes, by name.
+
+        Args:
+            after (Optional[str]): The last name of the previous page, None for
+                the first page
+            limit (int): Maximum number of nodes
+
+        Returns:
+            Tuple[str, Dict[str, Any]]: The query and its parameters
+        """
+        where = "WHERE n.name > $after " if after is not None else ""
+        query = (
+            f"MATCH (n:{self.label}) {where}"
+            "RETURN n.name AS name, properties(n) AS props "
+            "ORDER BY n.name LIMIT $limit"
+        )
+        return query, {"after": after, "limit": limit}
+
+    def edge_page(self, after: Optional[str], limit: int) -> Tuple[str, Dict[str, Any]]:
+        """
+        Build the query of the outgoing edges of a page of nodes, by name.
+
+        Returns a record per node, with its name as source and its edges as a
+        list of [target, properties] pairs.
+
+        Args:
+            after (Optional[str]): The last source of the previous page, None
+                for the first page
+            limit (int): Maximum number of source nodes
+
+        Returns:
+            Tuple[str, Dict[str, Any]]: The query and its parameters
+        """
+        where = "WHERE source.name > $after " if after is not None else ""
+        query = f"""
+            MATCH (source:{self.label}) {where}
+            WITH source ORDER BY source.name LIMIT $limit
+            OPTIONAL MATCH (source)-[r:{self.type}]->(target:{self.label})
+            RETURN source.name AS source,
+                collect(CASE WHEN target IS NULL THEN NULL
+                    ELSE [target.name, properties(r)] END) AS edges
+            ORDER BY source
+            """
+        return query, {"after": after, "limit": limit}
+
+    def find_edges(
+        self, relation: Optional[str] = None, nodes: Optional[Iterable[str]] = None
+    ) -> Tuple[str, Dict[str, Any]]:
+        """
+        Build the query of the edges matching filters.
+
+        Args:
+            relation (Optional[str]): Only edges with this relation
+            nodes (Optional[Iterable[str]]): Only edges from or to these nodes
+
+        Returns:
+            Tuple[str, Dict[str, Any]]: The query and its parameters
+        """
+        conditions = []
+        params: Dict[str, Any] = {}
+        if relation is not None:
+            conditions.append("coalesce(r.relation, r.edge) = $relation")
+            params["relation"] = relation
+        if nodes is not None:
+            conditions.append("(source.name IN $nodes OR target.name IN $nodes)")
+            params["nodes"] = list(dict.fromkeys(nodes))
+        where = f"WHERE {' AND '.join(conditions)} " if conditions else ""
+        return (
+            f"MATCH {self.edge_pattern} {where}"
+            "RETURN source.name AS source, target.name AS target, "
+            "properties(r) AS props",
+            params,
+        )
+
+    def neighbors(self, nodes: Iterable[str]) -> Tuple[str, Dict[str, Any]]:
+        """
+        Build the query of the distinct neighbors of nodes, in either direction.
+
+        Neighborhoods are expanded with one such query per hop, which visits
+        every node once instead of enumerating every path up to the distance.
+
+        Args:
+            nodes (Iterable[str]): The nodes to expand
+
+        Returns:
+            Tuple[str, Dict[str, Any]]: The query and its parameters
+        """
+        query = f"""
+            UNWIND $nodes AS name
+            MATCH (:{self.label} {{name: name}})-[:{self.type}]-(m:{self.label})
+            RETURN DISTINCT m.name AS name
+            """
+        return query, {"nodes": list(nodes)}
+
+
+def next_neighborhood_level(
+    seen: Dict[str, None],
+    neighbors: Iterable[str],
+    found: List[str],
+    limit: Optional[int],
+) -> List[str]:
+    """
+    Record the nodes one hop further out in a breadth-first neighborhood.
+
+    Args:
+        seen (Dict[str, None]): Nodes already reached, updated in place
+        neighbors (Iterable[str]): Neighbors of the current level
+        found (List[str]): Nodes of the neighborhood so far, extended in place
+        limit (Optional[int]): Maximum number of nodes of the neighborhood
+
+    Returns:
+        List[str]: The new nodes, sorted by name, to expand next
+    """
+    level = sorted({name for name in neighbors if name not in seen})
+    if limit is not None:
+        level = level[: max(limit - len(found), 0)]
+    seen.update(dict.fromkeys(level))
+    found.extend(level)
+    return level
 
 
 class Neo4jBackend(GraphBackend):
     """
     Neo4j backend implementation for the knowledge graph.
+
+    Nodes carry a label with a uniqueness constraint on their name, so that
+    nodes are looked up through its index, and edges are relationships of a
+    single type. Every thread reuses one session for all its queries. Bulk
+    writes send rows with UNWIND in batched write transactions, optionally from
+    several writer threads at once. Iterating over nodes and edges pages through
+    them by node name, so exports never hold the whole graph in memory.
     """
 
     def __init__(
@@ -17,6 +285,11 @@ class Neo4jBackend(GraphBackend):
         user: str = "neo4j",
         password: str = "password",
         database: str = "neo4j",
+        batch_size: int = DEFAULT_WRITE_BATCH_SIZE,
+        writers: int = 1,
+        node_label: str = DEFAULT_NODE_LABEL,
+        relationship_type: str = DEFAULT_RELATIONSHIP_TYPE,
+        page_size: int = DEFAULT_PAGE_SIZE,
     ):
         """
         Initialize a new Neo4j backend.
@@ -26,9 +299,30 @@ class Neo4jBackend(GraphBackend):
             user (str): The database user
             password (str): The database password
             database (str): The database name
+            batch_size (int): Number of nodes or edges written per transaction
+            writers (int): Number of threads writing batches in parallel
+            node_label (str): Label of the nodes of the graph
+            relationship_type (str): Type of the relationships of the graph
+            page_size (int): Number of nodes read per query when iterating over
+                nodes or edges
         """
+        if batch_size < 1 or writers < 1 or page_size < 1:
+            raise ValueError("batch_size, writers and page_size must be at least 1")
         self._driver = GraphDatabase.driver(uri, auth=(user, password))
         self._database = database
+        self.node_label = node_label
+        self.relationship_type = relationship_type
+        self._queries = CypherQueries(node_label, relationship_type)
+        self._label = self._queries.label
+        self._type = self._queries.type
+        self.batch_size = batch_size
+        self.writers = writers
+        self.page_size = page_size
+        self._local = threading.local()
+        self._sessions = []
+        self._sessions_lock = threading.Lock()
+        # Writer threads are kept with their sessions for the whole backend
+        self._executor: Optional[ThreadPoolExecutor] = None
         self._ensure_constraints()
 
     @classmethod
@@ -46,18 +340,19 @@ class Neo4jBackend(GraphBackend):
         # Create Neo4j backend with connection parameters
         backend = cls(**connection_params)
 
-        # Add all nodes with their attributes
-        for node_data in data["nodes"]:
-            node_id = node_data["id"]
-            attrs = node_data.get("attributes", {})
-            backend.add_node(node_id, **attrs)
-
-        # Add all edges with their attributes
-        for edge_data in data["edges"]:
-            source = edge_data["source"]
-            target = edge_data["target"]
-            attrs = edge_data.get("attributes", {})
-            backend.add_edge(source, target, **attrs)
+        # Add all nodes, then all edges, with their attributes
+        backend.add_nodes(
+            (node_data["id"], node_data.get("attributes", {}))
+            for node_data in data["nodes"]
+        )
+        backend.add_edges(
+            (
+                edge_data["source"],
+                edge_data["target"],
+                edge_data.get("attributes", {}),
+            )
+            for edge_data in data["edges"]
+        )
 
         return backend
 
@@ -68,46 +363,203 @@ class Neo4jBackend(GraphBackend):
         Returns:
             Dict[str, Any]: A serializable representation of the graph
         """
-        # Get all nodes with their attributes
-        nodes = []
-        for node in self.get_nodes():
-            attrs = self.get_node_attrs(node)
-            nodes.append({"id": node, "attributes": attrs})
-
-        # Get all edges with their attributes
-        edges = []
-        for source, target, attrs in self.get_edges():
-            edges.append({"source": source, "target": target, "attributes": attrs})
+        # Page through the nodes and the edges with their attributes
+        nodes = [{"id": node, "attributes": attrs} for node, attrs in self.iter_nodes()]
+        edges = [
+            {"source": source, "target": target, "attributes": attrs}
+            for source, target, attrs in self.iter_edges()
+        ]
 
         return {"nodes": nodes, "edges": edges}
 
     def _ensure_constraints(self) -> None:
-        """Ensure required constraints exist in the database."""
-        # neo4j does not support label-less node indexes. tbd later when our KG become large
-        pass
+        """Ensure the uniqueness constraint, and so an index, on node names."""
+        name = f"{self.node_label}_name_unique".replace("`", "")
+        with self._session() as session:
+            session.run(
+                f"CREATE CONSTRAINT {_quote(name)} IF NOT EXISTS "
+                f"FOR (n:{self._label}) REQUIRE n.name IS UNIQUE"
+            ).consume()
+
+    def migrate_unlabeled(self, batch_size: Optional[int] = None) -> Tuple[int, int]:
+        """
+        Label the nodes and retype the relationships of an unlabeled graph.
+
+        Graphs written before nodes had a label are not visible through the
+        labelled queries. Such graphs may hold several nodes with the same
+        name, which the uniqueness constraint forbids once labelled, so these
+        are merged first: the labelled node, or else one of them, is kept with
+        the sources of all, the properties it lacks and all their relationships.
+        This then adds the node label to every node with a name and no labels,
+        and replaces every relationship between such nodes that is not of the
+        relationship type by one with the same properties, and the old type as
+        relation if it had none. Runs in transactions of batch_size elements
+        and can be repeated safely.
+
+        Args:
+            batch_size (Optional[int]): Elements per transaction, the write
+                batch size by default
+
+        Returns:
+            Tuple[int, int]: The number of labelled nodes and retyped
+                relationships
+        """
+        batch_size = batch_size or self.batch_size
+        copy = f"""
+            CREATE ({{start}})-[copy:{self._type}]->({{end}})
+            SET copy = properties(r),
+                copy.relation = coalesce(r.relation, r.edge, type(r))
+            """
+        queries = [
+            f"""
+            MATCH (n)
+            WHERE n.name IS NOT NULL AND size(labels(n)) = 0
+            WITH n.name AS name, collect(n) AS unlabeled
+            OPTIONAL MATCH (existing:{self._label} {{name: name}})
+            WITH CASE WHEN existing IS NULL THEN unlabeled
+                ELSE [existing] + unlabeled END AS nodes
+            WHERE size(nodes) > 1
+            WITH nodes LIMIT $limit
+            WITH head(nodes) AS keep, tail(nodes) AS duplicates
+            WITH keep, duplicates, properties(keep) AS own,
+                reduce(
+                    sources = coalesce(keep.sources, []), duplicate IN duplicates |
+                    sources + [source IN coalesce(duplicate.sources, [])
+                        WHERE NOT source IN sources]
+                ) AS sources
+            FOREACH (duplicate IN duplicates | SET keep += properties(duplicate))
+            SET keep += own, keep.sources = sources
+            WITH keep, duplicates
+            UNWIND duplicates AS duplicate
+            CALL {{
+                WITH keep, duplicate
+                MATCH (duplicate)-[r]->(target)
+                WITH keep, r,
+                    CASE WHEN target = duplicate THEN keep ELSE target END AS target
+                {copy.format(start="keep", end="target")}
+                RETURN count(copy) AS outgoing
+            }}
+            CALL {{
+                WITH keep, duplicate
+                MATCH (source)-[r]->(duplicate)
+                WHERE source <> duplicate
+                WITH keep, r, source
+                {copy.format(start="source", end="keep")}
+                RETURN count(copy) AS incoming
+            }}
+            DETACH DELETE duplicate
+            RETURN count(duplicate) AS count
+            """,
+            f"""
+            MATCH (n)
+            WHERE n.name IS NOT NULL AND size(labels(n)) = 0
+            WITH n LIMIT $limit
+            SET n:{self._label}
+            RETURN count(n) AS count
+            """,
+            f"""
+            MATCH (source:{self._label})-[r]->(target:{self._label})
+            WHERE type(r) <> $type
+            WITH source, r, target LIMIT $limit
+            {copy.format(start="source", end="target")}
+            DELETE r
+            RETURN count(copy) AS count
+            """,
+        ]
+        counts = []
+        with self._session() as session:
+            for query in queries:
+                total = 0
+                while True:
+                    count = session.execute_write(
+                        lambda tx: tx.run(
+                            query, limit=batch_size, type=self.relationship_type
+                        ).single()["count"]
+                    )
+                    total += count
+                    if count < batch_size:
+                        break
+                counts.append(total)
+        merged, labelled, retyped = counts
+        logger.info(
+            f"Merged {merged} duplicate nodes, labelled {labelled} nodes and "
+            f"retyped {retyped} relationships"
+        )
+        return labelled, retyped
+
+    @contextmanager
+    def _session(self) -> Iterator[Any]:
+        """Get the long-lived session of the calling thread."""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._driver.session(database=self._database)
+            self._local.session = session
+            with self._sessions_lock:
+                self._sessions.append(session)
+        yield session
 
     def _close(self) -> None:
-        """Close the Neo4j driver connection."""
+        """Stop the writer threads, close the sessions and the driver connection."""
+        with self._sessions_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown()
+        with self._sessions_lock:
+            sessions, self._sessions = self._sessions, []
+        for session in sessions:
+            session.close()
+        self._local = threading.local()
         self._driver.close()
 
+    @staticmethod
+    def _run_batch(tx, query: str, rows: List[Dict[str, Any]]) -> None:
+        tx.run(query, rows=rows).consume()
+
+    def _write_batches(self, query: str, rows: List[Dict[str, Any]]) -> None:
+        """Write rows with an UNWIND query, batch_size rows per transaction."""
+        batches = [
+            rows[i : i + self.batch_size] for i in range(0, len(rows), self.batch_size)
+        ]
+
+        def write(batch: List[Dict[str, Any]]) -> None:
+            with self._session() as session:
+                session.execute_write(self._run_batch, query, batch)
+
+        if self.writers == 1 or len(batches) == 1:
+            for batch in batches:
+                write(batch)
+            return
+        with self._sessions_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.writers)
+            executor = self._executor
+        # list() raises the first error of any batch
+        list(executor.map(write, batches))
+
     def add_node(self, node: str, **attrs) -> None:
         """Add a node with optional attributes."""
-        with self._driver.session(database=self._database) as session:
-            props = {k: v for k, v in attrs.items() if v is not None}
-            props["name"] = node
+        self.add_nodes([(node, attrs)])
 
-            # Create a new node and then look up its name
-            result = session.run(
-                """
-                CREATE (n)
-                SET n += $props
-                RETURN n.name AS name
-                """,
-                props=props,
-            )
-            # Log the new node creation
-            name = result.single()["name"]
-            logger.debug(f"Created node with name: {name}")
+    def add_nodes(self, nodes: Iterable[Tuple[str, Dict[str, Any]]]) -> None:
+        """
+        Add or update many nodes with batched UNWIND transactions.
+
+        Attributes of a node given several times are combined in order, so
+        that parallel batches never write the same node.
+        """
+        props_by_name: Dict[str, Dict[str, Any]] = {}
+        for node, attrs in nodes:
+            props = props_by_name.setdefault(node, {"name": node})
+            props.update((k, v) for k, v in attrs.items() if v is not None)
+        self._write_batches(
+            f"""
+            UNWIND $rows AS row
+            MERGE (n:{self._label} {{name: row.name}})
+            SET n += row
+            """,
+            list(props_by_name.values()),
+        )
+        logger.debug(f"Wrote {len(props_by_name)} nodes")
 
     def has_node(self, node_id: str) -> bool:
         """
@@ -119,228 +571,374 @@ class Neo4jBackend(GraphBackend):
         Returns:
             bool: True if the node exists, False otherwise
         """
-        query = "MATCH (n) WHERE n.name = $name RETURN count(n) AS count"
-
-        with self._driver.session(database=self._database) as session:
-            result = session.run(query, name=node_id)
+        with self._session() as session:
+            result = session.run(self._queries.has_node, name=node_id)
             return result.single()["count"] > 0
 
     def add_edge(self, source: str, target: str, **attrs) -> None:
         """Add an edge with optional attributes using names."""
-        with self._driver.session(database=self._database) as session:
-            # Convert attributes to Neo4j format
-            props = {k: v for k, v in attrs.items() if v is not None}
+        self.add_edges([(source, target, attrs)])
 
-            # Use name to find source and target nodes
-            query = """
-            MATCH (source), (target)
-            WHERE source.name = $source AND target.name = $target
-            CREATE (source)-[r]->(target)
-            SET r += $props
-            RETURN r.edge as edge
-            """
-            result = session.run(query, source=source, target=target, props=props)
-            # Log the edge creation
-            if result.single():
-                logger.debug(f"Created edge from {source} to {target}")
-            else:
-                logger.warning(f"Failed to create edge from {source} to {target}")
+    def add_edges(self, edges: Iterable[Tuple[str, str, Dict[str, Any]]]) -> None:
+        """
+        Add or update many edges with batched UNWIND transactions.
+
+        Both nodes of an edge must exist; edges between missing nodes are not
+        written. Attributes of an edge given several times are combined in
+        order.
+        """
+        rows: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        for source, target, attrs in edges:
+            row = rows.setdefault(
+                (source, target), {"source": source, "target": target, "props": {}}
+            )
+            row["props"].update((k, v) for k, v in attrs.items() if v is not None)
+        self._write_batches(
+            f"""
+            UNWIND $rows AS row
+            MATCH (source:{self._label} {{name: row.source}})
+            MATCH (target:{self._label} {{name: row.target}})
+            MERGE (source)-[r:{self._type}]->(target)
+            SET r += row.props
+            """,
+            list(rows.values()),
+        )
+        logger.debug(f"Wrote {len(rows)} edges")
 
     def has_edge(self, source: str, target: str) -> bool:
         """Check if an edge exists using name."""
-        with self._driver.session(database=self._database) as session:
-            result = session.run(
-                """
-                MATCH (source)-[r]->(target)
-                WHERE source.name = $source AND target.name = $target
-                RETURN count(r) as count
-                """,
-                source=source,
-                target=target,
-            )
+        with self._session() as session:
+            result = session.run(self._queries.has_edge, source=source, target=target)
             return result.single()["count"] > 0
 
     def get_node_attrs(self, node: str) -> Dict[str, Any]:
         """Get all attributes of a node by its name."""
-        with self._driver.session(database=self._database) as session:
-            result = session.run(
-                """
-                MATCH (n)
-                WHERE n.name = $id
-                RETURN properties(n) as props
-                """,
-                id=node,
-            )
+        with self._session() as session:
+            result = session.run(self._queries.node_attrs, id=node)
             record = result.single()
             if not record:
                 return {}
 
-            props = record["props"].copy()
+            return self._normalize_node_props(record["props"])
 
-            # If there's no 'sources' list but there are other properties that should be
-            # in source metadata, create a sources list
-            if (
-                "sources" not in props and len(props) > 1
-            ):  # More than just the name property
-                # Create a normalized structure with sources
-                normalized_props = {}
+    @staticmethod
+    def _normalize_node_props(props: Dict[str, Any]) -> Dict[str, Any]:
+        """Normalize node properties to match NetworkX format."""
+        props = props.copy()
 
-                # Move metadata to sources list
-                source_entry = {
-                    k: v for k, v in props.items() if k != "name" and k != "sources"
-                }
-                if source_entry:  # Only add sources if there's actual metadata
-                    normalized_props["sources"] = [source_entry]
+        # If there's no 'sources' list but there are other properties that should be
+        # in source metadata, create a sources list
+        if (
+            "sources" not in props and len(props) > 1
+        ):  # More than just the name property
+            # Create a normalized structure with sources
+            normalized_props = {}
 
-                return normalized_props
+            # Move metadata to sources list
+            source_entry = {
+                k: v for k, v in props.items() if k != "name" and k != "sources"
+            }
+            if source_entry:  # Only add sources if there's actual metadata
+                normalized_props["sources"] = [source_entry]
 
-            return props
+            return normalized_props
+
+        return props
 
     def get_edge_attrs(self, source: str, target: str) -> Dict[str, Any]:
         """Get all attributes of an edge using name."""
-        with self._driver.session(database=self._database) as session:
-            result = session.run(
-                """
-                MATCH (source)-[r]->(target)
-                WHERE source.name = $source AND target.name = $target
-                RETURN properties(r) as props
-                """,
-                source=source,
-                target=target,
-            )
+        with self._session() as session:
+            result = session.run(self._queries.edge_attrs, source=source, target=target)
             record = result.single()
             if not record:
                 return {}
 
-            props = record["props"]
-
-            # Normalize format to match NetworkX backend
-            # If 'edge' exists but 'relation' doesn't, rename it
-            if "edge" in props and "relation" not in props:
-                props["relation"] = props["edge"]
-
-            # Create a sources array if it doesn't exist
-            if "sources" not in props:
-                # Gather metadata from the edge itself to create a source entry
-                source_entry = {k: v for k, v in props.items() if k not in ["relation"]}
-                # Include the relation in the source entry
-                if "relation" in props:
-                    source_entry["relation"] = props["relation"]
-                # Remove metadata keys from the top level, leaving only 'relation' and 'sources'
-                for k in list(props.keys()):
-                    if k != "relation" and k != "sources":
-                        props.pop(k)
-                # Add the source entry to the sources array
-                props["sources"] = [source_entry]
-
-            return props
+            return self._normalize_edge_props(record["props"])
+
+    @staticmethod
+    def _normalize_edge_props(props: Dict[str, Any]) -> Dict[str, Any]:
+        """Normalize edge properties to match NetworkX format."""
+        props = dict(props)
+
+        # If 'edge' exists but 'relation' doesn't, rename it
+        if "edge" in props and "relation" not in props:
+            props["relation"] = props["edge"]
+
+        # Create a sources array if it doesn't exist
+        if "sources" not in props:
+            # Gather metadata from the edge itself to create a source entry
+            source_entry = {k: v for k, v in props.items() if k not in ["relation"]}
+            # Include the relation in the source entry
+            if "relation" in props:
+                source_entry["relation"] = props["relation"]
+            # Remove metadata keys from the top level, leaving only 'relation' and 'sources'
+            for k in list(props.keys()):
+                if k != "relation" and k != "sources":
+                    props.pop(k)
+            # Add the source entry to the sources array
+            props["sources"] = [source_entry]
+
+        return props
+
+    def _read_batches(self, query: str, rows: List[Any]) -> Iterator[Dict[str, Any]]:
+        """Run a read query with UNWIND over rows, batch_size rows per query."""
+        with self._session() as session:
+            for i in range(0, len(rows), self.batch_size):
+                yield from session.run(query, rows=rows[i : i + self.batch_size])
+
+    def get_nodes_attrs(self, nodes: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Get the attributes of many nodes with batched UNWIND queries."""
+        records = self._read_batches(
+            self._queries.nodes_attrs, list(dict.fromkeys(nodes))
+        )
+        return {
+            record["name"]: self._normalize_node_props(record["props"])
+            for record in records
+        }
+
+    def get_edges_attrs(
+        self, edges: Iterable[Tuple[str, str]]
+    ) -> Dict[Tuple[str, str], Dict[str, Any]]:
+        """Get the attributes of many edges with batched UNWIND queries."""
+        records = self._read_batches(
+            self._queries.edges_attrs, [list(edge) for edge in dict.fromkeys(edges)]
+        )
+        return {
+            (record["source"], record["target"]): self._normalize_edge_props(
+                record["props"]
+            )
+            for record in records
+        }
 
     def get_nodes(self) -> Set[str]:
         """Get all nodes in the graph using name."""
-        with self._driver.session(database=self._database) as session:
-            result = session.run("MATCH (n) RETURN n.name AS name")
+        with self._session() as session:
+            result = session.run(self._queries.nodes)
             return {record["name"] for record in result}
 
+    def sample_nodes(self, k: int, rng: Optional[random.Random] = None) -> List[str]:
+        """
+        Pick k nodes uniformly at random, with replacement, in a single query.
+
+        The names are collected and sampled on the server, so only the k picked
+        names are sent back. Sampling uses the server's rand(), rng is ignored.
+        """
+        with self._session() as session:
+            result = session.run(self._queries.sample_nodes, k=k)
+            return [record["name"] for record in result]
+
     def get_random_node(self) -> str:
         """Get a random node from the graph using name."""
-        with self._driver.session(database=self._database) as session:
-            result = session.run(
-                """
-                MATCH (n) 
-                RETURN n.name AS name
-                LIMIT 1
-                """
-            )
-            record = result.single()
-            return record["name"] if record else None
+        nodes = self.sample_nodes(1)
+        return nodes[0] if nodes else None
 
     def get_edges(self) -> List[Tuple[str, str, Dict[str, Any]]]:
         """Get all edges in the graph with their attributes using name."""
-        with self._driver.session(database=self._database) as session:
+        with self._session() as session:
+            result = session.run(self._queries.edges)
+            return [
+                (
+                    record["source"],
+                    record["target"],
+                    self._normalize_listed_edge(record["props"]),
+                )
+                for record in result
+            ]
+
+    @staticmethod
+    def _normalize_listed_edge(props: Dict[str, Any]) -> Dict[str, Any]:
+        """Normalize the properties of an edge listed by get_edges."""
+        props = props.copy()  # Make a copy to avoid modifying the original
+
+        # Normalize format to match NetworkX backend
+        normalized_props = {}
+
+        # Handle relation/edge property
+        relation_value = None
+        if "edge" in props:
+            relation_value = props.pop("edge")
+            normalized_props["relation"] = relation_value
+        elif "relation" in props:
+            relation_value = props["relation"]
+            normalized_props["relation"] = props.pop("relation")
+
+        # Create a sources list if it doesn't exist
+        if "sources" not in props:
+            # Use remaining properties as a single source entry
+            source_entry = props.copy()
+
+            # Add the relation to the source entry
+            if relation_value is not None:
+                source_entry["relation"] = relation_value
+                # Also add as 'edge' to match NetworkX format
+                source_entry["edge"] = relation_value
+
+            normalized_props["sources"] = [source_entry]
+        else:
+            # If sources already exists, use it and ensure each entry has both relation and edge
+            sources = props.pop("sources")
+            for source_entry in sources:
+                if "relation" in source_entry and "edge" not in source_entry:
+                    source_entry["edge"] = source_entry["relation"]
+                elif "edge" in source_entry and "relation" not in source_entry:
+                    source_entry["relation"] = source_entry["edge"]
+
+            normalized_props["sources"] = sources
+
+            # Add any remaining top-level properties to normalized_props
+            for k, v in props.items():
+                normalized_props[k] = v
+
+        return normalized_props
+
+    def _pages(
+        self,
+        build: Callable[[Optional[str], int], Tuple[str, Dict[str, Any]]],
+        key: str,
+    ) -> Iterator[List[Any]]:
+        """
+        Page through a query ordered by node name with keyset pagination.
+
+        Every page starts after the last name of the previous one, so that
+        pages are found through the name index however far the export is.
+        """
+        after = None
+        while True:
+            query, params = build(after, self.page_size)
+            with self._session() as session:
+                records = list(session.run(query, params))
+            if records:
+                yield records
+            if len(records) < self.page_size:
+                return
+            after = records[-1][key]
+
+    def iter_nodes(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Iterate over all nodes with their attributes, page_size at a time."""
+        for records in self._pages(self._queries.node_page, "name"):
+            for record in records:
+                yield record["name"], self._normalize_node_props(record["props"])
+
+    def iter_edges(self) -> Iterator[Tuple[str, str, Dict[str, Any]]]:
+        """
+        Iterate over all edges with their attributes, ordered by source.
+
+        Pages hold the edges of page_size source nodes and give the same
+        attributes as get_edges.
+        """
+        for records in self._pages(self._queries.edge_page, "source"):
+            for record in records:
+                source = record["source"]
+                for target, props in record["edges"]:
+                    yield source, target, self._normalize_listed_edge(props)
+
+    def export_graph_file(
+        self, path: str, config: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """
+        Write the graph to a binary graph file, streaming it page by page.
+
+        Args:
+            path (str): Path of the file to write
+            config (Optional[Dict[str, Any]]): Knowledge graph configuration to
+                store in the file
+        """
+        write_graph_file(path, self.iter_nodes(), self.iter_edges(), config)
+
+    def get_edges_by_relation(
+        self, relation: str
+    ) -> List[Tuple[str, str, Dict[str, Any]]]:
+        """Get all edges with the given relation using name."""
+        with self._session() as session:
+            result = session.run(*self._queries.find_edges(relation=relation))
+            edges = [(r["source"], r["target"], r["props"]) for r in result]
+            return self._normalize_edge_data(edges)
+
+    def find_edges(
+        self, relation: Optional[str] = None, nodes: Optional[Iterable[str]] = None
+    ) -> Iterator[Tuple[str, str, Dict[str, Any]]]:
+        """Stream the edges matching filters, filtered by a Cypher WHERE clause."""
+        query, params = self._queries.find_edges(relation, nodes)
+        with self._session() as session:
+            result = session.run(query, params)
+            for record in result:
+                yield self._normalize_edge_data(
+                    [(record["source"], record["target"], record["props"])]
+                )[0]
+
+    def induced_subgraph(
+        self, nodes: Iterable[str]
+    ) -> Tuple[List[Tuple[str, Dict[str, Any]]], List[Tuple[str, str, Dict[str, Any]]]]:
+        """Get nodes and the edges between them in a single query."""
+        with self._session() as session:
             result = session.run(
-                """
-                MATCH (source)-[r]->(target)
-                RETURN source.name as source, target.name as target, properties(r) AS props
-                """
+                self._queries.induced_subgraph, nodes=list(dict.fromkeys(nodes))
             )
+            node_attrs = []
             edges = []
             for record in result:
-                source = record["source"]
-                target = record["target"]
-                props = record[
-                    "props"
-                ].copy()  # Make a copy to avoid modifying the original
-
-                # Normalize format to match NetworkX backend
-                normalized_props = {}
-
-                # Handle relation/edge property
-                relation_value = None
-                if "edge" in props:
-                    relation_value = props.pop("edge")
-                    normalized_props["relation"] = relation_value
-                elif "relation" in props:
-                    relation_value = props["relation"]
-                    normalized_props["relation"] = props.pop("relation")
-
-                # Create a sources list if it doesn't exist
-                if "sources" not in props:
-                    # Use remaining properties as a single source entry
-                    source_entry = props.copy()
-
-                    # Add the relation to the source entry
-                    if relation_value is not None:
-                        source_entry["relation"] = relation_value
-                        # Also add as 'edge' to match NetworkX format
-                        source_entry["edge"] = relation_value
-
-                    normalized_props["sources"] = [source_entry]
-                else:
-                    # If sources already exists, use it and ensure each entry has both relation and edge
-                    sources = props.pop("sources")
-                    for source_entry in sources:
-                        if "relation" in source_entry and "edge" not in source_entry:
-                            source_entry["edge"] = source_entry["relation"]
-                        elif "edge" in source_entry and "relation" not in source_entry:
-                            source_entry["relation"] = source_entry["edge"]
-
-                    normalized_props["sources"] = sources
-
-                    # Add any remaining top-level properties to normalized_props
-                    for k, v in props.items():
-                        normalized_props[k] = v
-
-                edges.append((source, target, normalized_props))
-
-            return edges
+                name = record["name"]
+                node_attrs.append((name, self._normalize_node_props(record["props"])))
+                edges.extend((name, target, props) for target, props in record["edges"])
+        return node_attrs, self._normalize_edge_data(edges)
+
+    def neighborhood(
+        self, nodes: Iterable[str], hops: int = 1, limit: Optional[int] = None
+    ) -> List[str]:
+        """Get the nodes within hops of the given nodes, one query per hop."""
+        if hops < 0:
+            raise ValueError("hops must not be negative")
+        frontier = list(dict.fromkeys(nodes))
+        seen = dict.fromkeys(frontier)
+        found: List[str] = []
+        with self._session() as session:
+            for _ in range(hops):
+                if not frontier or (limit is not None and len(found) >= limit):
+                    break
+                query, params = self._queries.neighbors(frontier)
+                names = [record["name"] for record in session.run(query, params)]
+                frontier = next_neighborhood_level(seen, names, found, limit)
+        return found
+
+    def get_relation_types(self) -> Set[str]:
+        """Get the relations of the edges in the graph."""
+        with self._session() as session:
+            result = session.run(self._queries.relation_types)
+            return {record["relation"] for record in result}
+
+    def get_statistics(self) -> GraphStatistics:
+        """
+        Get the statistics of the graph.
+
+        The database keeps node and edge counts up to date; the degree histogram
+        and relation frequencies are aggregated on the server, so no node or edge
+        is sent back.
+        """
+        with self._session() as session:
+            num_nodes = session.run(self._queries.count_nodes).single()["count"]
+            num_edges = session.run(self._queries.count_edges).single()["count"]
+            degrees = session.run(self._queries.degree_histogram)
+            degree_histogram = {record["degree"]: record["count"] for record in degrees}
+            relations = session.run(self._queries.relation_counts)
+            relation_counts = {
+                record["relation"]: record["count"] for record in relations
+            }
+        return GraphStatistics(num_nodes, num_edges, degree_histogram, relation_counts)
 
     def get_successors(self, node: str) -> List[str]:
         """Get all successor nodes of a node using name."""
-        with self._driver.session(database=self._database) as session:
-            result = session.run(
-                """
-                MATCH (source)-[]->(target)
-                WHERE source.name = $id
-                RETURN target.name as id
-                """,
-                id=node,
-            )
+        with self._session() as session:
+            result = session.run(self._queries.successors, id=node)
             return [record["id"] for record in result]
 
     def get_predecessors(self, node: str) -> List[str]:
         """Get all predecessor nodes of a node using name."""
-        with self._driver.session(database=self._database) as session:
-            result = session.run(
-                """
-                MATCH (source)-[]->(target)
-                WHERE target.name = $id
-                RETURN source.name as id
-                """,
-                id=node,
-            )
+        with self._session() as session:
+            result = session.run(self._queries.predecessors, id=node)
             return [record["id"] for record in result]
 
-    def _normalize_edge_data(self, edges_data):
+    @staticmethod
+    def _normalize_edge_data(edges_data):
         """Normalize edge data to match NetworkX format, without adding triplet_ids."""
         normalized_edges = []
 
@@ -377,73 +975,58 @@ class Neo4jBackend(GraphBackend):
 
     def get_out_edges(self, node: str) -> List[Tuple[str, str, Dict[str, Any]]]:
         """Get all outgoing edges of a node with their attributes using name."""
-        with self._driver.session(database=self._database) as session:
-            result = session.run(
-                "MATCH (source)-[r]->(target) WHERE source.name = $id "
-                "RETURN source.name as source, target.name as target, properties(r) as props",
-                id=node,
-            )
+        with self._session() as session:
+            result = session.run(self._queries.out_edges, id=node)
             edges = [(r["source"], r["target"], r["props"]) for r in result]
             return self._normalize_edge_data(edges)
 
     def get_in_edges(self, node: str) -> List[Tuple[str, str, Dict[str, Any]]]:
         """Get all incoming edges of a node with their attributes using name."""
-        with self._driver.session(database=self._database) as session:
-            result = session.run(
-                "MATCH (source)-[r]->(target) WHERE target.name = $id "
-                "RETURN source.name as source, target.name as target, properties(r) as props",
-                id=node,
-            )
+        with self._session() as session:
+            result = session.run(self._queries.in_edges, id=node)
             edges = [(r["source"], r["target"], r["props"].copy()) for r in result]
             return self._normalize_edge_data(edges)
 
     def remove_node(self, node: str) -> None:
         """Remove a node and all its edges using name."""
-        with self._driver.session(database=self._database) as session:
+        # The session stays open, consuming commits the write and raises errors
+        with self._session() as session:
             session.run(
-                """
-                MATCH (n)
+                f"""
+                MATCH (n:{self._label})
                 WHERE n.name = $id
                 DETACH DELETE n
                 """,
                 id=node,
-            )
+            ).consume()
 
     def number_of_edges(self) -> int:
         """Get the total number of edges in the graph."""
-        with self._driver.session(database=self._database) as session:
-            result = session.run("MATCH ()-[r]->() RETURN count(r) AS count")
+        with self._session() as session:
+            result = session.run(self._queries.count_edges)
             return result.single()["count"]
 
     def shortest_path(
         self, source: str, target: str, directed: bool = True
     ) -> List[str]:
         """Get the shortest path between two nodes using name."""
-        with self._driver.session(database=self._database) as session:
-            if directed:
-                query = """
-                MATCH (source), (target)
-                WHERE source.name = $source AND target.name = $target
-                MATCH path = shortestPath((source)-[*]->(target))
-                RETURN [node.name for node IN nodes(path)] AS path
-                """
-            else:
-                query = """
-                MATCH (source), (target)
-                WHERE source.name = $source AND target.name = $target
-                MATCH path = shortestPath((source)-[*]-(target))
-                RETURN [node.name for node IN nodes(path)] AS path
-                """
+        if directed:
+            query = self._queries.shortest_path
+        else:
+            query = self._queries.undirected_shortest_path
+        with self._session() as session:
             result = session.run(query, source=source, target=target)
             record = result.single()
             return record["path"] if record else []
 
     def __len__(self) -> int:
         """Get the total number of nodes in the graph."""
-        with self._driver.session(database=self._database) as session:
-            result = session.run("MATCH (n) RETURN count(n) as count")
+        with self._session() as session:
+            result = session.run(self._queries.count_nodes)
             return result.single()["count"]
 
     def __del__(self):
         """Clean up Neo4j driver connection."""
-        self._close()
+        # __init__ may have failed before connecting
+        if hasattr(self, "_sessions_lock"):
+            self._close()
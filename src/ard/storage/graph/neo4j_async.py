@@ -0,0 +1,300 @@
+import asyncio
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Set, Tuple
+
+from neo4j import AsyncGraphDatabase
+
+from ard.storage.graph.neo4j import (
+    DEFAULT_NODE_LABEL,
+    DEFAULT_RELATIONSHIP_TYPE,
+    DEFAULT_WRITE_BATCH_SIZE,
+    CypherQueries,
+    Neo4jBackend,
+    next_neighborhood_level,
+)
+from ard.storage.graph.statistics import GraphStatistics
+
+DEFAULT_POOL_SIZE = 100
+
+
+class AsyncNeo4jBackend:
+    """
+    Asynchronous, read-only access to a graph stored in Neo4j.
+
+    Has coroutine versions of the GraphBackend read methods, running the same
+    queries as Neo4jBackend and returning the same values. Every call takes its
+    own session from the connection pool of the driver, so that calls made
+    concurrently from one event loop run in parallel on up to pool_size
+    connections. Graphs are written with Neo4jBackend, using the same node
+    label and relationship type.
+    """
+
+    def __init__(
+        self,
+        uri: str = "bolt://localhost:7687",
+        user: str = "neo4j",
+        password: str = "password",
+        database: str = "neo4j",
+        pool_size: int = DEFAULT_POOL_SIZE,
+        batch_size: int = DEFAULT_WRITE_BATCH_SIZE,
+        node_label: str = DEFAULT_NODE_LABEL,
+        relationship_type: str = DEFAULT_RELATIONSHIP_TYPE,
+    ):
+        """
+        Initialize a new asynchronous Neo4j backend.
+
+        Args:
+            uri (str): The Neo4j database URI
+            user (str): The database user
+            password (str): The database password
+            database (str): The database name
+            pool_size (int): Maximum number of connections, shared by all calls
+            batch_size (int): Number of nodes or edges read per bulk query
+            node_label (str): Label of the nodes of the graph
+            relationship_type (str): Type of the relationships of the graph
+        """
+        if pool_size < 1 or batch_size < 1:
+            raise ValueError("pool_size and batch_size must be at least 1")
+        self._queries = CypherQueries(node_label, relationship_type)
+        self._driver = AsyncGraphDatabase.driver(
+            uri, auth=(user, password), max_connection_pool_size=pool_size
+        )
+        self._database = database
+        self.pool_size = pool_size
+        self.batch_size = batch_size
+
+    async def close(self) -> None:
+        """Close the driver and its connection pool."""
+        await self._driver.close()
+
+    async def __aenter__(self) -> "AsyncNeo4jBackend":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def _records(
+        self, query: str, params: Optional[Dict[str, Any]] = None, **kwargs
+    ) -> List[Any]:
+        """Run a read query in a session of its own and get all its records."""
+        async with self._driver.session(database=self._database) as session:
+            result = await session.run(query, params, **kwargs)
+            return [record async for record in result]
+
+    async def _count(self, query: str, **kwargs) -> int:
+        records = await self._records(query, **kwargs)
+        return records[0]["count"] if records else 0
+
+    async def _read_batches(self, query: str, rows: List[Any]) -> List[Any]:
+        """Run a read query with UNWIND over rows, the batches concurrently."""
+        batches = await asyncio.gather(
+            *(
+                self._records(query, rows=rows[i : i + self.batch_size])
+                for i in range(0, len(rows), self.batch_size)
+            )
+        )
+        return [record for batch in batches for record in batch]
+
+    async def has_node(self, node: str) -> bool:
+        """Check if a node exists in the graph."""
+        return await self._count(self._queries.has_node, name=node) > 0
+
+    async def has_edge(self, source: str, target: str) -> bool:
+        """Check if an edge exists."""
+        count = await self._count(self._queries.has_edge, source=source, target=target)
+        return count > 0
+
+    async def get_node_attrs(self, node: str) -> Dict[str, Any]:
+        """Get all attributes of a node, or an empty dict if it does not exist."""
+        records = await self._records(self._queries.node_attrs, id=node)
+        if not records:
+            return {}
+        return Neo4jBackend._normalize_node_props(records[0]["props"])
+
+    async def get_edge_attrs(self, source: str, target: str) -> Dict[str, Any]:
+        """Get all attributes of an edge, or an empty dict if it does not exist."""
+        records = await self._records(
+            self._queries.edge_attrs, source=source, target=target
+        )
+        if not records:
+            return {}
+        return Neo4jBackend._normalize_edge_props(records[0]["props"])
+
+    async def get_nodes_attrs(self, nodes: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Get the attributes of many nodes, leaving out missing ones."""
+        records = await self._read_batches(
+            self._queries.nodes_attrs, list(dict.fromkeys(nodes))
+        )
+        return {
+            record["name"]: Neo4jBackend._normalize_node_props(record["props"])
+            for record in records
+        }
+
+    async def get_edges_attrs(
+        self, edges: Iterable[Tuple[str, str]]
+    ) -> Dict[Tuple[str, str], Dict[str, Any]]:
+        """Get the attributes of many edges, leaving out missing ones."""
+        records = await self._read_batches(
+            self._queries.edges_attrs, [list(edge) for edge in dict.fromkeys(edges)]
+        )
+        return {
+            (record["source"], record["target"]): Neo4jBackend._normalize_edge_props(
+                record["props"]
+            )
+            for record in records
+        }
+
+    async def get_nodes(self) -> Set[str]:
+        """Get all nodes in the graph."""
+        records = await self._records(self._queries.nodes)
+        return {record["name"] for record in records}
+
+    async def sample_nodes(self, k: int) -> List[str]:
+        """Pick k nodes uniformly at random, with replacement, on the server."""
+        records = await self._records(self._queries.sample_nodes, k=k)
+        return [record["name"] for record in records]
+
+    async def get_edges(self) -> List[Tuple[str, str, Dict[str, Any]]]:
+        """Get all edges in the graph with their attributes."""
+        records = await self._records(self._queries.edges)
+        return [
+            (
+                record["source"],
+                record["target"],
+                Neo4jBackend._normalize_listed_edge(record["props"]),
+            )
+            for record in records
+        ]
+
+    async def find_edges(
+        self, relation: Optional[str] = None, nodes: Optional[Iterable[str]] = None
+    ) -> AsyncIterator[Tuple[str, str, Dict[str, Any]]]:
+        """
+        Stream the edges matching filters.
+
+        Args:
+            relation (Optional[str]): Only edges with this relation
+            nodes (Optional[Iterable[str]]): Only edges from or to these nodes
+
+        Yields:
+            Tuple[str, str, Dict[str, Any]]: (source, target, attributes)
+        """
+        query, params = self._queries.find_edges(relation, nodes)
+        async with self._driver.session(database=self._database) as session:
+            result = await session.run(query, params)
+            async for record in result:
+                yield Neo4jBackend._normalize_edge_data(
+                    [(record["source"], record["target"], record["props"])]
+                )[0]
+
+    async def get_edges_by_relation(
+        self, relation: str
+    ) -> List[Tuple[str, str, Dict[str, Any]]]:
+        """Get all edges with the given relation."""
+        return [edge async for edge in self.find_edges(relation=relation)]
+
+    async def induced_subgraph(
+        self, nodes: Iterable[str]
+    ) -> Tuple[List[Tuple[str, Dict[str, Any]]], List[Tuple[str, str, Dict[str, Any]]]]:
+        """Get nodes with their attributes and all edges between them."""
+        records = await self._records(
+            self._queries.induced_subgraph, nodes=list(dict.fromkeys(nodes))
+        )
+        node_attrs = []
+        edges = []
+        for record in records:
+            name = record["name"]
+            node_attrs.append(
+                (name, Neo4jBackend._normalize_node_props(record["props"]))
+            )
+            edges.extend((name, target, props) for target, props in record["edges"])
+        return node_attrs, Neo4jBackend._normalize_edge_data(edges)
+
+    async def neighborhood(
+        self, nodes: Iterable[str], hops: int = 1, limit: Optional[int] = None
+    ) -> List[str]:
+        """Get the nodes within hops of the given nodes, one query per hop."""
+        if hops < 0:
+            raise ValueError("hops must not be negative")
+        frontier = list(dict.fromkeys(nodes))
+        seen = dict.fromkeys(frontier)
+        found: List[str] = []
+        for _ in range(hops):
+            if not frontier or (limit is not None and len(found) >= limit):
+                break
+            query, params = self._queries.neighbors(frontier)
+            records = await self._records(query, params)
+            names = [record["name"] for record in records]
+            frontier = next_neighborhood_level(seen, names, found, limit)
+        return found
+
+    async def get_relation_types(self) -> Set[str]:
+        """Get the relations of the edges in the graph."""
+        records = await self._records(self._queries.relation_types)
+        return {record["relation"] for record in records}
+
+    async def get_statistics(self) -> GraphStatistics:
+        """Get the statistics of the graph, running its queries concurrently."""
+        num_nodes, num_edges, degrees, relations = await asyncio.gather(
+            self._count(self._queries.count_nodes),
+            self._count(self._queries.count_edges),
+            self._records(self._queries.degree_histogram),
+            self._records(self._queries.relation_counts),
+        )
+        return GraphStatistics(
+            num_nodes,
+            num_edges,
+            {record["degree"]: record["count"] for record in degrees},
+            {record["relation"]: record["count"] for record in relations},
+        )
+
+    async def get_successors(self, node: str) -> List[str]:
+        """Get all successor nodes of a node."""
+        records = await self._records(self._queries.successors, id=node)
+        return [record["id"] for record in records]
+
+    async def get_predecessors(self, node: str) -> List[str]:
+        """Get all predecessor nodes of a node."""
+        records = await self._records(self._queries.predecessors, id=node)
+        return [record["id"] for record in records]
+
+    async def get_neighbors(self, node: str) -> List[str]:
+        """Get the distinct successors and predecessors of a node."""
+        successors, predecessors = await asyncio.gather(
+            self.get_successors(node), self.get_predecessors(node)
+        )
+        neighbors = set(successors)
+        neighbors.update(predecessors)
+        return list(neighbors)
+
+    async def get_out_edges(self, node: str) -> List[Tuple[str, str, Dict[str, Any]]]:
+        """Get all outgoing edges of a node with their attributes."""
+        records = await self._records(self._queries.out_edges, id=node)
+        return Neo4jBackend._normalize_edge_data(
+            [(r["source"], r["target"], r["props"]) for r in records]
+        )
+
+    async def get_in_edges(self, node: str) -> List[Tuple[str, str, Dict[str, Any]]]:
+        """Get all incoming edges of a node with their attributes."""
+        records = await self._records(self._queries.in_edges, id=node)
+        return Neo4jBackend._normalize_edge_data(
+            [(r["source"], r["target"], r["props"]) for r in records]
+        )
+
+    async def number_of_nodes(self) -> int:
+        """Get the total number of nodes in the graph."""
+        return await self._count(self._queries.count_nodes)
+
+    async def number_of_edges(self) -> int:
+        """Get the total number of edges in the graph."""
+        return await self._count(self._queries.count_edges)
+
+    async def shortest_path(
+        self, source: str, target: str, directed: bool = True
+    ) -> List[str]:
+        """Get the shortest path between two nodes, or an empty list."""
+        if directed:
+            query = self._queries.shortest_path
+        else:
+            query = self._queries.undirected_shortest_path
+        records = await self._records(query, source=source, target=target)
+        return records[0]["path"] if records else []
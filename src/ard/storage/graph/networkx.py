@@ -1,18 +1,31 @@
-from typing import Any, Dict, List, Set, Tuple
+import random
+from collections import Counter
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
 import networkx as nx
+import numpy as np
 
 from ard.storage.graph import GraphBackend
+from ard.storage.graph.merge import MergeGroups, merge_edges, plan_merges
+from ard.storage.graph.statistics import GraphStatistics
+from ard.utils.indexed_set import IndexedSet
 
 
 class NetworkXBackend(GraphBackend):
     """
     NetworkX backend implementation for the knowledge graph.
+
+    The node index used for random sampling and the relation index with the
+    graph statistics are built the first time they are needed and then kept up
+    to date by the methods of the backend.
     """
 
     def __init__(self):
         """Initialize a new NetworkX backend."""
         self._graph = nx.DiGraph()
+        self._node_index: Optional[IndexedSet] = None
+        self._statistics: Optional[GraphStatistics] = None
+        self._relation_edges: Dict[str, Dict[Tuple[str, str], None]] = {}
 
     @classmethod
     def from_networkx(cls, graph: nx.DiGraph):
@@ -67,8 +80,125 @@ class NetworkXBackend(GraphBackend):
 
         return {"nodes": nodes, "edges": edges}
 
+    # Index maintenance. The _track methods run before the graph is changed.
+
+    def _tracking(self) -> bool:
+        return self._node_index is not None or self._statistics is not None
+
+    def _track_node(self, node: str) -> None:
+        if self._node_index is not None:
+            self._node_index.add(node)
+        if self._statistics is not None and node not in self._graph:
+            self._statistics.add_node()
+
+    def _track_edge(self, source: str, target: str, attrs: Dict[str, Any]) -> None:
+        if self._node_index is not None:
+            self._node_index.add(source)
+            self._node_index.add(target)
+        statistics = self._statistics
+        if statistics is None:
+            return
+
+        # The adjacency dicts of the graph, much cheaper than its views
+        succ = self._graph._succ
+        pred = self._graph._pred
+        current = succ[source].get(target) if source in succ else None
+        if current is not None:
+            if "relation" in attrs:
+                self._untrack_relation(source, target, current.get("relation"))
+                self._track_relation(source, target, attrs["relation"])
+            return
+
+        increment = 2 if source == target else 1
+        for node in (source,) if source == target else (source, target):
+            if node in succ:
+                degree = len(succ[node]) + len(pred[node])
+            else:
+                statistics.add_node()
+                degree = 0
+            statistics.change_degree(degree, degree + increment)
+        statistics.num_edges += 1
+        self._track_relation(source, target, attrs.get("relation"))
+
+    def _track_relation(self, source: str, target: str, relation: Any) -> None:
+        if isinstance(relation, str):
+            self._statistics.change_relation(None, relation)
+            self._relation_edges.setdefault(relation, {})[source, target] = None
+
+    def _untrack_relation(self, source: str, target: str, relation: Any) -> None:
+        if isinstance(relation, str):
+            self._statistics.change_relation(relation, None)
+            edges = self._relation_edges[relation]
+            del edges[source, target]
+            if not edges:
+                del self._relation_edges[relation]
+
+    def _untrack_node(self, node: str) -> None:
+        if self._node_index is not None:
+            self._node_index.discard(node)
+        statistics = self._statistics
+        graph = self._graph
+        if statistics is None or node not in graph:
+            return
+
+        successors = graph.succ[node]
+        predecessors = graph.pred[node]
+        for target, attrs in successors.items():
+            self._untrack_relation(node, target, attrs.get("relation"))
+        for source, attrs in predecessors.items():
+            if source != node:
+                self._untrack_relation(source, node, attrs.get("relation"))
+
+        for neighbor in set(successors).union(predecessors):
+            if neighbor != node:
+                degree = graph.degree(neighbor)
+                lost = (neighbor in successors) + (neighbor in predecessors)
+                statistics.change_degree(degree, degree - lost)
+        self_loops = 1 if node in successors else 0
+        statistics.num_edges -= len(successors) + len(predecessors) - self_loops
+        statistics.remove_node(graph.degree(node))
+
+    def _track_nodes(
+        self, nodes: Iterable[Tuple[str, Dict[str, Any]]]
+    ) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Pass nodes through, tracking each one before NetworkX adds it."""
+        for node in nodes:
+            self._track_node(node[0])
+            yield node
+
+    def _track_edges(
+        self, edges: Iterable[Tuple[str, str, Dict[str, Any]]]
+    ) -> Iterator[Tuple[str, str, Dict[str, Any]]]:
+        """Pass edges through, tracking each one before NetworkX adds it."""
+        for edge in edges:
+            self._track_edge(*edge)
+            yield edge
+
+    def _get_statistics(self) -> GraphStatistics:
+        """Get the maintained statistics, building them and the relation index."""
+        graph = self._graph
+        statistics = self._statistics
+        # The graph is public, so rebuild if nodes were added or removed directly
+        if statistics is None or statistics.num_nodes != len(graph):
+            self._relation_edges = {}
+            for source, target, relation in graph.edges(data="relation"):
+                if isinstance(relation, str):
+                    self._relation_edges.setdefault(relation, {})[source, target] = None
+            statistics = self._statistics = GraphStatistics(
+                num_nodes=len(graph),
+                num_edges=graph.number_of_edges(),
+                degree_histogram=dict(Counter(degree for _, degree in graph.degree())),
+                relation_counts={
+                    relation: len(edges)
+                    for relation, edges in self._relation_edges.items()
+                },
+            )
+        return statistics
+
     def add_node(self, node: str, **attrs) -> None:
         """Add a node with optional attributes."""
+        if self._tracking():
+            self._track_node(node)
         self._graph.add_node(node, **attrs)
 
     def has_node(self, node: str) -> bool:
@@ -77,8 +207,22 @@ class NetworkXBackend(GraphBackend):
 
     def add_edge(self, source: str, target: str, **attrs) -> None:
         """Add an edge with optional attributes."""
+        if self._tracking():
+            self._track_edge(source, target, attrs)
         self._graph.add_edge(source, target, **attrs)
 
+    def add_nodes(self, nodes: Iterable[Tuple[str, Dict[str, Any]]]) -> None:
+        """Add or update many nodes at once."""
+        if self._tracking():
+            nodes = self._track_nodes(nodes)
+        self._graph.add_nodes_from(nodes)
+
+    def add_edges(self, edges: Iterable[Tuple[str, str, Dict[str, Any]]]) -> None:
+        """Add or update many edges at once."""
+        if self._tracking():
+            edges = self._track_edges(edges)
+        self._graph.add_edges_from(edges)
+
     def has_edge(self, source: str, target: str) -> bool:
         """Check if an edge exists."""
         return self._graph.has_edge(source, target)
@@ -95,10 +239,75 @@ class NetworkXBackend(GraphBackend):
         """Get all nodes in the graph."""
         return set(self._graph.nodes())
 
+    def sample_nodes(self, k: int, rng: Optional[random.Random] = None) -> List[str]:
+        """Pick k nodes uniformly at random, with replacement, in O(k)."""
+        # The graph is public, so rebuild the index if it was changed directly
+        if self._node_index is None or len(self._node_index) != len(self._graph):
+            self._node_index = IndexedSet(self._graph)
+        return self._node_index.sample(k, rng)
+
     def get_edges(self) -> List[Tuple[str, str, Dict[str, Any]]]:
         """Get all edges in the graph with their attributes."""
         return list(self._graph.edges(data=True))
 
+    @property
+    def native_edge_arrays(self) -> bool:
+        """Edge arrays are built from the graph in memory."""
+        return True
+
+    def edge_arrays(self) -> Tuple[List[str], np.ndarray, np.ndarray]:
+        """Get the edges as arrays of node ids, numbered in insertion order."""
+        names = list(self._graph)
+        ids = {name: i for i, name in enumerate(names)}
+        num_edges = self._graph.number_of_edges()
+        sources = np.fromiter(
+            (ids[source] for source, _ in self._graph.edges()), np.int32, num_edges
+        )
+        targets = np.fromiter(
+            (ids[target] for _, target in self._graph.edges()), np.int32, num_edges
+        )
+        return names, sources, targets
+
+    def get_edges_by_relation(
+        self, relation: str
+    ) -> List[Tuple[str, str, Dict[str, Any]]]:
+        """Get all edges with the given relation from the relation index."""
+        self._get_statistics()
+        adj = self._graph.adj
+        return [
+            (source, target, adj[source][target])
+            for source, target in self._relation_edges.get(relation, ())
+        ]
+
+    def get_relation_types(self) -> Set[str]:
+        """Get the relations of the edges in the graph."""
+        return self._get_statistics().relation_types
+
+    def get_statistics(self) -> GraphStatistics:
+        """Get the statistics of the graph, maintained on every change."""
+        return self._get_statistics().copy()
+
+    def iter_nodes(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Iterate over all nodes with their attributes, in insertion order."""
+        return iter(self._graph.nodes(data=True))
+
+    def iter_edges(self) -> Iterator[Tuple[str, str, Dict[str, Any]]]:
+        """Iterate over all edges with their attributes, grouped by source."""
+        return iter(self._graph.edges(data=True))
+
+    def induced_subgraph(
+        self, nodes: Iterable[str]
+    ) -> Tuple[List[Tuple[str, Dict[str, Any]]], List[Tuple[str, str, Dict[str, Any]]]]:
+        """Get nodes and the edges between them with DiGraph.subgraph."""
+        subgraph = self._graph.subgraph(nodes)
+        return (
+            [(node, dict(attrs)) for node, attrs in subgraph.nodes(data=True)],
+            [
+                (source, target, dict(attrs))
+                for source, target, attrs in subgraph.edges(data=True)
+            ],
+        )
+
     def get_successors(self, node: str) -> List[str]:
         """Get all successor nodes of a node."""
         return list(self._graph.successors(node))
@@ -117,8 +326,42 @@ class NetworkXBackend(GraphBackend):
 
     def remove_node(self, node: str) -> None:
         """Remove a node and all its edges."""
+        if self._tracking():
+            self._untrack_node(node)
         self._graph.remove_node(node)
 
+    def merge_nodes(self, groups: MergeGroups) -> None:
+        """
+        Merge groups of nodes, each into a single node, in one pass.
+
+        Node and edge attributes are read straight from the adjacency dicts of
+        the graph, without copying them.
+        """
+        graph = self._graph
+        succ = graph._succ
+        pred = graph._pred
+        plan = plan_merges(groups, graph.__contains__, graph._node.get)
+
+        def incident_edges(node: str):
+            return (
+                ((node, target, data) for target, data in succ[node].items()),
+                ((source, node, data) for source, data in pred[node].items()),
+            )
+
+        def edge_attrs(source: str, target: str) -> Optional[Dict[str, Any]]:
+            return succ[source].get(target) if source in succ else None
+
+        edges = merge_edges(plan, incident_edges, edge_attrs)
+        if self._tracking():
+            for node in plan.relabel:
+                self.remove_node(node)
+        else:
+            graph.remove_nodes_from(list(plan.relabel))
+        self.add_nodes(plan.nodes.items())
+        self.add_edges(
+            (source, target, attrs) for (source, target), attrs in edges.items()
+        )
+
     def number_of_edges(self) -> int:
         """Get the total number of edges in the graph."""
         return self._graph.number_of_edges()
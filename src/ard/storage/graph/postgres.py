@@ -0,0 +1,521 @@
+import uuid
+from itertools import groupby
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+import networkx as nx
+import psycopg2
+
+from ard.data.triplets import Triplet
+from ard.storage.graph.base import GraphBackend
+from ard.storage.graph.statistics import GraphStatistics
+from ard.utils.postgres import get_db_connection_string
+
+DEFAULT_TABLE = "papers"
+DEFAULT_PAGE_SIZE = 10_000
+DEFAULT_MAX_PATH_LENGTH = 10
+
+# Order of the rows of an edge, the first one gives the relation of the edge
+_ROW_ORDER = "paper_hash, predicate, source_file"
+
+
+def _quote(table: str) -> str:
+    """Quote a table name, optionally qualified with a schema, for SQL."""
+    parts = table.split(".")
+    if not all(parts):
+        raise ValueError(f"Invalid table name: {table!r}")
+    return ".".join('"' + part.replace('"', '""') + '"' for part in parts)
+
+
+def _source(predicate: str, paper_hash: str, source_file: str) -> Dict[str, Any]:
+    """Get the provenance of a row, as gathered by TripletIngestor."""
+    return {"relation": predicate, "paper_hash": paper_hash, "source_file": source_file}
+
+
+def _group_edges(
+    rows: Iterable[Tuple[str, str, str, str, str]],
+) -> Iterator[Tuple[str, str, Dict[str, Any]]]:
+    """Turn rows ordered by subject and object into edges with attributes."""
+    for (source, target), group in groupby(rows, key=lambda row: (row[0], row[1])):
+        sources = [_source(*row[2:]) for row in group]
+        yield source, target, {"relation": sources[0]["relation"], "sources": sources}
+
+
+def _group_nodes(
+    rows: Iterable[Tuple[str, str, str, str]],
+) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """Turn rows ordered by node into nodes with attributes."""
+    for node, group in groupby(rows, key=lambda row: row[0]):
+        yield node, {"sources": [_source(*row[1:]) for row in group]}
+
+
+class PostgresBackend(GraphBackend):
+    """
+    Read-only graph view of the triplet table written by ard.utils.postgres.
+
+    Every row (subject, predicate, object, paper_hash, source_file) of the table
+    is a triplet. Nodes are the subjects and objects, and all rows between the
+    same subject and object make up one edge. As with TripletIngestor, every
+    row is a source of the edge and of both of its nodes; the relation of an
+    edge is the predicate of its first row in (paper_hash, predicate) order.
+
+    Neighbor lookups go through indexes on (subject, object) and (object,
+    subject), which are created when missing. Traversals expand a whole
+    frontier of nodes per query, and full scans are streamed with server-side
+    cursors. All write operations raise NotImplementedError, rows are added
+    with insert_paper_triplets.
+    """
+
+    def __init__(
+        self,
+        dsn: Optional[str] = None,
+        table: str = DEFAULT_TABLE,
+        create_indexes: bool = True,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        max_path_length: int = DEFAULT_MAX_PATH_LENGTH,
+    ) -> None:
+        """
+        Connect to a triplet table.
+
+        Args:
+            dsn (Optional[str]): PostgreSQL connection string, read from the
+                POSTGRES_* environment variables by default
+            table (str): Name of the triplet table, optionally with a schema
+            create_indexes (bool): Create the indexes used by the graph queries
+                if they don't exist
+            page_size (int): Number of rows fetched at once by streaming reads
+            max_path_length (int): Maximum number of edges of a shortest path,
+                bounding the number of frontier expansions
+
+        Raises:
+            ValueError: If page_size or max_path_length is less than 1
+        """
+        if page_size < 1 or max_path_length < 1:
+            raise ValueError("page_size and max_path_length must be at least 1")
+        self.table = table
+        self.page_size = page_size
+        self.max_path_length = max_path_length
+        self._table = _quote(table)
+        self._conn = psycopg2.connect(dsn or get_db_connection_string())
+        # Reads run outside of transactions, streams use holdable cursors
+        self._conn.autocommit = True
+        if create_indexes:
+            self.create_indexes()
+        self._conn.set_session(readonly=True)
+
+    def create_indexes(self) -> None:
+        """Create the indexes of the graph queries if they don't exist."""
+        name = self.table.split(".")[-1]
+        with self._conn.cursor() as cursor:
+            for suffix, columns in (
+                ("subject_object", "subject, object"),
+                ("object_subject", "object, subject"),
+                ("predicate", "predicate"),
+            ):
+                index = _quote(f"{name}_{suffix}_idx")
+                cursor.execute(
+                    f"CREATE INDEX IF NOT EXISTS {index} ON {self._table} ({columns})"
+                )
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
+
+    def _rows(self, query: str, params: Optional[Dict[str, Any]] = None) -> List[Any]:
+        with self._conn.cursor() as cursor:
+            cursor.execute(query, params)
+            return cursor.fetchall()
+
+    def _stream(
+        self, query: str, params: Optional[Dict[str, Any]] = None
+    ) -> Iterator[Any]:
+        """Run a query with a server-side cursor, fetching page_size rows at once."""
+        name = f"ard_{uuid.uuid4().hex}"
+        with self._conn.cursor(name, withhold=True) as cursor:
+            cursor.itersize = self.page_size
+            cursor.execute(query, params)
+            yield from cursor
+
+    def _edge_query(self, where: str = "") -> str:
+        return (
+            "SELECT subject, object, predicate, paper_hash, source_file "
+            f"FROM {self._table} {where} ORDER BY subject, object, {_ROW_ORDER}"
+        )
+
+    def _node_query(self, where: str = "") -> str:
+        columns = "predicate, paper_hash, source_file"
+        subject_where = where.format(column="subject")
+        object_where = where.format(column="object")
+        return (
+            f"SELECT subject AS node, {columns} FROM {self._table} {subject_where} "
+            f"UNION ALL SELECT object, {columns} FROM {self._table} {object_where} "
+            f"ORDER BY node, {_ROW_ORDER}"
+        )
+
+    def _existing(self, nodes: List[str]) -> Set[str]:
+        """Get those of the nodes that are in the graph."""
+        rows = self._rows(
+            f"SELECT subject FROM {self._table} WHERE subject = ANY(%(nodes)s) "
+            f"UNION SELECT object FROM {self._table} WHERE object = ANY(%(nodes)s)",
+            {"nodes": nodes},
+        )
+        return {row[0] for row in rows}
+
+    def _expand(
+        self, frontier: List[str], outgoing: bool, directed: bool = True
+    ) -> List[Tuple[str, str]]:
+        """Get the (node, neighbor) pairs of a frontier of nodes, in one query."""
+        forward = (
+            f"SELECT subject, object FROM {self._table} WHERE subject = ANY(%(nodes)s)"
+        )
+        backward = (
+            f"SELECT object, subject FROM {self._table} WHERE object = ANY(%(nodes)s)"
+        )
+        if not directed:
+            query = f"{forward} UNION {backward}"
+        else:
+            query = "SELECT DISTINCT * FROM ({}) pairs".format(
+                forward if outgoing else backward
+            )
+        return self._rows(f"{query} ORDER BY 1, 2", {"nodes": frontier})
+
+    def _read_only(self) -> NotImplementedError:
+        return NotImplementedError(f"{type(self).__name__} is read-only")
+
+    def add_node(self, node: str, **attrs) -> None:
+        """Not supported, the graph is read-only."""
+        raise self._read_only()
+
+    def add_edge(self, source: str, target: str, **attrs) -> None:
+        """Not supported, the graph is read-only."""
+        raise self._read_only()
+
+    def remove_node(self, node: str) -> None:
+        """Not supported, the graph is read-only."""
+        raise self._read_only()
+
+    def has_node(self, node: str) -> bool:
+        """Check if a node exists, through the subject and object indexes."""
+        return bool(self._existing([node]))
+
+    def has_edge(self, source: str, target: str) -> bool:
+        """Check if an edge exists."""
+        rows = self._rows(
+            f"SELECT EXISTS (SELECT 1 FROM {self._table} "
+            "WHERE subject = %(source)s AND object = %(target)s)",
+            {"source": source, "target": target},
+        )
+        return rows[0][0]
+
+    def get_node_attrs(self, node: str) -> Dict[str, Any]:
+        """Get all attributes of a node."""
+        attrs = self.get_nodes_attrs([node])
+        if node not in attrs:
+            raise KeyError(f"Node not found: {node}")
+        return attrs[node]
+
+    def get_edge_attrs(self, source: str, target: str) -> Dict[str, Any]:
+        """Get all attributes of an edge."""
+        rows = self._rows(
+            self._edge_query("WHERE subject = %(source)s AND object = %(target)s"),
+            {"source": source, "target": target},
+        )
+        if not rows:
+            raise KeyError(f"Edge not found: ({source}, {target})")
+        return next(_group_edges(rows))[2]
+
+    def get_nodes_attrs(self, nodes: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Get the attributes of many nodes in one query, leaving out missing ones."""
+        rows = self._rows(
+            self._node_query("WHERE {column} = ANY(%(nodes)s)"),
+            {"nodes": list(dict.fromkeys(nodes))},
+        )
+        return dict(_group_nodes(rows))
+
+    def get_edges_attrs(
+        self, edges: Iterable[Tuple[str, str]]
+    ) -> Dict[Tuple[str, str], Dict[str, Any]]:
+        """Get the attributes of many edges in one query, leaving out missing ones."""
+        edges = list(dict.fromkeys(edges))
+        rows = self._rows(
+            self._edge_query(
+                "WHERE (subject, object) IN (SELECT * FROM "
+                "unnest(%(sources)s::text[], %(targets)s::text[]))"
+            ),
+            {
+                "sources": [source for source, _ in edges],
+                "targets": [target for _, target in edges],
+            },
+        )
+        return {(source, target): attrs for source, target, attrs in _group_edges(rows)}
+
+    def get_nodes(self) -> Set[str]:
+        """Get all nodes in the graph."""
+        return {
+            row[0]
+            for row in self._stream(
+                f"SELECT subject FROM {self._table} "
+                f"UNION SELECT object FROM {self._table}"
+            )
+        }
+
+    def get_edges(self) -> List[Tuple[str, str, Dict[str, Any]]]:
+        """Get all edges in the graph with their attributes."""
+        return list(self.iter_edges())
+
+    def iter_nodes(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Stream all nodes with their attributes, in name order."""
+        return _group_nodes(self._stream(self._node_query()))
+
+    def iter_edges(self) -> Iterator[Tuple[str, str, Dict[str, Any]]]:
+        """Stream all edges with their attributes, in (source, target) order."""
+        return _group_edges(self._stream(self._edge_query()))
+
+    def iter_triplets(
+        self, paper_hashes: Optional[Iterable[str]] = None
+    ) -> Iterator[Triplet]:
+        """
+        Stream the rows of the table as triplets, in table order.
+
+        Args:
+            paper_hashes (Optional[Iterable[str]]): Only rows of these papers
+
+        Yields:
+            Triplet: A triplet per row, with paper_hash and source_file as metadata
+        """
+        query = (
+            "SELECT subject, predicate, object, paper_hash, source_file "
+            f"FROM {self._table}"
+        )
+        params = None
+        if paper_hashes is not None:
+            query += " WHERE paper_hash = ANY(%(papers)s)"
+            params = {"papers": list(paper_hashes)}
+        for subject, predicate, obj, paper_hash, source_file in self._stream(
+            query, params
+        ):
+            yield Triplet(
+                node_1=subject,
+                edge=predicate,
+                node_2=obj,
+                metadata={"paper_hash": paper_hash, "source_file": source_file},
+            )
+
+    def find_edges(
+        self, relation: Optional[str] = None, nodes: Optional[Iterable[str]] = None
+    ) -> Iterator[Tuple[str, str, Dict[str, Any]]]:
+        """Stream the edges matching filters, selected through the indexes."""
+        conditions = []
+        params: Dict[str, Any] = {}
+        if relation is not None:
+            conditions.append(
+                f"(subject, object) IN (SELECT subject, object FROM {self._table} "
+                "WHERE predicate = %(relation)s)"
+            )
+            params["relation"] = relation
+        if nodes is not None:
+            conditions.append("(subject = ANY(%(nodes)s) OR object = ANY(%(nodes)s))")
+            params["nodes"] = list(dict.fromkeys(nodes))
+        where = "WHERE " + " AND ".join(conditions) if conditions else ""
+        for source, target, attrs in _group_edges(
+            self._stream(self._edge_query(where), params)
+        ):
+            # An edge may have rows with the relation without it being the first
+            if relation is None or attrs["relation"] == relation:
+                yield source, target, attrs
+
+    def get_edges_by_relation(
+        self, relation: str
+    ) -> List[Tuple[str, str, Dict[str, Any]]]:
+        """Get all edges with the given relation, through the predicate index."""
+        return list(self.find_edges(relation=relation))
+
+    def induced_subgraph(
+        self, nodes: Iterable[str]
+    ) -> Tuple[List[Tuple[str, Dict[str, Any]]], List[Tuple[str, str, Dict[str, Any]]]]:
+        """Get nodes with their attributes and all edges between them, in two queries."""
+        nodes = list(dict.fromkeys(nodes))
+        node_attrs = self.get_nodes_attrs(nodes)
+        rows = self._rows(
+            self._edge_query(
+                "WHERE subject = ANY(%(nodes)s) AND object = ANY(%(nodes)s)"
+            ),
+            {"nodes": nodes},
+        )
+        return list(node_attrs.items()), list(_group_edges(rows))
+
+    def neighborhood(
+        self, nodes: Iterable[str], hops: int = 1, limit: Optional[int] = None
+    ) -> List[str]:
+        """Get the nodes within hops of the given nodes, one query per hop."""
+        if hops < 0:
+            raise ValueError("hops must not be negative")
+        nodes = list(dict.fromkeys(nodes))
+        existing = self._existing(nodes) if hops else set()
+        seen = {node: None for node in nodes if node in existing}
+        frontier = list(seen)
+        found: List[str] = []
+        for _ in range(hops):
+            if not frontier:
+                break
+            next_frontier = []
+            for _, neighbor in self._expand(frontier, True, directed=False):
+                if neighbor not in seen:
+                    seen[neighbor] = None
+                    next_frontier.append(neighbor)
+                    found.append(neighbor)
+                    if limit is not None and len(found) >= limit:
+                        return found
+            frontier = next_frontier
+        return found
+
+    def get_relation_types(self) -> Set[str]:
+        """Get the relations of the edges in the graph."""
+        return self.get_statistics().relation_types
+
+    def get_statistics(self) -> GraphStatistics:
+        """Get the statistics of the graph, aggregated by the database."""
+        edges = f"SELECT DISTINCT subject, object FROM {self._table}"
+        histogram = self._rows(
+            f"WITH edges AS ({edges}) "
+            "SELECT degree, count(*) FROM (SELECT node, count(*) AS degree FROM "
+            "(SELECT subject AS node FROM edges UNION ALL SELECT object FROM edges) "
+            "ends GROUP BY node) degrees GROUP BY degree"
+        )
+        relations = self._rows(
+            "SELECT predicate, count(*) FROM (SELECT DISTINCT ON (subject, object) "
+            f"predicate FROM {self._table} ORDER BY subject, object, {_ROW_ORDER}) "
+            "relations WHERE predicate IS NOT NULL GROUP BY predicate"
+        )
+        return GraphStatistics(
+            num_nodes=sum(count for _, count in histogram),
+            num_edges=sum(degree * count for degree, count in histogram) // 2,
+            degree_histogram=dict(histogram),
+            relation_counts=dict(relations),
+        )
+
+    def _adjacent(self, node: str, outgoing: bool) -> List[str]:
+        neighbors = [neighbor for _, neighbor in self._expand([node], outgoing)]
+        if not neighbors and not self.has_node(node):
+            raise KeyError(f"Node not found: {node}")
+        return neighbors
+
+    def get_successors(self, node: str) -> List[str]:
+        """Get all successor nodes of a node."""
+        return self._adjacent(node, outgoing=True)
+
+    def get_predecessors(self, node: str) -> List[str]:
+        """Get all predecessor nodes of a node."""
+        return self._adjacent(node, outgoing=False)
+
+    def _incident_edges(
+        self, node: str, column: str
+    ) -> List[Tuple[str, str, Dict[str, Any]]]:
+        rows = self._rows(
+            self._edge_query(f"WHERE {column} = %(node)s"), {"node": node}
+        )
+        if not rows and not self.has_node(node):
+            raise KeyError(f"Node not found: {node}")
+        return list(_group_edges(rows))
+
+    def get_out_edges(self, node: str) -> List[Tuple[str, str, Dict[str, Any]]]:
+        """Get all outgoing edges of a node with their attributes."""
+        return self._incident_edges(node, "subject")
+
+    def get_in_edges(self, node: str) -> List[Tuple[str, str, Dict[str, Any]]]:
+        """Get all incoming edges of a node with their attributes."""
+        return self._incident_edges(node, "object")
+
+    def number_of_edges(self) -> int:
+        """Get the total number of edges in the graph."""
+        rows = self._rows(
+            f"SELECT count(*) FROM (SELECT DISTINCT subject, object "
+            f"FROM {self._table}) edges"
+        )
+        return rows[0][0]
+
+    def shortest_path(
+        self, source: str, target: str, directed: bool = True
+    ) -> List[str]:
+        """
+        Get the shortest path between two nodes.
+
+        Runs a bidirectional breadth-first search, expanding the smaller of the
+        two frontiers with one query at a time, for at most max_path_length
+        expansions.
+
+        Raises:
+            nx.NodeNotFound: If either node is not in the graph
+            nx.NetworkXNoPath: If there is no path of at most max_path_length
+                edges between the nodes
+        """
+        existing = self._existing([source, target])
+        for node in (source, target):
+            if node not in existing:
+                raise nx.NodeNotFound(f"Node {node} not in graph")
+        if source == target:
+            return [source]
+
+        # Parents of the nodes reached from the source and from the target
+        pred: Dict[str, Optional[str]] = {source: None}
+        succ: Dict[str, Optional[str]] = {target: None}
+        forward, backward = [source], [target]
+        for _ in range(self.max_path_length):
+            if not forward or not backward:
+                break
+            outgoing = len(forward) <= len(backward)
+            reached, other = (pred, succ) if outgoing else (succ, pred)
+            frontier = []
+            for node, neighbor in self._expand(
+                forward if outgoing else backward, outgoing, directed
+            ):
+                if neighbor not in reached:
+                    reached[neighbor] = node
+                    frontier.append(neighbor)
+                if neighbor in other:
+                    return self._join_path(pred, succ, neighbor)
+            if outgoing:
+                forward = frontier
+            else:
+                backward = frontier
+        raise nx.NetworkXNoPath(
+            f"No path of at most {self.max_path_length} edges between "
+            f"{source} and {target}."
+        )
+
+    @staticmethod
+    def _join_path(
+        pred: Dict[str, Optional[str]], succ: Dict[str, Optional[str]], meeting: str
+    ) -> List[str]:
+        path = []
+        node: Optional[str] = meeting
+        while node is not None:
+            path.append(node)
+            node = pred[node]
+        path.reverse()
+        node = succ[meeting]
+        while node is not None:
+            path.append(node)
+            node = succ[node]
+        return path
+
+    def __len__(self) -> int:
+        """Get the total number of nodes in the graph."""
+        rows = self._rows(
+            f"SELECT count(*) FROM (SELECT subject FROM {self._table} "
+            f"UNION SELECT object FROM {self._table}) nodes"
+        )
+        return rows[0][0]
+
+    def to_serializable(self) -> Dict[str, Any]:
+        """
+        Convert the graph to a serializable dictionary.
+
+        Returns:
+            Dict[str, Any]: A serializable representation of the graph
+        """
+        nodes = [{"id": node, "attributes": attrs} for node, attrs in self.iter_nodes()]
+        edges = [
+            {"source": source, "target": target, "attributes": attrs}
+            for source, target, attrs in self.iter_edges()
+        ]
+        return {"nodes": nodes, "edges": edges}
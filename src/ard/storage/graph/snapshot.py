@@ -0,0 +1,398 @@
+import threading
+import weakref
+from dataclasses import dataclass
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+import networkx as nx
+
+from ard.storage.graph.base import GraphBackend
+from ard.storage.graph.csr import bidirectional_shortest_path
+from ard.storage.graph.merge import MergeGroups
+from ard.storage.graph.statistics import GraphStatistics
+from ard.storage.graph.wrapper import BackendWrapper
+
+# Number of merge groups applied at once, between which snapshots can be read
+MERGE_BATCH_SIZE = 1000
+
+Edge = Tuple[str, str, Dict[str, Any]]
+
+
+def _copy_attrs(attrs: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy attributes, with their lists, so that they can be extended in place."""
+    return {
+        key: list(value) if isinstance(value, list) else value
+        for key, value in attrs.items()
+    }
+
+
+def _copy_edges(edges: Iterable[Edge]) -> List[Edge]:
+    return [(source, target, _copy_attrs(attrs)) for source, target, attrs in edges]
+
+
+@dataclass
+class _NodeState:
+    """A node as it was when a snapshot was taken, with its edges."""
+
+    attrs: Dict[str, Any]
+    out_edges: Dict[str, Dict[str, Any]]
+    in_edges: Dict[str, Dict[str, Any]]
+
+
+class SnapshotBackend(BackendWrapper):
+    """
+    A graph backend that can take immutable snapshots of another backend.
+
+    Snapshots share the wrapped backend instead of copying it. Before a write
+    changes a node or its edges, the node as it was is saved in every open
+    snapshot that doesn't have it yet, so a snapshot reads changed nodes from
+    its own copies and all others from the wrapped backend. Taking a snapshot
+    is O(1) and every write copies each node it changes at most once per
+    open snapshot.
+
+    Writes and snapshot reads take turns on a lock, merges being applied
+    MERGE_BATCH_SIZE groups at a time, so readers in other threads see a
+    consistent graph while a writer keeps going. Attributes are returned as
+    copies, so that callers extending them in place don't change the graph
+    behind the snapshots.
+
+    Attributes:
+        generation (int): Number of writes so far
+    """
+
+    def __init__(self, backend: GraphBackend) -> None:
+        """
+        Initialize a SnapshotBackend.
+
+        Args:
+            backend (GraphBackend): The backend to take snapshots of
+        """
+        super().__init__(backend)
+        self.generation = 0
+        self._lock = threading.RLock()
+        self._snapshots: "weakref.WeakSet[GraphSnapshot]" = weakref.WeakSet()
+
+    def snapshot(self) -> "GraphSnapshot":
+        """
+        Take a snapshot of the current state of the graph.
+
+        Returns:
+            GraphSnapshot: A read-only view of the graph, unaffected by later
+                writes until it is closed or garbage collected
+        """
+        with self._lock:
+            snapshot = GraphSnapshot(self, self._backend.get_statistics())
+            self._snapshots.add(snapshot)
+            return snapshot
+
+    def release(self, snapshot: "GraphSnapshot") -> None:
+        """Stop keeping a snapshot up to date."""
+        with self._lock:
+            self._snapshots.discard(snapshot)
+
+    def _state(self, node: str) -> Optional[_NodeState]:
+        backend = self._backend
+        if not backend.has_node(node):
+            return None
+        return _NodeState(
+            _copy_attrs(backend.get_node_attrs(node)),
+            {t: _copy_attrs(a) for _, t, a in backend.get_out_edges(node)},
+            {s: _copy_attrs(a) for s, _, a in backend.get_in_edges(node)},
+        )
+
+    def _preserve(self, nodes: Iterable[str]) -> None:
+        """Save the nodes in the snapshots that don't have them yet."""
+        self.generation += 1
+        snapshots = list(self._snapshots)
+        if not snapshots:
+            return
+        for node in dict.fromkeys(nodes):
+            missing = [s for s in snapshots if node not in s._nodes]
+            if missing:
+                state = self._state(node)
+                for snapshot in missing:
+                    snapshot._nodes[node] = state
+
+    def _neighbors(self, nodes: Iterable[str]) -> List[str]:
+        backend = self._backend
+        return [
+            neighbor
+            for node in nodes
+            if backend.has_node(node)
+            for neighbor in backend.get_neighbors(node)
+        ]
+
+    def add_node(self, node: str, **attrs) -> None:
+        """Add a node with optional attributes."""
+        with self._lock:
+            self._preserve([node])
+            self._backend.add_node(node, **attrs)
+
+    def add_nodes(self, nodes: Iterable[Tuple[str, Dict[str, Any]]]) -> None:
+        """Add or update many nodes at once."""
+        nodes = list(nodes)
+        with self._lock:
+            self._preserve(node for node, _ in nodes)
+            self._backend.add_nodes(nodes)
+
+    def add_edge(self, source: str, target: str, **attrs) -> None:
+        """Add an edge with optional attributes."""
+        with self._lock:
+            self._preserve([source, target])
+            self._backend.add_edge(source, target, **attrs)
+
+    def add_edges(self, edges: Iterable[Tuple[str, str, Dict[str, Any]]]) -> None:
+        """Add or update many edges at once."""
+        edges = list(edges)
+        with self._lock:
+            self._preserve(node for edge in edges for node in edge[:2])
+            self._backend.add_edges(edges)
+
+    def remove_node(self, node: str) -> None:
+        """Remove a node and all its edges."""
+        with self._lock:
+            self._preserve([node, *self._neighbors([node])])
+            self._backend.remove_node(node)
+
+    def merge_nodes(self, groups: MergeGroups) -> None:
+        """Merge groups of nodes, MERGE_BATCH_SIZE groups at a time."""
+        groups = iter(groups)
+        while batch := [
+            (list(members), merged)
+            for members, merged in islice(groups, MERGE_BATCH_SIZE)
+        ]:
+            with self._lock:
+                members = [node for nodes, _ in batch for node in nodes]
+                self._preserve(
+                    [*members, *(merged for _, merged in batch)]
+                    + self._neighbors(members)
+                )
+                self._backend.merge_nodes(batch)
+
+    def get_node_attrs(self, node: str) -> Dict[str, Any]:
+        """Get a copy of all attributes of a node."""
+        return _copy_attrs(self._backend.get_node_attrs(node))
+
+    def get_edge_attrs(self, source: str, target: str) -> Dict[str, Any]:
+        """Get a copy of all attributes of an edge."""
+        return _copy_attrs(self._backend.get_edge_attrs(source, target))
+
+    def get_nodes_attrs(self, nodes: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Get copies of the attributes of many nodes at once."""
+        return {
+            node: _copy_attrs(attrs)
+            for node, attrs in self._backend.get_nodes_attrs(nodes).items()
+        }
+
+    def get_edges_attrs(
+        self, edges: Iterable[Tuple[str, str]]
+    ) -> Dict[Tuple[str, str], Dict[str, Any]]:
+        """Get copies of the attributes of many edges at once."""
+        return {
+            edge: _copy_attrs(attrs)
+            for edge, attrs in self._backend.get_edges_attrs(edges).items()
+        }
+
+    def get_out_edges(self, node: str) -> List[Tuple[str, str, Dict[str, Any]]]:
+        """Get all outgoing edges of a node with copies of their attributes."""
+        return _copy_edges(self._backend.get_out_edges(node))
+
+    def get_in_edges(self, node: str) -> List[Tuple[str, str, Dict[str, Any]]]:
+        """Get all incoming edges of a node with copies of their attributes."""
+        return _copy_edges(self._backend.get_in_edges(node))
+
+
+class GraphSnapshot(GraphBackend):
+    """
+    Read-only view of a graph as it was when taken by SnapshotBackend.
+
+    Nodes changed since then are read from the copies saved by the writer and
+    all others from the live backend, one node at a time under the lock of
+    the writer. Safe to read from other threads while the graph is written.
+    All write operations raise NotImplementedError.
+
+    Attributes:
+        generation (int): Number of writes to the graph before the snapshot
+    """
+
+    def __init__(self, owner: SnapshotBackend, statistics: GraphStatistics) -> None:
+        """
+        Initialize a GraphSnapshot, see SnapshotBackend.snapshot.
+
+        Args:
+            owner (SnapshotBackend): The backend the snapshot was taken of
+            statistics (GraphStatistics): The statistics of the graph
+        """
+        self.generation = owner.generation
+        self._owner = owner
+        self._live = owner.backend
+        self._lock = owner._lock
+        self._statistics = statistics
+        # Nodes changed since the snapshot, None for those added since
+        self._nodes: Dict[str, Optional[_NodeState]] = {}
+
+    def close(self) -> None:
+        """Release the snapshot, which must not be read afterwards."""
+        self._owner.release(self)
+        self._nodes.clear()
+
+    def _read_only(self) -> NotImplementedError:
+        return NotImplementedError(f"{type(self).__name__} is read-only")
+
+    def _saved(self, node: str) -> _NodeState:
+        state = self._nodes[node]
+        if state is None:
+            raise KeyError(f"Node not found: {node}")
+        return state
+
+    def add_node(self, node: str, **attrs) -> None:
+        """Not supported, the graph is read-only."""
+        raise self._read_only()
+
+    def add_edge(self, source: str, target: str, **attrs) -> None:
+        """Not supported, the graph is read-only."""
+        raise self._read_only()
+
+    def remove_node(self, node: str) -> None:
+        """Not supported, the graph is read-only."""
+        raise self._read_only()
+
+    def has_node(self, node: str) -> bool:
+        """Check if a node exists."""
+        with self._lock:
+            if node in self._nodes:
+                return self._nodes[node] is not None
+            return self._live.has_node(node)
+
+    def has_edge(self, source: str, target: str) -> bool:
+        """Check if an edge exists."""
+        with self._lock:
+            # Changing an edge saves both of its nodes
+            if source in self._nodes:
+                state = self._nodes[source]
+                return state is not None and target in state.out_edges
+            return self._live.has_edge(source, target)
+
+    def get_node_attrs(self, node: str) -> Dict[str, Any]:
+        """Get all attributes of a node."""
+        with self._lock:
+            if node in self._nodes:
+                return _copy_attrs(self._saved(node).attrs)
+            return _copy_attrs(self._live.get_node_attrs(node))
+
+    def get_edge_attrs(self, source: str, target: str) -> Dict[str, Any]:
+        """Get all attributes of an edge."""
+        with self._lock:
+            if source not in self._nodes:
+                return _copy_attrs(self._live.get_edge_attrs(source, target))
+            state = self._nodes[source]
+            if state is None or target not in state.out_edges:
+                raise KeyError(f"Edge not found: ({source}, {target})")
+            return _copy_attrs(state.out_edges[target])
+
+    def get_nodes(self) -> Set[str]:
+        """Get all nodes in the graph."""
+        with self._lock:
+            nodes = self._live.get_nodes()
+            for node, state in self._nodes.items():
+                if state is None:
+                    nodes.discard(node)
+                else:
+                    nodes.add(node)
+            return nodes
+
+    def get_edges(self) -> List[Tuple[str, str, Dict[str, Any]]]:
+        """Get all edges in the graph with their attributes."""
+        return list(self.iter_edges())
+
+    def iter_nodes(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Iterate over all nodes with their attributes, one node at a time."""
+        for node in self.get_nodes():
+            yield node, self.get_node_attrs(node)
+
+    def iter_edges(self) -> Iterator[Tuple[str, str, Dict[str, Any]]]:
+        """Iterate over all edges with their attributes, grouped by source."""
+        for node in self.get_nodes():
+            yield from self.get_out_edges(node)
+
+    def get_statistics(self) -> GraphStatistics:
+        """Get the statistics of the graph, as they were when it was taken."""
+        return self._statistics.copy()
+
+    def get_successors(self, node: str) -> List[str]:
+        """Get all successor nodes of a node."""
+        with self._lock:
+            if node in self._nodes:
+                return list(self._saved(node).out_edges)
+            return self._live.get_successors(node)
+
+    def get_predecessors(self, node: str) -> List[str]:
+        """Get all predecessor nodes of a node."""
+        with self._lock:
+            if node in self._nodes:
+                return list(self._saved(node).in_edges)
+            return self._live.get_predecessors(node)
+
+    def get_out_edges(self, node: str) -> List[Tuple[str, str, Dict[str, Any]]]:
+        """Get all outgoing edges of a node with their attributes."""
+        with self._lock:
+            if node in self._nodes:
+                edges = self._saved(node).out_edges.items()
+                return [(node, target, _copy_attrs(a)) for target, a in edges]
+            return _copy_edges(self._live.get_out_edges(node))
+
+    def get_in_edges(self, node: str) -> List[Tuple[str, str, Dict[str, Any]]]:
+        """Get all incoming edges of a node with their attributes."""
+        with self._lock:
+            if node in self._nodes:
+                edges = self._saved(node).in_edges.items()
+                return [(source, node, _copy_attrs(a)) for source, a in edges]
+            return _copy_edges(self._live.get_in_edges(node))
+
+    def number_of_edges(self) -> int:
+        """Get the total number of edges in the graph."""
+        return self._statistics.num_edges
+
+    def shortest_path(
+        self, source: str, target: str, directed: bool = True
+    ) -> List[str]:
+        """
+        Get the shortest path between two nodes.
+
+        Raises:
+            nx.NodeNotFound: If either node is not in the graph
+            nx.NetworkXNoPath: If there is no path between the nodes
+        """
+        for node in (source, target):
+            if not self.has_node(node):
+                raise nx.NodeNotFound(f"Node {node} not in graph")
+
+        if directed:
+            path = bidirectional_shortest_path(
+                source, target, self.get_successors, self.get_predecessors
+            )
+        else:
+            path = bidirectional_shortest_path(
+                source, target, self.get_neighbors, self.get_neighbors
+            )
+        if path is None:
+            raise nx.NetworkXNoPath(f"No path between {source} and {target}.")
+        return path
+
+    def __len__(self) -> int:
+        """Get the total number of nodes in the graph."""
+        return self._statistics.num_nodes
+
+    def to_serializable(self) -> Dict[str, Any]:
+        """
+        Convert the graph to a serializable dictionary.
+
+        Returns:
+            Dict[str, Any]: A serializable representation of the graph
+        """
+        nodes = [{"id": node, "attributes": attrs} for node, attrs in self.iter_nodes()]
+        edges = [
+            {"source": source, "target": target, "attributes": attrs}
+            for source, target, attrs in self.iter_edges()
+        ]
+        return {"nodes": nodes, "edges": edges}
@@ -0,0 +1,724 @@
+import json
+import random
+import sqlite3
+from contextlib import contextmanager
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+import networkx as nx
+import numpy as np
+
+from ard.storage.graph.base import GraphBackend
+from ard.storage.graph.csr import bidirectional_shortest_path
+from ard.storage.graph.merge import MergeGroups
+from ard.storage.graph.statistics import GraphStatistics
+
+DEFAULT_WRITE_BATCH_SIZE = 10_000
+DEFAULT_CACHE_MB = 64
+
+# Owners of provenance rows
+_NODE = 0
+_EDGE = 1
+
+# Maximum number of ids bound in a single IN clause
+_MAX_VARIABLES = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS nodes (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    attrs TEXT,
+    has_sources INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS edges (
+    id INTEGER PRIMARY KEY,
+    source INTEGER NOT NULL,
+    target INTEGER NOT NULL,
+    relation TEXT,
+    attrs TEXT,
+    has_sources INTEGER NOT NULL DEFAULT 0,
+    UNIQUE (source, target)
+);
+CREATE INDEX IF NOT EXISTS edges_target ON edges (target);
+CREATE INDEX IF NOT EXISTS edges_relation ON edges (relation);
+CREATE TABLE IF NOT EXISTS provenance (
+    kind INTEGER NOT NULL,
+    owner INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (kind, owner, position)
+) WITHOUT ROWID;
+"""
+
+
+def _batches(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    iterator = iter(items)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def _apply_attrs(
+    extra: Dict[str, Any],
+    has_sources: bool,
+    relation: Optional[str],
+    attrs: Dict[str, Any],
+    relation_column: bool,
+) -> Tuple[bool, Optional[str], Optional[List[Any]]]:
+    """
+    Apply an attribute update to the stored attributes of a node or an edge.
+
+    A "sources" list goes to the provenance table and a string relation of an
+    edge to its relation column; every other attribute is kept in extra, which
+    is updated in place.
+
+    Returns:
+        Tuple[bool, Optional[str], Optional[List[Any]]]: The new sources flag
+            and relation, and the provenance rows replacing the stored ones, or
+            None if they are unchanged
+    """
+    sources = None
+    for key, value in attrs.items():
+        if key == "sources" and isinstance(value, list):
+            sources, has_sources = value, True
+            extra.pop(key, None)
+        elif key == "relation" and relation_column and isinstance(value, str):
+            relation = value
+            extra.pop(key, None)
+        else:
+            if key == "sources" and has_sources:
+                sources, has_sources = [], False
+            elif key == "relation" and relation_column:
+                relation = None
+            extra[key] = value
+    return has_sources, relation, sources
+
+
+def _attrs(
+    relation: Optional[str],
+    extra: Optional[str],
+    has_sources: bool,
+    sources: List[Any],
+) -> Dict[str, Any]:
+    attrs: Dict[str, Any] = {}
+    if relation is not None:
+        attrs["relation"] = relation
+    if has_sources:
+        attrs["sources"] = sources
+    if extra:
+        attrs.update(json.loads(extra))
+    return attrs
+
+
+class SQLiteBackend(GraphBackend):
+    """
+    Out-of-core backend storing the graph in a SQLite file.
+
+    Nodes and edges are rows of indexed tables, looked up by name and by
+    source and target node ids, with string relations in an indexed column and
+    "sources" lists in a provenance table, one row per entry. Only the page
+    cache of SQLite, of a configurable size, and the rows of the current
+    operation are held in memory, whatever the size of the graph.
+
+    Bulk writes are split into batches, each written with executemany in a
+    single transaction. The file uses write-ahead logging, so any number of
+    processes can read it, with readonly=True, while one of them writes.
+    A backend must only be used by one thread at a time.
+
+    Attribute order follows CSRBackend: relation, sources, then all others.
+    """
+
+    def __init__(
+        self,
+        path: str = ":memory:",
+        readonly: bool = False,
+        batch_size: int = DEFAULT_WRITE_BATCH_SIZE,
+        cache_mb: int = DEFAULT_CACHE_MB,
+    ) -> None:
+        """
+        Open or create a graph stored in a SQLite file.
+
+        Args:
+            path (str): Path of the database file, ":memory:" for a temporary
+                in-memory graph
+            readonly (bool): Open an existing file for reading only
+            batch_size (int): Number of nodes or edges written per transaction
+            cache_mb (int): Size of the page cache of SQLite, in megabytes
+
+        Raises:
+            ValueError: If batch_size or cache_mb is less than 1
+        """
+        if batch_size < 1 or cache_mb < 1:
+            raise ValueError("batch_size and cache_mb must be at least 1")
+        self.path = path
+        self.readonly = readonly
+        self.batch_size = batch_size
+        if readonly:
+            self._conn = sqlite3.connect(
+                f"file:{path}?mode=ro", uri=True, check_same_thread=False
+            )
+        else:
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.isolation_level = None
+        self._conn.execute(f"PRAGMA cache_size = -{int(cache_mb) * 1024}")
+        if not readonly:
+            self._conn.execute("PRAGMA journal_mode = WAL")
+            self._conn.execute("PRAGMA synchronous = NORMAL")
+            self._conn.executescript(_SCHEMA)
+        self._depth = 0
+
+    @classmethod
+    def from_serializable(
+        cls, data: Dict[str, Any], path: str = ":memory:", **options
+    ) -> "SQLiteBackend":
+        """
+        Initialize a new SQLite backend from a serialized dictionary.
+
+        Args:
+            data (Dict[str, Any]): Serialized graph data from to_serializable()
+            path (str): Path of the database file to write
+            **options: Other options of the backend
+
+        Returns:
+            SQLiteBackend: New backend instance with all data loaded
+        """
+        backend = cls(path, **options)
+        backend.add_nodes(
+            (node_data["id"], node_data.get("attributes", {}))
+            for node_data in data["nodes"]
+        )
+        backend.add_edges(
+            (
+                edge_data["source"],
+                edge_data["target"],
+                edge_data.get("attributes", {}),
+            )
+            for edge_data in data["edges"]
+        )
+        return backend
+
+    def to_serializable(self) -> Dict[str, Any]:
+        """
+        Convert the graph to a serializable dictionary.
+
+        Returns:
+            Dict[str, Any]: A serializable representation of the graph
+        """
+        return {
+            "nodes": [
+                {"id": node, "attributes": attrs} for node, attrs in self.iter_nodes()
+            ],
+            "edges": [
+                {"source": source, "target": target, "attributes": attrs}
+                for source, target, attrs in self.iter_edges()
+            ],
+        }
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Run statements in a write transaction; nested calls join the outer one."""
+        if self._depth:
+            self._depth += 1
+            try:
+                yield self._conn
+            finally:
+                self._depth -= 1
+            return
+        self._conn.execute("BEGIN IMMEDIATE")
+        self._depth = 1
+        try:
+            yield self._conn
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        else:
+            self._conn.execute("COMMIT")
+        finally:
+            self._depth = 0
+
+    # Reading rows
+
+    def _node_id(self, node: str) -> Optional[int]:
+        row = self._conn.execute(
+            "SELECT id FROM nodes WHERE name = ?", (node,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def _require_node(self, node: str) -> int:
+        node_id = self._node_id(node)
+        if node_id is None:
+            raise KeyError(f"Node not found: {node}")
+        return node_id
+
+    def _sources(self, kind: int, owners: List[int]) -> Dict[int, List[Any]]:
+        """Read the provenance rows of many nodes or edges."""
+        sources: Dict[int, List[Any]] = {}
+        for batch in _batches(owners, _MAX_VARIABLES):
+            rows = self._conn.execute(
+                "SELECT owner, data FROM provenance "
+                f"WHERE kind = ? AND owner IN ({','.join('?' * len(batch))}) "
+                "ORDER BY owner, position",
+                (kind, *batch),
+            )
+            for owner, data in rows:
+                sources.setdefault(owner, []).append(json.loads(data))
+        return sources
+
+    def _with_sources(
+        self, kind: int, rows: Iterable[Tuple[Any, ...]]
+    ) -> Iterator[Tuple[Tuple[Any, ...], List[Any]]]:
+        """
+        Pair rows ordered by id, whose first column, with their provenance.
+
+        The provenance table is scanned alongside in owner order, so streaming
+        all nodes or edges takes two ordered scans and no lookups.
+        """
+        provenance = self._conn.execute(
+            "SELECT owner, data FROM provenance WHERE kind = ? "
+            "ORDER BY owner, position",
+            (kind,),
+        )
+        pending = next(provenance, None)
+        for row in rows:
+            owner = row[0]
+            sources = []
+            while pending is not None and pending[0] < owner:
+                pending = next(provenance, None)
+            while pending is not None and pending[0] == owner:
+                sources.append(json.loads(pending[1]))
+                pending = next(provenance, None)
+            yield row, sources
+
+    def _edges(
+        self, where: str = "", params: Tuple[Any, ...] = ()
+    ) -> List[Tuple[str, str, Dict[str, Any]]]:
+        """Read the edges matching a condition, in insertion order."""
+        rows = self._conn.execute(
+            "SELECT e.id, s.name, t.name, e.relation, e.attrs, e.has_sources "
+            "FROM edges e JOIN nodes s ON s.id = e.source "
+            f"JOIN nodes t ON t.id = e.target {where} ORDER BY e.id",
+            params,
+        ).fetchall()
+        sources = self._sources(_EDGE, [row[0] for row in rows if row[5]])
+        return [
+            (source, target, _attrs(relation, extra, has, sources.get(edge, [])))
+            for edge, source, target, relation, extra, has in rows
+        ]
+
+    def _adjacent_ids(self, node_id: int, column: str, other: str) -> List[int]:
+        return [
+            row[0]
+            for row in self._conn.execute(
+                f"SELECT {other} FROM edges WHERE {column} = ? ORDER BY id",
+                (node_id,),
+            )
+        ]
+
+    def _successor_ids(self, node_id: int) -> List[int]:
+        return self._adjacent_ids(node_id, "source", "target")
+
+    def _predecessor_ids(self, node_id: int) -> List[int]:
+        return self._adjacent_ids(node_id, "target", "source")
+
+    def _neighbor_ids(self, node_id: int) -> List[int]:
+        return self._successor_ids(node_id) + self._predecessor_ids(node_id)
+
+    # Writing rows
+
+    def _next_id(self, table: str) -> int:
+        return self._conn.execute(
+            f"SELECT coalesce(max(id), 0) + 1 FROM {table}"
+        ).fetchone()[0]
+
+    def _replace_sources(self, kind: int, owners: List[Tuple[int, List[Any]]]) -> None:
+        conn = self._conn
+        conn.executemany(
+            "DELETE FROM provenance WHERE kind = ? AND owner = ?",
+            [(kind, owner) for owner, _ in owners],
+        )
+        conn.executemany(
+            "INSERT INTO provenance (kind, owner, position, data) VALUES (?, ?, ?, ?)",
+            [
+                (kind, owner, position, json.dumps(source))
+                for owner, sources in owners
+                for position, source in enumerate(sources)
+            ],
+        )
+
+    def _write_nodes(self, nodes: Dict[str, Dict[str, Any]]) -> None:
+        """Insert or update nodes, combined by name, in the current transaction."""
+        conn = self._conn
+        next_id = self._next_id("nodes")
+        inserts, updates, provenance = [], [], []
+        for name, attrs in nodes.items():
+            row = conn.execute(
+                "SELECT id, attrs, has_sources FROM nodes WHERE name = ?", (name,)
+            ).fetchone()
+            if row is None:
+                node_id, extra, has_sources = next_id, {}, False
+                next_id += 1
+            else:
+                node_id, stored, has_sources = row
+                extra = json.loads(stored) if stored else {}
+            has_sources, _, sources = _apply_attrs(
+                extra, has_sources, None, attrs, relation_column=False
+            )
+            values = (json.dumps(extra) if extra else None, has_sources, node_id)
+            if row is None:
+                inserts.append((name, *values))
+            else:
+                updates.append(values)
+            if sources is not None:
+                provenance.append((node_id, sources))
+        conn.executemany(
+            "INSERT INTO nodes (name, attrs, has_sources, id) VALUES (?, ?, ?, ?)",
+            inserts,
+        )
+        conn.executemany(
+            "UPDATE nodes SET attrs = ?, has_sources = ? WHERE id = ?", updates
+        )
+        self._replace_sources(_NODE, provenance)
+
+    def _write_edges(self, edges: Dict[Tuple[str, str], Dict[str, Any]]) -> None:
+        """Insert or update edges, combined by endpoints, creating their nodes."""
+        conn = self._conn
+        names = dict.fromkeys(name for edge in edges for name in edge)
+        missing = [name for name in names if self._node_id(name) is None]
+        self._write_nodes({name: {} for name in missing})
+        ids = {name: self._node_id(name) for name in names}
+
+        next_id = self._next_id("edges")
+        inserts, updates, provenance = [], [], []
+        for (source, target), attrs in edges.items():
+            source_id, target_id = ids[source], ids[target]
+            row = conn.execute(
+                "SELECT id, relation, attrs, has_sources FROM edges "
+                "WHERE source = ? AND target = ?",
+                (source_id, target_id),
+            ).fetchone()
+            if row is None:
+                edge, relation, extra, has_sources = next_id, None, {}, False
+                next_id += 1
+            else:
+                edge, relation, stored, has_sources = row
+                extra = json.loads(stored) if stored else {}
+            has_sources, relation, sources = _apply_attrs(
+                extra, has_sources, relation, attrs, relation_column=True
+            )
+            values = (relation, json.dumps(extra) if extra else None, has_sources)
+            if row is None:
+                inserts.append((edge, source_id, target_id, *values))
+            else:
+                updates.append((*values, edge))
+            if sources is not None:
+                provenance.append((edge, sources))
+        conn.executemany(
+            "INSERT INTO edges (id, source, target, relation, attrs, has_sources) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            inserts,
+        )
+        conn.executemany(
+            "UPDATE edges SET relation = ?, attrs = ?, has_sources = ? WHERE id = ?",
+            updates,
+        )
+        self._replace_sources(_EDGE, provenance)
+
+    # GraphBackend interface
+
+    def add_node(self, node: str, **attrs) -> None:
+        """Add a node with optional attributes."""
+        self.add_nodes([(node, attrs)])
+
+    def add_nodes(self, nodes: Iterable[Tuple[str, Dict[str, Any]]]) -> None:
+        """Add or update many nodes, batch_size per transaction."""
+        for batch in _batches(nodes, self.batch_size):
+            combined: Dict[str, Dict[str, Any]] = {}
+            for node, attrs in batch:
+                combined.setdefault(node, {}).update(attrs)
+            with self._transaction():
+                self._write_nodes(combined)
+
+    def has_node(self, node: str) -> bool:
+        """Check if a node exists."""
+        return self._node_id(node) is not None
+
+    def add_edge(self, source: str, target: str, **attrs) -> None:
+        """Add an edge with optional attributes, creating missing nodes."""
+        self.add_edges([(source, target, attrs)])
+
+    def add_edges(self, edges: Iterable[Tuple[str, str, Dict[str, Any]]]) -> None:
+        """Add or update many edges, batch_size per transaction."""
+        for batch in _batches(edges, self.batch_size):
+            combined: Dict[Tuple[str, str], Dict[str, Any]] = {}
+            for source, target, attrs in batch:
+                combined.setdefault((source, target), {}).update(attrs)
+            with self._transaction():
+                self._write_edges(combined)
+
+    def has_edge(self, source: str, target: str) -> bool:
+        """Check if an edge exists."""
+        row = self._conn.execute(
+            "SELECT 1 FROM edges e JOIN nodes s ON s.id = e.source "
+            "JOIN nodes t ON t.id = e.target WHERE s.name = ? AND t.name = ?",
+            (source, target),
+        ).fetchone()
+        return row is not None
+
+    def get_node_attrs(self, node: str) -> Dict[str, Any]:
+        """Get all attributes of a node."""
+        attrs = self.get_nodes_attrs([node])
+        if node not in attrs:
+            raise KeyError(f"Node not found: {node}")
+        return attrs[node]
+
+    def get_edge_attrs(self, source: str, target: str) -> Dict[str, Any]:
+        """Get all attributes of an edge."""
+        attrs = self.get_edges_attrs([(source, target)])
+        if (source, target) not in attrs:
+            raise KeyError(f"Edge not found: ({source}, {target})")
+        return attrs[source, target]
+
+    def get_nodes_attrs(self, nodes: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Get the attributes of many nodes, with one provenance query per batch."""
+        result = {}
+        for batch in _batches(dict.fromkeys(nodes), _MAX_VARIABLES):
+            rows = self._conn.execute(
+                "SELECT id, name, attrs, has_sources FROM nodes "
+                f"WHERE name IN ({','.join('?' * len(batch))})",
+                batch,
+            ).fetchall()
+            sources = self._sources(_NODE, [row[0] for row in rows if row[3]])
+            for node_id, name, extra, has in rows:
+                result[name] = _attrs(None, extra, has, sources.get(node_id, []))
+        return result
+
+    def get_edges_attrs(
+        self, edges: Iterable[Tuple[str, str]]
+    ) -> Dict[Tuple[str, str], Dict[str, Any]]:
+        """Get the attributes of many edges, looked up by their node ids."""
+        conn = self._conn
+        ids = {}
+        for source, target in dict.fromkeys(edges):
+            row = conn.execute(
+                "SELECT e.id, e.relation, e.attrs, e.has_sources "
+                "FROM nodes s JOIN edges e ON e.source = s.id "
+                "JOIN nodes t ON t.id = e.target "
+                "WHERE s.name = ? AND t.name = ?",
+                (source, target),
+            ).fetchone()
+            if row is not None:
+                ids[source, target] = row
+        sources = self._sources(_EDGE, [row[0] for row in ids.values() if row[3]])
+        return {
+            edge: _attrs(relation, extra, has, sources.get(edge_id, []))
+            for edge, (edge_id, relation, extra, has) in ids.items()
+        }
+
+    def get_nodes(self) -> Set[str]:
+        """Get all nodes in the graph."""
+        return {row[0] for row in self._conn.execute("SELECT name FROM nodes")}
+
+    def sample_nodes(self, k: int, rng: Optional[random.Random] = None) -> List[str]:
+        """
+        Pick k nodes uniformly at random, with replacement.
+
+        Ids are drawn from the id range and ids of removed nodes redrawn while
+        most ids are in use; otherwise nodes are picked by offset.
+        """
+        rng = rng or random
+        count, max_id = self._conn.execute(
+            "SELECT count(*), coalesce(max(id), 0) FROM nodes"
+        ).fetchone()
+        if not count:
+            return []
+        sample = []
+        if count * 2 >= max_id:
+            while len(sample) < k:
+                row = self._conn.execute(
+                    "SELECT name FROM nodes WHERE id = ?", (rng.randrange(max_id) + 1,)
+                ).fetchone()
+                if row is not None:
+                    sample.append(row[0])
+            return sample
+        for _ in range(k):
+            sample.append(
+                self._conn.execute(
+                    "SELECT name FROM nodes ORDER BY id LIMIT 1 OFFSET ?",
+                    (rng.randrange(count),),
+                ).fetchone()[0]
+            )
+        return sample
+
+    def get_edges(self) -> List[Tuple[str, str, Dict[str, Any]]]:
+        """Get all edges in the graph with their attributes."""
+        return list(self.iter_edges())
+
+    def iter_nodes(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Stream all nodes with their attributes, in insertion order."""
+        rows = self._conn.execute(
+            "SELECT id, name, attrs, has_sources FROM nodes ORDER BY id"
+        )
+        for (_, name, extra, has), sources in self._with_sources(_NODE, rows):
+            yield name, _attrs(None, extra, has, sources)
+
+    def iter_edges(self) -> Iterator[Tuple[str, str, Dict[str, Any]]]:
+        """Stream all edges with their attributes, in insertion order."""
+        rows = self._conn.execute(
+            "SELECT e.id, s.name, t.name, e.relation, e.attrs, e.has_sources "
+            "FROM edges e JOIN nodes s ON s.id = e.source "
+            "JOIN nodes t ON t.id = e.target ORDER BY e.id"
+        )
+        for row, sources in self._with_sources(_EDGE, rows):
+            _, source, target, relation, extra, has = row
+            yield source, target, _attrs(relation, extra, has, sources)
+
+    def edge_arrays(self) -> Tuple[List[str], np.ndarray, np.ndarray]:
+        """Get the edges as arrays of node ids, numbered in insertion order."""
+        node_ids, names = [], []
+        for node_id, name in self._conn.execute(
+            "SELECT id, name FROM nodes ORDER BY id"
+        ):
+            node_ids.append(node_id)
+            names.append(name)
+        pairs = np.array(
+            self._conn.execute("SELECT source, target FROM edges").fetchall(),
+            dtype=np.int64,
+        ).reshape(-1, 2)
+        index = np.searchsorted(np.array(node_ids, dtype=np.int64), pairs)
+        return names, index[:, 0].astype(np.int32), index[:, 1].astype(np.int32)
+
+    def get_edges_by_relation(
+        self, relation: str
+    ) -> List[Tuple[str, str, Dict[str, Any]]]:
+        """Get all edges with the given relation, through the relation index."""
+        return self._edges("WHERE e.relation = ?", (relation,))
+
+    def get_relation_types(self) -> Set[str]:
+        """Get the relations of the edges in the graph."""
+        return {
+            row[0]
+            for row in self._conn.execute(
+                "SELECT DISTINCT relation FROM edges WHERE relation IS NOT NULL"
+            )
+        }
+
+    def get_statistics(self) -> GraphStatistics:
+        """Get the statistics of the graph, aggregated by SQLite."""
+        conn = self._conn
+        num_nodes = conn.execute("SELECT count(*) FROM nodes").fetchone()[0]
+        num_edges = conn.execute("SELECT count(*) FROM edges").fetchone()[0]
+        degrees = conn.execute(
+            """
+            SELECT degree, count(*) FROM (
+                SELECT (SELECT count(*) FROM edges WHERE source = n.id)
+                    + (SELECT count(*) FROM edges WHERE target = n.id) AS degree
+                FROM nodes n
+            ) GROUP BY degree
+            """
+        )
+        degree_histogram = dict(degrees.fetchall())
+        relations = conn.execute(
+            "SELECT relation, count(*) FROM edges "
+            "WHERE relation IS NOT NULL GROUP BY relation"
+        )
+        relation_counts = dict(relations.fetchall())
+        return GraphStatistics(num_nodes, num_edges, degree_histogram, relation_counts)
+
+    def get_successors(self, node: str) -> List[str]:
+        """Get all successor nodes of a node."""
+        return [
+            row[0]
+            for row in self._conn.execute(
+                "SELECT t.name FROM edges e JOIN nodes t ON t.id = e.target "
+                "WHERE e.source = ? ORDER BY e.id",
+                (self._require_node(node),),
+            )
+        ]
+
+    def get_predecessors(self, node: str) -> List[str]:
+        """Get all predecessor nodes of a node."""
+        return [
+            row[0]
+            for row in self._conn.execute(
+                "SELECT s.name FROM edges e JOIN nodes s ON s.id = e.source "
+                "WHERE e.target = ? ORDER BY e.id",
+                (self._require_node(node),),
+            )
+        ]
+
+    def get_out_edges(self, node: str) -> List[Tuple[str, str, Dict[str, Any]]]:
+        """Get all outgoing edges of a node with their attributes."""
+        return self._edges("WHERE e.source = ?", (self._require_node(node),))
+
+    def get_in_edges(self, node: str) -> List[Tuple[str, str, Dict[str, Any]]]:
+        """Get all incoming edges of a node with their attributes."""
+        return self._edges("WHERE e.target = ?", (self._require_node(node),))
+
+    def remove_node(self, node: str) -> None:
+        """Remove a node, its edges and their provenance."""
+        with self._transaction() as conn:
+            node_id = self._require_node(node)
+            conn.execute(
+                "DELETE FROM provenance WHERE kind = ? AND owner IN "
+                "(SELECT id FROM edges WHERE source = ? "
+                "UNION SELECT id FROM edges WHERE target = ?)",
+                (_EDGE, node_id, node_id),
+            )
+            conn.execute("DELETE FROM edges WHERE source = ?", (node_id,))
+            conn.execute("DELETE FROM edges WHERE target = ?", (node_id,))
+            conn.execute(
+                "DELETE FROM provenance WHERE kind = ? AND owner = ?", (_NODE, node_id)
+            )
+            conn.execute("DELETE FROM nodes WHERE id = ?", (node_id,))
+
+    def merge_nodes(self, groups: MergeGroups) -> None:
+        """Merge groups of nodes, each into a single node, in one transaction."""
+        with self._transaction():
+            super().merge_nodes(groups)
+
+    def number_of_edges(self) -> int:
+        """Get the total number of edges in the graph."""
+        return self._conn.execute("SELECT count(*) FROM edges").fetchone()[0]
+
+    def shortest_path(
+        self, source: str, target: str, directed: bool = True
+    ) -> List[str]:
+        """
+        Get the shortest path between two nodes.
+
+        Runs a bidirectional breadth-first search over node ids, reading the
+        adjacency of every expanded node through the source or target index.
+
+        Raises:
+            nx.NodeNotFound: If either node is not in the graph
+            nx.NetworkXNoPath: If there is no path between the nodes
+        """
+        ids = [self._node_id(node) for node in (source, target)]
+        for node, node_id in zip((source, target), ids):
+            if node_id is None:
+                raise nx.NodeNotFound(f"Node {node} not in graph")
+        if directed:
+            path = bidirectional_shortest_path(
+                ids[0], ids[1], self._successor_ids, self._predecessor_ids
+            )
+        else:
+            path = bidirectional_shortest_path(
+                ids[0], ids[1], self._neighbor_ids, self._neighbor_ids
+            )
+        if path is None:
+            raise nx.NetworkXNoPath(f"No path between {source} and {target}.")
+        names = {
+            node_id: name
+            for node_id, name in self._conn.execute(
+                f"SELECT id, name FROM nodes WHERE id IN ({','.join('?' * len(path))})",
+                path,
+            )
+        }
+        return [names[node_id] for node_id in path]
+
+    def __len__(self) -> int:
+        """Get the total number of nodes in the graph."""
+        return self._conn.execute("SELECT count(*) FROM nodes").fetchone()[0]
@@ -0,0 +1,89 @@
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Set
+
+
+@dataclass
+class GraphStatistics:
+    """
+    Summary counts of a graph.
+
+    Backends that keep statistics up to date apply every change through the
+    update methods below instead of recomputing them, so reading them is O(1)
+    in the size of the graph. Statistics returned by a backend are a copy.
+
+    Attributes:
+        num_nodes (int): Number of nodes
+        num_edges (int): Number of edges
+        degree_histogram (Dict[int, int]): Number of nodes by degree, counting
+            incoming and outgoing edges
+        relation_counts (Dict[str, int]): Number of edges by relation, edges
+            without a string relation are not counted
+    """
+
+    num_nodes: int = 0
+    num_edges: int = 0
+    degree_histogram: Dict[int, int] = field(default_factory=dict)
+    relation_counts: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def relation_types(self) -> Set[str]:
+        """Get the relations of the edges in the graph."""
+        return set(self.relation_counts)
+
+    def copy(self) -> "GraphStatistics":
+        """Get an independent copy of the statistics."""
+        return GraphStatistics(
+            self.num_nodes,
+            self.num_edges,
+            dict(self.degree_histogram),
+            dict(self.relation_counts),
+        )
+
+    def _count(self, counts: Dict, key, delta: int) -> None:
+        count = counts.get(key, 0) + delta
+        if count:
+            counts[key] = count
+        else:
+            del counts[key]
+
+    def add_node(self) -> None:
+        """Record a new node, which has no edges yet."""
+        self.num_nodes += 1
+        self._count(self.degree_histogram, 0, 1)
+
+    def remove_node(self, degree: int) -> None:
+        """Record the removal of a node that has the given degree."""
+        self.num_nodes -= 1
+        self._count(self.degree_histogram, degree, -1)
+
+    def change_degree(self, old: int, new: int) -> None:
+        """Record a change in the degree of a node."""
+        # Inlined, as this runs twice for every new edge
+        histogram = self.degree_histogram
+        count = histogram[old] - 1
+        if count:
+            histogram[old] = count
+        else:
+            del histogram[old]
+        histogram[new] = histogram.get(new, 0) + 1
+
+    def add_edge(self, relation: Optional[str]) -> None:
+        """Record a new edge; the degrees of its nodes change separately."""
+        self.num_edges += 1
+        if isinstance(relation, str):
+            self._count(self.relation_counts, relation, 1)
+
+    def remove_edge(self, relation: Optional[str]) -> None:
+        """Record the removal of an edge."""
+        self.num_edges -= 1
+        if isinstance(relation, str):
+            self._count(self.relation_counts, relation, -1)
+
+    def change_relation(self, old: Optional[str], new: Optional[str]) -> None:
+        """Record a change in the relation of an edge."""
+        if old == new:
+            return
+        if isinstance(old, str):
+            self._count(self.relation_counts, old, -1)
+        if isinstance(new, str):
+            self._count(self.relation_counts, new, 1)
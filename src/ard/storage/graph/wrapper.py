@@ -0,0 +1,185 @@
+import random
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+import numpy as np
+
+from ard.storage.graph.base import GraphBackend
+from ard.storage.graph.merge import MergeGroups
+from ard.storage.graph.statistics import GraphStatistics
+
+
+class BackendWrapper(GraphBackend):
+    """
+    A graph backend that forwards every call to another backend.
+
+    Subclasses override the methods they change, such as caching reads, and
+    keep the bulk and streaming operations of the wrapped backend for all the
+    others.
+    """
+
+    def __init__(self, backend: GraphBackend) -> None:
+        """
+        Initialize a BackendWrapper.
+
+        Args:
+            backend (GraphBackend): The backend to wrap
+        """
+        self._backend = backend
+
+    @property
+    def backend(self) -> GraphBackend:
+        """The wrapped backend."""
+        return self._backend
+
+    def add_node(self, node: str, **attrs) -> None:
+        """Add a node with optional attributes."""
+        self._backend.add_node(node, **attrs)
+
+    def has_node(self, node: str) -> bool:
+        """Check if a node exists."""
+        return self._backend.has_node(node)
+
+    def add_edge(self, source: str, target: str, **attrs) -> None:
+        """Add an edge with optional attributes."""
+        self._backend.add_edge(source, target, **attrs)
+
+    def add_nodes(self, nodes: Iterable[Tuple[str, Dict[str, Any]]]) -> None:
+        """Add or update many nodes at once."""
+        self._backend.add_nodes(nodes)
+
+    def add_edges(self, edges: Iterable[Tuple[str, str, Dict[str, Any]]]) -> None:
+        """Add or update many edges at once."""
+        self._backend.add_edges(edges)
+
+    def has_edge(self, source: str, target: str) -> bool:
+        """Check if an edge exists."""
+        return self._backend.has_edge(source, target)
+
+    def get_node_attrs(self, node: str) -> Dict[str, Any]:
+        """Get all attributes of a node."""
+        return self._backend.get_node_attrs(node)
+
+    def get_edge_attrs(self, source: str, target: str) -> Dict[str, Any]:
+        """Get all attributes of an edge."""
+        return self._backend.get_edge_attrs(source, target)
+
+    def get_nodes_attrs(self, nodes: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Get the attributes of many nodes at once."""
+        return self._backend.get_nodes_attrs(nodes)
+
+    def get_edges_attrs(
+        self, edges: Iterable[Tuple[str, str]]
+    ) -> Dict[Tuple[str, str], Dict[str, Any]]:
+        """Get the attributes of many edges at once."""
+        return self._backend.get_edges_attrs(edges)
+
+    def get_nodes(self) -> Set[str]:
+        """Get all nodes in the graph."""
+        return self._backend.get_nodes()
+
+    def sample_nodes(self, k: int, rng: Optional[random.Random] = None) -> List[str]:
+        """Pick k nodes uniformly at random, with replacement."""
+        return self._backend.sample_nodes(k, rng)
+
+    def get_edges(self) -> List[Tuple[str, str, Dict[str, Any]]]:
+        """Get all edges with their attributes."""
+        return self._backend.get_edges()
+
+    def iter_nodes(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Iterate over all nodes with their attributes."""
+        return self._backend.iter_nodes()
+
+    def iter_edges(self) -> Iterator[Tuple[str, str, Dict[str, Any]]]:
+        """Iterate over all edges with their attributes."""
+        return self._backend.iter_edges()
+
+    @property
+    def native_edge_arrays(self) -> bool:
+        """Whether the wrapped backend answers edge_arrays from memory."""
+        return self._backend.native_edge_arrays
+
+    def edge_arrays(self) -> Tuple[List[str], np.ndarray, np.ndarray]:
+        """Get the edges of the graph as arrays of integer node ids."""
+        return self._backend.edge_arrays()
+
+    def get_edges_by_relation(
+        self, relation: str
+    ) -> List[Tuple[str, str, Dict[str, Any]]]:
+        """Get all edges with the given relation."""
+        return self._backend.get_edges_by_relation(relation)
+
+    def find_edges(
+        self, relation: Optional[str] = None, nodes: Optional[Iterable[str]] = None
+    ) -> Iterator[Tuple[str, str, Dict[str, Any]]]:
+        """Iterate over the edges matching filters."""
+        return self._backend.find_edges(relation, nodes)
+
+    def induced_subgraph(
+        self, nodes: Iterable[str]
+    ) -> Tuple[List[Tuple[str, Dict[str, Any]]], List[Tuple[str, str, Dict[str, Any]]]]:
+        """Get nodes with their attributes and all edges between them."""
+        return self._backend.induced_subgraph(nodes)
+
+    def neighborhood(
+        self, nodes: Iterable[str], hops: int = 1, limit: Optional[int] = None
+    ) -> List[str]:
+        """Get the nodes within a number of hops of the given nodes."""
+        return self._backend.neighborhood(nodes, hops=hops, limit=limit)
+
+    def get_relation_types(self) -> Set[str]:
+        """Get the relations of the edges in the graph."""
+        return self._backend.get_relation_types()
+
+    def get_statistics(self) -> GraphStatistics:
+        """Get the statistics of the graph."""
+        return self._backend.get_statistics()
+
+    def get_successors(self, node: str) -> List[str]:
+        """Get all successor nodes of a node."""
+        return self._backend.get_successors(node)
+
+    def get_predecessors(self, node: str) -> List[str]:
+        """Get all predecessor nodes of a node."""
+        return self._backend.get_predecessors(node)
+
+    def get_neighbors(self, node: str) -> List[str]:
+        """Get the distinct successors and predecessors of a node."""
+        return self._backend.get_neighbors(node)
+
+    def random_walk(self, start_node: str, max_steps: int) -> List[str]:
+        """Perform a random walk starting from a node."""
+        return self._backend.random_walk(start_node, max_steps)
+
+    def get_out_edges(self, node: str) -> List[Tuple[str, str, Dict[str, Any]]]:
+        """Get all outgoing edges of a node with their attributes."""
+        return self._backend.get_out_edges(node)
+
+    def get_in_edges(self, node: str) -> List[Tuple[str, str, Dict[str, Any]]]:
+        """Get all incoming edges of a node with their attributes."""
+        return self._backend.get_in_edges(node)
+
+    def remove_node(self, node: str) -> None:
+        """Remove a node and all its edges."""
+        self._backend.remove_node(node)
+
+    def merge_nodes(self, groups: MergeGroups) -> None:
+        """Merge groups of nodes, each into a single node."""
+        self._backend.merge_nodes(groups)
+
+    def number_of_edges(self) -> int:
+        """Get the total number of edges in the graph."""
+        return self._backend.number_of_edges()
+
+    def shortest_path(
+        self, source: str, target: str, directed: bool = True
+    ) -> List[str]:
+        """Get the shortest path between two nodes."""
+        return self._backend.shortest_path(source, target, directed)
+
+    def __len__(self) -> int:
+        """Get the total number of nodes in the graph."""
+        return len(self._backend)
+
+    def to_serializable(self) -> Dict[str, Any]:
+        """Convert the graph to a serializable dictionary."""
+        return self._backend.to_serializable()
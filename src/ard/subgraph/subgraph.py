@@ -45,17 +45,10 @@ def select_additional_nodes(
         # If path nodes already exceed max_nodes, don't add any additional nodes
         return set()
 
-    # Collect all potential neighbors
+    # Collect all neighbors (both incoming and outgoing) outside the path
     potential_neighbors = set()
-    # Add neighbors based on probability
     if neighbor_probability > 0:
-        for node in path_nodes:
-            # Add all neighbors (both incoming and outgoing)
-            neighbors = set(original_graph.get_node_neighbors(node))
-
-            # Exclude nodes that are already in the path
-            neighbors -= set(path_nodes)
-            potential_neighbors.update(neighbors)
+        potential_neighbors = set(original_graph.get_neighborhood(path_nodes))
 
     # Start with an empty set of additional nodes
     additional_nodes = set()
@@ -164,21 +157,10 @@ class Subgraph(KnowledgeGraph):
             original_graph: The original knowledge graph
             nodes_to_include: Set of node names to include
         """
-        # Add all nodes from the original graph
-        for node in nodes_to_include:
-            # Add the node to our graph with its attributes
-            attrs = original_graph.get_node_attrs(node)
-            self.add_node(node, **attrs)
-
-        # Add edges between nodes that are in our set
-        for source in nodes_to_include:
-            # Get all edges from the original graph
-            for target in original_graph.get_successors(source):
-                if target in nodes_to_include:
-                    # Get edge attributes
-                    edge_attrs = original_graph.get_edge_attrs(source, target)
-                    # Add the edge to our graph
-                    self.add_edge(source, target, **edge_attrs)
+        # Read the nodes and the edges between them at once
+        nodes, edges = original_graph.graph.induced_subgraph(nodes_to_include)
+        self._backend.add_nodes(nodes)
+        self._backend.add_edges(edges)
 
     @classmethod
     def from_two_nodes(
@@ -52,13 +52,25 @@ class EmbeddingPathGenerator(SubgraphGenerator):
         Returns:
             float: Estimated distance
         """
+        return float(self._heuristics([current], target)[0])
+
+    def _heuristics(self, nodes: List[str], target: str) -> np.ndarray:
+        """
+        Estimate distances from many nodes to the target node at once.
+
+        Args:
+            nodes: Node names
+            target: Target node name
+
+        Returns:
+            np.ndarray: Estimated distance of every node, in order
+        """
         if self.embedder:
-            return self.embedder.calculate_distance(current, target)
+            return self.embedder.distances(target, nodes)
         else:
             # Use euclidean distance if no embedder is provided
-            return np.linalg.norm(
-                self.node_embeddings[current] - self.node_embeddings[target]
-            )
+            embeddings = np.stack([self.node_embeddings[node] for node in nodes])
+            return np.linalg.norm(embeddings - self.node_embeddings[target], axis=1)
 
     def generate_path_nodes(
         self, knowledge_graph: KnowledgeGraph, start_node: str, end_node: str
@@ -101,11 +113,16 @@ class EmbeddingPathGenerator(SubgraphGenerator):
 
             while current != end_node:
                 # Get neighbors and their heuristic values
-                neighbors = [
-                    (neighbor, self._heuristic(neighbor, end_node))
+                candidates = [
+                    neighbor
                     for neighbor in knowledge_graph.get_node_neighbors(current)
                     if neighbor not in visited
                 ]
+                neighbors = (
+                    list(zip(candidates, self._heuristics(candidates, end_node)))
+                    if candidates
+                    else []
+                )
 
                 if not neighbors:
                     # Dead end reached, backtrack if possible
@@ -2,6 +2,7 @@ import random
 from typing import List
 
 import networkx as nx
+import numpy as np
 
 from ard.knowledge_graph import KnowledgeGraph
 from ard.subgraph.subgraph_generator import (
@@ -15,18 +16,25 @@ class RandomWalkGenerator(SubgraphGenerator):
     Generates a subgraph based on a random walk from the start node.
     If the end node is found during the walk, the walk terminates.
     Otherwise, it continues until max_steps is reached.
+
+    When the graph supports fast walks (see KnowledgeGraph.uses_walk_engine),
+    several walkers are sent out at once and the first one, in walker order,
+    that reaches the end node gives the path. Otherwise a single walker steps
+    through the neighbors of every node it visits.
     """
 
-    def __init__(self, max_steps: int = 10, seed: int = None):
+    def __init__(self, max_steps: int = 10, seed: int = None, num_walkers: int = 64):
         """
         Initialize the RandomWalkGenerator.
 
         Args:
             max_steps: Maximum number of steps for the random walk
             seed: Random seed for reproducibility
+            num_walkers: Number of walks to try at once
         """
         self.max_steps = max_steps
         self.seed = seed
+        self.num_walkers = num_walkers
         if seed is not None:
             random.seed(seed)
 
@@ -51,6 +59,36 @@ class RandomWalkGenerator(SubgraphGenerator):
         # Validate nodes
         self.validate_nodes(knowledge_graph, start_node, end_node)
 
+        if not knowledge_graph.uses_walk_engine(self.num_walkers):
+            return self._walk(knowledge_graph, start_node, end_node)
+
+        walks = knowledge_graph.random_walks(
+            [start_node] * self.num_walkers,
+            self.max_steps,
+            targets=[end_node] * self.num_walkers,
+        )
+        reached = np.flatnonzero(walks.reached)
+        if len(reached):
+            return walks.path(int(reached[0]))
+
+        # If no walker found the end node, check if we can reach it directly
+        # from the last node one of them visited
+        end_neighbors = knowledge_graph.get_walk_engine().node_ids(
+            knowledge_graph.get_node_neighbors(end_node)
+        )
+        last_nodes = walks.nodes[np.arange(len(walks)), walks.lengths - 1]
+        adjacent = np.flatnonzero(np.isin(last_nodes, end_neighbors))
+        if len(adjacent):
+            return walks.path(int(adjacent[0])) + [end_node]
+
+        raise nx.NetworkXNoPath(
+            f"Random walk did not reach '{end_node}' from '{start_node}' within {self.max_steps} steps"
+        )
+
+    def _walk(
+        self, knowledge_graph: KnowledgeGraph, start_node: str, end_node: str
+    ) -> List[str]:
+        """Take a single walk step by step, through get_node_neighbors."""
         # Start the random walk
         path = [start_node]
         current_node = start_node
@@ -76,20 +114,13 @@ class RandomWalkGenerator(SubgraphGenerator):
 
         # If we've gone through all steps and haven't found the end node,
         # check if we can reach it directly from the last node we visited
-        all_neighbors = knowledge_graph.get_node_neighbors(current_node)
-
-        if end_node in all_neighbors:
+        if end_node in knowledge_graph.get_node_neighbors(current_node):
             path.append(end_node)
             return path
 
-        # If we didn't reach the end node, raise an exception
-        if end_node not in path:
-            raise nx.NetworkXNoPath(
-                f"Random walk did not reach '{end_node}' from '{start_node}' within {self.max_steps} steps"
-            )
-
-        # Return the path we found (if end_node is in the path)
-        return path
+        raise nx.NetworkXNoPath(
+            f"Random walk did not reach '{end_node}' from '{start_node}' within {self.max_steps} steps"
+        )
 
 
 class SingleNodeRandomWalkGenerator(SingleNodeSubgraphGenerator):
@@ -128,6 +159,9 @@ class SingleNodeRandomWalkGenerator(SingleNodeSubgraphGenerator):
         # Validate node
         self.validate_node(knowledge_graph, start_node)
 
+        if knowledge_graph.uses_walk_engine():
+            return knowledge_graph.random_walks([start_node], self.max_steps).path(0)
+
         # Start the random walk
         path = [start_node]
         current_node = start_node
@@ -0,0 +1,556 @@
+"""
+Approximate nearest-neighbour index over embeddings.
+
+IVFIndex is an inverted file index in pure NumPy. Spherical k-means splits the
+embeddings into num_lists lists around centroids, and a query only compares
+with the embeddings of the nprobe lists whose centroids are closest to it.
+With about sqrt(N) lists, a query costs O(sqrt(N)) comparisons instead of
+O(N), so finding the neighbours of every node is sub-quadratic.
+
+Similarities are cosine similarities, computed exactly for the embeddings of
+the probed lists. Neighbours in lists that are not probed are missed, which
+recall_report measures against an exhaustive search.
+"""
+
+import math
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from ard.utils.embedding_store import EmbeddingStore
+from ard.utils.section_file import SectionFileReader, SectionFileWriter
+
+ANN_INDEX_FILE_KIND = "ard.ann_index"
+ANN_INDEX_FILE_VERSION = 1
+
+DEFAULT_NPROBE = 8
+DEFAULT_ITERATIONS = 10
+DEFAULT_TRAIN_SAMPLE = 100_000
+
+# Number of vectors compared with all centroids in one matrix product
+_BLOCK_SIZE = 4096
+
+Query = Union[str, np.ndarray]
+Neighbors = List[Tuple[str, float]]
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    """Scale rows to unit length, leaving zero rows as they are."""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.where(norms > 0, norms, 1)
+
+
+def default_num_lists(size: int) -> int:
+    """Get the default number of lists for size embeddings, about 4 sqrt(size)."""
+    return max(1, min(size, int(4 * math.sqrt(size))))
+
+
+@dataclass
+class RecallReport:
+    """
+    Quality and speed of an index against an exhaustive search.
+
+    Attributes:
+        k (int): Number of neighbours per query
+        nprobe (int): Number of lists probed per query
+        num_queries (int): Number of queries
+        recall (float): Share of the exact top-k neighbours found by the index
+        ann_seconds (float): Time of the queries with the index
+        exact_seconds (float): Time of the same queries compared with every
+            embedding
+    """
+
+    k: int
+    nprobe: int
+    num_queries: int
+    recall: float
+    ann_seconds: float
+    exact_seconds: float
+
+    @property
+    def speedup(self) -> float:
+        """Get how many times faster the index answered than the exact search."""
+        return self.exact_seconds / self.ann_seconds if self.ann_seconds else 0.0
+
+
+class IVFIndex:
+    """
+    Inverted file index for cosine-similarity queries over named embeddings.
+
+    The index keeps its own unit-length float32 copy of the embeddings, in
+    rows that are reused after removals, and the rows of every list. Lists are
+    trained once, embeddings added later go to the list of their closest
+    centroid. Queries are either the name of an indexed embedding, which is
+    then left out of its own neighbours, or a vector.
+    """
+
+    def __init__(self, dim: int, nprobe: int = DEFAULT_NPROBE) -> None:
+        """
+        Initialize an empty, untrained IVFIndex.
+
+        Args:
+            dim (int): Size of the embeddings
+            nprobe (int): Default number of lists probed per query
+
+        Raises:
+            ValueError: If nprobe is less than 1
+        """
+        if nprobe < 1:
+            raise ValueError("nprobe must be at least 1")
+        self.dim = dim
+        self.nprobe = nprobe
+        self._centroids = np.empty((0, dim), dtype=np.float32)
+        self._vectors = np.empty((0, dim), dtype=np.float32)
+        self._names: List[Optional[str]] = []
+        self._rows: Dict[str, int] = {}
+        self._free: List[int] = []
+        self._list_of_row = np.empty(0, dtype=np.int64)
+        self._lists: List[List[int]] = []
+        self._arrays: List[Optional[np.ndarray]] = []
+
+    @classmethod
+    def from_store(
+        cls,
+        store: EmbeddingStore,
+        names: Optional[Sequence[str]] = None,
+        num_lists: Optional[int] = None,
+        nprobe: int = DEFAULT_NPROBE,
+        iterations: int = DEFAULT_ITERATIONS,
+        seed: int = 0,
+    ) -> "IVFIndex":
+        """
+        Train an index on the embeddings of a store and add them.
+
+        Args:
+            store (EmbeddingStore): The embeddings, e.g. those of an Embedder
+            names (Optional[Sequence[str]]): Texts to index, all of the store
+                if None
+            num_lists (Optional[int]): Number of lists, default_num_lists() if
+                None
+            nprobe (int): Default number of lists probed per query
+            iterations (int): Number of k-means iterations
+            seed (int): Seed of the k-means initialization
+
+        Returns:
+            IVFIndex: The trained index
+
+        Raises:
+            KeyError: If a name has no embedding in the store
+            ValueError: If there are no embeddings to index
+        """
+        names = store.names if names is None else list(names)
+        if not names:
+            raise ValueError("Cannot build an index without embeddings")
+        vectors = store.matrix[store.rows(names)]
+        index = cls(store.dim, nprobe=nprobe)
+        index.train(
+            vectors, num_lists or default_num_lists(len(names)), iterations, seed
+        )
+        index.add(names, vectors)
+        return index
+
+    @property
+    def num_lists(self) -> int:
+        """Get the number of lists, 0 until the index is trained."""
+        return len(self._centroids)
+
+    @property
+    def names(self) -> List[str]:
+        """Get the names of the indexed embeddings."""
+        return list(self._rows)
+
+    def train(
+        self,
+        vectors: np.ndarray,
+        num_lists: int,
+        iterations: int = DEFAULT_ITERATIONS,
+        seed: int = 0,
+        sample_size: int = DEFAULT_TRAIN_SAMPLE,
+    ) -> None:
+        """
+        Find the centroids of the lists with spherical k-means.
+
+        Args:
+            vectors (np.ndarray): Embeddings to train on, one per row
+            num_lists (int): Number of lists, at most the number of embeddings
+            iterations (int): Number of k-means iterations
+            seed (int): Seed of the initialization and sampling
+            sample_size (int): Largest number of embeddings trained on
+
+        Raises:
+            ValueError: If the index already holds embeddings, or there are no
+                vectors to train on
+        """
+        if self._rows:
+            raise ValueError("Cannot train an index that holds embeddings")
+        if not len(vectors) or num_lists < 1:
+            raise ValueError("Training requires vectors and at least one list")
+        rng = np.random.default_rng(seed)
+        vectors = _normalize(vectors)
+        if len(vectors) > sample_size:
+            vectors = vectors[rng.choice(len(vectors), sample_size, replace=False)]
+        num_lists = min(num_lists, len(vectors))
+        centroids = vectors[rng.choice(len(vectors), num_lists, replace=False)]
+
+        for _ in range(iterations):
+            assignment = self._closest(vectors, centroids)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignment, vectors)
+            counts = np.bincount(assignment, minlength=num_lists)
+            # Restart empty lists from random embeddings
+            empty = np.flatnonzero(counts == 0)
+            sums[empty] = vectors[rng.choice(len(vectors), len(empty))]
+            centroids = _normalize(sums)
+
+        self._centroids = centroids
+        self._lists = [[] for _ in range(num_lists)]
+        self._arrays = [None] * num_lists
+
+    @staticmethod
+    def _closest(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+        """Get the closest centroid of every vector, in blocks of rows."""
+        return np.concatenate(
+            [
+                np.argmax(vectors[start : start + _BLOCK_SIZE] @ centroids.T, axis=1)
+                for start in range(0, len(vectors), _BLOCK_SIZE)
+            ]
+        )
+
+    def add(self, names: Sequence[str], vectors: np.ndarray) -> None:
+        """
+        Add or replace embeddings.
+
+        Args:
+            names (Sequence[str]): Their names, without duplicates
+            vectors (np.ndarray): The embeddings, one row per name
+
+        Raises:
+            ValueError: If the index is not trained, or the embeddings do not
+                match the names or the size of the index
+        """
+        if not self.num_lists:
+            raise ValueError("The index must be trained before adding embeddings")
+        vectors = _normalize(vectors)
+        if vectors.shape != (len(names), self.dim):
+            raise ValueError(
+                f"Expected {len(names)} embeddings of size {self.dim}, got an "
+                f"array of shape {vectors.shape}"
+            )
+        self.remove([name for name in names if name in self._rows])
+
+        rows = []
+        for name in names:
+            row = self._free.pop() if self._free else len(self._names)
+            if row == len(self._names):
+                self._names.append(name)
+            else:
+                self._names[row] = name
+            self._rows[name] = row
+            rows.append(row)
+        self._reserve(len(self._names))
+        rows = np.array(rows, dtype=np.int64)
+        self._vectors[rows] = vectors
+        assignment = self._closest(vectors, self._centroids)
+        self._list_of_row[rows] = assignment
+        for row, list_id in zip(rows.tolist(), assignment.tolist()):
+            self._lists[list_id].append(row)
+            self._arrays[list_id] = None
+
+    def _reserve(self, size: int) -> None:
+        """Grow the row arrays to at least size rows, keeping their contents."""
+        capacity = len(self._vectors)
+        if size <= capacity:
+            return
+        capacity = max(capacity * 2, size)
+        vectors = np.empty((capacity, self.dim), dtype=np.float32)
+        vectors[: len(self._vectors)] = self._vectors
+        list_of_row = np.empty(capacity, dtype=np.int64)
+        list_of_row[: len(self._list_of_row)] = self._list_of_row
+        self._vectors, self._list_of_row = vectors, list_of_row
+
+    def remove(self, names: Sequence[str]) -> None:
+        """
+        Remove embeddings.
+
+        Args:
+            names (Sequence[str]): Names of indexed embeddings
+
+        Raises:
+            KeyError: If a name is not in the index
+        """
+        for name in names:
+            row = self._rows.pop(name)
+            list_id = int(self._list_of_row[row])
+            self._lists[list_id].remove(row)
+            self._arrays[list_id] = None
+            self._names[row] = None
+            self._free.append(row)
+
+    def _list_rows(self, list_id: int) -> np.ndarray:
+        rows = self._arrays[list_id]
+        if rows is None:
+            rows = self._arrays[list_id] = np.array(
+                self._lists[list_id], dtype=np.int64
+            )
+        return rows
+
+    def _query_vectors(self, queries: Sequence[Query]) -> Tuple[np.ndarray, List[int]]:
+        """Get unit query vectors, and the row of every query given by name."""
+        vectors = np.empty((len(queries), self.dim), dtype=np.float32)
+        exclude = []
+        for i, query in enumerate(queries):
+            if isinstance(query, str):
+                row = self._rows[query]
+                vectors[i] = self._vectors[row]
+                exclude.append(row)
+            else:
+                vectors[i] = _normalize(np.asarray(query).reshape(-1))
+                exclude.append(-1)
+        return vectors, exclude
+
+    def _candidates(
+        self, queries: Sequence[Query], nprobe: Optional[int]
+    ) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """Get the rows of the probed lists of every query and their similarity."""
+        nprobe = min(nprobe or self.nprobe, self.num_lists)
+        results = []
+        for start in range(0, len(queries), _BLOCK_SIZE):
+            vectors, exclude = self._query_vectors(queries[start : start + _BLOCK_SIZE])
+            scores = vectors @ self._centroids.T
+            if nprobe < self.num_lists:
+                probes = np.argpartition(-scores, nprobe - 1, axis=1)[:, :nprobe]
+            else:
+                probes = np.broadcast_to(np.arange(self.num_lists), scores.shape)
+            for vector, lists, row in zip(vectors, probes, exclude):
+                rows = np.concatenate([self._list_rows(i) for i in lists.tolist()])
+                if row >= 0:
+                    rows = rows[rows != row]
+                results.append((rows, self._vectors[rows] @ vector))
+        return results
+
+    def _neighbors(self, rows: np.ndarray, similarities: np.ndarray) -> Neighbors:
+        order = np.argsort(-similarities, kind="stable")
+        return [
+            (self._names[row], float(similarity))
+            for row, similarity in zip(rows[order].tolist(), similarities[order])
+        ]
+
+    def query_many(
+        self, queries: Sequence[Query], k: int = 10, nprobe: Optional[int] = None
+    ) -> List[Neighbors]:
+        """
+        Find the k most similar embeddings of every query.
+
+        Args:
+            queries (Sequence[Query]): Names of indexed embeddings or vectors
+            k (int): Number of neighbours per query
+            nprobe (Optional[int]): Number of lists probed, the default of the
+                index if None
+
+        Returns:
+            List[Neighbors]: For every query, up to k (name, cosine similarity)
+                pairs, most similar first
+
+        Raises:
+            KeyError: If a query name is not in the index
+            ValueError: If k is less than 1
+        """
+        if k < 1:
+            raise ValueError("k must be at least 1")
+        results = []
+        for rows, similarities in self._candidates(queries, nprobe):
+            if len(rows) > k:
+                top = np.argpartition(-similarities, k - 1)[:k]
+                rows, similarities = rows[top], similarities[top]
+            results.append(self._neighbors(rows, similarities))
+        return results
+
+    def query(
+        self, query: Query, k: int = 10, nprobe: Optional[int] = None
+    ) -> Neighbors:
+        """
+        Find the k most similar embeddings of a query.
+
+        Args:
+            query (Query): Name of an indexed embedding, or a vector
+            k (int): Number of neighbours
+            nprobe (Optional[int]): Number of lists probed, the default of the
+                index if None
+
+        Returns:
+            Neighbors: Up to k (name, cosine similarity) pairs, most similar first
+
+        Raises:
+            KeyError: If the query name is not in the index
+            ValueError: If k is less than 1
+        """
+        return self.query_many([query], k, nprobe)[0]
+
+    def radius_query_many(
+        self,
+        queries: Sequence[Query],
+        min_similarity: float,
+        nprobe: Optional[int] = None,
+    ) -> List[Neighbors]:
+        """
+        Find the embeddings at least min_similarity similar to every query.
+
+        Args:
+            queries (Sequence[Query]): Names of indexed embeddings or vectors
+            min_similarity (float): Lowest cosine similarity of a neighbour
+            nprobe (Optional[int]): Number of lists probed, the default of the
+                index if None
+
+        Returns:
+            List[Neighbors]: For every query, the (name, cosine similarity)
+                pairs of its neighbours, most similar first
+
+        Raises:
+            KeyError: If a query name is not in the index
+        """
+        results = []
+        for rows, similarities in self._candidates(queries, nprobe):
+            close = similarities >= min_similarity
+            results.append(self._neighbors(rows[close], similarities[close]))
+        return results
+
+    def radius_query(
+        self, query: Query, min_similarity: float, nprobe: Optional[int] = None
+    ) -> Neighbors:
+        """
+        Find the embeddings at least min_similarity similar to a query.
+
+        Args:
+            query (Query): Name of an indexed embedding, or a vector
+            min_similarity (float): Lowest cosine similarity of a neighbour
+            nprobe (Optional[int]): Number of lists probed, the default of the
+                index if None
+
+        Returns:
+            Neighbors: The (name, cosine similarity) pairs of the neighbours,
+                most similar first
+
+        Raises:
+            KeyError: If the query name is not in the index
+        """
+        return self.radius_query_many([query], min_similarity, nprobe)[0]
+
+    def recall_report(
+        self,
+        k: int = 10,
+        num_queries: int = 100,
+        nprobe: Optional[int] = None,
+        seed: int = 0,
+    ) -> RecallReport:
+        """
+        Measure the recall of top-k queries against an exhaustive search.
+
+        Args:
+            k (int): Number of neighbours per query
+            num_queries (int): Number of indexed embeddings queried, sampled
+                at random
+            nprobe (Optional[int]): Number of lists probed, the default of the
+                index if None
+            seed (int): Seed of the sampling
+
+        Returns:
+            RecallReport: The recall and the time of both searches
+        """
+        names = self.names
+        rng = np.random.default_rng(seed)
+        queries = [
+            names[i]
+            for i in rng.choice(len(names), min(num_queries, len(names)), False)
+        ]
+
+        start = time.perf_counter()
+        approximate = self.query_many(queries, k, nprobe)
+        ann_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        rows = np.array([self._rows[name] for name in names], dtype=np.int64)
+        vectors = self._vectors[rows]
+        positions = {name: i for i, name in enumerate(names)}
+        found = total = 0
+        for query, neighbors in zip(queries, approximate):
+            similarities = vectors @ vectors[positions[query]]
+            similarities[positions[query]] = -np.inf
+            top = np.argpartition(-similarities, min(k, len(names) - 1) - 1)[:k]
+            exact = {names[i] for i in top.tolist() if similarities[i] > -np.inf}
+            found += len(exact & {name for name, _ in neighbors})
+            total += len(exact)
+        exact_seconds = time.perf_counter() - start
+
+        return RecallReport(
+            k=k,
+            nprobe=min(nprobe or self.nprobe, self.num_lists),
+            num_queries=len(queries),
+            recall=found / total if total else 1.0,
+            ann_seconds=ann_seconds,
+            exact_seconds=exact_seconds,
+        )
+
+    def save(self, path: str) -> None:
+        """
+        Save the index to a section file.
+
+        Args:
+            path (str): Path of the file to write
+        """
+        names = self.names
+        rows = np.array([self._rows[name] for name in names], dtype=np.int64)
+        with SectionFileWriter(
+            path, kind=ANN_INDEX_FILE_KIND, version=ANN_INDEX_FILE_VERSION
+        ) as writer:
+            writer.write_array("centroids", self._centroids, dtype=np.float32)
+            writer.write_array("vectors", self._vectors[rows], dtype=np.float32)
+            writer.write_array("lists", self._list_of_row[rows], dtype=np.int64)
+            writer.write_strings("names", names)
+            writer.meta.update(
+                dim=self.dim,
+                nprobe=self.nprobe,
+                num_lists=self.num_lists,
+                count=len(names),
+            )
+
+    @classmethod
+    def load(cls, path: str) -> "IVFIndex":
+        """
+        Load an index saved with save().
+
+        Args:
+            path (str): Path of the file
+
+        Returns:
+            IVFIndex: The index
+
+        Raises:
+            FileNotFoundError: If the file doesn't exist
+            ValueError: If the file is not an index file or has an unsupported
+                version
+        """
+        file = SectionFileReader(path, kind=ANN_INDEX_FILE_KIND)
+        if file.version > ANN_INDEX_FILE_VERSION:
+            raise ValueError(f"Unsupported index file version {file.version}: {path}")
+        meta = file.meta
+        dim, count = meta["dim"], meta["count"]
+        index = cls(dim, nprobe=meta["nprobe"])
+        index._centroids = file.array("centroids").reshape(meta["num_lists"], dim)
+        index._vectors = file.array("vectors").reshape(count, dim)
+        index._list_of_row = file.array("lists")
+        index._names = file.strings("names").to_list()
+        index._rows = {name: row for row, name in enumerate(index._names)}
+        index._lists = [[] for _ in range(index.num_lists)]
+        for row, list_id in enumerate(index._list_of_row.tolist()):
+            index._lists[list_id].append(row)
+        index._arrays = [None] * index.num_lists
+        return index
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._rows
+
+    def __len__(self) -> int:
+        return len(self._rows)
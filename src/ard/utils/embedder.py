@@ -1,16 +1,34 @@
 import json
 import os
-from typing import Dict, List
+import queue
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
 import numpy as np
 
+from ard.utils.ann_index import IVFIndex
+from ard.utils.embedding_cache import EmbeddingCache
+from ard.utils.embedding_file import (
+    is_embedding_file,
+    read_embedding_file,
+    write_embedding_file,
+)
+from ard.utils.embedding_store import EmbeddingStore
+from ard.utils.encoding_engine import (
+    DEFAULT_CHUNK_SIZE,
+    EncodingEngine,
+    chunked,
+    load_sentence_transformer,
+)
+
 
 class Embedder:
     """
     A class for generating, storing, and retrieving embeddings for nodes in a knowledge graph.
 
     This class provides a centralized way to handle embeddings, which can be used by
-    various components like node mergers and path generators.
+    various components like node mergers and path generators. Cached embeddings
+    are kept in an EmbeddingStore, so that one text can be compared with many
+    others, or many with many, in a single matrix product.
     """
 
     def __init__(
@@ -18,6 +36,8 @@ class Embedder:
         model_name: str = "all-MiniLM-L6-v2",
         cache_embeddings: bool = True,
         distance_metric: str = "cosine",
+        persistent_cache: Optional[EmbeddingCache] = None,
+        encoding_engine: Optional[EncodingEngine] = None,
     ):
         """
         Initialize the Embedder.
@@ -26,12 +46,26 @@ class Embedder:
             model_name: Name of the SentenceTransformer model to use
             cache_embeddings: Whether to cache embeddings in memory
             distance_metric: Distance metric to use ('cosine', 'euclidean', or 'dot')
+            persistent_cache: Cache shared across runs, consulted before encoding
+                any text with the model
+            encoding_engine: Engine to encode with, e.g. over a pool of worker
+                processes. Texts are encoded in this process if None.
+
+        Raises:
+            ValueError: If the encoding engine uses another model
         """
+        if encoding_engine is not None and encoding_engine.model_name != model_name:
+            raise ValueError(
+                f"Model name mismatch: {encoding_engine.model_name} (engine) vs "
+                f"{model_name} (embedder)"
+            )
         self.model_name = model_name
         self.cache_embeddings = cache_embeddings
         self.distance_metric = distance_metric
+        self.persistent_cache = persistent_cache
+        self.encoding_engine = encoding_engine
         self._model = None  # Lazy-loaded
-        self._embeddings = {}  # Cache for embeddings
+        self._embeddings = EmbeddingStore()  # Cache for embeddings
 
     def _load_model(self):
         """
@@ -41,15 +75,37 @@ class Embedder:
             ImportError: If sentence-transformers is not installed
         """
         if self._model is None:
-            try:
-                from sentence_transformers import SentenceTransformer
-            except ImportError:
-                raise ImportError(
-                    "The sentence-transformers package is required for Embedder. "
-                    "Install it with 'pip install sentence-transformers'"
-                )
+            self._model = load_sentence_transformer(self.model_name)
+
+    def _engine(self) -> EncodingEngine:
+        """Get the encoding engine, or one encoding with the model of the embedder."""
+        if self.encoding_engine is not None:
+            return self.encoding_engine
+        self._load_model()
+        return EncodingEngine(self.model_name, model=self._model)
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        """
+        Encode texts with the model, reading and filling the persistent cache.
+
+        Args:
+            texts: The texts to encode
 
-            self._model = SentenceTransformer(self.model_name)
+        Returns:
+            np.ndarray: Their float32 embeddings, one row per text
+        """
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+        if self.persistent_cache is None:
+            return self._engine().encode(texts)
+
+        found = self.persistent_cache.get_many(self.model_name, texts)
+        missing = [text for text in dict.fromkeys(texts) if text not in found]
+        if missing:
+            embeddings = self._engine().encode(missing)
+            self.persistent_cache.put_many(self.model_name, missing, embeddings)
+            found.update(zip(missing, embeddings))
+        return np.stack([found[text] for text in texts])
 
     def embed(
         self,
@@ -64,21 +120,77 @@ class Embedder:
         Returns:
             Dict[str, np.ndarray]: Dictionary mapping node names to their embeddings
         """
-        self._load_model()
-
-        # Get all nodes from the graph
-        embeddings = self._model.encode(words, show_progress_bar=False)
-
-        # Ensure embeddings are 2D array
-        if len(embeddings.shape) == 1:
-            embeddings = embeddings.reshape(1, -1)
+        words = list(dict.fromkeys(words))
+        embeddings = self._encode(words)
 
         # Store embeddings in cache if enabled
         if self.cache_embeddings:
-            for word, embedding in zip(words, embeddings):
-                self._embeddings[word] = embedding.flatten()  # Store as 1D array
+            self._embeddings.add_many(words, embeddings)
+            return {word: self._embeddings[word] for word in words}
 
-        return {word: embedding.flatten() for word, embedding in zip(words, embeddings)}
+        return dict(zip(words, embeddings))
+
+    def embed_stream(
+        self, words: Iterable[str], chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> int:
+        """
+        Calculate embeddings for words as they arrive, e.g. from a generator.
+
+        Words are read chunk_size at a time, so encoding starts before all of
+        them are known and, with an engine using worker processes, goes on while
+        the next words are produced. Words already in the in-memory or the
+        persistent cache are not encoded again.
+
+        Args:
+            words: The words to embed
+            chunk_size: Number of words looked up in the caches at a time
+
+        Returns:
+            int: Number of embeddings added to the in-memory cache
+
+        Raises:
+            ValueError: If caching is disabled, as the embeddings would be lost
+        """
+        if not self.cache_embeddings:
+            raise ValueError("embed_stream requires cache_embeddings")
+
+        # Misses are read by the pool's task thread when the engine has workers,
+        # so embeddings found in the persistent cache are passed back in a queue
+        hits: "queue.SimpleQueue[Dict[str, np.ndarray]]" = queue.SimpleQueue()
+        seen = set()
+
+        def misses() -> Iterator[str]:
+            for chunk in chunked(words, chunk_size):
+                chunk = [
+                    word
+                    for word in dict.fromkeys(chunk)
+                    if word not in seen and word not in self._embeddings
+                ]
+                seen.update(chunk)
+                if self.persistent_cache is not None and chunk:
+                    found = self.persistent_cache.get_many(self.model_name, chunk)
+                    if found:
+                        hits.put(found)
+                        chunk = [word for word in chunk if word not in found]
+                yield from chunk
+
+        count = 0
+
+        def add_hits() -> None:
+            nonlocal count
+            while not hits.empty():
+                found = hits.get()
+                self._embeddings.add_many(list(found), np.stack(list(found.values())))
+                count += len(found)
+
+        for texts, embeddings in self._engine().iter_encode(misses()):
+            add_hits()
+            if self.persistent_cache is not None:
+                self.persistent_cache.put_many(self.model_name, texts, embeddings)
+            self._embeddings.add_many(texts, embeddings)
+            count += len(texts)
+        add_hits()
+        return count
 
     def get_embedding(self, text: str) -> np.ndarray:
         """
@@ -91,22 +203,19 @@ class Embedder:
             text: The text to get the embedding for
 
         Returns:
-            np.ndarray: The embedding vector
+            np.ndarray: The embedding vector, read-only if it is cached
         """
         # Check if embedding is in cache
         if text in self._embeddings:
             return self._embeddings[text]
 
         # Calculate embedding
-        self._load_model()
-        embedding = self._model.encode(text, show_progress_bar=False)
-
-        # Ensure embedding is 1D
-        embedding = np.asarray(embedding).flatten()
+        embedding = self._encode([text])[0]
 
         # Cache embedding if enabled
         if self.cache_embeddings:
-            self._embeddings[text] = embedding
+            self._embeddings.add(text, embedding)
+            return self._embeddings[text]
 
         return embedding
 
@@ -120,27 +229,39 @@ class Embedder:
         Returns:
             Dict[str, np.ndarray]: Dictionary mapping texts to their embeddings
         """
-        # Check which texts are not in cache
-        missing_texts = [text for text in texts if text not in self._embeddings]
+        store = self._store(texts)
+        return {text: store[text] for text in texts}
 
-        # Calculate embeddings for missing texts
-        if missing_texts:
-            self._load_model()
-            missing_embeddings = self._model.encode(
-                missing_texts, show_progress_bar=False
-            )
+    def _store(self, texts: List[str]) -> EmbeddingStore:
+        """
+        Get a store holding the embeddings of texts, encoding the missing ones.
+
+        Missing embeddings are encoded in a single batch. With caching, they
+        are added to the cache, which is returned. Without, a temporary store
+        with only the given texts is returned.
+
+        Args:
+            texts: The texts
 
-            # Ensure embeddings are 2D array
-            if len(missing_embeddings.shape) == 1:
-                missing_embeddings = missing_embeddings.reshape(1, -1)
+        Returns:
+            EmbeddingStore: A store with an embedding for every text
+        """
+        missing = [
+            text for text in dict.fromkeys(texts) if text not in self._embeddings
+        ]
+        if not missing:
+            return self._embeddings
 
-            # Cache embeddings if enabled
-            if self.cache_embeddings:
-                for text, embedding in zip(missing_texts, missing_embeddings):
-                    self._embeddings[text] = embedding.flatten()
+        embeddings = self._encode(missing)
+        if self.cache_embeddings:
+            self._embeddings.add_many(missing, embeddings)
+            return self._embeddings
 
-        # Return embeddings for all texts
-        return {text: self.get_embedding(text) for text in texts}
+        cached = [text for text in dict.fromkeys(texts) if text in self._embeddings]
+        store = EmbeddingStore(embeddings.shape[1])
+        store.add_many(cached, self._embeddings.matrix[self._embeddings.rows(cached)])
+        store.add_many(missing, embeddings)
+        return store
 
     @property
     def embeddings_len(self) -> int:
@@ -162,24 +283,7 @@ class Embedder:
         Raises:
             ValueError: If the specified metric is not supported
         """
-        # Get embeddings
-        embedding1 = self.get_embedding(text1)
-        embedding2 = self.get_embedding(text2)
-
-        # Use provided metric or fall back to default
-        metric = metric or self.distance_metric
-
-        # Calculate distance based on selected metric
-        if metric == "cosine":
-            return 1.0 - self._cosine_similarity(embedding1, embedding2)
-        elif metric == "euclidean":
-            return self._euclidean_distance(embedding1, embedding2)
-        elif metric == "dot":
-            return -self._dot_product(
-                embedding1, embedding2
-            )  # Negative because smaller is better for distance
-        else:
-            raise ValueError(f"Unknown distance metric: {metric}")
+        return float(self._compare([text1], [text2], metric, similarity=False)[0, 0])
 
     def calculate_similarity(self, text1: str, text2: str, metric: str = None) -> float:
         """
@@ -197,79 +301,181 @@ class Embedder:
         Raises:
             ValueError: If the specified metric is not supported
         """
-        # Get embeddings
-        embedding1 = self.get_embedding(text1)
-        embedding2 = self.get_embedding(text2)
+        return float(self._compare([text1], [text2], metric, similarity=True)[0, 0])
 
-        # Use provided metric or fall back to default
-        metric = metric or self.distance_metric
+    def distances(self, text: str, others: List[str], metric: str = None) -> np.ndarray:
+        """
+        Calculate the distances from a text to many others.
 
-        # Calculate similarity based on selected metric
-        if metric == "cosine":
-            return self._cosine_similarity(embedding1, embedding2)
-        elif metric == "euclidean":
-            # Convert euclidean distance to similarity (1 / (1 + distance))
-            distance = self._euclidean_distance(embedding1, embedding2)
-            return 1.0 / (1.0 + distance)
-        elif metric == "dot":
-            return self._dot_product(embedding1, embedding2)
-        else:
-            raise ValueError(f"Unknown distance metric: {metric}")
+        Args:
+            text: The text to compare
+            others: The texts to compare it with
+            metric: Distance metric to use ('cosine', 'euclidean', or 'dot'). If None,
+                   uses the metric specified during initialization.
+
+        Returns:
+            np.ndarray: Distance to every text in others, in order
 
-    def _cosine_similarity(self, vec1: np.ndarray, vec2: np.ndarray) -> float:
+        Raises:
+            ValueError: If the specified metric is not supported
         """
-        Calculate cosine similarity between two vectors.
+        return self._compare([text], others, metric, similarity=False)[0]
+
+    def similarities(
+        self, text: str, others: List[str], metric: str = None
+    ) -> np.ndarray:
+        """
+        Calculate the similarities of a text to many others.
 
         Args:
-            vec1: First vector
-            vec2: Second vector
+            text: The text to compare
+            others: The texts to compare it with
+            metric: Distance metric to use ('cosine', 'euclidean', or 'dot'). If None,
+                   uses the metric specified during initialization.
 
         Returns:
-            float: Cosine similarity (0-1)
+            np.ndarray: Similarity to every text in others, in order
+
+        Raises:
+            ValueError: If the specified metric is not supported
+        """
+        return self._compare([text], others, metric, similarity=True)[0]
+
+    def pairwise_distances(
+        self,
+        texts1: List[str],
+        texts2: Optional[List[str]] = None,
+        metric: str = None,
+    ) -> np.ndarray:
         """
-        # Ensure vectors are 1D
-        vec1 = np.asarray(vec1).flatten()
-        vec2 = np.asarray(vec2).flatten()
+        Calculate the distances between every pair of texts.
+
+        Args:
+            texts1: Texts of the rows
+            texts2: Texts of the columns, texts1 if None
+            metric: Distance metric to use ('cosine', 'euclidean', or 'dot'). If None,
+                   uses the metric specified during initialization.
 
-        return np.dot(vec1, vec2) / (np.linalg.norm(vec1) * np.linalg.norm(vec2))
+        Returns:
+            np.ndarray: A (len(texts1), len(texts2)) matrix of distances
 
-    def _euclidean_distance(self, vec1: np.ndarray, vec2: np.ndarray) -> float:
+        Raises:
+            ValueError: If the specified metric is not supported
         """
-        Calculate Euclidean distance between two vectors.
+        if texts2 is None:
+            texts2 = texts1
+        return self._compare(texts1, texts2, metric, similarity=False)
+
+    def pairwise_similarities(
+        self,
+        texts1: List[str],
+        texts2: Optional[List[str]] = None,
+        metric: str = None,
+    ) -> np.ndarray:
+        """
+        Calculate the similarities between every pair of texts.
 
         Args:
-            vec1: First vector
-            vec2: Second vector
+            texts1: Texts of the rows
+            texts2: Texts of the columns, texts1 if None
+            metric: Distance metric to use ('cosine', 'euclidean', or 'dot'). If None,
+                   uses the metric specified during initialization.
 
         Returns:
-            float: Euclidean distance
+            np.ndarray: A (len(texts1), len(texts2)) matrix of similarities
+
+        Raises:
+            ValueError: If the specified metric is not supported
         """
-        # Ensure vectors are 1D
-        vec1 = np.asarray(vec1).flatten()
-        vec2 = np.asarray(vec2).flatten()
+        if texts2 is None:
+            texts2 = texts1
+        return self._compare(texts1, texts2, metric, similarity=True)
 
-        return np.linalg.norm(vec1 - vec2)
+    def build_index(self, texts: Optional[List[str]] = None, **kwargs) -> IVFIndex:
+        """
+        Build an approximate nearest-neighbour index over embeddings.
 
-    def _dot_product(self, vec1: np.ndarray, vec2: np.ndarray) -> float:
+        The index answers "texts most similar to X" queries by cosine
+        similarity without comparing X with every text.
+
+        Args:
+            texts: Texts to index, encoding the missing ones. All cached
+                embeddings if None.
+            **kwargs: Arguments of IVFIndex.from_store, such as num_lists and
+                nprobe
+
+        Returns:
+            IVFIndex: The index
+
+        Raises:
+            ValueError: If there are no embeddings to index
+        """
+        if texts is None:
+            return IVFIndex.from_store(self._embeddings, **kwargs)
+        texts = list(dict.fromkeys(texts))
+        return IVFIndex.from_store(self._store(texts), names=texts, **kwargs)
+
+    def _compare(
+        self,
+        texts1: List[str],
+        texts2: List[str],
+        metric: Optional[str],
+        similarity: bool,
+    ) -> np.ndarray:
         """
-        Calculate dot product between two vectors.
+        Compare every text of texts1 with every text of texts2.
 
         Args:
-            vec1: First vector
-            vec2: Second vector
+            texts1: Texts of the rows
+            texts2: Texts of the columns
+            metric: Distance metric to use, or None for the default one
+            similarity: Whether to return similarities rather than distances
 
         Returns:
-            float: Dot product
+            np.ndarray: A (len(texts1), len(texts2)) matrix
+
+        Raises:
+            ValueError: If the specified metric is not supported
         """
-        # Ensure vectors are 1D
-        vec1 = np.asarray(vec1).flatten()
-        vec2 = np.asarray(vec2).flatten()
+        # Use provided metric or fall back to default
+        metric = metric or self.distance_metric
+        if metric not in ("cosine", "euclidean", "dot"):
+            raise ValueError(f"Unknown distance metric: {metric}")
+
+        store = self._store(list(texts1) + list(texts2))
+        rows1, rows2 = store.rows(texts1), store.rows(texts2)
+        vectors1, vectors2 = store.matrix[rows1], store.matrix[rows2]
+
+        if metric == "euclidean":
+            if len(rows1) == 1:
+                # Differences are exact where the expansion below cancels
+                distances = np.linalg.norm(vectors2 - vectors1, axis=1)[np.newaxis]
+            else:
+                # Expanded in float64, float32 cancels to errors around 1e-3
+                vectors1 = vectors1.astype(np.float64)
+                vectors2 = vectors2.astype(np.float64)
+                squared = (
+                    np.einsum("ij,ij->i", vectors1, vectors1)[:, np.newaxis]
+                    + np.einsum("ij,ij->i", vectors2, vectors2)[np.newaxis]
+                    - 2 * (vectors1 @ vectors2.T)
+                )
+                distances = np.sqrt(np.maximum(squared, 0))
+            # Convert euclidean distance to similarity (1 / (1 + distance))
+            return 1.0 / (1.0 + distances) if similarity else distances
 
-        return np.dot(vec1, vec2)
+        products = vectors1 @ vectors2.T
+        if metric == "cosine":
+            products /= np.outer(store.norms[rows1], store.norms[rows2])
+            return products if similarity else 1.0 - products
+        # Negative because smaller is better for distance
+        return products if similarity else -products
 
     def save_to_file(self, filename: str) -> None:
         """
-        Save embeddings to a JSON file.
+        Save embeddings to a file.
+
+        Files with the .emb extension use the binary embedding format (see
+        ard.utils.embedding_file); any other extension uses JSON.
 
         Args:
             filename: Path to save the embeddings to
@@ -277,6 +483,17 @@ class Embedder:
         # Create directory if it doesn't exist
         os.makedirs(os.path.dirname(os.path.abspath(filename)), exist_ok=True)
 
+        if is_embedding_file(filename):
+            write_embedding_file(
+                filename,
+                self._embeddings,
+                {
+                    "model_name": self.model_name,
+                    "distance_metric": self.distance_metric,
+                },
+            )
+            return
+
         # Convert numpy arrays to lists for JSON serialization
         serializable_embeddings = {}
         for key, embedding in self._embeddings.items():
@@ -292,12 +509,20 @@ class Embedder:
         with open(filename, "w", encoding="utf-8") as f:
             json.dump(data, f, indent=2)
 
-    def load_from_file(self, filename: str) -> None:
+    @staticmethod
+    def _read_file(
+        filename: str, mmap: bool = True
+    ) -> Tuple[EmbeddingStore, Dict[str, Any]]:
         """
-        Load embeddings from a JSON file.
+        Read the embeddings and metadata of a binary or JSON embeddings file.
 
         Args:
             filename: Path to load the embeddings from
+            mmap: Whether to memory-map the matrix of a binary file
+
+        Returns:
+            Tuple[EmbeddingStore, Dict[str, Any]]: The embeddings, and the
+                metadata with the model name and the distance metric
 
         Raises:
             FileNotFoundError: If the file doesn't exist
@@ -306,27 +531,95 @@ class Embedder:
         if not os.path.exists(filename):
             raise FileNotFoundError(f"Embeddings file not found: {filename}")
 
+        if is_embedding_file(filename):
+            return read_embedding_file(filename, mmap=mmap)
+
         try:
             with open(filename, "r", encoding="utf-8") as f:
                 data = json.load(f)
         except Exception as e:
             raise ValueError(f"Error loading embeddings file: {str(e)}")
 
+        # Convert list embeddings back to a single matrix
+        store = EmbeddingStore()
+        embeddings = data.pop("embeddings")
+        if embeddings:
+            store.add_many(list(embeddings), np.array(list(embeddings.values())))
+        return store, data
+
+    def load_from_file(self, filename: str, mmap: bool = True) -> None:
+        """
+        Load embeddings from a file.
+
+        Files with the .emb extension are read as binary embedding files, whose
+        matrix is memory-mapped by default so that processes loading the same
+        file share its pages; any other extension is read as JSON.
+
+        Args:
+            filename: Path to load the embeddings from
+            mmap: Whether to memory-map the matrix of a binary file
+
+        Raises:
+            FileNotFoundError: If the file doesn't exist
+            ValueError: If the file contains incompatible data
+        """
+        store, meta = self._read_file(filename, mmap=mmap)
+
         # Check if the model name matches
-        if data["model_name"] != self.model_name:
+        if meta["model_name"] != self.model_name:
             raise ValueError(
-                f"Model name mismatch: {data['model_name']} (file) vs {self.model_name} (current)"
+                f"Model name mismatch: {meta['model_name']} (file) vs {self.model_name} (current)"
             )
 
-        # Convert list embeddings back to numpy arrays
-        self._embeddings = {}
-        for key, embedding_list in data["embeddings"].items():
-            self._embeddings[key] = np.array(embedding_list)
+        self._embeddings = store
 
         # Update distance metric if it exists in the file
-        if "distance_metric" in data:
-            self.distance_metric = data["distance_metric"]
+        if "distance_metric" in meta:
+            self.distance_metric = meta["distance_metric"]
+
+    @classmethod
+    def from_file(cls, filename: str, mmap: bool = True, **kwargs) -> "Embedder":
+        """
+        Create an Embedder for the model of an embeddings file, and load it.
+
+        Args:
+            filename: Path to load the embeddings from
+            mmap: Whether to memory-map the matrix of a binary file
+            **kwargs: Other arguments of the Embedder
+
+        Returns:
+            Embedder: An embedder with the model, metric and embeddings of the file
+
+        Raises:
+            FileNotFoundError: If the file doesn't exist
+            ValueError: If the file contains incompatible data
+        """
+        store, meta = cls._read_file(filename, mmap=mmap)
+        if "distance_metric" in meta:
+            kwargs["distance_metric"] = meta["distance_metric"]
+        embedder = cls(model_name=meta["model_name"], **kwargs)
+        embedder._embeddings = store
+        return embedder
 
     def clear_cache(self) -> None:
         """Clear the embedding cache."""
-        self._embeddings = {}
+        self._embeddings = EmbeddingStore()
+
+
+def convert_embeddings_file(source: str, target: str) -> None:
+    """
+    Convert an embeddings file between the JSON and the binary format.
+
+    The format of each file is given by its extension, .emb for binary and
+    anything else for JSON, so this also migrates JSON caches written by older
+    versions to the binary format.
+
+    Args:
+        source: Path of the file to convert
+        target: Path of the file to write
+
+    Raises:
+        FileNotFoundError: If the source file doesn't exist
+        ValueError: If the source file contains incompatible data
+    """
+    Embedder.from_file(source).save_to_file(target)
@@ -0,0 +1,245 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+DEFAULT_MAX_ENTRIES = 1_000_000
+DEFAULT_TIMEOUT = 30.0
+
+# Maximum number of keys bound in a single IN clause
+_MAX_VARIABLES = 500
+
+# The number of embeddings is kept up to date by triggers in a one-row table,
+# so that writes never count the whole table. It is initialized from the rows
+# of caches created before it existed.
+_SCHEMA = """
+BEGIN IMMEDIATE;
+CREATE TABLE IF NOT EXISTS embeddings (
+    model TEXT NOT NULL,
+    key BLOB NOT NULL,
+    vector BLOB NOT NULL,
+    last_used INTEGER NOT NULL,
+    PRIMARY KEY (model, key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS embeddings_last_used ON embeddings (last_used);
+CREATE TABLE IF NOT EXISTS embedding_count (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    size INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO embedding_count (id, size)
+    SELECT 0, COUNT(*) FROM embeddings
+    WHERE NOT EXISTS (SELECT 1 FROM embedding_count);
+CREATE TRIGGER IF NOT EXISTS embeddings_inserted AFTER INSERT ON embeddings
+BEGIN
+    UPDATE embedding_count SET size = size + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS embeddings_deleted AFTER DELETE ON embeddings
+BEGIN
+    UPDATE embedding_count SET size = size - 1;
+END;
+COMMIT;
+"""
+
+
+def default_cache_path() -> str:
+    """Get the path of the shared cache, $ARD_EMBEDDING_CACHE if it is set."""
+    return os.environ.get("ARD_EMBEDDING_CACHE") or os.path.join(
+        os.path.expanduser("~"), ".cache", "ard", "embeddings.sqlite"
+    )
+
+
+def normalize_text(text: str) -> str:
+    """Normalize a text to NFC with single spaces, the form its key is hashed in."""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def text_key(text: str) -> bytes:
+    """Get the cache key of a text, the SHA-256 digest of its normalized form."""
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).digest()
+
+
+@dataclass
+class CacheStats:
+    """
+    Lookups and writes of an EmbeddingCache since it was opened.
+
+    Attributes:
+        hits (int): Texts found in the cache
+        misses (int): Texts not found in the cache
+        writes (int): Embeddings added to the cache
+        evictions (int): Embeddings evicted to keep the cache under its size
+    """
+
+    hits: int = 0
+    misses: int = 0
+    writes: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Get the share of lookups found in the cache, 0 before any lookup."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class EmbeddingCache:
+    """
+    Persistent embedding cache shared across runs and processes.
+
+    Embeddings are stored in a SQLite file, keyed by model name and the hash
+    of the normalized text, so that rebuilding a graph from mostly unchanged
+    data only encodes the new texts. The file uses write-ahead logging and
+    immediate write transactions, so any number of processes can read and
+    write the same cache. When it holds more than max_entries embeddings, the
+    least recently used are evicted.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        timeout: float = DEFAULT_TIMEOUT,
+    ) -> None:
+        """
+        Open or create an embedding cache.
+
+        Args:
+            path (Optional[str]): Path of the database file, default_cache_path()
+                if None, ":memory:" for a cache private to this instance
+            max_entries (int): Largest number of embeddings kept
+            timeout (float): Seconds to wait for a lock held by another process
+
+        Raises:
+            ValueError: If max_entries is less than 1
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.path = path or default_cache_path()
+        self.max_entries = max_entries
+        self.stats = CacheStats()
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._conn = sqlite3.connect(
+            self.path, timeout=timeout, check_same_thread=False
+        )
+        self._conn.isolation_level = None
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("PRAGMA synchronous = NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Run statements in a write transaction, holding the database lock."""
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield self._conn
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
+
+    def get_many(self, model_name: str, texts: Sequence[str]) -> Dict[str, np.ndarray]:
+        """
+        Look up the embeddings of texts, marking the ones found as used.
+
+        Args:
+            model_name (str): Name of the model the embeddings come from
+            texts (Sequence[str]): The texts
+
+        Returns:
+            Dict[str, np.ndarray]: The float32 embeddings of the texts found
+        """
+        unique = list(dict.fromkeys(texts))
+        keys: Dict[bytes, List[str]] = {}
+        for text in unique:
+            keys.setdefault(text_key(text), []).append(text)
+        found: Dict[str, np.ndarray] = {}
+        key_list = list(keys)
+        batches = [
+            key_list[start : start + _MAX_VARIABLES]
+            for start in range(0, len(key_list), _MAX_VARIABLES)
+        ]
+        with self._lock:
+            for batch in batches:
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings "
+                    f"WHERE model = ? AND key IN ({placeholders})",
+                    [model_name, *batch],
+                ).fetchall()
+                if not rows:
+                    continue
+                for key, vector in rows:
+                    embedding = np.frombuffer(vector, dtype=np.float32)
+                    for text in keys[key]:
+                        found[text] = embedding
+                with self._transaction() as conn:
+                    conn.execute(
+                        f"UPDATE embeddings SET last_used = ? WHERE model = ? "
+                        f"AND key IN ({','.join('?' * len(rows))})",
+                        [time.time_ns(), model_name, *[key for key, _ in rows]],
+                    )
+            self.stats.hits += len(found)
+            self.stats.misses += len(unique) - len(found)
+        return found
+
+    def put_many(
+        self, model_name: str, texts: Sequence[str], embeddings: np.ndarray
+    ) -> None:
+        """
+        Add or replace the embeddings of texts, evicting the least recently
+        used ones if the cache grows over max_entries.
+
+        Args:
+            model_name (str): Name of the model the embeddings come from
+            texts (Sequence[str]): The texts
+            embeddings (np.ndarray): Their embeddings, one row per text
+
+        Raises:
+            ValueError: If the number of embeddings does not match the number
+                of texts
+        """
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        if len(embeddings) != len(texts):
+            raise ValueError(
+                f"Expected {len(texts)} embeddings, got an array of shape "
+                f"{embeddings.shape}"
+            )
+        now = time.time_ns()
+        rows = [
+            (model_name, text_key(text), embedding.tobytes(), now)
+            for text, embedding in zip(texts, embeddings)
+        ]
+        with self._lock, self._transaction() as conn:
+            # An upsert, since the rows deleted by REPLACE fire no triggers
+            conn.executemany(
+                "INSERT INTO embeddings (model, key, vector, last_used) "
+                "VALUES (?, ?, ?, ?) ON CONFLICT (model, key) DO UPDATE SET "
+                "vector = excluded.vector, last_used = excluded.last_used",
+                rows,
+            )
+            self.stats.writes += len(rows)
+            (size,) = conn.execute("SELECT size FROM embedding_count").fetchone()
+            if size > self.max_entries:
+                evicted = conn.execute(
+                    "DELETE FROM embeddings WHERE (model, key) IN (SELECT model, "
+                    "key FROM embeddings ORDER BY last_used LIMIT ?)",
+                    (size - self.max_entries,),
+                ).rowcount
+                self.stats.evictions += evicted
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT size FROM embedding_count").fetchone()[0]
@@ -0,0 +1,86 @@
+"""
+Binary file format for embedding caches.
+
+An embedding file is a section file (see ard.utils.section_file) with the
+following sections:
+
+- matrix: the embeddings as float32 values, one row of dim values per text
+- norms: the L2 norm of every row
+- names.offsets / names.data: the text of every row
+
+The metadata holds the model name, the distance metric, the size and dtype of
+the embeddings and their count. Opened with mmap=True, the matrix is a view
+over a memory map of the file, so that several processes loading the same
+embeddings share its pages.
+"""
+
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from ard.utils.embedding_store import EmbeddingStore
+from ard.utils.section_file import SectionFileReader, SectionFileWriter
+
+EMBEDDING_FILE_KIND = "ard.embeddings"
+EMBEDDING_FILE_VERSION = 1
+EMBEDDING_FILE_EXTENSION = ".emb"
+
+
+def is_embedding_file(filename: str) -> bool:
+    """Check if a filename uses the binary embedding file extension."""
+    return str(filename).lower().endswith(EMBEDDING_FILE_EXTENSION)
+
+
+def write_embedding_file(
+    path: str, store: EmbeddingStore, meta: Optional[Dict[str, Any]] = None
+) -> None:
+    """
+    Write embeddings to a binary embedding file.
+
+    Args:
+        path (str): Path of the file to write
+        store (EmbeddingStore): The embeddings
+        meta (Optional[Dict[str, Any]]): Metadata to store with them, such as the
+            model name and the distance metric
+    """
+    with SectionFileWriter(
+        path, kind=EMBEDDING_FILE_KIND, version=EMBEDDING_FILE_VERSION
+    ) as writer:
+        writer.write_array("matrix", store.matrix, dtype=np.float32)
+        writer.write_array("norms", store.norms, dtype=np.float32)
+        writer.write_strings("names", store.names)
+        writer.meta.update(meta or {})
+        writer.meta.update(dim=store.dim, dtype="float32", count=len(store))
+
+
+def read_embedding_file(
+    path: str, mmap: bool = True
+) -> Tuple[EmbeddingStore, Dict[str, Any]]:
+    """
+    Read a binary embedding file.
+
+    Args:
+        path (str): Path of the file
+        mmap (bool): Whether to memory-map the matrix instead of reading it
+
+    Returns:
+        Tuple[EmbeddingStore, Dict[str, Any]]: The embeddings and the metadata
+
+    Raises:
+        FileNotFoundError: If the file doesn't exist
+        ValueError: If the file is not an embedding file or has an unsupported
+            version
+    """
+    file = SectionFileReader(path, kind=EMBEDDING_FILE_KIND, mmap=mmap)
+    if file.version > EMBEDDING_FILE_VERSION:
+        raise ValueError(f"Unsupported embedding file version {file.version}: {path}")
+    meta = file.meta
+    if meta["dtype"] != "float32":
+        raise ValueError(f"Unsupported embedding dtype {meta['dtype']}: {path}")
+
+    count, dim = meta["count"], meta["dim"]
+    matrix = file.array("matrix").reshape(count, dim or 0)
+    store = EmbeddingStore.from_arrays(
+        file.strings("names").to_list(), matrix, file.array("norms")
+    )
+    return store, meta
@@ -0,0 +1,206 @@
+from typing import Dict, Iterator, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+# Number of rows allocated by the first add
+INITIAL_CAPACITY = 1024
+
+
+class EmbeddingStore(Mapping[str, np.ndarray]):
+    """
+    Embeddings of many texts in a single contiguous float32 matrix.
+
+    Every text owns a row of the matrix, found through a dict of row numbers,
+    and the L2 norm of every row is kept next to it, so that comparing one
+    embedding with many others is a single matrix product. The matrix grows by
+    doubling its capacity. Replacing the embedding of a text overwrites its
+    row in place.
+
+    The store reads as a mapping from texts to their embeddings. Embeddings are
+    read-only views into the matrix, copy them to keep them across writes. A
+    store can also wrap read-only arrays, such as a memory-mapped embedding
+    file, which are copied into memory on the first write.
+    """
+
+    def __init__(self, dim: Optional[int] = None) -> None:
+        """
+        Initialize an EmbeddingStore.
+
+        Args:
+            dim (Optional[int]): Size of the embeddings, taken from the first
+                embedding added if None
+        """
+        self._dim = dim
+        self._matrix = np.empty((0, dim or 0), dtype=np.float32)
+        self._norms = np.empty(0, dtype=np.float32)
+        self._index: Dict[str, int] = {}
+        self._names: List[str] = []
+
+    @classmethod
+    def from_arrays(
+        cls,
+        names: Sequence[str],
+        matrix: np.ndarray,
+        norms: Optional[np.ndarray] = None,
+    ) -> "EmbeddingStore":
+        """
+        Create a store over existing arrays, without copying them.
+
+        Args:
+            names (Sequence[str]): The texts, in row order
+            matrix (np.ndarray): Their float32 embeddings, one row per text
+            norms (Optional[np.ndarray]): The L2 norms of the rows, computed if
+                None
+
+        Returns:
+            EmbeddingStore: A store reading from the arrays
+
+        Raises:
+            ValueError: If the arrays do not have one row per text, or the
+                matrix is not float32
+        """
+        if matrix.ndim != 2 or len(matrix) != len(names):
+            raise ValueError(
+                f"Expected {len(names)} embeddings, got an array of shape "
+                f"{matrix.shape}"
+            )
+        if matrix.dtype != np.float32:
+            raise ValueError(f"Expected float32 embeddings, got {matrix.dtype}")
+        if norms is None:
+            norms = np.linalg.norm(matrix, axis=1).astype(np.float32)
+        elif norms.shape != (len(names),):
+            raise ValueError(
+                f"Expected {len(names)} norms, got an array of shape {norms.shape}"
+            )
+
+        store = cls(matrix.shape[1] if len(names) else None)
+        if len(names):
+            store._matrix, store._norms = matrix, norms
+            store._names = list(names)
+            store._index = {name: row for row, name in enumerate(store._names)}
+            if len(store._index) != len(store._names):
+                raise ValueError("Duplicate texts in the embeddings")
+        return store
+
+    @property
+    def dim(self) -> Optional[int]:
+        """Get the size of the embeddings, None until the first one is added."""
+        return self._dim
+
+    @property
+    def names(self) -> List[str]:
+        """Get the texts in row order."""
+        return list(self._names)
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """Get the embeddings as a (len(store), dim) matrix, in row order."""
+        return self._matrix[: len(self._names)]
+
+    @property
+    def norms(self) -> np.ndarray:
+        """Get the L2 norms of the embeddings, in row order."""
+        return self._norms[: len(self._names)]
+
+    def add(self, name: str, embedding: np.ndarray) -> None:
+        """
+        Add or replace the embedding of a text.
+
+        Args:
+            name (str): The text
+            embedding (np.ndarray): Its embedding, flattened to one dimension
+
+        Raises:
+            ValueError: If the embedding does not have the size of the store
+        """
+        self.add_many([name], np.asarray(embedding).reshape(1, -1))
+
+    def add_many(self, names: Sequence[str], embeddings: np.ndarray) -> None:
+        """
+        Add or replace the embeddings of many texts at once.
+
+        Args:
+            names (Sequence[str]): The texts, without duplicates
+            embeddings (np.ndarray): Their embeddings, one row per text
+
+        Raises:
+            ValueError: If the number of embeddings does not match the number
+                of texts, or their size does not match the store
+        """
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        if embeddings.ndim != 2 or len(embeddings) != len(names):
+            raise ValueError(
+                f"Expected {len(names)} embeddings, got an array of shape "
+                f"{embeddings.shape}"
+            )
+        if not len(names):
+            return
+        if self._dim is None:
+            self._dim = embeddings.shape[1]
+            self._matrix = np.empty((0, self._dim), dtype=np.float32)
+        if embeddings.shape[1] != self._dim:
+            raise ValueError(
+                f"Embedding size mismatch: {embeddings.shape[1]} (new) vs "
+                f"{self._dim} (store)"
+            )
+
+        rows = np.empty(len(names), dtype=np.int64)
+        for i, name in enumerate(names):
+            row = self._index.get(name)
+            if row is None:
+                row = self._index[name] = len(self._names)
+                self._names.append(name)
+            rows[i] = row
+        self._reserve(len(self._names))
+        if not self._matrix.flags.writeable:
+            self._matrix, self._norms = self._matrix.copy(), self._norms.copy()
+        self._matrix[rows] = embeddings
+        self._norms[rows] = np.linalg.norm(embeddings, axis=1)
+
+    def _reserve(self, size: int) -> None:
+        """Grow the matrix to at least size rows, keeping its contents."""
+        capacity = len(self._matrix)
+        if size <= capacity:
+            return
+        capacity = max(capacity * 2, size, INITIAL_CAPACITY)
+        matrix = np.empty((capacity, self._dim), dtype=np.float32)
+        norms = np.empty(capacity, dtype=np.float32)
+        matrix[: len(self._matrix)] = self._matrix
+        norms[: len(self._norms)] = self._norms
+        self._matrix, self._norms = matrix, norms
+
+    def rows(self, names: Sequence[str]) -> np.ndarray:
+        """
+        Get the row numbers of texts.
+
+        Args:
+            names (Sequence[str]): The texts
+
+        Returns:
+            np.ndarray: Their rows in matrix and norms
+
+        Raises:
+            KeyError: If a text has no embedding
+        """
+        return np.fromiter(
+            (self._index[name] for name in names), dtype=np.int64, count=len(names)
+        )
+
+    def clear(self) -> None:
+        """Remove all embeddings, keeping the size of the store."""
+        self._index.clear()
+        self._names.clear()
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        embedding = self._matrix[self._index[name]]
+        embedding.flags.writeable = False
+        return embedding
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._index
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._names)
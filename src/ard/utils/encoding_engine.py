@@ -0,0 +1,243 @@
+import multiprocessing
+from itertools import islice
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+DEFAULT_BATCH_SIZE = 64
+DEFAULT_CHUNK_SIZE = 4096
+
+# Model of a worker process, loaded once by its initializer
+_worker_model = None
+
+
+def load_sentence_transformer(model_name: str) -> Any:
+    """
+    Load a SentenceTransformer model.
+
+    Args:
+        model_name (str): Name of the model
+
+    Returns:
+        Any: The model
+
+    Raises:
+        ImportError: If sentence-transformers is not installed
+    """
+    try:
+        from sentence_transformers import SentenceTransformer
+    except ImportError:
+        raise ImportError(
+            "The sentence-transformers package is required for Embedder. "
+            "Install it with 'pip install sentence-transformers'"
+        )
+    return SentenceTransformer(model_name)
+
+
+def chunked(items: Iterable[str], size: int) -> Iterator[List[str]]:
+    """Split an iterable of texts into lists of size texts, the last one shorter."""
+    iterator = iter(items)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def encode_sorted(model: Any, texts: Sequence[str], batch_size: int) -> np.ndarray:
+    """
+    Encode texts in batches of similar length.
+
+    Texts are sorted by length, longest first, so that every batch is padded to
+    about the length of its own texts, and encoded one batch per model call.
+
+    Args:
+        model (Any): A model with a SentenceTransformer-like encode method
+        texts (Sequence[str]): The texts to encode
+        batch_size (int): Number of texts per model call
+
+    Returns:
+        np.ndarray: The float32 embeddings, one row per text in input order
+    """
+    order = sorted(range(len(texts)), key=lambda i: -len(texts[i]))
+    batches = []
+    for start in range(0, len(order), batch_size):
+        batch = [texts[i] for i in order[start : start + batch_size]]
+        embeddings = model.encode(batch, batch_size=batch_size, show_progress_bar=False)
+        batches.append(np.asarray(embeddings, dtype=np.float32).reshape(len(batch), -1))
+    if not batches:
+        return np.empty((0, 0), dtype=np.float32)
+    embeddings = np.empty((len(texts), batches[0].shape[1]), dtype=np.float32)
+    embeddings[order] = np.concatenate(batches)
+    return embeddings
+
+
+def _init_worker(
+    model_factory: Callable[[str], Any], model_name: str, threads: Optional[int]
+) -> None:
+    """Load the model of a worker process, limiting its threads."""
+    global _worker_model
+    if threads is not None:
+        try:
+            import torch
+
+            torch.set_num_threads(threads)
+        except ImportError:
+            pass
+    _worker_model = model_factory(model_name)
+
+
+def _encode_chunk(args: Tuple[List[str], int]) -> Tuple[List[str], np.ndarray]:
+    texts, batch_size = args
+    return texts, encode_sorted(_worker_model, texts, batch_size)
+
+
+class EncodingEngine:
+    """
+    Batched text encoder, in process or over a pool of worker processes.
+
+    Texts are encoded in batches of similar length to cut padding. With
+    num_workers > 0, chunks of texts are spread over worker processes that each
+    load the model once, which makes use of all cores of CPU-only machines.
+    Streaming input is encoded chunk by chunk as it arrives, so encoding can
+    start before all texts are known.
+
+    Usage:
+        with EncodingEngine("all-MiniLM-L6-v2", num_workers=8) as engine:
+            embeddings = engine.encode(names)
+            for texts, embeddings in engine.iter_encode(stream_of_names):
+                ...
+    """
+
+    def __init__(
+        self,
+        model_name: str = "all-MiniLM-L6-v2",
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        num_workers: int = 0,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        model: Optional[Any] = None,
+        model_factory: Callable[[str], Any] = load_sentence_transformer,
+        threads_per_worker: Optional[int] = 1,
+        start_method: str = "spawn",
+    ) -> None:
+        """
+        Initialize an EncodingEngine.
+
+        Args:
+            model_name (str): Name of the model
+            batch_size (int): Number of texts per model call
+            num_workers (int): Number of worker processes, 0 to encode in this
+                process
+            chunk_size (int): Number of texts sent to a worker at a time, and
+                read at a time from streaming input
+            model (Optional[Any]): Already loaded model to encode with in this
+                process, loaded with model_factory if None
+            model_factory (Callable[[str], Any]): Picklable function loading
+                the model from its name, in this process or in every worker
+            threads_per_worker (Optional[int]): Number of PyTorch threads of a
+                worker, None to keep the default of one per core
+            start_method (str): How to start workers, "spawn" is the safe
+                choice with PyTorch
+
+        Raises:
+            ValueError: If batch_size or chunk_size is less than 1, or
+                num_workers is negative
+        """
+        if batch_size < 1 or chunk_size < 1:
+            raise ValueError("batch_size and chunk_size must be at least 1")
+        if num_workers < 0:
+            raise ValueError("num_workers must not be negative")
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.num_workers = num_workers
+        self.chunk_size = chunk_size
+        self.model_factory = model_factory
+        self.threads_per_worker = threads_per_worker
+        self.start_method = start_method
+        self._model = model
+        self._pool = None
+
+    @property
+    def model(self) -> Any:
+        """Get the model of this process, loading it on first use."""
+        if self._model is None:
+            self._model = self.model_factory(self.model_name)
+        return self._model
+
+    def _get_pool(self):
+        if self._pool is None:
+            context = multiprocessing.get_context(self.start_method)
+            self._pool = context.Pool(
+                self.num_workers,
+                initializer=_init_worker,
+                initargs=(self.model_factory, self.model_name, self.threads_per_worker),
+            )
+        return self._pool
+
+    def close(self) -> None:
+        """Stop the worker processes, if they were started."""
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+
+    def __enter__(self) -> "EncodingEngine":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def encode(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        Encode texts.
+
+        Args:
+            texts (Sequence[str]): The texts to encode
+
+        Returns:
+            np.ndarray: The float32 embeddings, one row per text in input order
+        """
+        if not self.num_workers:
+            return encode_sorted(self.model, texts, self.batch_size)
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+
+        # Sort once over all texts so that every chunk has texts of one length
+        order = sorted(range(len(texts)), key=lambda i: -len(texts[i]))
+        chunks = [
+            (
+                [texts[i] for i in order[start : start + self.chunk_size]],
+                self.batch_size,
+            )
+            for start in range(0, len(order), self.chunk_size)
+        ]
+        embeddings = np.concatenate(
+            [
+                embeddings
+                for _, embeddings in self._get_pool().imap(_encode_chunk, chunks)
+            ]
+        )
+        result = np.empty_like(embeddings)
+        result[order] = embeddings
+        return result
+
+    def iter_encode(
+        self, texts: Iterable[str]
+    ) -> Iterator[Tuple[List[str], np.ndarray]]:
+        """
+        Encode streaming texts, chunk by chunk.
+
+        Input is read chunk_size texts at a time. With workers, chunks are
+        encoded while the next ones are read.
+
+        Args:
+            texts (Iterable[str]): The texts to encode, e.g. a generator
+
+        Yields:
+            Tuple[List[str], np.ndarray]: A chunk of texts in input order and
+                their float32 embeddings
+        """
+        if not self.num_workers:
+            for chunk in chunked(texts, self.chunk_size):
+                yield chunk, encode_sorted(self.model, chunk, self.batch_size)
+            return
+
+        chunks = ((chunk, self.batch_size) for chunk in chunked(texts, self.chunk_size))
+        yield from self._get_pool().imap(_encode_chunk, chunks)
@@ -0,0 +1,83 @@
+import random
+from typing import Hashable, Iterable, Iterator, List, Optional
+
+
+class IndexedSet:
+    """
+    A set that also supports O(1) uniform random sampling.
+
+    Items are kept in a list next to a dict of their positions. Removing an item
+    moves the last item into its slot, so adding, removing and sampling all take
+    constant time. Iteration order is insertion order until the first removal.
+    """
+
+    def __init__(self, items: Iterable[Hashable] = ()) -> None:
+        """
+        Initialize an IndexedSet.
+
+        Args:
+            items (Iterable[Hashable]): Initial items, duplicates are ignored
+        """
+        self._items: List[Hashable] = []
+        self._positions = {}
+        for item in items:
+            self.add(item)
+
+    def add(self, item: Hashable) -> None:
+        """Add an item if it is not already in the set."""
+        if item not in self._positions:
+            self._positions[item] = len(self._items)
+            self._items.append(item)
+
+    def discard(self, item: Hashable) -> None:
+        """Remove an item if it is in the set."""
+        position = self._positions.pop(item, None)
+        if position is None:
+            return
+        last = self._items.pop()
+        if position < len(self._items):
+            self._items[position] = last
+            self._positions[last] = position
+
+    def choice(self, rng: Optional[random.Random] = None) -> Hashable:
+        """
+        Pick an item uniformly at random.
+
+        Args:
+            rng (Optional[random.Random]): Random number generator, defaults to
+                the global one of the random module
+
+        Raises:
+            IndexError: If the set is empty
+        """
+        if not self._items:
+            raise IndexError("Cannot choose from an empty set")
+        return (rng or random).choice(self._items)
+
+    def sample(self, k: int, rng: Optional[random.Random] = None) -> List[Hashable]:
+        """
+        Pick k items uniformly at random, with replacement.
+
+        Args:
+            k (int): Number of items to pick
+            rng (Optional[random.Random]): Random number generator, defaults to
+                the global one of the random module
+
+        Returns:
+            List[Hashable]: The picked items, empty if the set is empty
+        """
+        if not self._items:
+            return []
+        return (rng or random).choices(self._items, k=k)
+
+    def __contains__(self, item: Hashable) -> bool:
+        return item in self._positions
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(self._items)
+
+    def __getitem__(self, index: int) -> Hashable:
+        return self._items[index]
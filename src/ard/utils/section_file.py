@@ -0,0 +1,438 @@
+import json
+import os
+import shutil
+import struct
+import tempfile
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+MAGIC = b"ARDSECT1"
+ALIGNMENT = 64
+_TRAILER = struct.Struct("<Q8s")
+
+
+def _padding(offset: int) -> int:
+    return -offset % ALIGNMENT
+
+
+class SpooledSection:
+    """
+    A section whose contents are appended in chunks before the file is finalized.
+
+    Chunks are written to a temporary file so that many sections can grow at the
+    same time without holding their contents in memory.
+    """
+
+    def __init__(self, name: str, dtype: np.dtype, path: str) -> None:
+        self.name = name
+        self.dtype = np.dtype(dtype)
+        self.length = 0
+        self._path = path
+        self._file = open(self._path, "wb")
+
+    def append(self, values: Any) -> None:
+        """
+        Append values to the section.
+
+        Args:
+            values: An array or sequence convertible to the section dtype
+        """
+        array = np.asarray(values, dtype=self.dtype)
+        if array.size:
+            self._file.write(array.tobytes())
+            self.length += array.size
+
+    def copy_to(self, target) -> None:
+        """Copy the spooled contents into an open file object."""
+        self._file.close()
+        with open(self._path, "rb") as f:
+            shutil.copyfileobj(f, target, length=1 << 20)
+
+    def read(self) -> np.ndarray:
+        """Read the spooled contents back into memory."""
+        self._file.flush()
+        return np.fromfile(self._path, dtype=self.dtype)
+
+    def close(self) -> None:
+        """Close and delete the spool file."""
+        self._file.close()
+        if os.path.exists(self._path):
+            os.remove(self._path)
+
+
+class SectionFileWriter:
+    """
+    Writer for a simple container of named, 64-byte aligned NumPy arrays.
+
+    The file starts with a magic number, followed by the raw section data and a
+    JSON footer describing every section (offset, dtype and length) together with
+    free-form metadata. Sections are aligned so that readers can map them
+    straight into NumPy arrays with np.memmap.
+
+    Usage:
+        with SectionFileWriter(path, kind="ard.example", version=1) as writer:
+            writer.write_array("values", np.arange(10))
+            spool = writer.spool("ids", np.int64)
+            spool.append([1, 2, 3])
+            writer.meta["count"] = 10
+    """
+
+    def __init__(self, path: str, kind: str, version: int = 1) -> None:
+        """
+        Initialize a SectionFileWriter.
+
+        Args:
+            path (str): Path of the file to write
+            kind (str): Identifier of the file format stored in the container
+            version (int): Version of the file format
+        """
+        self.path = path
+        self.kind = kind
+        self.version = version
+        self.meta: Dict[str, Any] = {}
+        self._sections: Dict[str, Dict[str, Any]] = {}
+        self._spools: List[SpooledSection] = []
+        self._spool_dir: Optional[str] = None
+        self._spool_count = 0
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._tmp_path = f"{path}.tmp"
+        self._file = open(self._tmp_path, "wb")
+        self._file.write(MAGIC)
+
+    def __enter__(self) -> "SectionFileWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def _begin_section(self, name: str, dtype: np.dtype, length: int) -> None:
+        if name in self._sections:
+            raise ValueError(f"Duplicate section: {name}")
+        offset = self._file.tell()
+        pad = _padding(offset)
+        if pad:
+            self._file.write(b"\0" * pad)
+            offset += pad
+        self._sections[name] = {
+            "offset": offset,
+            "dtype": np.dtype(dtype).str,
+            "length": int(length),
+        }
+
+    def write_array(self, name: str, values: Any, dtype: Any = None) -> None:
+        """
+        Write a complete section.
+
+        Args:
+            name (str): Section name
+            values: An array or sequence of values
+            dtype: Optional dtype to convert the values to
+        """
+        array = np.ascontiguousarray(np.asarray(values, dtype=dtype)).reshape(-1)
+        self._begin_section(name, array.dtype, array.size)
+        self._file.write(array.tobytes())
+
+    def write_strings(self, name: str, strings: Sequence[str]) -> None:
+        """
+        Write a string table as '<name>.offsets' and '<name>.data' sections.
+
+        Args:
+            name (str): Table name
+            strings (Sequence[str]): The strings to store
+        """
+        table = StringTableBuilder()
+        for string in strings:
+            table.add(string)
+        table.write(self, name)
+
+    def spool(self, name: str, dtype: Any) -> SpooledSection:
+        """
+        Create a section that is filled incrementally.
+
+        Args:
+            name (str): Section name
+            dtype: The dtype of the section values
+
+        Returns:
+            SpooledSection: The section to append values to
+        """
+        if self._spool_dir is None:
+            self._spool_dir = tempfile.mkdtemp(
+                prefix=".spool-", dir=os.path.dirname(os.path.abspath(self.path))
+            )
+        path = os.path.join(self._spool_dir, f"{self._spool_count}.spool")
+        self._spool_count += 1
+        spool = SpooledSection(name, dtype, path)
+        self._spools.append(spool)
+        return spool
+
+    def discard(self, spool: SpooledSection) -> None:
+        """
+        Drop a spooled section instead of writing it at close.
+
+        Args:
+            spool (SpooledSection): A section returned by spool()
+        """
+        self._spools.remove(spool)
+        spool.close()
+
+    def close(self) -> None:
+        """Copy spooled sections, write the footer and move the file in place."""
+        for spool in self._spools:
+            self._begin_section(spool.name, spool.dtype, spool.length)
+            spool.copy_to(self._file)
+            spool.close()
+        self._spools = []
+
+        footer = json.dumps(
+            {
+                "kind": self.kind,
+                "version": self.version,
+                "meta": self.meta,
+                "sections": self._sections,
+            }
+        ).encode("utf-8")
+        self._file.write(footer)
+        self._file.write(_TRAILER.pack(len(footer), MAGIC))
+        self._file.close()
+        self._cleanup_spool_dir()
+        os.replace(self._tmp_path, self.path)
+
+    def abort(self) -> None:
+        """Discard everything written so far."""
+        for spool in self._spools:
+            spool.close()
+        self._spools = []
+        self._file.close()
+        self._cleanup_spool_dir()
+        if os.path.exists(self._tmp_path):
+            os.remove(self._tmp_path)
+
+    def _cleanup_spool_dir(self) -> None:
+        if self._spool_dir is not None:
+            shutil.rmtree(self._spool_dir, ignore_errors=True)
+            self._spool_dir = None
+
+
+class SectionFileReader:
+    """
+    Reader for files written by SectionFileWriter.
+
+    Sections are either read into memory on request or, with mmap=True, exposed
+    as read-only views over a single memory map of the file, so that several
+    processes opening the same file share its pages.
+    """
+
+    def __init__(self, path: str, kind: Optional[str] = None, mmap: bool = False):
+        """
+        Open a section file.
+
+        Args:
+            path (str): Path of the file
+            kind (Optional[str]): Expected format identifier
+            mmap (bool): Whether to memory-map the file
+
+        Raises:
+            FileNotFoundError: If the file doesn't exist
+            ValueError: If the file is not a valid section file of the expected kind
+        """
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"File not found: {path}")
+
+        self.path = path
+        with open(path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"Not a section file: {path}")
+            f.seek(-_TRAILER.size, os.SEEK_END)
+            footer_length, magic = _TRAILER.unpack(f.read(_TRAILER.size))
+            if magic != MAGIC:
+                raise ValueError(f"Truncated section file: {path}")
+            f.seek(-_TRAILER.size - footer_length, os.SEEK_END)
+            footer = json.loads(f.read(footer_length).decode("utf-8"))
+
+        if kind is not None and footer.get("kind") != kind:
+            raise ValueError(
+                f"Unexpected file kind {footer.get('kind')!r} in {path}, expected {kind!r}"
+            )
+
+        self.kind: str = footer["kind"]
+        self.version: int = footer["version"]
+        self.meta: Dict[str, Any] = footer["meta"]
+        self._sections: Dict[str, Dict[str, Any]] = footer["sections"]
+        self._mmap = np.memmap(path, dtype=np.uint8, mode="r") if mmap else None
+
+    def has(self, name: str) -> bool:
+        """Check if a section exists."""
+        return name in self._sections
+
+    def length(self, name: str) -> int:
+        """Get the number of values in a section."""
+        return self._sections[name]["length"]
+
+    def array(self, name: str, start: int = 0, stop: Optional[int] = None):
+        """
+        Get the values of a section, or of a slice of it.
+
+        Args:
+            name (str): Section name
+            start (int): First value to read
+            stop (Optional[int]): End of the slice, defaults to the section length
+
+        Returns:
+            np.ndarray: The values (a read-only view when memory-mapped)
+        """
+        section = self._sections.get(name)
+        if section is None:
+            raise KeyError(f"Section not found: {name}")
+        dtype = np.dtype(section["dtype"])
+        length = section["length"]
+        stop = length if stop is None else min(stop, length)
+        start = min(start, stop)
+        offset = section["offset"] + start * dtype.itemsize
+        count = stop - start
+
+        if self._mmap is not None:
+            return self._mmap[offset : offset + count * dtype.itemsize].view(dtype)
+        return np.fromfile(self.path, dtype=dtype, count=count, offset=offset)
+
+    def iter_chunks(self, name: str, chunk_size: int) -> Iterator[np.ndarray]:
+        """
+        Read a section in consecutive chunks.
+
+        Args:
+            name (str): Section name
+            chunk_size (int): Number of values per chunk
+
+        Yields:
+            np.ndarray: Consecutive slices of the section
+        """
+        length = self.length(name)
+        for start in range(0, length, chunk_size):
+            yield self.array(name, start, start + chunk_size)
+
+    def strings(self, name: str) -> "StringTable":
+        """Get a string table written with write_strings or StringTableBuilder."""
+        return StringTable(self.array(f"{name}.offsets"), self.array(f"{name}.data"))
+
+
+class StringTableBuilder:
+    """
+    Incrementally built, optionally interned, table of UTF-8 strings.
+
+    Strings are stored back to back in a byte blob and located through an
+    offsets array, so that string i is data[offsets[i]:offsets[i + 1]].
+
+    Attributes:
+        ids (Dict[str, int]): Ids of the interned strings
+    """
+
+    def __init__(self, writer: Optional[SectionFileWriter] = None, name: str = ""):
+        """
+        Initialize a StringTableBuilder.
+
+        Args:
+            writer (Optional[SectionFileWriter]): Writer to spool the table to. If
+                None, the table is kept in memory until write() is called.
+            name (str): Table name, required when spooling
+        """
+        self.ids: Dict[str, int] = {}
+        self._offset = 0
+        if writer is not None:
+            self._offsets = writer.spool(f"{name}.offsets", np.int64)
+            self._data = writer.spool(f"{name}.data", np.uint8)
+            self._offsets.append([0])
+        else:
+            self._offsets = [0]
+            self._data = []
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def _count(self) -> int:
+        if isinstance(self._offsets, list):
+            return len(self._offsets) - 1
+        return self._offsets.length - 1
+
+    def add(self, string: str) -> int:
+        """
+        Append a string without interning.
+
+        Args:
+            string (str): The string to append
+
+        Returns:
+            int: The id of the string
+        """
+        encoded = string.encode("utf-8")
+        self._offset += len(encoded)
+        if isinstance(self._offsets, list):
+            self._data.append(encoded)
+            self._offsets.append(self._offset)
+        else:
+            self._data.append(np.frombuffer(encoded, dtype=np.uint8))
+            self._offsets.append([self._offset])
+        return self._count - 1
+
+    def intern(self, string: str) -> int:
+        """
+        Get the id of a string, appending it on first use.
+
+        Args:
+            string (str): The string to intern
+
+        Returns:
+            int: The id of the string
+        """
+        string_id = self.ids.get(string)
+        if string_id is None:
+            string_id = self.ids[string] = self.add(string)
+        return string_id
+
+    def write(self, writer: SectionFileWriter, name: str) -> None:
+        """Write an in-memory table as '<name>.offsets' and '<name>.data'."""
+        writer.write_array(f"{name}.offsets", self._offsets, dtype=np.int64)
+        writer.write_array(
+            f"{name}.data", np.frombuffer(b"".join(self._data), dtype=np.uint8)
+        )
+
+
+class StringTable:
+    """
+    Read-only view of a string table.
+
+    Strings are decoded on access, so a memory-mapped table costs nothing until
+    it is used.
+    """
+
+    def __init__(self, offsets: np.ndarray, data: np.ndarray) -> None:
+        self._offsets = offsets
+        self._data = data
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index: int) -> str:
+        start = int(self._offsets[index])
+        end = int(self._offsets[index + 1])
+        return self._data[start:end].tobytes().decode("utf-8")
+
+    def to_bytes(self, index: int) -> bytes:
+        """Get the raw UTF-8 bytes of a string."""
+        start = int(self._offsets[index])
+        end = int(self._offsets[index + 1])
+        return self._data[start:end].tobytes()
+
+    def to_list(self) -> List[str]:
+        """Decode the whole table."""
+        blob = self._data.tobytes()
+        offsets = self._offsets.tolist()
+        return [
+            blob[offsets[i] : offsets[i + 1]].decode("utf-8")
+            for i in range(len(offsets) - 1)
+        ]
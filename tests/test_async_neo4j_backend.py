@@ -0,0 +1,190 @@
+import asyncio
+
+import pytest
+
+from ard.knowledge_graph import AsyncKnowledgeGraph
+from ard.storage.graph import AsyncNeo4jBackend
+from ard.storage.graph import neo4j_async as neo4j_async_module
+
+
+class FakeAsyncResult:
+    """A query result returning fixed records."""
+
+    def __init__(self, records):
+        self._records = list(records)
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for record in self._records:
+            yield record
+
+
+class FakeAsyncSession:
+    """A session recording every query it runs, one query at a time."""
+
+    def __init__(self, driver):
+        self._driver = driver
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self._driver.open_sessions -= 1
+
+    async def run(self, query, parameters=None, **kwargs):
+        driver = self._driver
+        driver.queries.append(
+            (" ".join(query.split()), {**(parameters or {}), **kwargs})
+        )
+        driver.running += 1
+        driver.max_running = max(driver.max_running, driver.running)
+        # Let the other coroutines send their queries
+        await asyncio.sleep(0.01)
+        driver.running -= 1
+        for key, records in driver.results.items():
+            if key in query:
+                return FakeAsyncResult(records)
+        return FakeAsyncResult([{"count": 0}])
+
+
+class FakeAsyncDriver:
+    """An async driver recording queries, with canned results."""
+
+    def __init__(self, pool_size):
+        self.pool_size = pool_size
+        self.queries = []
+        self.results = {}
+        self.open_sessions = 0
+        self.running = 0
+        self.max_running = 0
+        self.closed = False
+
+    def session(self, database=None):
+        self.open_sessions += 1
+        return FakeAsyncSession(self)
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def drivers(monkeypatch):
+    """Make AsyncNeo4jBackend connect to fake drivers."""
+    created = []
+
+    def driver(uri, auth=None, max_connection_pool_size=None):
+        created.append(FakeAsyncDriver(max_connection_pool_size))
+        return created[-1]
+
+    monkeypatch.setattr(neo4j_async_module.AsyncGraphDatabase, "driver", driver)
+    return created
+
+
+def test_concurrent_reads_share_the_pool(drivers):
+    """Test that concurrent calls run at once, each in its own session."""
+
+    async def main():
+        async with AsyncNeo4jBackend(pool_size=8) as backend:
+            driver = drivers[0]
+            driver.results["RETURN target.name AS id"] = [{"id": "b"}]
+            driver.results["RETURN source.name AS id"] = [{"id": "b"}, {"id": "c"}]
+            neighbors = await asyncio.gather(
+                *(backend.get_neighbors(f"n{i}") for i in range(10))
+            )
+        return driver, neighbors
+
+    driver, neighbors = asyncio.run(main())
+    assert driver.pool_size == 8 and driver.closed
+    assert [sorted(n) for n in neighbors] == [["b", "c"]] * 10
+    assert len(driver.queries) == 20
+    assert driver.max_running == 20
+    assert driver.open_sessions == 0
+
+    with pytest.raises(ValueError):
+        AsyncNeo4jBackend(pool_size=0)
+
+
+def test_reads_match_the_sync_backend(drivers):
+    """Test that reads run the queries and normalization of Neo4jBackend."""
+
+    async def main():
+        backend = AsyncNeo4jBackend(batch_size=2)
+        driver = drivers[0]
+        driver.results["WHERE source.name = $id RETURN source.name"] = [
+            {"source": "a", "target": "b", "props": {"relation": "binds"}}
+        ]
+        driver.results["UNWIND $rows AS name"] = [
+            {"name": "a", "props": {"name": "a", "sources": []}}
+        ]
+        driver.results["RETURN DISTINCT m.name"] = [{"name": "c"}]
+        driver.results["shortestPath"] = []
+        return driver, await asyncio.gather(
+            backend.get_out_edges("a"),
+            backend.get_nodes_attrs(["a", "b", "c", "a"]),
+            backend.neighborhood(["a"], hops=2, limit=3),
+            backend.has_node("a"),
+            backend.shortest_path("a", "b"),
+        )
+
+    driver, (out_edges, attrs, neighborhood, has_node, path) = asyncio.run(main())
+    assert out_edges == [
+        (
+            "a",
+            "b",
+            {"relation": "binds", "sources": [{"relation": "binds", "edge": "binds"}]},
+        )
+    ]
+    # Two batches of node names
+    assert attrs == {"a": {"name": "a", "sources": []}}
+    assert [len(p["rows"]) for _, p in driver.queries if "rows" in p] == [2, 1]
+    assert neighborhood == ["c"]
+    assert not has_node
+    assert path == []
+    for query, _ in driver.queries:
+        assert "`Entity`" in query
+
+
+def test_async_knowledge_graph(drivers):
+    """Test triplet iteration and subgraph extraction through the facade."""
+
+    async def main():
+        async with AsyncKnowledgeGraph(
+            config={"name": "test"}, uri="bolt://fake", pool_size=4
+        ) as kg:
+            driver = drivers[0]
+            driver.results["OPTIONAL MATCH"] = [
+                {
+                    "name": "a",
+                    "props": {"name": "a", "sources": []},
+                    "edges": [["b", {"relation": "binds", "sources": [{"x": 1}]}]],
+                },
+                {"name": "b", "props": {"name": "b", "sources": []}, "edges": []},
+            ]
+            driver.results["RETURN source.name AS source"] = [
+                {
+                    "source": "a",
+                    "target": "b",
+                    "props": {"relation": "binds", "sources": [{"x": 1}, {"x": 2}]},
+                }
+            ]
+            triplets = [
+                t
+                async for t in kg.iter_triplets(
+                    relation="binds",
+                    predicate=lambda n1, e, n2, meta: meta["x"] == 2,
+                    as_tuples=True,
+                )
+            ]
+            subgraphs = await asyncio.gather(
+                kg.extract_subgraph(["a", "b"]), kg.extract_subgraph(["a", "b"])
+            )
+        return triplets, subgraphs
+
+    triplets, subgraphs = asyncio.run(main())
+    assert triplets == [("a", "binds", "b", {"x": 2})]
+    for subgraph in subgraphs:
+        assert subgraph.config == {"name": "test"}
+        assert subgraph.get_nodes() == {"a", "b"}
+        assert subgraph.get_edge_attrs("a", "b")["relation"] == "binds"
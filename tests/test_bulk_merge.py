@@ -0,0 +1,128 @@
+import random
+
+import pytest
+
+from ard.knowledge_graph import KnowledgeGraph
+from ard.storage.graph import GraphBackend
+
+
+def _move_edge(backend, source, target, data):
+    if not backend.has_edge(source, target):
+        backend.add_edge(source, target, relation=data.get("relation", ""), sources=[])
+    if "sources" in data:
+        edge_attrs = backend.get_edge_attrs(source, target)
+        edge_attrs["sources"].extend(data["sources"])
+        backend.add_edge(source, target, **edge_attrs)
+
+
+def _merge_one_by_one(backend, groups):
+    """Merge groups one node at a time through the public backend methods."""
+    for group, merged in groups:
+        if not backend.has_node(merged):
+            backend.add_node(merged, sources=[])
+        for node in group:
+            if node == merged or not backend.has_node(node):
+                continue
+            attrs = backend.get_node_attrs(node)
+            if "sources" in attrs:
+                merged_attrs = backend.get_node_attrs(merged)
+                merged_attrs["sources"].extend(attrs["sources"])
+                backend.add_node(merged, **merged_attrs)
+            for _, target, data in backend.get_out_edges(node):
+                _move_edge(backend, merged, target, data)
+            for source, _, data in backend.get_in_edges(node):
+                _move_edge(backend, source, merged, data)
+            backend.remove_node(node)
+
+
+def _random_graph(backend, seed):
+    rng = random.Random(seed)
+    kg = KnowledgeGraph(backend=backend)
+    for i in range(200):
+        kg.add_edge(
+            f"n{rng.randrange(40)}",
+            f"n{rng.randrange(40)}",
+            relation=rng.choice(["binds", "inhibits", "activates"]),
+            sources=[f"chunk_{i}"],
+        )
+    for node in kg.get_nodes():
+        kg.add_node(node, sources=[node], label=node)
+    return kg
+
+
+def _random_groups(seed, chained):
+    """Draw groups, optionally reusing merged nodes and merged away nodes."""
+    rng = random.Random(seed)
+    nodes = [f"n{i}" for i in range(45)]
+    groups = []
+    for i in range(12):
+        group = rng.sample(nodes, min(len(nodes), rng.randrange(2, 5)))
+        merged = rng.choice(group) if rng.random() < 0.7 else f"new{i}"
+        groups.append((group, merged))
+        if chained:
+            nodes.append(merged)
+        else:
+            nodes = [node for node in nodes if node not in group]
+    return groups
+
+
+def _snapshot(backend):
+    return list(backend.iter_nodes()), dict(
+        ((source, target), attrs) for source, target, attrs in backend.iter_edges()
+    )
+
+
+@pytest.mark.parametrize("backend", ["networkx", "csr", "default"])
+@pytest.mark.parametrize("chained", [False, True])
+def test_bulk_merge_matches_one_by_one(backend, chained):
+    """Test that a bulk merge gives the graph of merging groups one by one."""
+    for seed in range(10):
+        groups = _random_groups(seed, chained)
+        reference = _random_graph("networkx", seed)
+        _merge_one_by_one(reference.graph, groups)
+
+        kg = _random_graph("networkx" if backend == "default" else backend, seed)
+        kg.get_statistics()
+        if backend == "default":
+            GraphBackend.merge_nodes(kg.graph, groups)
+        else:
+            kg.graph.merge_nodes(groups)
+
+        nodes, edges = _snapshot(kg.graph)
+        reference_nodes, reference_edges = _snapshot(reference.graph)
+        assert dict(nodes) == dict(reference_nodes)
+        assert edges == reference_edges
+        assert kg.get_statistics() == GraphBackend.get_statistics(kg.graph)
+
+
+def test_bulk_merge_leaves_inputs_unchanged():
+    """Test that merging does not modify attributes read before the merge."""
+    kg = _random_graph("csr", 0)
+    node_attrs = kg.get_node_attrs("n1")
+    out_edges = kg.graph.get_out_edges("n2")
+    expected = [(s, t, dict(a, sources=list(a["sources"]))) for s, t, a in out_edges]
+
+    kg.graph.merge_nodes([(["n1", "n2"], "n1"), (["n1", "missing"], "n1")])
+
+    assert node_attrs["sources"] == ["n1"]
+    assert out_edges == expected
+    assert not kg.has_node("n2") and not kg.has_node("missing")
+    assert kg.get_node_attrs("n1")["sources"] == ["n1", "n2"]
+
+
+def test_merge_rebuilds_walk_engine():
+    """Test that walks see the graph after merging nodes."""
+    kg = KnowledgeGraph()
+    kg.add_edge("Protein", "pathway", relation="in", sources=[])
+    kg.add_edge("protein", "cell", relation="in", sources=[])
+    kg.get_walk_engine()
+
+    kg.merge_nodes("Protein", "protein", "protein")
+    kg.merge_nodes("cell", "pathway", "location")
+
+    engine = kg.get_walk_engine()
+    assert sorted(engine.names) == ["location", "protein"]
+    assert kg.random_walks(["protein"], max_steps=1, seed=0).path(0) == [
+        "protein",
+        "location",
+    ]
@@ -0,0 +1,133 @@
+import random
+
+import pytest
+
+from ard.knowledge_graph import KnowledgeGraph
+from ard.storage.graph import CachedBackend, NetworkXBackend
+
+
+class CountingBackend(NetworkXBackend):
+    """A NetworkX backend counting the reads that reach it."""
+
+    def __init__(self):
+        super().__init__()
+        self.reads = 0
+
+    def get_nodes_attrs(self, nodes):
+        self.reads += 1
+        return super().get_nodes_attrs(nodes)
+
+    def get_edges_attrs(self, edges):
+        self.reads += 1
+        return super().get_edges_attrs(edges)
+
+    def get_successors(self, node):
+        self.reads += 1
+        return super().get_successors(node)
+
+    def get_out_edges(self, node):
+        self.reads += 1
+        return super().get_out_edges(node)
+
+
+@pytest.fixture
+def cached():
+    inner = CountingBackend()
+    inner.add_edge("a", "b", relation="binds", sources=["s1"])
+    inner.add_edge("b", "c", relation="inhibits", sources=["s2"])
+    return CachedBackend(inner)
+
+
+def test_repeated_reads_hit_the_cache(cached):
+    """Test that a repeated lookup reads the wrapped backend once."""
+    for _ in range(3):
+        assert cached.get_successors("a") == ["b"]
+        assert cached.has_edge("a", "b")
+        assert cached.get_edge_attrs("a", "b")["relation"] == "binds"
+        assert not cached.has_node("missing")
+
+    assert cached.backend.reads == 3
+    info = cached.cache_info()
+    assert (info["adjacency"].hits, info["adjacency"].misses) == (2, 1)
+    assert (info["edges"].hits, info["edges"].misses) == (5, 1)
+    assert (info["nodes"].hits, info["nodes"].misses) == (2, 1)
+
+
+def test_cached_attributes_are_copies(cached):
+    """Test that changing returned attributes does not change the cache."""
+    cached.get_node_attrs("a")["label"] = "changed"
+    cached.get_out_edges("a")[0][2]["relation"] = "changed"
+    assert "label" not in cached.get_node_attrs("a")
+    assert cached.get_out_edges("a")[0][2]["relation"] == "binds"
+
+
+def test_writes_invalidate_affected_entries(cached):
+    """Test that reads after writes through the wrapper see the new graph."""
+    cached.get_successors("a")
+    assert not cached.has_edge("a", "c")
+    cached.get_node_attrs("c")
+
+    cached.add_edge("a", "c", relation="activates", sources=[])
+    cached.add_node("c", label="C", sources=[])
+    assert sorted(cached.get_successors("a")) == ["b", "c"]
+    assert cached.get_edge_attrs("a", "c")["relation"] == "activates"
+    assert cached.get_node_attrs("c")["label"] == "C"
+
+    cached.get_predecessors("c")
+    cached.remove_node("b")
+    assert cached.get_successors("a") == ["c"]
+    assert cached.get_predecessors("c") == ["a"]
+    assert not cached.has_edge("a", "b") and not cached.has_node("b")
+
+    cached.merge_nodes([(["a", "c"], "ac")])
+    assert not cached.has_node("a") and cached.has_node("ac")
+
+
+def test_matches_uncached_backend():
+    """Test that random reads and writes give the results of the plain backend."""
+    rng = random.Random(0)
+    plain = NetworkXBackend()
+    cached = CachedBackend(NetworkXBackend(), max_size=8)
+    nodes = [f"n{i}" for i in range(10)]
+    for _ in range(500):
+        source, target = rng.choice(nodes), rng.choice(nodes)
+        op = rng.randrange(5)
+        if op == 0:
+            relation = str(rng.random())
+            for backend in (plain, cached):
+                backend.add_edge(source, target, relation=relation)
+        elif op == 1 and plain.has_node(source):
+            for backend in (plain, cached):
+                backend.remove_node(source)
+        else:
+            assert cached.has_edge(source, target) == plain.has_edge(source, target)
+            if plain.has_node(source):
+                assert sorted(cached.get_neighbors(source)) == sorted(
+                    plain.get_neighbors(source)
+                )
+                assert cached.get_in_edges(source) == plain.get_in_edges(source)
+            if plain.has_edge(source, target):
+                assert cached.get_edge_attrs(source, target) == plain.get_edge_attrs(
+                    source, target
+                )
+
+    for info in cached.cache_info().values():
+        assert info.size <= 8
+    assert cached.get_statistics() == plain.get_statistics()
+
+
+def test_knowledge_graph_cache_option():
+    """Test that the cache option wraps the backend transparently."""
+    kg = KnowledgeGraph(cache=True)
+    kg.add_edge("a", "b", relation="binds", sources=[])
+    assert isinstance(kg.graph, CachedBackend)
+    assert kg.get_successors("a") == ["b"]
+    assert kg.get_successors("a") == ["b"]
+    assert kg.graph.cache_info()["adjacency"].hits == 1
+
+    kg = KnowledgeGraph(backend="csr", cache=16)
+    assert kg.graph.cache_info()["nodes"].max_size == 16
+    assert not isinstance(KnowledgeGraph().graph, CachedBackend)
+
+    with pytest.raises(ValueError):
+        CachedBackend(NetworkXBackend(), max_size=0)
@@ -0,0 +1,149 @@
+import random
+
+import networkx as nx
+import pytest
+
+from ard.data.triplets import Triplet
+from ard.knowledge_graph import KnowledgeGraph
+from ard.storage.graph import CSRBackend, NetworkXBackend
+
+
+def _random_triplets(n, num_nodes, seed=0):
+    rng = random.Random(seed)
+    return [
+        Triplet(
+            node_1=f"node_{rng.randrange(num_nodes)}",
+            edge=rng.choice(["binds", "inhibits", "activates"]),
+            node_2=f"node_{rng.randrange(num_nodes)}",
+            metadata={"chunk_id": f"chunk_{i}"},
+        )
+        for i in range(n)
+    ]
+
+
+def _assert_same_graph(csr, reference, ordered_predecessors=True):
+    def order(items):
+        return items if ordered_predecessors else sorted(items, key=str)
+
+    assert len(csr) == len(reference)
+    assert csr.number_of_edges() == reference.number_of_edges()
+    assert list(csr.iter_nodes()) == list(reference.iter_nodes())
+    assert csr.get_edges() == reference.get_edges()
+    for node in reference.get_nodes():
+        assert csr.get_successors(node) == reference.get_successors(node)
+        assert order(csr.get_predecessors(node)) == order(
+            reference.get_predecessors(node)
+        )
+        assert sorted(csr.get_neighbors(node)) == sorted(reference.get_neighbors(node))
+        assert csr.get_out_edges(node) == reference.get_out_edges(node)
+        assert order(csr.get_in_edges(node)) == order(reference.get_in_edges(node))
+
+
+@pytest.fixture
+def graphs():
+    """Build the same knowledge graph on both backends."""
+    triplets = _random_triplets(300, 40)
+    reference = KnowledgeGraph()
+    reference.add_triplets(triplets)
+    kg = KnowledgeGraph(backend="csr")
+    kg.add_triplets(triplets)
+    return kg, reference
+
+
+def test_csr_backend_matches_networkx(graphs):
+    """Test that ingestion into the CSR backend builds the same graph."""
+    kg, reference = graphs
+    assert isinstance(kg.graph, CSRBackend)
+    _assert_same_graph(kg.graph, reference.graph)
+
+    source, target, attrs = reference.get_edges_data()[0]
+    assert kg.has_edge(source, target)
+    assert kg.get_edge_attrs(source, target) == attrs
+    assert not kg.has_edge("node_0", "missing")
+    assert str(kg) == str(reference)
+
+
+def test_csr_backend_updates_and_removals(graphs):
+    """Test writes interleaved with reads, including tombstones and compaction."""
+    kg, reference = graphs
+    rng = random.Random(1)
+
+    for step in range(200):
+        nodes = sorted(reference.get_nodes())
+        action = rng.random()
+        if action < 0.3 and nodes:
+            node = rng.choice(nodes)
+            kg.remove_node(node)
+            reference.remove_node(node)
+        elif action < 0.8:
+            source = f"node_{rng.randrange(60)}"
+            target = f"node_{rng.randrange(60)}"
+            attrs = {"relation": f"rel_{step % 3}", "sources": [{"step": step}]}
+            if step % 7 == 0:
+                attrs["weight"] = step
+            kg.add_edge(source, target, **attrs)
+            reference.add_edge(source, target, **attrs)
+        else:
+            node = f"node_{rng.randrange(60)}"
+            kg.add_node(node, label=step)
+            reference.add_node(node, label=step)
+
+        if step % 25 == 0:
+            _assert_same_graph(kg.graph, reference.graph)
+
+    _assert_same_graph(kg.graph, reference.graph)
+
+
+def test_csr_backend_merge_nodes(graphs):
+    """Test that merging nodes gives the same result on both backends."""
+    kg, reference = graphs
+    for graph in (kg, reference):
+        graph.merge_nodes("node_1", "node_2", "node_1_2")
+    _assert_same_graph(kg.graph, reference.graph)
+
+
+def test_csr_random_walk_matches_networkx(graphs):
+    """Test that seeded random walks visit the same nodes on both backends."""
+    kg, reference = graphs
+    for node in sorted(reference.get_nodes())[:10]:
+        random.seed(42)
+        expected = reference.random_walk(node, max_steps=15)
+        random.seed(42)
+        assert kg.random_walk(node, max_steps=15) == expected
+
+
+@pytest.mark.parametrize("directed", [True, False])
+def test_csr_shortest_path(graphs, directed):
+    """Test that shortest paths are as short as NetworkX's."""
+    kg, reference = graphs
+    nodes = sorted(reference.get_nodes())
+    for source, target in zip(nodes[:10], nodes[-10:]):
+        try:
+            expected = reference.graph.shortest_path(source, target, directed)
+        except nx.NetworkXNoPath:
+            with pytest.raises(nx.NetworkXNoPath):
+                kg.graph.shortest_path(source, target, directed)
+            continue
+        path = kg.graph.shortest_path(source, target, directed)
+        assert len(path) == len(expected)
+        assert path[0] == source and path[-1] == target
+
+    with pytest.raises(nx.NodeNotFound):
+        kg.graph.shortest_path("missing", nodes[0])
+
+
+def test_csr_conversions(graphs):
+    """Test conversion to and from NetworkX and the serializable format."""
+    kg, reference = graphs
+    nx_graph = reference.graph.graph
+
+    # Edges are copied grouped by source, which changes the predecessor order
+    from_nx = CSRBackend.from_networkx(nx_graph)
+    _assert_same_graph(from_nx, reference.graph, ordered_predecessors=False)
+
+    back = NetworkXBackend.from_networkx(from_nx.to_networkx())
+    assert list(back.graph.nodes(data=True)) == list(nx_graph.nodes(data=True))
+    assert list(back.graph.edges(data=True)) == list(nx_graph.edges(data=True))
+
+    from_serializable = CSRBackend.from_serializable(kg.graph.to_serializable())
+    _assert_same_graph(from_serializable, reference.graph, ordered_predecessors=False)
@@ -7,7 +7,7 @@ import pytest
 
 from ard.data.triplets import Triplet
 from ard.knowledge_graph.knowledge_graph import KnowledgeGraph
-from ard.utils.embedder import Embedder
+from ard.utils.embedder import Embedder, convert_embeddings_file
 
 
 @pytest.fixture
@@ -93,7 +93,7 @@ def test_get_embedding(mock_sentence_transformer):
 
     # Check that the embedding was calculated
     assert embedding.shape == (3,)
-    assert np.array_equal(embedding, np.array([0.1, 0.2, 0.3]))
+    assert np.array_equal(embedding, np.array([0.1, 0.2, 0.3], dtype=np.float32))
 
     # Check that the embedding was cached
     assert "A" in embedder._embeddings
@@ -117,9 +117,9 @@ def test_get_embeddings(mock_sentence_transformer):
 
     # Check that embeddings were calculated for all texts
     assert set(embeddings.keys()) == {"A", "B", "C"}
-    assert np.array_equal(embeddings["A"], np.array([0.1, 0.2, 0.3]))
-    assert np.array_equal(embeddings["B"], np.array([0.2, 0.3, 0.4]))
-    assert np.array_equal(embeddings["C"], np.array([0.3, 0.4, 0.5]))
+    assert np.array_equal(embeddings["A"], np.array([0.1, 0.2, 0.3], dtype=np.float32))
+    assert np.array_equal(embeddings["B"], np.array([0.2, 0.3, 0.4], dtype=np.float32))
+    assert np.array_equal(embeddings["C"], np.array([0.3, 0.4, 0.5], dtype=np.float32))
 
     # Check that embeddings were cached
     assert set(embedder._embeddings.keys()) == {"A", "B", "C"}
@@ -213,8 +213,12 @@ def test_save_and_load_embeddings():
 
         # Check that embeddings were loaded correctly
         assert set(embedder2._embeddings.keys()) == {"A", "B"}
-        assert np.array_equal(embedder2._embeddings["A"], np.array([0.1, 0.2, 0.3]))
-        assert np.array_equal(embedder2._embeddings["B"], np.array([0.2, 0.3, 0.4]))
+        assert np.array_equal(
+            embedder2._embeddings["A"], np.array([0.1, 0.2, 0.3], dtype=np.float32)
+        )
+        assert np.array_equal(
+            embedder2._embeddings["B"], np.array([0.2, 0.3, 0.4], dtype=np.float32)
+        )
 
 
 def test_clear_cache():
@@ -230,3 +234,48 @@ def test_clear_cache():
 
     # Check that cache is empty
     assert embedder._embeddings == {}
+
+
+def test_binary_embeddings_file(tmp_path):
+    """Test saving embeddings to a memory-mapped binary file and converting JSON."""
+    embedder = Embedder(model_name="test-model", distance_metric="euclidean")
+    embedder._embeddings.add_many(
+        ["A", "B", "C"], np.array([[0.1, 0.2, 0.3], [0.2, 0.3, 0.4], [3.0, 4.0, 0.0]])
+    )
+    filename = str(tmp_path / "embeddings.emb")
+    embedder.save_to_file(filename)
+
+    embedder2 = Embedder.from_file(filename)
+    assert embedder2.model_name == "test-model"
+    assert embedder2.distance_metric == "euclidean"
+    store = embedder2._embeddings
+    assert isinstance(store.matrix.base, np.memmap)
+    assert np.array_equal(store.matrix, embedder._embeddings.matrix)
+    assert store.norms[2] == pytest.approx(5.0)
+    assert embedder2.calculate_distance("A", "C") == pytest.approx(
+        embedder.calculate_distance("A", "C")
+    )
+
+    # Writes copy the mapped matrix instead of failing
+    store.add("A", np.zeros(3))
+    store.add("D", np.ones(3))
+    assert not store["A"].any() and len(store) == 4
+    assert np.array_equal(
+        Embedder.from_file(filename)._embeddings["A"], embedder._embeddings["A"]
+    )
+
+    with pytest.raises(ValueError, match="Model name mismatch"):
+        Embedder(model_name="other-model").load_from_file(filename)
+
+    # JSON files convert to the same binary file
+    json_file = str(tmp_path / "embeddings.json")
+    binary_file = str(tmp_path / "converted.emb")
+    embedder.save_to_file(json_file)
+    convert_embeddings_file(json_file, binary_file)
+    converted = Embedder.from_file(binary_file, mmap=False)
+    assert converted._embeddings.names == ["A", "B", "C"]
+    assert np.array_equal(converted._embeddings.matrix, embedder._embeddings.matrix)
+
+    empty = str(tmp_path / "empty.emb")
+    Embedder(model_name="test-model").save_to_file(empty)
+    assert Embedder.from_file(empty).embeddings_len == 0
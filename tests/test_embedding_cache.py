@@ -0,0 +1,134 @@
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pytest
+
+from ard.knowledge_graph.node_merger import EmbeddingBasedNodeMerger
+from ard.utils.embedder import Embedder
+from ard.utils.embedding_cache import EmbeddingCache
+
+
+class _CountingModel:
+    """Encodes a text as its character counts, remembering what was encoded."""
+
+    def __init__(self):
+        self.encoded = []
+
+    def encode(self, texts, **kwargs):
+        self.encoded.extend(texts)
+        return np.array([[len(text), text.count("a"), 1.0] for text in texts])
+
+
+def _vectors(texts):
+    return np.array([[len(text), i, 1.0] for i, text in enumerate(texts)])
+
+
+def _fill(path, worker):
+    cache = EmbeddingCache(path, timeout=60)
+    texts = [f"text {i}" for i in range(worker * 50, worker * 50 + 200)]
+    for start in range(0, len(texts), 20):
+        batch = texts[start : start + 20]
+        cache.get_many("model", batch)
+        cache.put_many("model", batch, _vectors(batch))
+    cache.close()
+
+
+def test_cache_lookups_and_stats(tmp_path):
+    """Test that embeddings are found by model and normalized text."""
+    cache = EmbeddingCache(str(tmp_path / "cache.sqlite"))
+    cache.put_many("model", ["a  b", "c"], _vectors(["a  b", "c"]))
+    cache.put_many("other", ["c"], np.zeros((1, 3)))
+
+    found = cache.get_many("model", [" a b", "c", "c", "missing"])
+    assert set(found) == {" a b", "c"}
+    assert found[" a b"].dtype == np.float32
+    assert list(found["c"]) == [1.0, 1.0, 1.0]
+    assert list(cache.get_many("other", ["c"])["c"]) == [0.0, 0.0, 0.0]
+    assert cache.stats.hits == 3 and cache.stats.misses == 1
+    assert cache.stats.hit_rate == pytest.approx(0.75)
+    assert len(cache) == 3
+
+    with pytest.raises(ValueError):
+        cache.put_many("model", ["d"], np.zeros((2, 3)))
+    with pytest.raises(ValueError):
+        EmbeddingCache(":memory:", max_entries=0)
+
+
+def test_cache_evicts_least_recently_used():
+    """Test that the cache stays under max_entries, keeping recent entries."""
+    cache = EmbeddingCache(":memory:", max_entries=3)
+    cache.put_many("model", ["a", "b", "c"], _vectors(["a", "b", "c"]))
+    cache.get_many("model", ["a"])
+    cache.put_many("model", ["d"], _vectors(["d"]))
+
+    assert len(cache) == 3 and cache.stats.evictions == 1
+    found = cache.get_many("model", ["a", "b", "c", "d"])
+    assert {"a", "d"} <= set(found) and len(found) == 3
+
+
+def test_cache_size_is_kept_without_counting(tmp_path):
+    """Test that writes keep the size in a table instead of counting rows."""
+    path = str(tmp_path / "cache.sqlite")
+    # A cache written before the size was kept
+    conn = sqlite3.connect(path)
+    conn.executescript(
+        """
+        CREATE TABLE embeddings (
+            model TEXT NOT NULL, key BLOB NOT NULL, vector BLOB NOT NULL,
+            last_used INTEGER NOT NULL, PRIMARY KEY (model, key)
+        ) WITHOUT ROWID;
+        INSERT INTO embeddings VALUES ('model', x'01', x'', 0), ('model', x'02', x'', 0);
+        """
+    )
+    conn.close()
+
+    cache = EmbeddingCache(path, max_entries=4)
+    assert len(cache) == 2
+    statements = []
+    cache._conn.set_trace_callback(statements.append)
+    cache.put_many("model", ["a", "b"], _vectors(["a", "b"]))
+    cache.put_many("model", ["a", "c"], _vectors(["a", "c"]))
+    assert not any("COUNT" in statement for statement in statements)
+    assert len(cache) == 4 and cache.stats.evictions == 1
+    cache.close()
+    assert len(EmbeddingCache(path)) == 4
+
+
+def test_embedder_reuses_cache_across_runs(tmp_path):
+    """Test that a second run encodes only the texts the first did not."""
+    path = str(tmp_path / "cache.sqlite")
+    first = Embedder(persistent_cache=EmbeddingCache(path))
+    first._model = _CountingModel()
+    first.get_embeddings(["alpha", "beta", "gamma"])
+
+    second = Embedder(persistent_cache=EmbeddingCache(path))
+    second._model = _CountingModel()
+    embeddings = second.get_embeddings(["alpha", "beta", "delta"])
+    assert second._model.encoded == ["delta"]
+    assert list(embeddings["alpha"]) == [5.0, 2.0, 1.0]
+    assert second.persistent_cache.stats.hit_rate == pytest.approx(2 / 3)
+
+    # Another model does not see the embeddings
+    other = Embedder("other-model", persistent_cache=EmbeddingCache(path))
+    other._model = _CountingModel()
+    other.get_embedding("alpha")
+    assert other._model.encoded == ["alpha"]
+
+    # A merger shares the embedder it is given
+    merger = EmbeddingBasedNodeMerger(embedder=second)
+    assert merger.embedder is second
+
+
+def test_cache_shared_by_processes(tmp_path):
+    """Test that processes can fill the same cache at the same time."""
+    path = str(tmp_path / "cache.sqlite")
+    EmbeddingCache(path).close()
+    with ProcessPoolExecutor(max_workers=4) as executor:
+        list(executor.map(_fill, [path] * 4, range(4)))
+
+    cache = EmbeddingCache(path)
+    assert len(cache) == 350
+    found = cache.get_many("model", ["text 0", "text 349"])
+    assert list(found["text 0"]) == [6.0, 0.0, 1.0]
+    assert len(found) == 2
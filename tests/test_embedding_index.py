@@ -0,0 +1,124 @@
+import numpy as np
+import pytest
+
+from ard.knowledge_graph.node_merger import EmbeddingBasedNodeMerger
+from ard.utils.ann_index import IVFIndex
+from ard.utils.embedder import Embedder
+from ard.utils.embedding_store import EmbeddingStore
+
+
+def _clustered(n, dim=16, clusters=20, seed=0):
+    """Create n named embeddings around a few random centers."""
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dim))
+    vectors = centers[rng.integers(clusters, size=n)] + 0.1 * rng.normal(size=(n, dim))
+    store = EmbeddingStore(dim)
+    store.add_many([f"node {i}" for i in range(n)], vectors)
+    return store
+
+
+def _exact(store, name, k):
+    unit = store.matrix / store.norms[:, None]
+    similarities = unit @ unit[store.rows([name])[0]]
+    order = [i for i in np.argsort(-similarities) if store.names[i] != name]
+    return [store.names[i] for i in order[:k]], similarities
+
+
+class _ClusterModel:
+    """Encodes "<cluster>-<i>" texts as a cluster direction with offset i."""
+
+    def encode(self, texts, **kwargs):
+        vectors = []
+        for text in texts:
+            cluster, i = (int(part) for part in text.split("-"))
+            vector = np.zeros(8)
+            vector[cluster] = 1.0
+            vector[(cluster + 1) % 8] = 0.01 * i
+            vectors.append(vector)
+        return np.array(vectors)
+
+
+class _Graph:
+    def __init__(self, nodes):
+        self.nodes = nodes
+
+    def get_nodes(self):
+        return self.nodes
+
+
+def test_index_queries_add_remove():
+    """Test that probing all lists matches an exhaustive search."""
+    store = _clustered(500)
+    index = IVFIndex.from_store(store, num_lists=10, nprobe=10)
+    assert len(index) == 500 and index.num_lists == 10
+
+    expected, similarities = _exact(store, "node 7", 5)
+    neighbors = index.query("node 7", k=5)
+    assert [name for name, _ in neighbors] == expected
+    assert neighbors[0][1] == pytest.approx(similarities[store.rows(expected[:1])[0]])
+    assert "node 7" not in dict(index.query("node 7", k=500))
+
+    close = index.radius_query("node 7", 0.9)
+    assert {name for name, _ in close} == {
+        name
+        for name, similarity in zip(store.names, similarities)
+        if similarity >= 0.9 and name != "node 7"
+    }
+    assert all(similarity >= 0.9 for _, similarity in close)
+
+    # A vector query finds its own embedding first
+    assert index.query(store["node 3"], k=1)[0][0] == "node 3"
+
+    index.remove(["node 3", "node 4"])
+    assert "node 3" not in index and len(index) == 498
+    assert "node 3" not in dict(index.query(store["node 3"], k=10))
+    index.add(["node 3", "new"], np.stack([store["node 3"], -store["node 5"]]))
+    assert len(index) == 500
+    assert index.query(-store["node 5"], k=1)[0][0] == "new"
+
+    with pytest.raises(KeyError):
+        index.remove(["missing"])
+    with pytest.raises(ValueError):
+        index.add(["bad"], np.zeros((1, 3)))
+    with pytest.raises(ValueError):
+        IVFIndex(16).add(["untrained"], np.zeros((1, 16)))
+
+
+def test_index_recall_and_file(tmp_path):
+    """Test the recall of a few probes and that a saved index answers the same."""
+    store = _clustered(3000, clusters=50)
+    index = IVFIndex.from_store(store, nprobe=8)
+    assert index.num_lists == int(4 * np.sqrt(3000))
+
+    report = index.recall_report(k=10, num_queries=50)
+    assert report.num_queries == 50 and report.nprobe == 8
+    assert report.recall >= 0.9
+    full = index.recall_report(k=10, num_queries=50, nprobe=index.num_lists)
+    assert full.recall == 1.0
+
+    path = str(tmp_path / "index.ann")
+    index.save(path)
+    loaded = IVFIndex.load(path)
+    assert len(loaded) == len(index) and loaded.nprobe == 8
+    assert loaded.query("node 42", k=10) == index.query("node 42", k=10)
+    loaded.add(["extra"], store["node 42"][None])
+    assert loaded.query("extra", k=1)[0][0] == "node 42"
+
+
+def test_merger_with_index_matches_exhaustive():
+    """Test that merge candidates from a fully probed index match exhaustive ones."""
+    nodes = [f"{cluster}-{i}" for i in range(30) for cluster in range(8)]
+    embedder = Embedder("test-model")
+    embedder._model = _ClusterModel()
+
+    exhaustive = EmbeddingBasedNodeMerger(embedder=embedder, index_min_nodes=None)
+    indexed = EmbeddingBasedNodeMerger(
+        embedder=embedder, index_min_nodes=1, batch_size=16, nprobe=64
+    )
+    expected = exhaustive.find_merge_candidates(_Graph(nodes))
+    assert len(expected) == 8
+    assert indexed.find_merge_candidates(_Graph(nodes)) == expected
+    assert indexed.find_merge_candidates(_Graph([])) == []
+
+    index = embedder.build_index(nodes[:40], num_lists=4)
+    assert len(index) == 40 and index.query("0-0", k=1)[0][0].startswith("0-")
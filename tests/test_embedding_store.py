@@ -0,0 +1,166 @@
+import numpy as np
+import pytest
+
+from ard.knowledge_graph.node_merger import EmbeddingBasedNodeMerger
+from ard.utils import embedding_store
+from ard.utils.embedder import Embedder
+from ard.utils.embedding_store import EmbeddingStore
+
+
+class _FakeModel:
+    """Encodes every text as a fixed random vector, grouped in a few clusters."""
+
+    def __init__(self, dim=8, seed=0):
+        self.dim = dim
+        self.rng = np.random.default_rng(seed)
+        self.centers = self.rng.normal(size=(4, dim))
+        self.vectors = {}
+        self.calls = 0
+
+    def _vector(self, text):
+        if text not in self.vectors:
+            center = self.centers[hash(text) % len(self.centers)]
+            self.vectors[text] = center + 0.05 * self.rng.normal(size=self.dim)
+        return self.vectors[text]
+
+    def encode(self, texts, **kwargs):
+        self.calls += 1
+        if isinstance(texts, str):
+            return self._vector(texts)
+        return np.array([self._vector(text) for text in texts])
+
+
+def _embedder(**kwargs):
+    embedder = Embedder(model_name="test-model", **kwargs)
+    embedder._model = _FakeModel()
+    return embedder
+
+
+def _reference(a, b, metric, similarity):
+    a, b = np.asarray(a, dtype=np.float64), np.asarray(b, dtype=np.float64)
+    if metric == "cosine":
+        value = a @ b / (np.linalg.norm(a) * np.linalg.norm(b))
+        return value if similarity else 1.0 - value
+    if metric == "euclidean":
+        value = np.linalg.norm(a - b)
+        return 1.0 / (1.0 + value) if similarity else value
+    return a @ b if similarity else -(a @ b)
+
+
+def test_embedding_store(monkeypatch):
+    """Test that the store keeps rows, norms and the index in step."""
+    monkeypatch.setattr(embedding_store, "INITIAL_CAPACITY", 2)
+    store = EmbeddingStore()
+    assert store == {} and store.dim is None
+
+    rng = np.random.default_rng(0)
+    embeddings = rng.normal(size=(5, 3))
+    store.add_many(["a", "b", "c", "d"], embeddings[:4])
+    store.add("e", embeddings[4])
+    store.add("b", embeddings[0])
+    assert store.names == ["a", "b", "c", "d", "e"] and store.dim == 3
+    assert store.matrix.dtype == np.float32 and store.matrix.shape == (5, 3)
+    assert np.allclose(store["b"], embeddings[0])
+    assert np.allclose(store["e"], embeddings[4])
+    assert np.allclose(store.norms, np.linalg.norm(store.matrix, axis=1))
+    assert list(store.rows(["e", "a"])) == [4, 0]
+
+    with pytest.raises(ValueError):
+        store["a"][0] = 1.0
+    with pytest.raises(KeyError):
+        store.rows(["a", "missing"])
+    with pytest.raises(ValueError):
+        store.add("f", np.zeros(4))
+    with pytest.raises(ValueError):
+        store.add_many(["f", "g"], np.zeros((1, 3)))
+
+    store.clear()
+    assert len(store) == 0 and "a" not in store
+
+
+@pytest.mark.parametrize("metric", ["cosine", "euclidean", "dot"])
+def test_vectorized_comparisons(metric):
+    """Test that the matrix APIs match comparisons of single pairs."""
+    embedder = _embedder(distance_metric=metric)
+    texts = [f"text {i}" for i in range(20)]
+    others = texts[5:] + ["new"]
+    vectors = {
+        text: np.asarray(embedder._model._vector(text)) for text in texts + ["new"]
+    }
+
+    # Missing embeddings are encoded in one batch
+    distances = embedder.distances("text 0", others)
+    assert embedder._model.calls == 1
+    similarities = embedder.similarities("text 0", others)
+    assert distances.shape == similarities.shape == (len(others),)
+    pairwise = embedder.pairwise_distances(texts[:4], others)
+    pairwise_similarities = embedder.pairwise_similarities(texts[:4])
+    assert pairwise.shape == (4, len(others))
+    assert pairwise_similarities.shape == (4, 4)
+
+    for j, other in enumerate(others):
+        expected = _reference(vectors["text 0"], vectors[other], metric, False)
+        assert distances[j] == pytest.approx(expected, rel=1e-4, abs=1e-4)
+        assert embedder.calculate_distance("text 0", other) == pytest.approx(
+            expected, rel=1e-4, abs=1e-4
+        )
+        expected = _reference(vectors["text 0"], vectors[other], metric, True)
+        assert similarities[j] == pytest.approx(expected, rel=1e-4, abs=1e-4)
+        for i, text in enumerate(texts[:4]):
+            expected = _reference(vectors[text], vectors[other], metric, False)
+            assert pairwise[i, j] == pytest.approx(expected, rel=1e-4, abs=1e-3)
+    assert np.allclose(
+        np.diag(pairwise_similarities),
+        [_reference(vectors[t], vectors[t], metric, True) for t in texts[:4]],
+        rtol=1e-4,
+        atol=1e-3,
+    )
+
+    # Only the texts compared are embedded
+    assert embedder.embeddings_len == len(texts)
+
+    with pytest.raises(ValueError, match="Unknown distance metric: invalid"):
+        embedder.distances("text 0", others, metric="invalid")
+
+
+def test_comparisons_without_cache():
+    """Test that comparisons without caching leave the cache empty."""
+    embedder = _embedder(cache_embeddings=False)
+    embedder._embeddings.add("cached", np.ones(8))
+    similarities = embedder.similarities("cached", ["a", "b", "cached"])
+    assert similarities[2] == pytest.approx(1.0)
+    assert embedder.embeddings_len == 1
+    assert set(embedder.get_embeddings(["a", "cached"])) == {"a", "cached"}
+    assert embedder.embeddings_len == 1
+
+
+def test_embedding_merger_matches_pairwise_loop():
+    """Test that merging by blocks finds the groups of the pairwise loop."""
+    from ard.data.triplets import Triplet
+    from ard.knowledge_graph import KnowledgeGraph
+
+    kg = KnowledgeGraph.from_triplets(
+        [
+            Triplet(node_1=f"node {i}", edge="binds", node_2=f"node {i + 1}")
+            for i in range(30)
+        ]
+    )
+    merger = EmbeddingBasedNodeMerger(similarity_threshold=0.9, batch_size=7)
+    merger.embedder._model = _FakeModel()
+
+    expected = []
+    processed = set()
+    for node1 in kg.get_nodes():
+        if node1 in processed:
+            continue
+        similar_nodes = {node1}
+        for node2 in kg.get_nodes():
+            if node1 == node2 or node2 in processed:
+                continue
+            if merger.embedder.calculate_similarity(node1, node2) >= 0.9:
+                similar_nodes.add(node2)
+        if len(similar_nodes) > 1:
+            expected.append(similar_nodes)
+            processed.update(similar_nodes)
+
+    assert expected and merger.find_merge_candidates(kg) == expected
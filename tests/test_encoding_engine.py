@@ -0,0 +1,106 @@
+import os
+
+import numpy as np
+import pytest
+
+from ard.utils.embedder import Embedder
+from ard.utils.embedding_cache import EmbeddingCache
+from ard.utils.encoding_engine import EncodingEngine, encode_sorted
+
+
+class _LengthModel:
+    """Encodes a text as its length and first character, recording batches."""
+
+    def __init__(self, name="test-model"):
+        self.name = name
+        self.batches = []
+
+    def encode(self, texts, batch_size=32, **kwargs):
+        self.batches.append(list(texts))
+        return np.array([[len(text), ord(text[0]), os.getpid()] for text in texts])
+
+
+def _texts(n):
+    return [f"{chr(97 + i % 26)}{'x' * (i % 17)}" for i in range(n)]
+
+
+def _expected(texts):
+    return np.array([[len(text), ord(text[0])] for text in texts], dtype=np.float32)
+
+
+def test_encode_sorted_batches_by_length():
+    """Test that batches hold texts of similar length and results keep order."""
+    model = _LengthModel()
+    texts = _texts(100)
+    embeddings = encode_sorted(model, texts, batch_size=16)
+
+    assert embeddings.dtype == np.float32 and embeddings.shape == (100, 3)
+    assert np.array_equal(embeddings[:, :2], _expected(texts))
+    assert [len(batch) for batch in model.batches] == [16] * 6 + [4]
+    lengths = [len(text) for batch in model.batches for text in batch]
+    assert lengths == sorted(lengths, reverse=True)
+
+
+def test_engine_in_process_streaming():
+    """Test that streaming input is encoded before it is exhausted."""
+    engine = EncodingEngine(
+        batch_size=8, chunk_size=10, model_factory=_LengthModel, num_workers=0
+    )
+    texts = _texts(35)
+    consumed = []
+
+    def stream():
+        for text in texts:
+            consumed.append(text)
+            yield text
+
+    chunks = engine.iter_encode(stream())
+    first_texts, first_embeddings = next(chunks)
+    assert first_texts == texts[:10] and len(consumed) < len(texts)
+    assert np.array_equal(first_embeddings[:, :2], _expected(texts[:10]))
+    rest = list(chunks)
+    assert [len(chunk) for chunk, _ in rest] == [10, 10, 5]
+
+    with pytest.raises(ValueError):
+        EncodingEngine(batch_size=0)
+
+
+def test_engine_worker_pool():
+    """Test that a pool of workers encodes all chunks in order."""
+    texts = _texts(500)
+    with EncodingEngine(
+        batch_size=16,
+        chunk_size=64,
+        num_workers=2,
+        model_factory=_LengthModel,
+        start_method="fork",
+    ) as engine:
+        embeddings = engine.encode(texts)
+        assert np.array_equal(embeddings[:, :2], _expected(texts))
+        assert os.getpid() not in set(embeddings[:, 2].tolist())
+
+        chunks = list(engine.iter_encode(iter(texts)))
+        assert [text for chunk, _ in chunks for text in chunk] == texts
+        streamed = np.concatenate([chunk for _, chunk in chunks])
+        assert np.array_equal(streamed[:, :2], _expected(texts))
+
+
+def test_embedder_streams_through_engine(tmp_path):
+    """Test that the embedder streams words through its engine and caches."""
+    cache = EmbeddingCache(str(tmp_path / "cache.sqlite"))
+    cache.put_many("test-model", ["cached"], np.ones((1, 3)))
+    engine = EncodingEngine("test-model", chunk_size=4, model_factory=_LengthModel)
+    embedder = Embedder("test-model", persistent_cache=cache, encoding_engine=engine)
+    embedder._embeddings.add("known", np.zeros(3))
+
+    words = iter(["cached", "known"] + _texts(10) + _texts(10))
+    assert embedder.embed_stream(words, chunk_size=5) == 11
+    assert embedder.embeddings_len == 12
+    assert np.array_equal(embedder.get_embedding("cached"), np.ones(3))
+    assert embedder.get_embedding("bx")[0] == 2
+    assert cache.stats.writes == 1 + 10
+
+    with pytest.raises(ValueError, match="Model name mismatch"):
+        Embedder("other-model", encoding_engine=engine)
+    with pytest.raises(ValueError):
+        Embedder("test-model", cache_embeddings=False).embed_stream(["a"])
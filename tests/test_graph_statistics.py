@@ -0,0 +1,96 @@
+import os
+import random
+import tempfile
+
+import pytest
+
+from ard.knowledge_graph import KnowledgeGraph
+from ard.storage.graph import GraphBackend, GraphStatistics
+
+
+def _scanned(backend):
+    """Get the relation index and statistics by scanning every edge."""
+    relations = {
+        relation: sorted(GraphBackend.get_edges_by_relation(backend, relation))
+        for relation in ["binds", "inhibits", "activates"]
+    }
+    return relations, GraphBackend.get_statistics(backend)
+
+
+def _assert_matches_scan(kg):
+    relations, statistics = _scanned(kg.graph)
+    assert kg.get_statistics() == statistics
+    assert kg.get_edges() == statistics.relation_types
+    for relation, edges in relations.items():
+        assert sorted(kg.get_edges_by_relation(relation)) == edges
+
+
+@pytest.mark.parametrize("backend", ["networkx", "csr", "sqlite"])
+def test_statistics_follow_updates(backend):
+    """Test that maintained statistics match a full scan after every change."""
+    kg = KnowledgeGraph(backend=backend)
+    assert kg.get_statistics() == GraphStatistics()
+    rng = random.Random(0)
+    relations = ["binds", "inhibits", "activates"]
+
+    for step in range(400):
+        action = rng.random()
+        nodes = sorted(kg.get_nodes())
+        if action < 0.15 and nodes:
+            kg.remove_node(rng.choice(nodes))
+        elif action < 0.25:
+            kg.add_node(f"node_{rng.randrange(40)}", sources=[])
+        elif action < 0.35:
+            kg.graph.add_edges(
+                (
+                    f"node_{rng.randrange(40)}",
+                    f"node_{rng.randrange(40)}",
+                    {"relation": rng.choice(relations), "sources": []},
+                )
+                for _ in range(5)
+            )
+        else:
+            # Includes self-loops, relation changes and edges without a relation
+            attrs = {"sources": [{"step": step}]}
+            if rng.random() < 0.9:
+                attrs["relation"] = rng.choice(relations)
+            kg.add_edge(
+                f"node_{rng.randrange(40)}", f"node_{rng.randrange(40)}", **attrs
+            )
+
+        if step % 20 == 0:
+            _assert_matches_scan(kg)
+    _assert_matches_scan(kg)
+
+    statistics = kg.get_statistics()
+    assert statistics.num_nodes == kg.number_of_nodes() == len(kg.get_nodes())
+    assert sum(statistics.degree_histogram.values()) == statistics.num_nodes
+    assert str(kg) == (
+        f"KnowledgeGraph(nodes={statistics.num_nodes}, "
+        f"edge_types={len(statistics.relation_counts)}, "
+        f"edges={statistics.num_edges})"
+    )
+
+
+def test_statistics_of_readonly_graph():
+    """Test statistics and relation queries on a memory-mapped graph."""
+    kg = KnowledgeGraph()
+    kg.add_edge("a", "b", relation="binds", sources=[])
+    kg.add_edge("b", "c", relation="inhibits", sources=[])
+    kg.add_edge("c", "a", relation="binds", sources=[])
+    kg.add_edge("c", "c", sources=[])
+    kg.add_node("lonely", sources=[])
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "graph.kgb")
+        kg.save_to_file(path)
+        readonly = KnowledgeGraph.open_readonly(path)
+
+        statistics = readonly.get_statistics()
+        assert statistics == kg.get_statistics()
+        assert statistics.relation_counts == {"binds": 2, "inhibits": 1}
+        assert statistics.degree_histogram == {0: 1, 2: 2, 4: 1}
+        assert sorted(readonly.get_edges_by_relation("binds")) == sorted(
+            kg.get_edges_by_relation("binds")
+        )
+        assert readonly.get_edges_by_relation("missing") == []
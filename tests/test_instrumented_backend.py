@@ -0,0 +1,149 @@
+import json
+import threading
+
+import pytest
+
+from ard.data.triplets import Triplet
+from ard.knowledge_graph import KnowledgeGraph
+from ard.storage.graph import (
+    InstrumentedBackend,
+    NetworkXBackend,
+    assert_max_calls,
+)
+
+
+def _triplets(n):
+    return [
+        Triplet(node_1=f"n{i}", edge="binds", node_2=f"n{i + 1}", metadata={})
+        for i in range(n)
+    ]
+
+
+def test_calls_are_counted_by_method_and_scope():
+    """Test that calls count in the totals and in every open scope."""
+    backend = InstrumentedBackend(NetworkXBackend(), buckets=(1e-3, 1.0))
+    backend.add_edge("a", "b", relation="binds")
+    with backend.scope("outer") as outer:
+        backend.has_node("a")
+        with backend.scope("inner") as inner:
+            backend.get_successors("a")
+            backend.get_successors("b")
+            assert len(backend) == 2
+        # Iterators are counted once, when exhausted
+        assert list(backend.iter_edges()) == [("a", "b", {"relation": "binds"})]
+
+    assert inner.calls == 3
+    assert inner.methods["get_successors"].calls == 2
+    assert outer.calls == 5
+    assert [scope.name for scope in backend.scopes] == ["inner", "outer"]
+    assert backend.stats.calls == 6
+    stats = backend.stats.methods["get_successors"]
+    assert sum(stats.histogram) == 2 and len(stats.histogram) == 3
+    assert stats.max_seconds <= stats.total_seconds
+
+    report = json.loads(json.dumps(backend.report()))
+    assert report["total"]["methods"]["add_edge"]["calls"] == 1
+    assert report["scopes"][1]["name"] == "outer"
+    assert report["scopes"][1]["end_time_ns"] >= report["scopes"][1]["start_time_ns"]
+
+    backend.reset()
+    assert backend.stats.calls == 0 and backend.scopes == []
+
+    with pytest.raises(ValueError):
+        InstrumentedBackend(NetworkXBackend(), buckets=(1.0, 0.1))
+
+
+def test_concurrent_scopes_count_their_own_calls():
+    """Test that scopes open in other threads do not count each other's calls."""
+    backend = InstrumentedBackend(NetworkXBackend())
+    backend.add_node("a")
+    barrier = threading.Barrier(2)
+    results = {}
+
+    def lookups(name, count):
+        with backend.scope(name) as stats:
+            barrier.wait()
+            for _ in range(count):
+                backend.has_node("a")
+            barrier.wait()
+        results[name] = stats.calls
+
+    threads = [
+        threading.Thread(target=lookups, args=(f"worker {count}", count))
+        for count in (3, 5)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == {"worker 3": 3, "worker 5": 5}
+    assert backend.stats.calls == 9
+
+
+def test_call_budget(tmp_path):
+    """Test that ingestion stays within a fixed number of backend calls."""
+    kg = KnowledgeGraph(instrument=True)
+    assert isinstance(kg.graph, InstrumentedBackend)
+
+    # Calls per batch, not per triplet
+    with assert_max_calls(kg.graph, 4, "add_triplets"):
+        kg.add_triplets(_triplets(100), batch_size=None)
+    assert kg.number_of_nodes() == 101
+
+    with pytest.raises(AssertionError, match="get_successors: 2"):
+        with assert_max_calls(kg.graph, 1, "two lookups"):
+            kg.get_successors("n1")
+            kg.get_successors("n2")
+
+    filename = tmp_path / "calls.json"
+    kg.graph.save_report(str(filename))
+    scopes = json.loads(filename.read_text())["scopes"]
+    assert [scope["name"] for scope in scopes] == ["add_triplets", "two lookups"]
+
+
+def test_opentelemetry_spans():
+    """Test that scopes and calls are exported as nested spans."""
+    pytest.importorskip("opentelemetry.sdk")
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+        InMemorySpanExporter,
+    )
+
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    backend = InstrumentedBackend(NetworkXBackend(), tracer=provider.get_tracer("ard"))
+    with backend.scope("subgraph extraction #12"):
+        backend.add_node("a")
+        backend.has_node("a")
+
+    spans = {span.name: span for span in exporter.get_finished_spans()}
+    scope = spans["subgraph extraction #12"]
+    assert scope.attributes["graph_backend.calls"] == 2
+    for name in ("GraphBackend.add_node", "GraphBackend.has_node"):
+        assert spans[name].parent.span_id == scope.context.span_id
+
+
+def test_opentelemetry_streaming_spans():
+    """Test that iterator spans stay open until the iterator is exhausted."""
+    pytest.importorskip("opentelemetry.sdk")
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+        InMemorySpanExporter,
+    )
+
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    backend = InstrumentedBackend(NetworkXBackend(), tracer=provider.get_tracer("ard"))
+    backend.add_edge("a", "b", relation="binds")
+    exporter.clear()
+
+    edges = backend.iter_edges()
+    assert exporter.get_finished_spans() == ()
+    assert len(list(edges)) == 1
+    (span,) = exporter.get_finished_spans()
+    assert span.name == "GraphBackend.iter_edges"
@@ -50,13 +50,20 @@
 #     assert ("source1", "target2", "cites") in edges
 #     assert ("source2", "target1", "contradicts") in edges
 
+import gc
 import os
+import random
 import tempfile
+import time
+from types import SimpleNamespace
 
+import pandas as pd
 import pytest
 
-from ard.data.triplets import Triplet
+from ard.data.triplets import Triplet, Triplets
 from ard.knowledge_graph import KnowledgeGraph
+from ard.knowledge_graph.ingestion import TripletIngestor
+from ard.storage.graph.graph_file import GraphFileReader, GraphFileWriter
 
 
 @pytest.fixture
@@ -298,6 +305,98 @@ def test_save_and_load_file():
             os.remove(temp_filename)
 
 
+def test_save_and_load_binary_file(sample_triplets_with_duplicates):
+    """Test that the binary format round-trips the graph exactly."""
+    kg = KnowledgeGraph.from_triplets(
+        sample_triplets_with_duplicates
+        + [
+            Triplet(
+                node_1="tau",
+                edge="binds",
+                node_2="microglia",
+                metadata={
+                    "verified": True,
+                    "score": None,
+                    "pages": [1, 2],
+                    "year": 2021,
+                    "label": "τ-protein",
+                },
+            ),
+        ]
+    )
+    kg.add_node("isolated")
+    kg.add_node("annotated", sources=[], label="extra attribute")
+    kg.config = {"custom_setting": "test_value"}
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        binary_file = os.path.join(temp_dir, "graph.kgb")
+        json_file = os.path.join(temp_dir, "graph.json")
+        kg.save_to_file(binary_file)
+        kg.save_to_file(json_file)
+
+        loaded_kg = KnowledgeGraph.load_from_file(binary_file)
+        json_kg = KnowledgeGraph.load_from_file(json_file)
+
+    assert loaded_kg.config == kg.config
+    assert list(loaded_kg.graph.graph.nodes(data=True)) == list(
+        kg.graph.graph.nodes(data=True)
+    )
+    assert list(loaded_kg.graph.graph.edges(data=True)) == list(
+        kg.graph.graph.edges(data=True)
+    )
+    assert list(loaded_kg.graph.graph.edges(data=True)) == list(
+        json_kg.graph.graph.edges(data=True)
+    )
+
+
+def test_binary_file_chunked_streaming():
+    """Test that chunked writing and reading handle unordered edges and new keys."""
+    nodes = [(f"n{i}", {"sources": [{"i": i}] * (i % 3)}) for i in range(7)]
+    edges = [
+        (f"n{(i * 5) % 7}", f"n{i}", {"relation": "r", "sources": [{"k": i}]})
+        for i in range(7)
+    ]
+    edges[-1][2]["sources"].append({"late_key": 1.5})
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "graph.kgb")
+        with GraphFileWriter(path, chunk_size=2) as writer:
+            for node, attrs in nodes:
+                writer.add_node(node, attrs)
+            for source, target, attrs in edges:
+                writer.add_edge(source, target, attrs)
+
+        reader = GraphFileReader(path, chunk_size=3)
+        assert list(reader.iter_nodes()) == nodes
+        assert sorted(reader.iter_edges(), key=lambda edge: edge[1]) == edges
+
+        with pytest.raises(ValueError, match="unknown node"):
+            with GraphFileWriter(path) as writer:
+                writer.add_edge("a", "b", {})
+
+
+def test_binary_file_empty_sources():
+    """Test that empty provenance entries survive a binary round trip."""
+    nodes = [
+        ("mixed", {"sources": [{}, {"x": 1}, {}]}),
+        ("only_empty", {"sources": [{}, {}]}),
+    ]
+    edges = [("mixed", "only_empty", {"relation": "r", "sources": [{}]})]
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "graph.kgb")
+        with GraphFileWriter(path, chunk_size=1) as writer:
+            for node, attrs in nodes:
+                writer.add_node(node, attrs)
+            for source, target, attrs in edges:
+                writer.add_edge(source, target, attrs)
+
+        for chunk_size in (1, 4):
+            reader = GraphFileReader(path, chunk_size=chunk_size)
+            assert list(reader.iter_nodes()) == nodes
+            assert list(reader.iter_edges()) == edges
+
+
 def test_load_from_nonexistent_file():
     """Test loading from a non-existent file raises the correct exception."""
     # Choose a file path that definitely doesn't exist
@@ -368,3 +467,198 @@ def test_random_walk():
 
     # Walks should be identical with the same seed
     assert walk1 == walk2
+
+
+def _add_triplets_one_by_one(kg, triplets):
+    """Reference implementation: the original per-triplet ingestion loop."""
+    for triplet in triplets:
+        if not kg.has_node(triplet.node_1):
+            kg.add_node(triplet.node_1, sources=[])
+        if not kg.has_node(triplet.node_2):
+            kg.add_node(triplet.node_2, sources=[])
+
+        source_metadata = {"relation": triplet.edge, "triplet_id": id(triplet)}
+        if triplet.metadata:
+            source_metadata.update(triplet.metadata)
+
+        node1_attrs = kg.get_node_attrs(triplet.node_1)
+        node1_attrs["sources"].append(source_metadata.copy())
+        kg.add_node(triplet.node_1, **node1_attrs)
+
+        node2_attrs = kg.get_node_attrs(triplet.node_2)
+        node2_attrs["sources"].append(source_metadata.copy())
+        kg.add_node(triplet.node_2, **node2_attrs)
+
+        if kg.has_edge(triplet.node_1, triplet.node_2):
+            edge_data = kg.get_edge_attrs(triplet.node_1, triplet.node_2)
+            edge_data["sources"].append(source_metadata)
+            kg.add_edge(triplet.node_1, triplet.node_2, **edge_data)
+        else:
+            edge_data = {"relation": triplet.edge, "sources": [source_metadata]}
+            kg.add_edge(triplet.node_1, triplet.node_2, **edge_data)
+
+
+@pytest.mark.parametrize("batch_size", [None, 1, 3])
+def test_batched_ingestion_matches_per_triplet(
+    sample_triplets_with_duplicates, batch_size
+):
+    """Test that batched ingestion builds exactly the same graph as the original loop."""
+    triplets = sample_triplets_with_duplicates + [
+        Triplet(node_1="tau", edge="binds", node_2="microglia"),
+        Triplet(node_1="tau", edge="binds", node_2="tau"),
+        Triplet(node_1="microglia", edge="activates", node_2="activation"),
+    ]
+
+    expected = KnowledgeGraph()
+    _add_triplets_one_by_one(expected, triplets[:3])
+    _add_triplets_one_by_one(expected, triplets[3:])
+
+    kg = KnowledgeGraph()
+    kg.add_triplets(triplets[:3], batch_size=batch_size)
+    kg.add_triplets(triplets[3:], batch_size=batch_size)
+
+    assert list(kg.graph.graph.nodes(data=True)) == list(
+        expected.graph.graph.nodes(data=True)
+    )
+    assert list(kg.graph.graph.edges(data=True)) == list(
+        expected.graph.graph.edges(data=True)
+    )
+
+
+def test_relaxed_gc_only_during_flush(sample_triplets_with_duplicates):
+    """Test that ingestion keeps the collector enabled and restores its threshold."""
+    thresholds = gc.get_threshold()
+    kg = KnowledgeGraph()
+    seen = []
+    original = kg._backend.add_nodes
+
+    def add_nodes(nodes):
+        seen.append((gc.isenabled(), gc.get_threshold()[0]))
+        original(nodes)
+
+    kg._backend.add_nodes = add_nodes
+    ingestor = TripletIngestor(kg._backend)
+    ingestor.add(sample_triplets_with_duplicates)
+    ingestor.flush()
+    kg.add_triplets(sample_triplets_with_duplicates, batch_size=2, relax_gc=True)
+
+    assert seen[0] == (True, thresholds[0])
+    assert all(enabled and threshold >= 100_000 for enabled, threshold in seen[1:])
+    assert gc.isenabled() and gc.get_threshold() == thresholds
+
+
+@pytest.mark.parametrize("backend", ["networkx", "csr", "readonly"])
+def test_iter_triplets_filters(sample_triplets_with_duplicates, backend, tmp_path):
+    """Test that filtered triplet iteration matches filtering all triplets."""
+    kg = KnowledgeGraph(backend="csr" if backend == "csr" else "networkx")
+    kg.add_triplets(sample_triplets_with_duplicates)
+    kg.add_edge("neurons", "microglia", relation="activates", sources=[])
+    if backend == "readonly":
+        kg.save_to_file(str(tmp_path / "graph.kgb"))
+        kg = KnowledgeGraph.open_readonly(str(tmp_path / "graph.kgb"))
+
+    def key(triplet):
+        return triplet.node_1, triplet.edge, triplet.node_2, str(triplet.metadata)
+
+    everything = kg.triplets
+    assert len(everything) == 5
+    assert sorted(map(key, kg.iter_triplets())) == sorted(map(key, everything))
+
+    undergoes = list(kg.iter_triplets(relation="undergoes"))
+    assert sorted(map(key, undergoes)) == sorted(
+        key(t) for t in everything if t.edge == "undergoes"
+    )
+    around = list(kg.iter_triplets(nodes=["microglia", "neurons", "missing"]))
+    assert sorted(map(key, around)) == sorted(
+        key(t) for t in everything if {t.node_1, t.node_2} & {"microglia", "neurons"}
+    )
+    assert list(kg.iter_triplets(relation="forms", nodes=["tau"])) == []
+
+    confident = kg.iter_triplets(
+        predicate=lambda n1, edge, n2, metadata: metadata.get("confidence", 0) > 0.85,
+        as_tuples=True,
+    )
+    assert list(confident) == [
+        (
+            "microglia",
+            "undergoes",
+            "activation",
+            {"chunk_id": "chunk_1", "confidence": 0.9},
+        )
+    ]
+
+
+def test_triplets_to_csv_from_iterator(sample_triplets_with_duplicates, tmp_path):
+    """Test writing streamed triplets and tuples to CSV."""
+    kg = KnowledgeGraph.from_triplets(sample_triplets_with_duplicates)
+    path = tmp_path / "triplets.csv"
+
+    Triplets.write_csv(path, kg.iter_triplets(relation="undergoes", as_tuples=True))
+    rows = pd.read_csv(path)
+    assert list(rows["node_1"]) == ["microglia", "microglia"]
+    assert list(rows["edge"]) == ["undergoes", "undergoes"]
+
+    triplets = Triplets(sample_triplets_with_duplicates, {}, {})
+    triplets.to_csv(path, triplets=kg.iter_triplets(nodes=["tau"]))
+    assert list(pd.read_csv(path)["node_2"]) == ["neurons"]
+
+
+class _FakeItem:
+    """A dataset item returning fixed triplets after a random delay."""
+
+    def __init__(self, item_id, triplets, delay, fail=False):
+        self.id = item_id
+        self._triplets = triplets
+        self._delay = delay
+        self._fail = fail
+
+    def get_triplets(self):
+        time.sleep(self._delay)
+        if self._fail:
+            raise FileNotFoundError(f"No triplets for {self.id}")
+        return SimpleNamespace(triplets=self._triplets)
+
+
+@pytest.fixture
+def fake_dataset():
+    """Build a dataset of items that finish loading out of order."""
+    rng = random.Random(0)
+    items = []
+    for i in range(12):
+        triplets = [
+            Triplet(
+                node_1=f"n{rng.randrange(8)}",
+                edge=rng.choice(["binds", "inhibits"]),
+                node_2=f"n{rng.randrange(8)}",
+                metadata={"chunk_id": f"item_{i}_{j}"},
+            )
+            for j in range(5)
+        ]
+        items.append(_FakeItem(f"item_{i}", triplets, rng.random() * 0.01, i == 5))
+    return SimpleNamespace(items=items)
+
+
+@pytest.mark.parametrize("workers", [None, 1, 4])
+def test_from_dataset_workers(fake_dataset, workers):
+    """Test that parallel loading builds the same graph in dataset order."""
+    expected = KnowledgeGraph()
+    for item in fake_dataset.items[:10]:
+        if item.id != "item_5":
+            expected.add_triplets(item.get_triplets().triplets)
+
+    results = []
+    kg = KnowledgeGraph.from_dataset(
+        fake_dataset, max_items=10, workers=workers, prefetch=3, on_item=results.append
+    )
+
+    assert list(kg.graph.iter_nodes()) == list(expected.graph.iter_nodes())
+    assert list(kg.graph.iter_edges()) == list(expected.graph.iter_edges())
+    assert [result.item_id for result in results] == [f"item_{i}" for i in range(10)]
+    assert [result.num_triplets for result in results] == [5] * 5 + [0] + [5] * 4
+    assert isinstance(results[5].error, FileNotFoundError)
+    assert all(result.load_seconds > 0 for result in results)
+
+    with pytest.raises(FileNotFoundError):
+        KnowledgeGraph.from_dataset(fake_dataset, skip_errors=False, workers=workers)
+    with pytest.raises(ValueError):
+        KnowledgeGraph.from_dataset(fake_dataset, workers=0)
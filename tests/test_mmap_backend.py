@@ -0,0 +1,110 @@
+import os
+import random
+import tempfile
+
+import networkx as nx
+import pytest
+
+from ard.data.triplets import Triplet
+from ard.knowledge_graph import KnowledgeGraph
+from ard.storage.graph import MmapGraphBackend
+
+
+@pytest.fixture
+def graph_files():
+    """Save a random knowledge graph in the binary format."""
+    rng = random.Random(0)
+    names = [f"node_{i}" for i in range(40)] + ["ünïcode", "Zeta", ""]
+    triplets = [
+        Triplet(
+            node_1=rng.choice(names),
+            edge=rng.choice(["binds", "inhibits", "activates"]),
+            node_2=rng.choice(names),
+            metadata={"chunk_id": f"chunk_{i}", "confidence": rng.random()},
+        )
+        for i in range(150)
+    ]
+    kg = KnowledgeGraph.from_triplets(triplets)
+    kg.add_node("isolated", label="no sources")
+    kg.config = {"custom_setting": "test_value"}
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "graph.kgb")
+        kg.save_to_file(path)
+        yield kg, path
+
+
+def test_open_readonly_matches_networkx(graph_files):
+    """Test that every read operation matches the NetworkX backend."""
+    kg, path = graph_files
+    readonly = KnowledgeGraph.open_readonly(path)
+
+    assert isinstance(readonly.graph, MmapGraphBackend)
+    assert readonly.config == kg.config
+    assert len(readonly.graph) == len(kg.graph)
+    assert readonly.number_of_edges() == kg.number_of_edges()
+    assert readonly.get_nodes() == kg.get_nodes()
+    assert readonly.get_edges_data() == kg.get_edges_data()
+    assert not readonly.has_node("missing")
+    assert not readonly.has_edge("missing", "node_1")
+
+    for node in kg.get_nodes():
+        assert readonly.has_node(node)
+        assert readonly.get_node_attrs(node) == kg.get_node_attrs(node)
+        assert readonly.get_successors(node) == kg.get_successors(node)
+        assert readonly.get_out_edges(node) == kg.get_out_edges(node)
+        # Incoming edges are ordered by source rather than by insertion
+        assert sorted(readonly.get_predecessors(node)) == sorted(
+            kg.get_predecessors(node)
+        )
+        assert sorted(readonly.get_in_edges(node), key=str) == sorted(
+            kg.get_in_edges(node), key=str
+        )
+
+    for source, target, attrs in kg.get_edges_data():
+        assert readonly.has_edge(source, target)
+        assert readonly.get_edge_attrs(source, target) == attrs
+
+
+@pytest.mark.parametrize("directed", [True, False])
+def test_shortest_path_length_matches_networkx(graph_files, directed):
+    """Test that shortest paths are valid and as short as NetworkX's."""
+    kg, path = graph_files
+    backend = MmapGraphBackend(path)
+    nodes = sorted(kg.get_nodes())
+
+    for source in nodes[:10]:
+        for target in nodes:
+            try:
+                expected = kg.graph.shortest_path(source, target, directed=directed)
+            except nx.NetworkXNoPath:
+                with pytest.raises(nx.NetworkXNoPath):
+                    backend.shortest_path(source, target, directed=directed)
+                continue
+
+            found = backend.shortest_path(source, target, directed=directed)
+            assert len(found) == len(expected)
+            assert found[0] == source and found[-1] == target
+            for u, v in zip(found, found[1:]):
+                assert backend.has_edge(u, v) or (
+                    not directed and backend.has_edge(v, u)
+                )
+
+    with pytest.raises(nx.NodeNotFound):
+        backend.shortest_path("missing", nodes[0])
+
+
+def test_open_readonly_rejects_writes_and_json(graph_files):
+    """Test that the read-only graph rejects writes and non-binary files."""
+    kg, path = graph_files
+    readonly = KnowledgeGraph.open_readonly(path)
+
+    with pytest.raises(NotImplementedError):
+        readonly.add_node("new")
+    with pytest.raises(NotImplementedError):
+        readonly.remove_node("node_1")
+
+    json_path = os.path.join(os.path.dirname(path), "graph.json")
+    kg.save_to_file(json_path)
+    with pytest.raises(ValueError, match="binary"):
+        KnowledgeGraph.open_readonly(json_path)
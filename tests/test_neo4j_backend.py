@@ -0,0 +1,453 @@
+import threading
+
+import pytest
+
+from ard.storage.graph import Neo4jBackend
+from ard.storage.graph import neo4j as neo4j_module
+
+
+class FakeResult:
+    """A query result returning fixed records."""
+
+    def __init__(self, records):
+        self._records = records
+
+    def __iter__(self):
+        return iter(self._records)
+
+    def single(self):
+        return self._records[0] if self._records else None
+
+    def consume(self):
+        return None
+
+
+class FakeSession:
+    """A session recording every query it runs."""
+
+    def __init__(self, driver):
+        self._driver = driver
+        self.closed = False
+
+    def run(self, query, parameters=None, **kwargs):
+        return self._driver.record(self, query, {**(parameters or {}), **kwargs})
+
+    def execute_write(self, work, *args):
+        self._driver.transactions += 1
+        return work(self, *args)
+
+    def close(self):
+        self.closed = True
+
+
+class FakeDriver:
+    """A driver recording the queries of all sessions, with canned results."""
+
+    def __init__(self):
+        self.queries = []
+        self.sessions = []
+        self.transactions = 0
+        self.results = {}
+        self._lock = threading.Lock()
+
+    def session(self, database=None):
+        session = FakeSession(self)
+        with self._lock:
+            self.sessions.append(session)
+        return session
+
+    def record(self, session, query, params):
+        with self._lock:
+            self.queries.append((" ".join(query.split()), params))
+        for key, records in self.results.items():
+            if key in query:
+                return FakeResult(records)
+        return FakeResult([{"count": 0}])
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def driver(monkeypatch):
+    """Make Neo4jBackend connect to a fake driver."""
+    fake = FakeDriver()
+    monkeypatch.setattr(
+        neo4j_module.GraphDatabase, "driver", lambda uri, auth=None: fake
+    )
+    return fake
+
+
+def test_bulk_writes_are_batched(driver):
+    """Test that nodes and edges are written with UNWIND in batches."""
+    backend = Neo4jBackend(batch_size=2)
+    driver.queries.clear()
+
+    backend.add_nodes(
+        [
+            ("a", {"sources": ["s1"]}),
+            ("b", {"label": None}),
+            ("c", {}),
+            ("a", {"label": "A"}),
+        ]
+    )
+    backend.add_edges(
+        [("a", "b", {"relation": "binds"}), ("b", "c", {"relation": "inhibits"})]
+    )
+
+    assert all("UNWIND $rows AS row" in query for query, _ in driver.queries)
+    node_rows = [params["rows"] for query, params in driver.queries[:2]]
+    assert node_rows == [
+        [{"name": "a", "sources": ["s1"], "label": "A"}, {"name": "b"}],
+        [{"name": "c"}],
+    ]
+    edge_query, edge_params = driver.queries[2]
+    assert "MERGE (source)-[r:`RELATES_TO`]->(target)" in edge_query
+    assert [row["props"] for row in edge_params["rows"]] == [
+        {"relation": "binds"},
+        {"relation": "inhibits"},
+    ]
+    assert driver.transactions == 3
+    # Every query ran on the one session of this thread
+    assert len(driver.sessions) == 1
+
+
+def test_single_writes_and_reads_reuse_the_session(driver):
+    """Test that add_node, add_edge and reads go through one session."""
+    backend = Neo4jBackend()
+    driver.queries.clear()
+    backend.add_node("a", label="A")
+    backend.add_edge("a", "a", relation="self")
+    backend.has_node("a")
+    backend.number_of_edges()
+
+    assert len(driver.sessions) == 1
+    assert len(driver.queries) == 4
+    assert driver.queries[0][1]["rows"] == [{"name": "a", "label": "A"}]
+
+    backend._close()
+    assert driver.sessions[0].closed
+
+
+def test_parallel_writers(driver):
+    """Test that batches are spread over writer threads with their own session."""
+    backend = Neo4jBackend(batch_size=10, writers=4)
+    driver.queries.clear()
+    backend.add_nodes((f"n{i}", {"index": i}) for i in range(95))
+
+    rows = [row for _, params in driver.queries for row in params["rows"]]
+    assert sorted(row["index"] for row in rows) == list(range(95))
+    assert driver.transactions == 10
+    assert 1 < len(driver.sessions) <= 5
+
+    # Later calls reuse the writer threads and their sessions
+    for i in range(20):
+        backend.add_nodes((f"m{i}-{j}", {}) for j in range(40))
+    assert len(driver.sessions) <= 5
+    backend._close()
+    assert all(session.closed for session in driver.sessions)
+
+    with pytest.raises(ValueError):
+        Neo4jBackend(batch_size=0)
+
+
+def test_from_serializable_writes_in_bulk(driver):
+    """Test that loading a serialized graph takes one query per batch."""
+    data = {
+        "nodes": [{"id": f"n{i}", "attributes": {"sources": []}} for i in range(5)],
+        "edges": [
+            {"source": f"n{i}", "target": f"n{i + 1}", "attributes": {}}
+            for i in range(4)
+        ],
+    }
+    Neo4jBackend.from_serializable(data, batch_size=3)
+    # The constraint, then two batches of nodes and two of edges
+    assert len(driver.queries) == 5
+
+
+def test_ingestion_reads_and_writes_in_bulk(driver):
+    """Test that adding triplets takes a few queries per batch, not per triplet."""
+    from ard.data.triplets import Triplet
+    from ard.knowledge_graph import KnowledgeGraph
+
+    driver.results["UNWIND $rows AS name"] = [
+        {"name": "a", "props": {"name": "a", "sources": ["old"]}}
+    ]
+    driver.results["row[0]"] = []
+    kg = KnowledgeGraph(
+        backend="neo4j", uri="bolt://fake", user="u", password="p", batch_size=100
+    )
+    driver.queries.clear()
+
+    kg.add_triplets(
+        [
+            Triplet(node_1="a", edge="binds", node_2=f"n{i}", metadata={"i": i})
+            for i in range(50)
+        ]
+    )
+
+    # One lookup and one write for the nodes, then for the edges
+    assert len(driver.queries) == 4
+    node_rows = driver.queries[1][1]["rows"]
+    assert node_rows[0]["name"] == "a"
+    assert node_rows[0]["sources"][0] == "old"
+    assert len(node_rows[0]["sources"]) == 51
+    assert len(driver.queries[3][1]["rows"]) == 50
+
+
+def test_labels_and_constraint(driver):
+    """Test that every query matches nodes and edges by label and type."""
+    backend = Neo4jBackend(node_label="Concept", relationship_type="LINKS")
+    constraint, _ = driver.queries[0]
+    assert constraint == (
+        "CREATE CONSTRAINT `Concept_name_unique` IF NOT EXISTS "
+        "FOR (n:`Concept`) REQUIRE n.name IS UNIQUE"
+    )
+
+    driver.queries.clear()
+    driver.results.update({"count(": [{"count": 0}], "": []})
+    backend.add_nodes([("a", {})])
+    backend.add_edges([("a", "a", {})])
+    backend.has_node("a")
+    backend.get_node_attrs("a")
+    backend.get_successors("a")
+    backend.get_out_edges("a")
+    backend.get_nodes_attrs(["a"])
+    backend.number_of_edges()
+    backend.shortest_path("a", "a")
+    backend.remove_node("a")
+    for query, _ in driver.queries:
+        assert "MATCH (n)" not in query and "MATCH (source)" not in query
+        assert "[r]" not in query and "[]" not in query and "[*]" not in query
+        assert "`Concept`" in query or "`LINKS`" in query
+
+    with pytest.raises(ValueError):
+        Neo4jBackend(node_label="")
+
+
+def test_remove_node_commits(driver, monkeypatch):
+    """Test that the delete is consumed, since the session stays open."""
+    consumed = []
+    monkeypatch.setattr(FakeResult, "consume", lambda self: consumed.append(self))
+    backend = Neo4jBackend()
+    consumed.clear()
+    backend.remove_node("a")
+    assert len(consumed) == 1
+
+
+class FakeUnlabeledGraph:
+    """A graph written without labels, answering the migration queries."""
+
+    def __init__(self):
+        self.nodes = {}
+        self.relationships = []
+
+    def add_node(self, node_id, name, labels=(), **props):
+        self.nodes[node_id] = {"labels": set(labels), "props": {"name": name, **props}}
+
+    def add_relationship(self, source, target, type, **props):
+        self.relationships.append([source, target, type, props])
+
+    def names(self, labelled):
+        return [
+            node["props"]["name"]
+            for node in self.nodes.values()
+            if bool(node["labels"]) is labelled
+        ]
+
+    def retype(self, relationship):
+        relationship[3]["relation"] = relationship[3].get("relation", relationship[2])
+        relationship[2] = "RELATES_TO"
+
+    def merge(self, limit):
+        groups = {}
+        for node_id, node in self.nodes.items():
+            if not node["labels"]:
+                groups.setdefault(node["props"]["name"], []).append(node_id)
+        for node_id, node in self.nodes.items():
+            if node["labels"] and node["props"]["name"] in groups:
+                groups[node["props"]["name"]].insert(0, node_id)
+        merged = 0
+        for keep, *duplicates in [ids for ids in groups.values() if len(ids) > 1][
+            :limit
+        ]:
+            props = self.nodes[keep]["props"]
+            sources = list(props.get("sources", []))
+            for duplicate in duplicates:
+                duplicate_props = self.nodes.pop(duplicate)["props"]
+                for source in duplicate_props.get("sources", []):
+                    if source not in sources:
+                        sources.append(source)
+                for key, value in duplicate_props.items():
+                    props.setdefault(key, value)
+                for relationship in self.relationships:
+                    if duplicate in relationship[:2]:
+                        relationship[:2] = [
+                            keep if end == duplicate else end
+                            for end in relationship[:2]
+                        ]
+                        self.retype(relationship)
+                merged += 1
+            props["sources"] = sources
+        return merged
+
+    def label(self, limit):
+        unlabeled = [node for node in self.nodes.values() if not node["labels"]]
+        for node in unlabeled[:limit]:
+            if node["props"]["name"] in self.names(labelled=True):
+                raise RuntimeError("ConstraintValidationFailed")
+            node["labels"].add("Entity")
+        return len(unlabeled[:limit])
+
+    def retype_all(self, limit):
+        relationships = [
+            relationship
+            for relationship in self.relationships
+            if relationship[2] != "RELATES_TO"
+            and all(self.nodes[end]["labels"] for end in relationship[:2])
+        ]
+        for relationship in relationships[:limit]:
+            self.retype(relationship)
+        return len(relationships[:limit])
+
+
+def test_migrate_unlabeled(driver):
+    """Test that migration merges nodes of the same name before labelling them."""
+    graph = FakeUnlabeledGraph()
+    graph.add_node(1, "a", sources=["s1"])
+    graph.add_node(2, "a", sources=["s2", "s1"], label="A")
+    graph.add_node(3, "a", sources=["s3"])
+    graph.add_node(4, "b", sources=[])
+    graph.add_node(5, "c", labels=["Entity"], sources=["s4"])
+    graph.add_node(6, "c", sources=["s5"])
+    graph.add_node(7, "d", sources=[])
+    graph.add_relationship(2, 4, "BINDS")
+    graph.add_relationship(4, 3, "INHIBITS", relation="blocks")
+    graph.add_relationship(6, 4, "LINKS")
+    graph.add_relationship(4, 7, "LINKS")
+
+    def run(query):
+        if "collect(n) AS unlabeled" in query:
+            return graph.merge
+        if "SET n:" in query:
+            return graph.label
+        return graph.retype_all
+
+    backend = Neo4jBackend(batch_size=2)
+    driver.queries.clear()
+    driver.record = lambda session, query, params: (
+        driver.queries.append((" ".join(query.split()), params))
+        or FakeResult([{"count": run(query)(params["limit"])}])
+    )
+
+    assert backend.migrate_unlabeled() == (3, 1)
+    # Two batches of each step but the last, until a batch is not full
+    assert [params["limit"] for _, params in driver.queries] == [2] * 5
+    assert "DETACH DELETE duplicate" in driver.queries[0][0]
+    assert "SET n:`Entity`" in driver.queries[2][0]
+    assert "CREATE (source)-[copy:`RELATES_TO`]->(target)" in driver.queries[4][0]
+
+    assert sorted(graph.names(labelled=True)) == ["a", "b", "c", "d"]
+    assert graph.names(labelled=False) == []
+    assert graph.nodes[1]["props"] == {
+        "name": "a",
+        "sources": ["s1", "s2", "s3"],
+        "label": "A",
+    }
+    assert graph.nodes[5]["props"]["sources"] == ["s4", "s5"]
+    assert sorted(
+        (source, target, type, props["relation"])
+        for source, target, type, props in graph.relationships
+    ) == [
+        (1, 4, "RELATES_TO", "BINDS"),
+        (4, 1, "RELATES_TO", "blocks"),
+        (4, 7, "RELATES_TO", "LINKS"),
+        (5, 4, "RELATES_TO", "LINKS"),
+    ]
+    # Nothing is left to migrate
+    assert backend.migrate_unlabeled() == (0, 0)
+
+
+def test_subgraph_queries(driver):
+    """Test that subgraphs take a single query and neighborhoods one per hop."""
+    backend = Neo4jBackend()
+    driver.queries.clear()
+    driver.results["OPTIONAL MATCH"] = [
+        {
+            "name": "a",
+            "props": {"name": "a", "sources": []},
+            "edges": [["b", {"relation": "binds", "sources": []}]],
+        },
+        {"name": "b", "props": {"name": "b", "sources": []}, "edges": []},
+    ]
+    driver.results["RETURN DISTINCT m.name"] = [
+        {"name": "d"},
+        {"name": "c"},
+        {"name": "a"},
+    ]
+
+    nodes, edges = backend.induced_subgraph(["a", "b", "a"])
+    assert nodes == [
+        ("a", {"name": "a", "sources": []}),
+        ("b", {"name": "b", "sources": []}),
+    ]
+    assert edges == [("a", "b", {"relation": "binds", "sources": []})]
+    assert driver.queries[0][1] == {"nodes": ["a", "b"]}
+
+    # One query per hop, each expanding the nodes first reached by the last
+    assert backend.neighborhood(["a"], hops=3, limit=5) == ["c", "d"]
+    assert [params for _, params in driver.queries[1:]] == [
+        {"nodes": ["a"]},
+        {"nodes": ["c", "d"]},
+    ]
+    assert "*" not in driver.queries[1][0]
+    assert backend.neighborhood(["a"], hops=3, limit=1) == ["c"]
+    assert len(driver.queries) == 4
+
+
+def test_export_pages_by_name(driver, tmp_path):
+    """Test that nodes and edges are exported in keyset pages by node name."""
+    from ard.knowledge_graph import KnowledgeGraph
+
+    names = sorted(f"n{i:02d}" for i in range(25))
+    edges = {
+        name: [[names[(i + 1) % 25], {"relation": "next"}]]
+        for i, name in enumerate(names)
+    }
+
+    def record(session, query, params):
+        query = " ".join(query.split())
+        driver.queries.append((query, params))
+        after, limit = params.get("after"), params.get("limit")
+        page = [name for name in names if after is None or name > after][:limit]
+        if "properties(n) AS props ORDER BY" in query:
+            return FakeResult(
+                [
+                    {"name": name, "props": {"name": name, "sources": []}}
+                    for name in page
+                ]
+            )
+        if "AS edges ORDER BY source" in query:
+            return FakeResult([{"source": name, "edges": edges[name]} for name in page])
+        return FakeResult([{"count": len(names)}])
+
+    driver.record = record
+    kg = KnowledgeGraph(
+        backend="neo4j", uri="bolt://fake", user="u", password="p", page_size=10
+    )
+    driver.queries.clear()
+
+    assert [node for node, _ in kg.graph.iter_nodes()] == names
+    assert [params["after"] for _, params in driver.queries] == [None, "n09", "n19"]
+    assert "n.name > $after" in driver.queries[1][0]
+
+    path = tmp_path / "graph.kgb"
+    kg.save_to_file(str(path))
+    loaded = KnowledgeGraph.load_from_file(str(path))
+    assert loaded.get_nodes() == set(names)
+    assert loaded.number_of_edges() == 25
+    assert loaded.get_edge_attrs("n24", "n00")["relation"] == "next"
+
+    data = kg.graph.to_serializable()
+    assert [node["id"] for node in data["nodes"]] == names
+    assert len(data["edges"]) == 25
@@ -0,0 +1,155 @@
+import os
+import random
+import tempfile
+from collections import Counter
+
+import pytest
+
+from ard.knowledge_graph import KnowledgeGraph
+from ard.knowledge_graph.sampling import NodeSampler
+from ard.utils.indexed_set import IndexedSet
+
+
+@pytest.fixture
+def two_components():
+    """Build a graph with a star, a separate edge and an isolated node."""
+    kg = KnowledgeGraph()
+    for leaf in ["b", "c", "d", "e"]:
+        kg.add_edge("a", leaf, relation="links", sources=[])
+    kg.add_edge("x", "y", relation="links", sources=[])
+    kg.add_node("lonely", sources=[])
+    return kg
+
+
+def test_indexed_set():
+    """Test that the indexed set behaves like a set under random updates."""
+    rng = random.Random(0)
+    indexed = IndexedSet()
+    reference = set()
+    for _ in range(2000):
+        item = rng.randrange(100)
+        if rng.random() < 0.5:
+            indexed.add(item)
+            reference.add(item)
+        else:
+            indexed.discard(item)
+            reference.discard(item)
+        assert len(indexed) == len(reference)
+        assert set(indexed) == reference
+        assert all(item in indexed for item in reference)
+
+    assert set(indexed.sample(500, rng)) <= reference
+    assert IndexedSet().sample(3) == []
+    with pytest.raises(IndexError):
+        IndexedSet().choice()
+
+
+@pytest.mark.parametrize("backend", ["networkx", "csr"])
+def test_sample_nodes_follows_updates(backend):
+    """Test that sampled nodes track insertions and removals."""
+    kg = KnowledgeGraph(backend=backend)
+    assert kg.get_random_node() is None
+
+    rng = random.Random(1)
+    nodes = set()
+    for i in range(300):
+        kg.add_edge(f"n{i}", f"n{i + 1}", relation="next", sources=[])
+        nodes.update([f"n{i}", f"n{i + 1}"])
+    kg.graph.add_nodes([("bulk", {"sources": []})])
+    nodes.add("bulk")
+    assert set(kg.graph.sample_nodes(20_000, rng)) == nodes
+
+    # Removes two thirds of the nodes, which compacts the CSR ids
+    for i in range(301):
+        if i % 3:
+            kg.remove_node(f"n{i}")
+            nodes.discard(f"n{i}")
+    sample = kg.graph.sample_nodes(20_000, rng)
+    assert set(sample) == nodes
+    # Uniform: every node gets roughly its share of the sample
+    assert min(Counter(sample).values()) > 20_000 / len(nodes) / 2
+
+
+def test_sample_nodes_readonly(two_components):
+    """Test uniform sampling on a memory-mapped graph."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "graph.kgb")
+        two_components.save_to_file(path)
+        readonly = KnowledgeGraph.open_readonly(path)
+        sample = readonly.graph.sample_nodes(1000, random.Random(0))
+        assert set(sample) == two_components.get_nodes()
+        assert readonly.get_random_node() in two_components.get_nodes()
+
+
+def test_node_sampler_weighting_and_components(two_components):
+    """Test degree-weighted and component-restricted sampling."""
+    backend = two_components.graph
+
+    degree = NodeSampler(backend, weighting="degree", seed=0).sample_nodes(8000)
+    counts = Counter(degree)
+    assert "lonely" not in counts
+    # "a" has degree 4 and every other node degree 1, out of a total of 10
+    assert 0.35 < counts["a"] / len(degree) < 0.45
+
+    largest = NodeSampler(backend, component="largest", seed=0).sample_nodes(500)
+    assert set(largest) == {"a", "b", "c", "d", "e"}
+    assert set(NodeSampler(backend, component="y").sample_nodes(50)) == {"x", "y"}
+
+    with pytest.raises(ValueError):
+        NodeSampler(backend, component="missing").sample_nodes(1)
+    with pytest.raises(ValueError):
+        NodeSampler(backend, weighting="pagerank")
+
+
+def test_sample_node_pairs(two_components):
+    """Test that reachable pairs stay within a connected component."""
+    components = [{"a", "b", "c", "d", "e"}, {"x", "y"}]
+
+    pairs = two_components.sample_node_pairs(2000, seed=0)
+    assert len(pairs) == 2000
+    for start, end in pairs:
+        assert start != end
+        assert any({start, end} <= component for component in components)
+    assert {start for start, _ in pairs} == set().union(*components)
+    assert pairs == two_components.sample_node_pairs(2000, seed=0)
+
+    unrestricted = two_components.sample_node_pairs(2000, reachable=False, seed=0)
+    assert all(start != end for start, end in unrestricted)
+    assert any(
+        not any({start, end} <= component for component in components)
+        for start, end in unrestricted
+    )
+
+    isolated = KnowledgeGraph()
+    isolated.add_node("p")
+    isolated.add_node("q")
+    with pytest.raises(ValueError):
+        isolated.sample_node_pairs(1)
+    assert len(isolated.sample_node_pairs(5, reachable=False)) == 5
+
+
+def test_sample_node_pairs_reuses_components(two_components, monkeypatch):
+    """Test that components are computed once until the graph is modified."""
+    calls = []
+    original = NodeSampler._components
+
+    def components(self):
+        calls.append(self)
+        return original(self)
+
+    monkeypatch.setattr(NodeSampler, "_components", components)
+    first = two_components.sample_node_pairs(10, seed=1)
+    assert two_components.sample_node_pairs(10, seed=1) == first
+    two_components.sample_node_pairs(10, weighting="degree", seed=1)
+    assert len(calls) == 2
+
+    two_components.add_edge("y", "z", relation="links", sources=[])
+    pairs = two_components.sample_node_pairs(500, seed=1)
+    assert len(calls) == 3
+    assert "z" in {node for pair in pairs for node in pair}
+
+    # Writes made directly to the backend are noticed as well
+    two_components.graph.add_edges([("z", "w", {"relation": "links", "sources": []})])
+    pairs = two_components.sample_node_pairs(500, seed=1)
+    assert len(calls) == 4
+    assert "w" in {node for pair in pairs for node in pair}
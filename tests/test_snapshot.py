@@ -0,0 +1,129 @@
+import copy
+import random
+import threading
+
+import pytest
+
+from ard.data.triplets import Triplet
+from ard.knowledge_graph import KnowledgeGraph
+from ard.storage.graph import GraphSnapshot, NetworkXBackend, SnapshotBackend
+from ard.storage.graph import snapshot as snapshot_module
+
+
+def _random_triplets(n, num_nodes, seed=0):
+    rng = random.Random(seed)
+    return [
+        Triplet(
+            node_1=f"node_{rng.randrange(num_nodes)}",
+            edge=rng.choice(["binds", "inhibits", "activates"]),
+            node_2=f"node_{rng.randrange(num_nodes)}",
+            metadata={"chunk_id": f"chunk_{i}"},
+        )
+        for i in range(n)
+    ]
+
+
+def _edge_key(edge):
+    return edge[0], edge[1]
+
+
+def _assert_same_graph(backend, reference):
+    assert len(backend) == len(reference)
+    assert backend.number_of_edges() == reference.number_of_edges()
+    assert backend.get_statistics() == reference.get_statistics()
+    assert dict(backend.iter_nodes()) == dict(reference.iter_nodes())
+    assert sorted(backend.get_edges(), key=_edge_key) == sorted(
+        reference.get_edges(), key=_edge_key
+    )
+    for node in reference.get_nodes():
+        assert backend.has_node(node)
+        assert sorted(backend.get_successors(node)) == sorted(
+            reference.get_successors(node)
+        )
+        assert sorted(backend.get_predecessors(node)) == sorted(
+            reference.get_predecessors(node)
+        )
+        assert sorted(backend.get_in_edges(node), key=_edge_key) == sorted(
+            reference.get_in_edges(node), key=_edge_key
+        )
+        for source, target, attrs in reference.get_out_edges(node):
+            assert backend.has_edge(source, target)
+            assert backend.get_edge_attrs(source, target) == attrs
+
+
+def _copy(kg):
+    return NetworkXBackend.from_serializable(copy.deepcopy(kg.graph.to_serializable()))
+
+
+def test_snapshot_is_unaffected_by_writes():
+    """Test that a snapshot keeps the graph as it was through all kinds of writes."""
+    kg = KnowledgeGraph.from_triplets(_random_triplets(300, 40))
+    reference = _copy(kg)
+    snapshot = kg.snapshot()
+    assert isinstance(snapshot.graph, GraphSnapshot)
+    assert isinstance(kg.graph, SnapshotBackend)
+
+    # Ingestion extends the sources of existing nodes and edges in place
+    kg.add_triplets(_random_triplets(200, 60, seed=1))
+    kg.add_edge("node_1", "new", relation="binds")
+    kg.add_node("node_2", label="changed")
+    second = kg.snapshot()
+    second_reference = _copy(kg)
+    kg.remove_node("node_3")
+    kg.merge_nodes("node_4", "node_5", "node_4_5")
+    kg.graph.merge_nodes([(["node_6", "node_7", "missing"], "node_6")])
+
+    _assert_same_graph(snapshot.graph, reference)
+    _assert_same_graph(second.graph, second_reference)
+    assert not snapshot.has_node("new") and not snapshot.has_edge("node_1", "new")
+    with pytest.raises(KeyError):
+        snapshot.get_node_attrs("node_4_5")
+
+    path = snapshot.graph.shortest_path("node_0", "node_3", directed=False)
+    assert len(path) == len(reference.shortest_path("node_0", "node_3", False))
+    with pytest.raises(NotImplementedError):
+        snapshot.add_node("new")
+
+    snapshot.graph.close()
+    second.graph.close()
+    kg.add_node("after")
+    assert len(kg.graph._snapshots) == 0
+
+
+def test_merges_are_applied_in_batches(monkeypatch):
+    """Test that merging in batches gives the same graph as in one pass."""
+    monkeypatch.setattr(snapshot_module, "MERGE_BATCH_SIZE", 2)
+    groups = [([f"node_{i}", f"node_{i + 1}"], f"node_{i}") for i in range(0, 20, 3)]
+    groups.append((["node_0", "node_30"], "merged"))
+    kg = KnowledgeGraph.from_triplets(_random_triplets(300, 40))
+    reference = _copy(kg)
+    snapshot = kg.snapshot()
+
+    kg.graph.merge_nodes(groups)
+    reference.merge_nodes(groups)
+    _assert_same_graph(kg.graph, reference)
+    assert snapshot.number_of_nodes() == 40
+
+
+def test_snapshot_reads_while_writing():
+    """Test that readers in other threads always see the same graph."""
+    kg = KnowledgeGraph.from_triplets(_random_triplets(300, 40))
+    snapshot = kg.snapshot()
+    expected = sorted(snapshot.get_edges_data(), key=_edge_key)
+    results = []
+
+    def read():
+        for _ in range(5):
+            results.append(sorted(snapshot.get_edges_data(), key=_edge_key))
+
+    readers = [threading.Thread(target=read) for _ in range(4)]
+    for reader in readers:
+        reader.start()
+    for seed in range(10):
+        kg.add_triplets(_random_triplets(50, 60, seed=seed + 1), batch_size=10)
+        kg.merge_nodes(f"node_{seed}", f"node_{seed + 20}", f"merged_{seed}")
+    for reader in readers:
+        reader.join()
+
+    assert len(results) == 20
+    assert all(result == expected for result in results)
@@ -0,0 +1,184 @@
+import random
+
+import networkx as nx
+import pytest
+
+from ard.data.triplets import Triplet
+from ard.knowledge_graph import KnowledgeGraph
+from ard.storage.graph import SQLiteBackend
+
+
+def _random_triplets(n, num_nodes, seed=0):
+    rng = random.Random(seed)
+    return [
+        Triplet(
+            node_1=f"node_{rng.randrange(num_nodes)}",
+            edge=rng.choice(["binds", "inhibits", "activates"]),
+            node_2=f"node_{rng.randrange(num_nodes)}",
+            metadata={"chunk_id": f"chunk_{i}"},
+        )
+        for i in range(n)
+    ]
+
+
+def _edge_key(edge):
+    return edge[0], edge[1]
+
+
+def _assert_same_graph(backend, reference):
+    assert len(backend) == len(reference)
+    assert backend.number_of_edges() == reference.number_of_edges()
+    assert list(backend.iter_nodes()) == list(reference.iter_nodes())
+    # Edges are listed in insertion order rather than grouped by source
+    assert sorted(backend.get_edges(), key=_edge_key) == sorted(
+        reference.get_edges(), key=_edge_key
+    )
+    for node in reference.get_nodes():
+        assert backend.get_node_attrs(node) == reference.get_node_attrs(node)
+        assert backend.get_successors(node) == reference.get_successors(node)
+        assert backend.get_predecessors(node) == reference.get_predecessors(node)
+        assert sorted(backend.get_neighbors(node)) == sorted(
+            reference.get_neighbors(node)
+        )
+        assert backend.get_out_edges(node) == reference.get_out_edges(node)
+        assert backend.get_in_edges(node) == reference.get_in_edges(node)
+
+
+@pytest.fixture
+def graphs(tmp_path):
+    """Build the same knowledge graph in memory and in a SQLite file."""
+    triplets = _random_triplets(300, 40)
+    reference = KnowledgeGraph()
+    reference.add_triplets(triplets)
+    kg = KnowledgeGraph(backend="sqlite", path=str(tmp_path / "graph.db"))
+    kg.add_triplets(triplets)
+    return kg, reference
+
+
+def test_sqlite_backend_matches_networkx(graphs):
+    """Test that ingestion into the SQLite backend builds the same graph."""
+    kg, reference = graphs
+    assert isinstance(kg.graph, SQLiteBackend)
+    _assert_same_graph(kg.graph, reference.graph)
+
+    source, target, attrs = reference.get_edges_data()[0]
+    assert kg.has_edge(source, target)
+    assert kg.get_edge_attrs(source, target) == attrs
+    assert not kg.has_edge("node_0", "missing")
+    with pytest.raises(KeyError):
+        kg.get_node_attrs("missing")
+    assert str(kg) == str(reference)
+    assert sorted(kg.get_edges_by_relation("binds")) == sorted(
+        reference.get_edges_by_relation("binds")
+    )
+
+
+def test_sqlite_backend_updates_and_removals(graphs):
+    """Test writes interleaved with reads, including attribute replacements."""
+    kg, reference = graphs
+    rng = random.Random(1)
+
+    for step in range(200):
+        nodes = sorted(reference.get_nodes())
+        action = rng.random()
+        if action < 0.2 and nodes:
+            node = rng.choice(nodes)
+            kg.remove_node(node)
+            reference.remove_node(node)
+        elif action < 0.7:
+            source = f"node_{rng.randrange(60)}"
+            target = f"node_{rng.randrange(60)}"
+            attrs = {"relation": f"rel_{step % 3}", "sources": [{"step": step}]}
+            if step % 7 == 0:
+                attrs["weight"] = step
+            if step % 11 == 0:
+                attrs["relation"] = None
+            kg.add_edge(source, target, **attrs)
+            reference.add_edge(source, target, **attrs)
+        else:
+            node = f"node_{rng.randrange(60)}"
+            attrs = {"label": step}
+            if step % 5 == 0:
+                attrs["sources"] = "replaced" if step % 2 else [step, [step]]
+            kg.add_node(node, **attrs)
+            reference.add_node(node, **attrs)
+
+        if step % 25 == 0:
+            _assert_same_graph(kg.graph, reference.graph)
+
+    _assert_same_graph(kg.graph, reference.graph)
+    assert kg.get_statistics() == reference.get_statistics()
+
+
+def test_sqlite_backend_merge_nodes(graphs):
+    """Test that merging nodes gives the same result as on NetworkX."""
+    kg, reference = graphs
+    for graph in (kg, reference):
+        graph.merge_nodes("node_1", "node_2", "node_1_2")
+    _assert_same_graph(kg.graph, reference.graph)
+
+
+@pytest.mark.parametrize("directed", [True, False])
+def test_sqlite_shortest_path(graphs, directed):
+    """Test that shortest paths are as short as NetworkX's."""
+    kg, reference = graphs
+    nodes = sorted(reference.get_nodes())
+    for source, target in zip(nodes[:10], nodes[-10:]):
+        try:
+            expected = reference.graph.shortest_path(source, target, directed)
+        except nx.NetworkXNoPath:
+            with pytest.raises(nx.NetworkXNoPath):
+                kg.graph.shortest_path(source, target, directed)
+            continue
+        path = kg.graph.shortest_path(source, target, directed)
+        assert len(path) == len(expected)
+        assert path[0] == source and path[-1] == target
+
+    with pytest.raises(nx.NodeNotFound):
+        kg.graph.shortest_path("missing", nodes[0])
+
+
+def test_sqlite_file_is_shared_by_readers(graphs, tmp_path):
+    """Test that a saved file can be reopened, also read-only, by other backends."""
+    kg, reference = graphs
+    path = str(tmp_path / "graph.db")
+
+    reader = SQLiteBackend(path, readonly=True)
+    _assert_same_graph(reader, reference.graph)
+    with pytest.raises(Exception):
+        reader.add_node("new")
+
+    kg.add_node("new", label="written after the reader opened")
+    assert reader.has_node("new")
+    reader.close()
+
+    names, sources, targets = kg.graph.edge_arrays()
+    assert names == [node for node, _ in kg.graph.iter_nodes()]
+    assert sorted(zip(sources.tolist(), targets.tolist())) == sorted(
+        (names.index(s), names.index(t)) for s, t, _ in kg.get_edges_data()
+    )
+    sample = kg.graph.sample_nodes(20, random.Random(0))
+    assert len(sample) == 20 and set(sample) <= kg.get_nodes()
+
+    copy = SQLiteBackend.from_serializable(kg.graph.to_serializable())
+    _assert_same_graph(copy, kg.graph)
+
+    with pytest.raises(ValueError):
+        SQLiteBackend(batch_size=0)
+
+
+def test_sqlite_bulk_writes_are_batched(tmp_path):
+    """Test that bulk writes take one transaction per batch."""
+    backend = SQLiteBackend(str(tmp_path / "graph.db"), batch_size=10)
+    statements = []
+    backend._conn.set_trace_callback(statements.append)
+    backend.add_edges(
+        (f"n{i}", f"n{i + 1}", {"relation": "next", "sources": [{"i": i}]})
+        for i in range(25)
+    )
+    assert statements.count("BEGIN IMMEDIATE") == 3
+    assert backend.number_of_edges() == 25 and len(backend) == 26
+    assert backend.get_edge_attrs("n3", "n4") == {
+        "relation": "next",
+        "sources": [{"i": 3}],
+    }
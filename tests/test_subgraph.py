@@ -11,6 +11,7 @@ from langchain_core.prompts import PromptTemplate
 
 from ard.data.triplets import Triplet
 from ard.knowledge_graph import KnowledgeGraph
+from ard.storage.graph import GraphBackend
 from ard.subgraph.subgraph import Subgraph
 from ard.subgraph.subgraph_generator import (
     SingleNodeSubgraphGenerator,
@@ -1094,3 +1095,58 @@ def test_llm_walk_generator(sample_knowledge_graph):
         assert any(successor in neighbors_str for successor in successors)
     if predecessors:
         assert any(predecessor in neighbors_str for predecessor in predecessors)
+
+
+@pytest.mark.parametrize("backend", ["networkx", "csr", "default"])
+def test_induced_subgraph_and_neighborhood(backend):
+    """Test subgraph extraction and neighborhoods against a per-node scan."""
+    rng = random.Random(0)
+    kg = KnowledgeGraph(backend="csr" if backend == "csr" else "networkx")
+    for i in range(120):
+        kg.add_edge(
+            f"n{rng.randrange(40)}",
+            f"n{rng.randrange(40)}",
+            relation="r",
+            sources=[i],
+        )
+    graph = kg.graph
+    nodes = {f"n{i}" for i in range(0, 40, 3)} | {"missing"}
+
+    if backend == "default":
+        nodes_attrs, edges = GraphBackend.induced_subgraph(graph, nodes)
+        neighborhood = GraphBackend.neighborhood(graph, nodes, hops=2)
+    else:
+        nodes_attrs, edges = graph.induced_subgraph(nodes)
+        neighborhood = graph.neighborhood(nodes, hops=2)
+
+    present = nodes & graph.get_nodes()
+    assert dict(nodes_attrs) == {node: graph.get_node_attrs(node) for node in present}
+    assert sorted(edges) == sorted(
+        (source, target, graph.get_edge_attrs(source, target))
+        for source in present
+        for target in graph.get_successors(source)
+        if target in present
+    )
+
+    one_hop = {n for node in present for n in graph.get_neighbors(node)} - present
+    two_hops = {n for node in one_hop for n in graph.get_neighbors(node)} - present
+    assert len(neighborhood) == len(set(neighborhood))
+    assert set(neighborhood) == one_hop | two_hops
+    assert set(neighborhood[: len(one_hop)]) == one_hop
+    assert kg.get_neighborhood(nodes, hops=2, limit=3) == neighborhood[:3]
+    assert kg.get_neighborhood(nodes, hops=0) == []
+
+
+def test_subgraph_reads_nodes_and_edges_at_once(sample_knowledge_graph):
+    """Test that a subgraph is read with induced_subgraph, not per node."""
+    backend = sample_knowledge_graph.graph
+    with (
+        patch.object(backend, "get_node_attrs", side_effect=AssertionError),
+        patch.object(backend, "get_edge_attrs", side_effect=AssertionError),
+    ):
+        subgraph = Subgraph.from_two_nodes(
+            sample_knowledge_graph, "A", "D", ShortestPathGenerator()
+        )
+    for source, target, attrs in subgraph.get_edges_data():
+        assert attrs == backend.get_edge_attrs(source, target)
+    assert set(subgraph.get_nodes()) >= set(subgraph.path_nodes)
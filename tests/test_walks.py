@@ -0,0 +1,190 @@
+import os
+import random
+import tempfile
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from ard.knowledge_graph import KnowledgeGraph
+from ard.knowledge_graph.walks import WALK_ENGINE_MIN_WALKERS, WalkEngine
+from ard.subgraph.subgraph_generator.random_walk import (
+    RandomWalkGenerator,
+    SingleNodeRandomWalkGenerator,
+)
+
+
+def _random_graph(backend: str) -> KnowledgeGraph:
+    """Build a random graph with self-loops, reciprocal edges and a dead end."""
+    rng = random.Random(0)
+    kg = KnowledgeGraph(backend=backend)
+    for _ in range(300):
+        kg.add_edge(
+            f"n{rng.randrange(60)}", f"n{rng.randrange(60)}", relation="r", sources=[]
+        )
+    kg.add_node("lonely", sources=[])
+    kg.remove_node("n3")
+    return kg
+
+
+@pytest.fixture
+def star():
+    """Build a star around "hub" whose first leaf is connected to a tail."""
+    kg = KnowledgeGraph()
+    for leaf in ["a", "b", "c", "d"]:
+        kg.add_edge("hub", leaf, relation="links", sources=[])
+    for i in range(5):
+        kg.add_edge("a", f"tail{i}", relation="links", sources=[])
+    return kg
+
+
+@pytest.mark.parametrize("backend", ["networkx", "csr", "readonly"])
+def test_engine_matches_neighbors(backend):
+    """Test that the engine adjacency matches get_node_neighbors."""
+    kg = _random_graph("csr" if backend == "csr" else "networkx")
+    with tempfile.TemporaryDirectory() as temp_dir:
+        if backend == "readonly":
+            path = os.path.join(temp_dir, "graph.kgb")
+            kg.save_to_file(path)
+            kg = KnowledgeGraph.open_readonly(path)
+        engine = kg.get_walk_engine()
+
+        assert sorted(engine.names) == sorted(kg.get_nodes())
+        for i, node in enumerate(engine.names):
+            neighbors = engine.indices[engine.indptr[i] : engine.indptr[i + 1]]
+            assert sorted(engine.names[j] for j in neighbors) == sorted(
+                kg.get_node_neighbors(node)
+            )
+
+        starts = sorted(kg.get_nodes()) * 5
+        walks = kg.random_walks(starts, max_steps=8, seed=1)
+        for start, path in zip(starts, walks.paths()):
+            assert path[0] == start
+            for current, following in zip(path, path[1:]):
+                assert following in kg.get_node_neighbors(current)
+            assert len(path) == 9 or not kg.get_node_neighbors(path[-1])
+        assert walks.path(starts.index("lonely")) == ["lonely"]
+
+
+def test_walks_are_reproducible_per_walker(star):
+    """Test that a walk only depends on its own seed."""
+    engine = WalkEngine.from_backend(star.graph)
+    batch = engine.walk(["hub", "a", "tail0"], max_steps=6, seed=10)
+    single = engine.walk(["a"], max_steps=6, seed=[11])
+    assert batch.path(1) == single.path(0)
+    assert batch.paths() == engine.walk(["hub", "a", "tail0"], 6, seed=10).paths()
+
+    random.seed(5)
+    first = star.random_walks(["hub"] * 20, max_steps=6).paths()
+    random.seed(5)
+    assert star.random_walks(["hub"] * 20, max_steps=6).paths() == first
+
+
+def test_walks_stop_at_targets(star):
+    """Test early termination and padding of walks that reach their target."""
+    walks = star.random_walks(
+        ["hub"] * 200 + ["b"], max_steps=400, targets=["tail4"] * 200 + ["b"], seed=0
+    )
+    assert walks.reached.all()
+    assert walks.path(200) == ["b"]
+    for i, path in enumerate(walks.paths()[:200]):
+        assert path[-1] == "tail4" and "tail4" not in path[:-1]
+        assert (walks.nodes[i, len(path) :] == -1).all()
+    assert walks.lengths.max() > 3
+
+    no_target = star.random_walks(["hub"], max_steps=4, targets=[None], seed=0)
+    assert not no_target.reached[0] and len(no_target.path(0)) == 5
+
+
+def test_transition_weights(star):
+    """Test uniform, degree-biased and node2vec transitions."""
+    engine = star.get_walk_engine()
+    starts = ["hub"] * 20_000
+
+    uniform = Counter(path[1] for path in engine.walk(starts, 1, seed=0).paths())
+    assert set(uniform) == {"a", "b", "c", "d"}
+    assert 0.2 < uniform["a"] / len(starts) < 0.3
+
+    # "a" has degree 6 and the other leaves degree 1
+    biased = engine.walk(starts, 1, seed=0, degree_bias=1.0).paths()
+    assert 0.6 < Counter(path[1] for path in biased)["a"] / len(starts) < 0.7
+
+    # From "a" after "hub", stepping back is weighted 1/p and the tail 1/q
+    from_a = [path for path in engine.walk(starts, 2, seed=1).paths() if path[1] == "a"]
+    returns = np.mean([path[2] == "hub" for path in from_a])
+    assert 0.1 < returns < 0.25
+    outward = [
+        path
+        for path in engine.walk(starts, 2, seed=1, p=4.0, q=0.25).paths()
+        if path[1] == "a"
+    ]
+    assert np.mean([path[2] == "hub" for path in outward]) < 0.02
+
+
+def test_walk_engine_errors_and_cache(star):
+    """Test invalid arguments and rebuilding the engine after changes."""
+    with pytest.raises(ValueError):
+        star.random_walks(["missing"])
+    with pytest.raises(ValueError):
+        star.random_walks(["hub"], targets=["missing"])
+    with pytest.raises(ValueError):
+        star.random_walks(["hub"], p=0)
+    with pytest.raises(ValueError):
+        star.random_walks(["hub", "a"], seed=[1])
+
+    engine = star.get_walk_engine()
+    assert star.get_walk_engine() is engine
+    star.add_edge("b", "c", relation="links", sources=[])
+    rebuilt = star.get_walk_engine()
+    assert rebuilt is not engine
+    b = rebuilt.names.index("b")
+    neighbors = rebuilt.indices[rebuilt.indptr[b] : rebuilt.indptr[b + 1]]
+    assert sorted(rebuilt.names[i] for i in neighbors) == ["c", "hub"]
+
+
+@pytest.mark.parametrize("backend", ["networkx", "sqlite"])
+def test_generators_avoid_full_graph_reads(backend, tmp_path, monkeypatch):
+    """Test that walks only export the graph when the backend holds it in memory."""
+    if backend == "sqlite":
+        kg = KnowledgeGraph(backend="sqlite", path=str(tmp_path / "graph.db"))
+    else:
+        kg = KnowledgeGraph()
+    for leaf in ["a", "b", "c"]:
+        kg.add_edge("hub", leaf, relation="links", sources=[])
+    # Every walk ends next to "end", so that the generator always finds a path
+    for node in ["hub", "a", "b", "c"]:
+        kg.add_edge(node, "end", relation="links", sources=[])
+
+    backend_type = type(kg._backend)
+    calls = Counter()
+    for name in ["get_statistics", "edge_arrays"]:
+        original = getattr(backend_type, name)
+
+        def counted(self, *args, _name=name, _original=original, **kwargs):
+            calls[_name] += 1
+            return _original(self, *args, **kwargs)
+
+        monkeypatch.setattr(backend_type, name, counted)
+
+    native = backend == "networkx"
+    assert kg.uses_walk_engine() is native
+    assert kg.uses_walk_engine(WALK_ENGINE_MIN_WALKERS)
+    for _ in range(3):
+        path = SingleNodeRandomWalkGenerator(max_steps=4).generate_path_nodes(kg, "hub")
+        assert len(path) == 5
+        path = RandomWalkGenerator(max_steps=20).generate_path_nodes(kg, "a", "end")
+        assert path[0] == "a" and path[-1] == "end"
+    assert calls == (Counter(edge_arrays=1) if native else Counter())
+
+
+def test_walk_engine_follows_backend_writes():
+    """Test that the engine is rebuilt after writes made directly to the backend."""
+    kg = KnowledgeGraph()
+    kg.add_edge("a", "b", relation="links", sources=[])
+    engine = kg.get_walk_engine()
+    assert kg.get_walk_engine() is engine
+
+    kg.graph.add_edges([("b", "c", {"relation": "links", "sources": []})])
+    assert kg.get_walk_engine() is not engine
+    path = RandomWalkGenerator(max_steps=50).generate_path_nodes(kg, "a", "c")
+    assert path[0] == "a" and path[-1] == "c"